@@ -80,6 +80,32 @@ class Config:
     # Интервал проверки SLA заявок (в минутах)
     SLA_CHECK_INTERVAL: int = int(os.getenv("SLA_CHECK_INTERVAL", "30"))
 
+    # Интервал полной пересинхронизации индекса SLA с БД (в часах)
+    SLA_INDEX_RESYNC_HOURS: int = int(os.getenv("SLA_INDEX_RESYNC_HOURS", "6"))
+
+    # Общие подключения к БД процесса (app/database/registry.py) для экземпляров,
+    # созданных без явного пути/URL (get_database())
+    DB_SHARED_CONNECTIONS: bool = os.getenv("DB_SHARED_CONNECTIONS", "true").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+
+    # Пул legacy Database для общих экземпляров (app/database/sqlite_pool.py):
+    # соединения только для чтения (0 - пул выключен, все запросы на одном соединении)
+    # и максимум одиночных записей в одной групповой транзакции
+    DB_READ_CONNECTIONS: int = int(os.getenv("DB_READ_CONNECTIONS", "4"))
+    DB_WRITE_BATCH_SIZE: int = int(os.getenv("DB_WRITE_BATCH_SIZE", "64"))
+
+    # Кэш пользователей в RoleCheckMiddleware: время жизни (секунды, 0 - выключен) и размер
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "5000"))
+
+    # Rate limiting: максимум пользователей в памяти (давно неактивные вытесняются)
+    # и общие лимиты всех контейнеров через Redis (REDIS_URL)
+    RATE_LIMIT_MAX_USERS: int = int(os.getenv("RATE_LIMIT_MAX_USERS", "100000"))
+    RATE_LIMIT_REDIS: bool = os.getenv("RATE_LIMIT_REDIS", "false").lower() in ("true", "1", "yes")
+
     # Интервал напоминаний о непринятых заявках (в минутах)
     REMINDER_INTERVAL: int = int(os.getenv("REMINDER_INTERVAL", "5"))
 
@@ -91,6 +117,9 @@ class Config:
     # Автоматические бэкапы
     BACKUP_ENABLED: bool = os.getenv("BACKUP_ENABLED", "true").lower() in ("true", "1", "yes")
     BACKUP_SCHEDULE: str = os.getenv("BACKUP_SCHEDULE", "0 3 * * *")  # Cron формат
+    # Сжатие бэкапов (none, gzip, zstd) и срок хранения в днях (app/database/backup.py)
+    BACKUP_COMPRESSION: str = os.getenv("BACKUP_COMPRESSION", "gzip").lower()
+    BACKUP_KEEP_DAYS: int = int(os.getenv("BACKUP_KEEP_DAYS", "30"))
 
     # Telethon Parser Configuration
     TELETHON_API_ID: int | None = int(os.getenv("TELETHON_API_ID")) if os.getenv("TELETHON_API_ID") else None
@@ -101,6 +130,13 @@ class Config:
     # Включение парсера (можно отключить если не нужен)
     PARSER_ENABLED: bool = os.getenv("PARSER_ENABLED", "false").lower() in ("true", "1", "yes")
 
+    # Очередь сообщений парсера (app/services/parser_ingestion.py): воркеры, размер,
+    # ожидание места перед отбросом (секунды) и пул разбора текста (thread, process)
+    PARSER_WORKERS: int = int(os.getenv("PARSER_WORKERS", "4"))
+    PARSER_QUEUE_SIZE: int = int(os.getenv("PARSER_QUEUE_SIZE", "200"))
+    PARSER_QUEUE_PUT_TIMEOUT: float = float(os.getenv("PARSER_QUEUE_PUT_TIMEOUT", "10"))
+    PARSER_PARSE_EXECUTOR: str = os.getenv("PARSER_PARSE_EXECUTOR", "thread").lower()
+
     @classmethod
     def validate(cls) -> bool:
         """Валидация конфигурации"""
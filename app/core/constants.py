@@ -34,6 +34,11 @@ class OrderStatus:
         """Список всех статусов"""
         return [cls.NEW, cls.ASSIGNED, cls.ACCEPTED, cls.ONSITE, cls.CLOSED, cls.REFUSED, cls.DR]
 
+    @classmethod
+    def active_statuses(cls) -> list[str]:
+        """Незавершенные статусы (в порядке вывода в отчетах)"""
+        return [cls.NEW, cls.ASSIGNED, cls.ACCEPTED, cls.ONSITE, cls.DR]
+
     @classmethod
     def get_status_emoji(cls, status: str) -> str:
         """Получение эмодзи для статуса"""
@@ -62,6 +67,17 @@ class OrderStatus:
         }
         return names.get(status, status)
 
+    @classmethod
+    def get_timestamp_field(cls, status: str) -> str | None:
+        """Колонка заявки со временем входа в статус (None - статус без колонки)"""
+        fields = {
+            cls.ASSIGNED: "assigned_at",
+            cls.ACCEPTED: "accepted_at",
+            cls.ONSITE: "onsite_at",
+            cls.CLOSED: "closed_at",
+        }
+        return fields.get(status)
+
 
 class EquipmentType:
     """Типы техники"""
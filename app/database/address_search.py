@@ -0,0 +1,165 @@
+"""
+Полнотекстовый индекс адресов заявок (SQLite FTS5, токенизатор trigram)
+
+Индекс orders_address_fts - external content таблица поверх orders.client_address.
+Он поддерживается триггерами на INSERT/UPDATE/DELETE, поэтому актуален при
+записи через любой слой (legacy Database, ORMDatabase, скрипты).
+Trigram-токенизатор ищет подстроки от 3 символов без учета регистра
+(включая кириллицу), что покрывает поиск по части названия улицы.
+"""
+
+import re
+from collections.abc import Sequence
+from typing import Any
+
+
+ADDRESS_FTS_TABLE = "orders_address_fts"
+
+# Минимальная длина слова, которое можно искать через trigram-индекс
+MIN_INDEXED_TERM_LENGTH = 3
+
+ADDRESS_FTS_DDL: tuple[str, ...] = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {ADDRESS_FTS_TABLE} USING fts5(
+        client_address,
+        content='orders',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_address_fts_insert
+    AFTER INSERT ON orders BEGIN
+        INSERT INTO {ADDRESS_FTS_TABLE}(rowid, client_address)
+        VALUES (new.id, new.client_address);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_address_fts_delete
+    AFTER DELETE ON orders BEGIN
+        INSERT INTO {ADDRESS_FTS_TABLE}({ADDRESS_FTS_TABLE}, rowid, client_address)
+        VALUES ('delete', old.id, old.client_address);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_address_fts_update
+    AFTER UPDATE OF client_address ON orders BEGIN
+        INSERT INTO {ADDRESS_FTS_TABLE}({ADDRESS_FTS_TABLE}, rowid, client_address)
+        VALUES ('delete', old.id, old.client_address);
+        INSERT INTO {ADDRESS_FTS_TABLE}(rowid, client_address)
+        VALUES (new.id, new.client_address);
+    END
+    """,
+)
+
+# Объекты индекса в sqlite_master: таблица и три триггера.
+# Пересоздание таблицы orders (batch-миграции SQLite) удаляет триггеры,
+# поэтому при старте проверяем, что все объекты на месте.
+ADDRESS_FTS_OBJECTS = (
+    ADDRESS_FTS_TABLE,
+    "trg_orders_address_fts_insert",
+    "trg_orders_address_fts_delete",
+    "trg_orders_address_fts_update",
+)
+
+# Полное перестроение индекса по текущему содержимому orders
+ADDRESS_FTS_REBUILD = f"INSERT INTO {ADDRESS_FTS_TABLE}({ADDRESS_FTS_TABLE}) VALUES ('rebuild')"
+
+# Кандидаты из индекса: ID неудаленных заявок по убыванию релевантности.
+# Без LIMIT: короткие слова (номера домов) в MATCH не попадают и проверяются
+# уже в rank_by_terms, поэтому усечение по bm25 теряло бы точные совпадения.
+ADDRESS_FTS_CANDIDATES_SQL = f"""
+    SELECT {ADDRESS_FTS_TABLE}.rowid AS rowid, {ADDRESS_FTS_TABLE}.rank AS score
+    FROM {ADDRESS_FTS_TABLE}
+    JOIN orders ON orders.id = {ADDRESS_FTS_TABLE}.rowid
+    WHERE {ADDRESS_FTS_TABLE} MATCH :match AND orders.deleted_at IS NULL
+"""  # nosec B608 - имя таблицы - константа модуля
+
+# Типы адресных объектов (полные формы после нормализации и сокращения).
+# Встречаются почти в каждом адресе, поэтому в поиске не участвуют.
+ADDRESS_STOP_WORDS = frozenset(
+    {
+        "улица",
+        "ул",
+        "дом",
+        "д",
+        "квартира",
+        "кв",
+        "проспект",
+        "пр",
+        "переулок",
+        "пер",
+        "набережная",
+        "наб",
+        "город",
+        "г",
+        "корпус",
+        "корп",
+        "строение",
+        "стр",
+    }
+)
+
+
+def address_search_terms(address: str) -> list[str]:
+    """
+    Разбиение адреса на значимые слова для поиска
+
+    Args:
+        address: Нормализованный адрес (нижний регистр)
+
+    Returns:
+        Уникальные слова в порядке появления, без типов адресных объектов
+    """
+    terms: list[str] = []
+    for word in re.split(r"[^\w]+", address.lower()):
+        if word and word not in ADDRESS_STOP_WORDS and word not in terms:
+            terms.append(word)
+    return terms
+
+
+def build_match_expression(terms: Sequence[str]) -> str | None:
+    """
+    Построение FTS5 MATCH выражения: любое из слов длиной от 3 символов
+
+    Args:
+        terms: Слова запроса
+
+    Returns:
+        Выражение для MATCH или None, если искать через индекс нечего
+    """
+    indexed = [term for term in terms if len(term) >= MIN_INDEXED_TERM_LENGTH]
+    if not indexed:
+        return None
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in indexed)
+
+
+def rank_by_terms(orders: Sequence[Any], terms: Sequence[str]) -> list[Any]:
+    """
+    Ранжирование кандидатов по числу совпавших слов запроса
+
+    Если есть заявки, адрес которых содержит все слова запроса, возвращаются
+    только они. Иначе - все кандидаты, сначала с большим числом совпадений.
+    Внутри группы сохраняется исходный порядок (релевантность индекса).
+
+    Args:
+        orders: Кандидаты из индекса
+        terms: Слова запроса (включая короткие - номера домов и квартир)
+
+    Returns:
+        Отсортированный список заявок
+    """
+    if not terms:
+        return list(orders)
+
+    scored = []
+    for position, order in enumerate(orders):
+        address = (order.client_address or "").lower()
+        score = sum(1 for term in terms if term in address)
+        scored.append((score, position, order))
+
+    if any(score == len(terms) for score, _, _ in scored):
+        scored = [item for item in scored if item[0] == len(terms)]
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [order for _, _, order in scored]
@@ -0,0 +1,320 @@
+"""
+Онлайн-бэкап SQLite без блокировки бота
+
+Рабочая БД открыта в режиме WAL, поэтому копирование файла (shutil.copy2)
+может захватить несогласованное состояние без файла -wal и блокирует event
+loop на время чтения. Бэкап выполняется через sqlite3 backup API: страницы
+копируются порциями в отдельном потоке, между порциями поток засыпает и
+отдает блокировки писателям.
+
+Готовая копия проверяется (PRAGMA quick_check), при необходимости сжимается
+(gzip или zstd - пакет zstandard), рядом записывается файл контрольной суммы
+<имя>.sha256 в формате sha256sum. Старые копии удаляются по сроку хранения.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import shutil
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, cast
+
+from app.utils.helpers import MOSCOW_TZ
+
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+# Расширения файлов бэкапа по типу сжатия
+_EXTENSIONS = {
+    COMPRESSION_NONE: ".db",
+    COMPRESSION_GZIP: ".db.gz",
+    COMPRESSION_ZSTD: ".db.zst",
+}
+
+CHECKSUM_SUFFIX = ".sha256"
+
+# Размер блока при сжатии и подсчете контрольной суммы
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Ошибка создания или проверки бэкапа"""
+
+
+@dataclass(slots=True)
+class BackupResult:
+    """Результат создания бэкапа"""
+
+    path: Path
+    size: int
+    checksum: str
+    pages: int
+    duration: float
+    deleted: list[Path] = field(default_factory=list)
+
+
+def _open_compressed(path: Path, compression: str) -> BinaryIO:
+    """
+    Открытие файла бэкапа на запись с нужным сжатием
+
+    Args:
+        path: Путь к файлу
+        compression: Тип сжатия
+
+    Returns:
+        Файловый объект для записи
+    """
+    if compression == COMPRESSION_GZIP:
+        return cast(BinaryIO, gzip.open(path, "wb", compresslevel=6))
+    if compression == COMPRESSION_ZSTD:
+        import zstandard
+
+        return cast(BinaryIO, zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb")))
+    return open(path, "wb")
+
+
+def file_checksum(path: Path) -> str:
+    """
+    SHA-256 файла (читается блоками)
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Контрольная сумма в hex
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_backup(path: Path) -> bool:
+    """
+    Сверка файла бэкапа с его файлом контрольной суммы
+
+    Args:
+        path: Путь к файлу бэкапа
+
+    Returns:
+        True, если контрольная сумма совпадает
+    """
+    checksum_path = path.with_name(path.name + CHECKSUM_SUFFIX)
+    if not checksum_path.exists():
+        return False
+    expected = checksum_path.read_text(encoding="utf-8").split()[0]
+    return file_checksum(path) == expected
+
+
+class SQLiteBackup:
+    """Онлайн-бэкап файла SQLite со сжатием, проверкой и сроком хранения"""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        backup_dir: str | Path,
+        compression: str = COMPRESSION_NONE,
+        keep_days: int = 30,
+        prefix: str = "bot_database_",
+        pages_per_step: int = 1024,
+        step_pause: float = 0.005,
+    ):
+        """
+        Инициализация
+
+        Args:
+            db_path: Путь к рабочей БД
+            backup_dir: Директория бэкапов
+            compression: Сжатие: none, gzip или zstd
+            keep_days: Срок хранения копий в днях (0 - не удалять)
+            prefix: Префикс имен файлов бэкапа
+            pages_per_step: Страниц БД за один шаг backup API
+            step_pause: Пауза между шагами в секундах (время для писателей)
+        """
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Неизвестный тип сжатия бэкапа: {compression}")
+        if compression == COMPRESSION_ZSTD:
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    "Пакет zstandard не установлен, бэкап будет сжат gzip. "
+                    "Установите: pip install zstandard"
+                )
+                compression = COMPRESSION_GZIP
+
+        self.db_path = Path(db_path)
+        self.backup_dir = Path(backup_dir)
+        self.compression = compression
+        self.keep_days = keep_days
+        self.prefix = prefix
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+
+    async def create(self) -> BackupResult:
+        """
+        Создание бэкапа в отдельном потоке (event loop не блокируется)
+
+        Returns:
+            BackupResult
+        """
+        return await asyncio.to_thread(self.create_sync)
+
+    def create_sync(self) -> BackupResult:
+        """
+        Создание бэкапа в текущем потоке (для скриптов)
+
+        Returns:
+            BackupResult
+
+        Raises:
+            BackupError: БД не найдена или копия не прошла проверку
+        """
+        if not self.db_path.exists():
+            raise BackupError(f"База данных не найдена: {self.db_path}")
+
+        started = time.monotonic()
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+
+        timestamp = datetime.now(MOSCOW_TZ).strftime("%Y-%m-%d_%H-%M-%S")
+        target = self.backup_dir / f"{self.prefix}{timestamp}{_EXTENSIONS[self.compression]}"
+        snapshot = self.backup_dir / f".{self.prefix}{timestamp}.db.tmp"
+        partial = target.with_name(target.name + ".tmp")
+
+        try:
+            pages = self._copy_pages(snapshot)
+            self._check_integrity(snapshot)
+
+            if self.compression == COMPRESSION_NONE:
+                snapshot.replace(partial)
+            else:
+                with (
+                    open(snapshot, "rb") as source,
+                    _open_compressed(partial, self.compression) as destination,
+                ):
+                    shutil.copyfileobj(source, destination, _CHUNK_SIZE)
+                snapshot.unlink()
+
+            checksum = file_checksum(partial)
+            partial.replace(target)
+            target.with_name(target.name + CHECKSUM_SUFFIX).write_text(
+                f"{checksum}  {target.name}\n", encoding="utf-8"
+            )
+        finally:
+            snapshot.unlink(missing_ok=True)
+            partial.unlink(missing_ok=True)
+
+        # Проверяем файл, уже записанный на диск
+        if not verify_backup(target):
+            raise BackupError(f"Контрольная сумма бэкапа не совпадает: {target}")
+
+        deleted = self.cleanup()
+        duration = time.monotonic() - started
+        logger.info(
+            "Бэкап БД создан: %s (%d страниц, %.1f с, удалено старых: %d)",
+            target.name,
+            pages,
+            duration,
+            len(deleted),
+        )
+        return BackupResult(
+            path=target,
+            size=target.stat().st_size,
+            checksum=checksum,
+            pages=pages,
+            duration=duration,
+            deleted=deleted,
+        )
+
+    def _copy_pages(self, snapshot: Path) -> int:
+        """
+        Копирование БД через backup API порциями страниц
+
+        Args:
+            snapshot: Файл копии
+
+        Returns:
+            Число скопированных страниц
+        """
+        total_pages = 0
+
+        def progress(_status: int, remaining: int, total: int) -> None:
+            nonlocal total_pages
+            total_pages = total
+            logger.debug("Бэкап БД: осталось %d из %d страниц", remaining, total)
+
+        source = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            destination = sqlite3.connect(snapshot)
+            try:
+                source.backup(
+                    destination,
+                    pages=self.pages_per_step,
+                    progress=progress,
+                    sleep=self.step_pause,
+                )
+            finally:
+                destination.close()
+        finally:
+            source.close()
+        return total_pages
+
+    @staticmethod
+    def _check_integrity(snapshot: Path) -> None:
+        """Проверка структуры копии (PRAGMA quick_check)"""
+        connection = sqlite3.connect(snapshot)
+        try:
+            result = connection.execute("PRAGMA quick_check").fetchone()[0]
+        finally:
+            connection.close()
+        if result != "ok":
+            raise BackupError(f"Копия БД повреждена: {result}")
+
+    def list_backups(self) -> list[Path]:
+        """
+        Файлы бэкапов в директории
+
+        Returns:
+            Пути, новые первыми
+        """
+        if not self.backup_dir.exists():
+            return []
+        backups = [
+            path
+            for path in self.backup_dir.glob(f"{self.prefix}*")
+            if path.name.endswith(tuple(_EXTENSIONS.values()))
+        ]
+        return sorted(backups, key=lambda path: path.name, reverse=True)
+
+    def cleanup(self) -> list[Path]:
+        """
+        Удаление бэкапов старше срока хранения (вместе с файлами контрольных сумм)
+
+        Returns:
+            Удаленные файлы бэкапов
+        """
+        if self.keep_days <= 0:
+            return []
+
+        cutoff = datetime.now(MOSCOW_TZ) - timedelta(days=self.keep_days)
+        deleted = []
+        for path in self.list_backups():
+            try:
+                if datetime.fromtimestamp(path.stat().st_mtime, tz=MOSCOW_TZ) >= cutoff:
+                    continue
+                path.unlink()
+                path.with_name(path.name + CHECKSUM_SUFFIX).unlink(missing_ok=True)
+                deleted.append(path)
+            except OSError as e:
+                logger.warning("Не удалось удалить старый бэкап %s: %s", path.name, e)
+        return deleted
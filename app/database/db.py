@@ -3,13 +3,19 @@
 """
 
 import logging
+from collections.abc import Iterable
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 import aiosqlite
 
 from app.config import Config, OrderStatus, UserRole
+from app.database.address_search import (
+    ADDRESS_FTS_DDL,
+    ADDRESS_FTS_OBJECTS,
+    ADDRESS_FTS_REBUILD,
+)
 from app.database.models import (
     AuditLog,
     FinancialReport,
@@ -18,30 +24,59 @@ from app.database.models import (
     Order,
     User,
 )
+from app.database.registry import database_registry
+from app.database.row_mapper import OrderRowMapper
+from app.database.sqlite_pool import SQLitePool, WriteResult
+from app.database.user_cache import user_cache
 from app.domain.order_state_machine import InvalidStateTransitionError, OrderStateMachine
-from app.utils.helpers import MOSCOW_TZ, get_now
+from app.domain.sla_index import sla_index
+from app.utils.date_parser import parse_scheduled_window
+from app.utils.helpers import get_now, normalize_phone, to_db_timestamp
 
 
 if TYPE_CHECKING:
+    from app.repositories.base import BaseRepository
     from app.services.service_factory import ServiceFactory
 
 
 logger = logging.getLogger(__name__)
 
+RepositoryT = TypeVar("RepositoryT", bound="BaseRepository")
+
+MASTER_FINANCIAL_REPORT_INSERT_SQL = """
+    INSERT INTO master_financial_reports (
+        report_id, master_id, master_name, orders_count,
+        total_amount, total_materials_cost, total_net_profit,
+        total_master_profit, total_company_profit, average_check,
+        reviews_count, out_of_city_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class Database:
     """Класс для работы с базой данных"""
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | None = None, shared: bool | None = None):
         """
         Инициализация
 
         Args:
             db_path: Путь к файлу базы данных
+            shared: Брать соединения из общего пула процесса (database_registry).
+                По умолчанию - только для БД из конфигурации (без явного пути)
         """
         self.db_path = db_path or Config.DATABASE_PATH
         self.connection: aiosqlite.Connection | None = None
+        if shared is None:
+            shared = db_path is None and Config.DB_SHARED_CONNECTIONS
+        # In-memory БД у каждого соединения своя - пул для нее не имеет смысла
+        self.shared = shared and self.db_path != ":memory:"
+        self._lease_id: int | None = None
+        # Пул читателей и очередь писателя (только для общих экземпляров)
+        self._pool: SQLitePool | None = None
+        self._pool_lease_id: int | None = None
         self._service_factory: ServiceFactory | None = None
+        self._order_mapper = OrderRowMapper()
 
     def _get_connection(self) -> aiosqlite.Connection:
         """
@@ -58,20 +93,85 @@ class Database:
         Публичный accessor для безопасного доступа к соединению.
 
         Используется сервисами/репозиториями вместо обращения к self.connection напрямую.
+        С пулом SQLite соединение только для чтения: единственный писатель - очередь
+        пула, записи выполняются через transaction() (см. repository()).
         """
         return self._get_connection()
 
-    async def connect(self):
-        """Подключение к базе данных"""
+    def repository(self, repository_class: type[RepositoryT]) -> RepositoryT:
+        """
+        Репозиторий, записи которого идут через transaction() этой БД
+
+        Args:
+            repository_class: Класс репозитория (наследник BaseRepository)
+
+        Returns:
+            Экземпляр репозитория
+        """
+        return repository_class(self._get_connection(), self.transaction)
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Открытие нового соединения"""
         connection = await aiosqlite.connect(self.db_path)
         connection.row_factory = aiosqlite.Row
         # Устанавливаем isolation_level для правильной работы транзакций
-        await connection.execute("PRAGMA journal_mode=WAL")
-        self.connection = connection
+        cursor = await connection.execute("PRAGMA journal_mode=WAL")
+        # Незакрытый курсор держит блокировку и мешает другим соединениям к этому файлу
+        await cursor.close()
         logger.info("Подключено к базе данных: %s", self.db_path)
+        return connection
+
+    async def connect(self):
+        """
+        Подключение к базе данных
+
+        Общий экземпляр (shared) берет свободное соединение из пула
+        database_registry. Повторный connect() без disconnect() ничего не делает.
+        Если включен DB_READ_CONNECTIONS, запросы методов Database идут через
+        общий SQLitePool: чтения - на соединениях читателей, записи - через
+        очередь писателя.
+        """
+        if self.shared:
+            if self._lease_id is not None:
+                return
+            self._lease_id, connection = await database_registry.acquire_connection(
+                self, self.db_path, self._open_connection
+            )
+            self.connection = connection
+            self._service_factory = None
+
+            if Config.DB_READ_CONNECTIONS > 0:
+                self._pool_lease_id, pool = database_registry.acquire_pool(
+                    self, self.db_path, self._create_pool
+                )
+                await pool.open(self._open_connection)
+                self._pool = pool
+                # Писатель у файла один - очередь пула; запись мимо нее получила бы SQLITE_BUSY
+                cursor = await connection.execute("PRAGMA query_only=ON")
+                await cursor.close()
+            return
+
+        self.connection = await self._open_connection()
 
     async def disconnect(self):
-        """Отключение от базы данных"""
+        """
+        Отключение от базы данных
+
+        Общий экземпляр возвращает соединение в пул database_registry
+        (после этого соединение может получить другой владелец).
+        """
+        if self.shared:
+            if self._pool_lease_id is not None:
+                pool_lease_id, self._pool_lease_id = self._pool_lease_id, None
+                self._pool = None
+                await database_registry.release(pool_lease_id)
+            if self._lease_id is not None:
+                lease_id, self._lease_id = self._lease_id, None
+                self.connection = None
+                self._service_factory = None
+                await database_registry.release(lease_id)
+            return
+
         connection = self.connection
         if connection:
             await connection.close()
@@ -89,9 +189,68 @@ class Database:
             from app.services.service_factory import ServiceFactory
 
             connection = self._get_connection()
-            self._service_factory = ServiceFactory(connection)
+            self._service_factory = ServiceFactory(connection, self.transaction)
         return self._service_factory
 
+    def _create_pool(self) -> SQLitePool:
+        """Создание пула читателей и писателя для файла БД"""
+        return SQLitePool(
+            self.db_path,
+            readers=Config.DB_READ_CONNECTIONS,
+            max_batch=Config.DB_WRITE_BATCH_SIZE,
+        )
+
+    @asynccontextmanager
+    async def _reader(self):
+        """
+        Соединение для SELECT-запросов
+
+        С пулом - свободный читатель (или соединение текущей транзакции),
+        без пула - основное соединение.
+        """
+        if self._pool is None:
+            yield self._get_connection()
+            return
+
+        async with self._pool.reader() as connection:
+            yield connection
+
+    @asynccontextmanager
+    async def _writer(self):
+        """
+        Соединение для записи без своей транзакции (создание схемы и индексов)
+
+        С пулом - соединение писателя в порядке очереди, без пула - основное соединение.
+        """
+        if self._pool is None:
+            yield self._get_connection()
+            return
+
+        async with self._pool.transaction() as connection:
+            yield connection
+
+    async def _execute_write(self, query: str, params: Any = ()) -> WriteResult:
+        """
+        Одиночный оператор записи с фиксацией
+
+        С пулом оператор ставится в очередь писателя и фиксируется групповой
+        транзакцией вместе с соседними записями (group commit).
+
+        Args:
+            query: SQL оператор
+            params: Параметры
+
+        Returns:
+            WriteResult (lastrowid, rowcount)
+        """
+        if self._pool is not None:
+            return await self._pool.execute(query, params)
+
+        connection = self._get_connection()
+        cursor = await connection.execute(query, params)
+        await connection.commit()
+        return WriteResult(cursor.lastrowid, cursor.rowcount)
+
     @asynccontextmanager
     async def transaction(self):
         """
@@ -99,17 +258,29 @@ class Database:
 
         Использует BEGIN IMMEDIATE для предотвращения race conditions в SQLite.
         Автоматически делает commit при успехе или rollback при ошибке.
+        С пулом транзакция выполняется на соединении писателя в порядке
+        очереди, поэтому параллельные транзакции не пересекаются.
 
         Usage:
-            async with db.transaction():
+            async with db.transaction() as connection:
                 # Все операции внутри этого блока атомарны
-                await db.connection.execute(...)
-                await db.connection.execute(...)
+                await connection.execute(...)
+                await connection.execute(...)
                 # commit выполнится автоматически
 
         Raises:
             Exception: Любая ошибка внутри транзакции вызовет rollback
         """
+        if self._pool is not None:
+            try:
+                async with self._pool.transaction() as connection:
+                    yield connection
+                logger.debug("✅ Транзакция успешно завершена (commit)")
+            except Exception as e:
+                logger.error(f"❌ Транзакция отменена (rollback): {e}")
+                raise
+            return
+
         connection = self._get_connection()
 
         # BEGIN IMMEDIATE получает эксклюзивную блокировку сразу
@@ -163,96 +334,102 @@ class Database:
         logger.warning("⚠️  Создание legacy схемы. Рекомендуется использовать Alembic!")
 
         # Минимальная схема для работы
-        connection = self._get_connection()
-
-        await connection.execute(
+        async with self._writer() as connection:
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    telegram_id INTEGER UNIQUE NOT NULL,
+                    username TEXT,
+                    first_name TEXT,
+                    last_name TEXT,
+                    role TEXT DEFAULT 'UNKNOWN',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
             """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                telegram_id INTEGER UNIQUE NOT NULL,
-                username TEXT,
-                first_name TEXT,
-                last_name TEXT,
-                role TEXT DEFAULT 'UNKNOWN',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
 
-        await connection.execute(
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS masters (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    telegram_id INTEGER UNIQUE NOT NULL,
+                    phone TEXT NOT NULL,
+                    specialization TEXT NOT NULL,
+                    is_active BOOLEAN DEFAULT 1,
+                    is_approved BOOLEAN DEFAULT 0,
+                    work_chat_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (telegram_id) REFERENCES users(telegram_id)
+                )
             """
-            CREATE TABLE IF NOT EXISTS masters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                telegram_id INTEGER UNIQUE NOT NULL,
-                phone TEXT NOT NULL,
-                specialization TEXT NOT NULL,
-                is_active BOOLEAN DEFAULT 1,
-                is_approved BOOLEAN DEFAULT 0,
-                work_chat_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (telegram_id) REFERENCES users(telegram_id)
             )
-        """
-        )
 
-        await connection.execute(
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS orders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    equipment_type TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    client_name TEXT NOT NULL,
+                    client_address TEXT NOT NULL,
+                    client_phone TEXT NOT NULL,
+                    client_phone_normalized TEXT,
+                    status TEXT DEFAULT 'NEW',
+                    assigned_master_id INTEGER,
+                    dispatcher_id INTEGER,
+                    notes TEXT,
+                    scheduled_time TEXT,
+                    scheduled_at TIMESTAMP,
+                    scheduled_until TIMESTAMP,
+                    total_amount REAL,
+                    materials_cost REAL,
+                    master_profit REAL,
+                    company_profit REAL,
+                    has_review INTEGER DEFAULT 0,
+                    assigned_at TIMESTAMP,
+                    accepted_at TIMESTAMP,
+                    onsite_at TIMESTAMP,
+                    closed_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (assigned_master_id) REFERENCES masters(id),
+                    FOREIGN KEY (dispatcher_id) REFERENCES users(telegram_id)
+                )
             """
-            CREATE TABLE IF NOT EXISTS orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                equipment_type TEXT NOT NULL,
-                description TEXT NOT NULL,
-                client_name TEXT NOT NULL,
-                client_address TEXT NOT NULL,
-                client_phone TEXT NOT NULL,
-                status TEXT DEFAULT 'NEW',
-                assigned_master_id INTEGER,
-                dispatcher_id INTEGER,
-                notes TEXT,
-                scheduled_time TEXT,
-                total_amount REAL,
-                materials_cost REAL,
-                master_profit REAL,
-                company_profit REAL,
-                has_review INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (assigned_master_id) REFERENCES masters(id),
-                FOREIGN KEY (dispatcher_id) REFERENCES users(telegram_id)
             )
-        """
-        )
 
-        await connection.execute(
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS audit_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    action TEXT NOT NULL,
+                    details TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(telegram_id)
+                )
             """
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                action TEXT NOT NULL,
-                details TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(telegram_id)
             )
-        """
-        )
 
-        await connection.execute(
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS order_status_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    order_id INTEGER NOT NULL,
+                    old_status TEXT,
+                    new_status TEXT NOT NULL,
+                    changed_by INTEGER,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    notes TEXT,
+                    FOREIGN KEY (order_id) REFERENCES orders(id),
+                    FOREIGN KEY (changed_by) REFERENCES users(telegram_id)
+                )
             """
-            CREATE TABLE IF NOT EXISTS order_status_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id INTEGER NOT NULL,
-                old_status TEXT,
-                new_status TEXT NOT NULL,
-                changed_by INTEGER,
-                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                notes TEXT,
-                FOREIGN KEY (order_id) REFERENCES orders(id),
-                FOREIGN KEY (changed_by) REFERENCES users(telegram_id)
             )
-        """
-        )
 
-        await connection.commit()
-        logger.info("[OK] Legacy схема создана")
+            await connection.commit()
+            logger.info("[OK] Legacy схема создана")
 
     async def _create_indexes(self):
         """Создание индексов для оптимизации"""
@@ -266,13 +443,64 @@ class Database:
             "CREATE INDEX IF NOT EXISTS idx_orders_dispatcher_id ON orders(dispatcher_id)",
             "CREATE INDEX IF NOT EXISTS idx_audit_user_id ON audit_log(user_id)",
         ]
+        # Индексы по колонкам orders, которые добавляются миграциями Alembic:
+        # в базе, созданной прежней версией, колонки нет до `alembic upgrade head`
+        column_indexes = {
+            "client_phone_normalized": (
+                "CREATE INDEX IF NOT EXISTS idx_orders_client_phone_normalized "
+                "ON orders(client_phone_normalized)"
+            ),
+            "closed_at": "CREATE INDEX IF NOT EXISTS idx_orders_closed_at ON orders(closed_at)",
+            "scheduled_at": (
+                "CREATE INDEX IF NOT EXISTS idx_orders_scheduled_at ON orders(scheduled_at)"
+            ),
+        }
 
-        connection = self._get_connection()
+        async with self._writer() as connection:
+            for index_sql in indexes:
+                await connection.execute(index_sql)
+
+            cursor = await connection.execute("PRAGMA table_info(orders)")
+            order_columns = {row[1] for row in await cursor.fetchall()}
+            for column, index_sql in column_indexes.items():
+                if column in order_columns:
+                    await connection.execute(index_sql)
+                else:
+                    logger.warning(
+                        f"⚠️  Колонка orders.{column} отсутствует, индекс не создан. "
+                        "Запустите миграции: alembic upgrade head"
+                    )
 
-        for index_sql in indexes:
-            await connection.execute(index_sql)
+            await connection.commit()
 
-        await connection.commit()
+        await self._create_address_search_index()
+
+    async def _create_address_search_index(self):
+        """
+        Создание FTS5 индекса адресов заявок (см. app.database.address_search)
+
+        Если индекс или его триггеры отсутствуют (первый запуск, пересоздание
+        таблицы orders), они создаются и индекс перестраивается по всем заявкам.
+        Если SQLite собран без FTS5, поиск по адресу работает через LIKE.
+        """
+        async with self._writer() as connection:
+            placeholders = ", ".join("?" * len(ADDRESS_FTS_OBJECTS))
+            cursor = await connection.execute(
+                f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({placeholders})",  # nosec B608
+                ADDRESS_FTS_OBJECTS,
+            )
+            row = await cursor.fetchone()
+            if row and row[0] == len(ADDRESS_FTS_OBJECTS):
+                return
+
+            try:
+                for ddl in ADDRESS_FTS_DDL:
+                    await connection.execute(ddl)
+                await connection.execute(ADDRESS_FTS_REBUILD)
+                await connection.commit()
+            except aiosqlite.OperationalError as e:
+                await connection.rollback()
+                logger.warning("FTS5 индекс адресов недоступен, поиск будет через LIKE: %s", e)
 
     # ==================== USERS ====================
 
@@ -295,8 +523,6 @@ class Database:
         Returns:
             Объект User
         """
-        connection = self._get_connection()
-
         # Проверяем существование пользователя
         user = await self.get_user_by_telegram_id(telegram_id)
 
@@ -307,7 +533,7 @@ class Database:
                 or user.first_name != first_name
                 or user.last_name != last_name
             ):
-                await connection.execute(
+                await self._execute_write(
                     """
                     UPDATE users
                     SET username = ?, first_name = ?, last_name = ?
@@ -315,7 +541,6 @@ class Database:
                     """,
                     (username, first_name, last_name, telegram_id),
                 )
-                await connection.commit()
                 user.username = username
                 user.first_name = first_name
                 user.last_name = last_name
@@ -366,11 +591,10 @@ class Database:
 
             # Обновляем роль в базе данных, если она изменилась
             if roles_updated:
-                await connection.execute(
+                await self._execute_write(
                     "UPDATE users SET role = ? WHERE telegram_id = ?",
                     (user.role, telegram_id),
                 )
-                await connection.commit()
                 final_roles = user.get_roles()
                 logger.info(
                     f"Роль пользователя {telegram_id} обновлена: {current_roles} -> {final_roles}"
@@ -405,17 +629,16 @@ class Database:
         role_str = ",".join(sorted(roles))
 
         # Создаем нового пользователя
-        cursor = await connection.execute(
+        result = await self._execute_write(
             """
             INSERT INTO users (telegram_id, username, first_name, last_name, role)
             VALUES (?, ?, ?, ?, ?)
             """,
             (telegram_id, username, first_name, last_name, role_str),
         )
-        await connection.commit()
 
         user = User(
-            id=cursor.lastrowid,
+            id=result.lastrowid,
             telegram_id=telegram_id,
             username=username,
             first_name=first_name,
@@ -437,12 +660,11 @@ class Database:
         Returns:
             Объект User или None
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            "SELECT * FROM users WHERE telegram_id = ?", (telegram_id,)
-        )
-        row = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT * FROM users WHERE telegram_id = ?", (telegram_id,)
+            )
+            row = await cursor.fetchone()
 
         if row:
             return User(
@@ -467,12 +689,10 @@ class Database:
         Returns:
             True если успешно
         """
-        connection = self._get_connection()
-
-        await connection.execute(
+        await self._execute_write(
             "UPDATE users SET role = ? WHERE telegram_id = ?", (role, telegram_id)
         )
-        await connection.commit()
+        user_cache.invalidate(telegram_id)
         logger.info("Роль пользователя %s изменена на %s", telegram_id, role)
         return True
 
@@ -489,8 +709,7 @@ class Database:
         Returns:
             True если успешно
         """
-        async with self.transaction():
-            connection = self._get_connection()
+        async with self.transaction() as connection:
             user = await self.get_user_by_telegram_id(telegram_id)
             if not user:
                 logger.error(f"Пользователь {telegram_id} не найден")
@@ -504,6 +723,7 @@ class Database:
             )
             # commit() выполнится автоматически
 
+        user_cache.invalidate(telegram_id)
         logger.info("Роль %s добавлена пользователю %s. Роли: %s", role, telegram_id, new_roles)
         return True
 
@@ -520,8 +740,7 @@ class Database:
         Returns:
             True если успешно
         """
-        async with self.transaction():
-            connection = self._get_connection()
+        async with self.transaction() as connection:
             user = await self.get_user_by_telegram_id(telegram_id)
             if not user:
                 logger.error(f"Пользователь {telegram_id} не найден")
@@ -535,6 +754,7 @@ class Database:
             )
             # commit() выполнится автоматически
 
+        user_cache.invalidate(telegram_id)
         logger.info(f"Роль {role} удалена у пользователя {telegram_id}. Роли: {new_roles}")
         return True
 
@@ -554,12 +774,10 @@ class Database:
 
         roles_str = ",".join(sorted(set(roles)))
 
-        connection = self._get_connection()
-
-        await connection.execute(
+        await self._execute_write(
             "UPDATE users SET role = ? WHERE telegram_id = ?", (roles_str, telegram_id)
         )
-        await connection.commit()
+        user_cache.invalidate(telegram_id)
         logger.info(f"Роли пользователя {telegram_id} установлены: {roles_str}")
         return True
 
@@ -570,10 +788,9 @@ class Database:
         Returns:
             Список пользователей
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute("SELECT * FROM users ORDER BY created_at DESC")
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute("SELECT * FROM users ORDER BY created_at DESC")
+            rows = await cursor.fetchall()
 
         users = []
         for row in rows:
@@ -651,19 +868,16 @@ class Database:
         Returns:
             Объект Master
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
+        result = await self._execute_write(
             """
             INSERT INTO masters (telegram_id, phone, specialization, is_approved)
             VALUES (?, ?, ?, ?)
             """,
             (telegram_id, phone, specialization, is_approved),
         )
-        await connection.commit()
 
         master = Master(
-            id=cursor.lastrowid,
+            id=result.lastrowid,
             telegram_id=telegram_id,
             phone=phone,
             specialization=specialization,
@@ -684,18 +898,17 @@ class Database:
         Returns:
             Объект Master или None
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            SELECT m.*, u.username, u.first_name, u.last_name
-            FROM masters m
-            LEFT JOIN users u ON m.telegram_id = u.telegram_id
-            WHERE m.telegram_id = ?
-            """,
-            (telegram_id,),
-        )
-        row = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT m.*, u.username, u.first_name, u.last_name
+                FROM masters m
+                LEFT JOIN users u ON m.telegram_id = u.telegram_id
+                WHERE m.telegram_id = ?
+                """,
+                (telegram_id,),
+            )
+            row = await cursor.fetchone()
 
         if row:
             return Master(
@@ -723,18 +936,17 @@ class Database:
         Returns:
             Объект Master или None
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            SELECT m.*, u.username, u.first_name, u.last_name
-            FROM masters m
-            LEFT JOIN users u ON m.telegram_id = u.telegram_id
-            WHERE m.id = ?
-            """,
-            (master_id,),
-        )
-        row = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT m.*, u.username, u.first_name, u.last_name
+                FROM masters m
+                LEFT JOIN users u ON m.telegram_id = u.telegram_id
+                WHERE m.id = ?
+                """,
+                (master_id,),
+            )
+            row = await cursor.fetchone()
 
         if row:
             return Master(
@@ -752,6 +964,54 @@ class Database:
             )
         return None
 
+    async def get_masters_by_ids(self, master_ids: Iterable[int]) -> dict[int, Master]:
+        """
+        Пакетное получение мастеров по списку ID (один запрос вместо N)
+
+        Args:
+            master_ids: ID мастеров (дубликаты и None игнорируются)
+
+        Returns:
+            Словарь {master_id: Master} для найденных мастеров
+        """
+        ids = sorted({master_id for master_id in master_ids if master_id is not None})
+        if not ids:
+            return {}
+
+        async with self._reader() as connection:
+            masters: dict[int, Master] = {}
+
+            # SQLite ограничивает число параметров в запросе, поэтому бьем на пачки
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = await connection.execute(
+                    f"""
+                    SELECT m.*, u.username, u.first_name, u.last_name
+                    FROM masters m
+                    LEFT JOIN users u ON m.telegram_id = u.telegram_id
+                    WHERE m.id IN ({placeholders})
+                    """,  # nosec B608 - плейсхолдеры формируются по числу ID, значения передаются параметрами
+                    chunk,
+                )
+                for row in await cursor.fetchall():
+                    masters[row["id"]] = Master(
+                        id=row["id"],
+                        telegram_id=row["telegram_id"],
+                        phone=row["phone"],
+                        specialization=row["specialization"],
+                        is_active=bool(row["is_active"]),
+                        is_approved=bool(row["is_approved"]),
+                        work_chat_id=row["work_chat_id"],
+                        created_at=(
+                            datetime.fromisoformat(row["created_at"]) if row["created_at"] else None
+                        ),
+                        username=row["username"],
+                        first_name=row["first_name"],
+                        last_name=row["last_name"],
+                    )
+        return masters
+
     async def get_master_by_work_chat_id(self, work_chat_id: int) -> Master | None:
         """
         Получение мастера по ID рабочей группы
@@ -762,18 +1022,17 @@ class Database:
         Returns:
             Объект Master или None
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            SELECT m.*, u.username, u.first_name, u.last_name
-            FROM masters m
-            LEFT JOIN users u ON m.telegram_id = u.telegram_id
-            WHERE m.work_chat_id = ?
-            """,
-            (work_chat_id,),
-        )
-        row = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT m.*, u.username, u.first_name, u.last_name
+                FROM masters m
+                LEFT JOIN users u ON m.telegram_id = u.telegram_id
+                WHERE m.work_chat_id = ?
+                """,
+                (work_chat_id,),
+            )
+            row = await cursor.fetchone()
 
         if row:
             return Master(
@@ -819,10 +1078,9 @@ class Database:
 
         query += " ORDER BY m.created_at DESC"
 
-        connection = self._get_connection()
-
-        cursor = await connection.execute(query, params)
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
 
         masters = []
         for row in rows:
@@ -856,12 +1114,9 @@ class Database:
         Returns:
             True если успешно
         """
-        connection = self._get_connection()
-
-        await connection.execute(
+        await self._execute_write(
             "UPDATE masters SET is_active = ? WHERE telegram_id = ?", (is_active, telegram_id)
         )
-        await connection.commit()
 
         logger.info(
             f"Статус мастера {telegram_id} изменен на {'активный' if is_active else 'неактивный'}"
@@ -882,18 +1137,16 @@ class Database:
         # Логируем перед обновлением
         logger.info(f"Updating work_chat_id for master {telegram_id} to {work_chat_id}")
 
-        connection = self._get_connection()
-
-        await connection.execute(
+        await self._execute_write(
             "UPDATE masters SET work_chat_id = ? WHERE telegram_id = ?", (work_chat_id, telegram_id)
         )
-        await connection.commit()
 
         # Проверяем результат обновления
-        cursor = await connection.execute(
-            "SELECT work_chat_id FROM masters WHERE telegram_id = ?", (telegram_id,)
-        )
-        result = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT work_chat_id FROM masters WHERE telegram_id = ?", (telegram_id,)
+            )
+            result = await cursor.fetchone()
         actual_work_chat_id = result["work_chat_id"] if result else None
 
         logger.info(
@@ -932,14 +1185,15 @@ class Database:
         Returns:
             Объект Order
         """
-        connection = self._get_connection()
-
         now = get_now()
-        cursor = await connection.execute(
+        scheduled_at, scheduled_until = parse_scheduled_window(scheduled_time)
+        result = await self._execute_write(
             """
             INSERT INTO orders (equipment_type, description, client_name, client_address,
-                              client_phone, master_lead_name, dispatcher_id, notes, scheduled_time, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                              client_phone, client_phone_normalized, master_lead_name, dispatcher_id,
+                              notes, scheduled_time, scheduled_at, scheduled_until,
+                              created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 equipment_type,
@@ -947,18 +1201,20 @@ class Database:
                 client_name,
                 client_address,
                 client_phone,
+                normalize_phone(client_phone),
                 master_lead_name,
                 dispatcher_id,
                 notes,
                 scheduled_time,
+                to_db_timestamp(scheduled_at) if scheduled_at else None,
+                to_db_timestamp(scheduled_until) if scheduled_until else None,
                 now.isoformat(),
                 now.isoformat(),
             ),
         )
-        await connection.commit()
 
         order = Order(
-            id=cursor.lastrowid,
+            id=result.lastrowid,
             equipment_type=equipment_type,
             description=description,
             client_name=client_name,
@@ -968,11 +1224,16 @@ class Database:
             dispatcher_id=dispatcher_id,
             notes=notes,
             scheduled_time=scheduled_time,
+            scheduled_at=scheduled_at,
+            scheduled_until=scheduled_until,
             status=OrderStatus.NEW,
             created_at=now,
             updated_at=now,
         )
 
+        if order.id is not None:
+            sla_index.track(order.id, OrderStatus.NEW, now)
+
         logger.info(f"Создана заявка #{order.id}")
 
         return order
@@ -987,97 +1248,61 @@ class Database:
         Returns:
             Объект Order или None
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
+        async with self._reader() as connection:
+            query = """
+                SELECT o.*,
+                       u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+                       u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+                FROM orders o
+                LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+                LEFT JOIN masters m ON o.assigned_master_id = m.id
+                LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+                WHERE o.id = ?
             """
-            SELECT o.*,
-                   u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
-                   u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
-            FROM orders o
-            LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
-            LEFT JOIN masters m ON o.assigned_master_id = m.id
-            LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
-            WHERE o.id = ?
-            """,
-            (order_id,),
-        )
-        row = await cursor.fetchone()
+            cursor = await connection.execute(query, (order_id,))
+            row = await cursor.fetchone()
 
         if row:
-            return Order(
-                id=row["id"],
-                equipment_type=row["equipment_type"],
-                description=row["description"],
-                client_name=row["client_name"],
-                client_address=row["client_address"],
-                client_phone=row["client_phone"],
-                master_lead_name=(
-                    row["master_lead_name"]
-                    if "master_lead_name" in row and row["master_lead_name"] is not None
-                    else None
-                ),
-                status=row["status"],
-                assigned_master_id=row["assigned_master_id"],
-                dispatcher_id=row["dispatcher_id"],
-                notes=row["notes"],
-                scheduled_time=row["scheduled_time"],
-                total_amount=(
-                    row["total_amount"]
-                    if "total_amount" in row and row["total_amount"] is not None
-                    else None
-                ),
-                materials_cost=(
-                    row["materials_cost"]
-                    if "materials_cost" in row and row["materials_cost"] is not None
-                    else None
-                ),
-                master_profit=(
-                    row["master_profit"]
-                    if "master_profit" in row and row["master_profit"] is not None
-                    else None
-                ),
-                company_profit=(
-                    row["company_profit"]
-                    if "company_profit" in row and row["company_profit"] is not None
-                    else None
-                ),
-                has_review=(
-                    bool(row["has_review"])
-                    if "has_review" in row and row["has_review"] is not None
-                    else None
-                ),
-                out_of_city=(
-                    bool(row["out_of_city"])
-                    if "out_of_city" in row and row["out_of_city"] is not None
-                    else None
-                ),
-                estimated_completion_date=(
-                    row["estimated_completion_date"]
-                    if "estimated_completion_date" in row
-                    and row["estimated_completion_date"] is not None
-                    else None
-                ),
-                prepayment_amount=(
-                    row["prepayment_amount"]
-                    if "prepayment_amount" in row and row["prepayment_amount"] is not None
-                    else None
-                ),
-                created_at=(
-                    datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
-                    if row["created_at"]
-                    else None
-                ),
-                updated_at=(
-                    datetime.fromisoformat(row["updated_at"]).replace(tzinfo=MOSCOW_TZ)
-                    if row["updated_at"]
-                    else None
-                ),
-                dispatcher_name=row["dispatcher_name"],
-                master_name=row["master_name"],
-            )
+            return self._order_mapper.map_row(query, cursor.description, row)
         return None
 
+    async def get_orders_by_ids(self, order_ids: Iterable[int]) -> list[Order]:
+        """
+        Пакетное получение заявок по списку ID (один запрос вместо N)
+
+        Args:
+            order_ids: ID заявок
+
+        Returns:
+            Найденные заявки в порядке переданных ID (отсутствующие и повторы пропускаются)
+        """
+        ids = list(dict.fromkeys(order_id for order_id in order_ids if order_id is not None))
+        if not ids:
+            return []
+
+        found: dict[int, Order] = {}
+        async with self._reader() as connection:
+            # SQLite ограничивает число параметров в запросе, поэтому бьем на пачки
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                query = f"""
+                    SELECT o.*,
+                           u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+                           u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+                    FROM orders o
+                    LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+                    LEFT JOIN masters m ON o.assigned_master_id = m.id
+                    LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+                    WHERE o.id IN ({", ".join("?" * len(chunk))})
+                """  # nosec B608 - плейсхолдеры формируются по числу ID, значения передаются параметрами
+                cursor = await connection.execute(query, chunk)
+                rows = await cursor.fetchall()
+                for order in self._order_mapper.map_rows(query, cursor.description, rows):
+                    if order.id is not None:
+                        found[order.id] = order
+
+        return [found[order_id] for order_id in ids if order_id in found]
+
     async def get_all_orders(
         self, status: str | None = None, master_id: int | None = None, limit: int | None = None
     ) -> list[Order]:
@@ -1118,79 +1343,144 @@ class Database:
             query += " LIMIT ?"
             params.append(limit)
 
-        connection = self._get_connection()
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
 
-        cursor = await connection.execute(query, params)
-        rows = await cursor.fetchall()
+        return self._order_mapper.map_rows(query, cursor.description, rows)
 
-        orders = []
-        for row in rows:
-            orders.append(
-                Order(
-                    id=row["id"],
-                    equipment_type=row["equipment_type"],
-                    description=row["description"],
-                    client_name=row["client_name"],
-                    client_address=row["client_address"],
-                    client_phone=row["client_phone"],
-                    status=row["status"],
-                    assigned_master_id=row["assigned_master_id"],
-                    dispatcher_id=row["dispatcher_id"],
-                    notes=row["notes"],
-                    scheduled_time=(
-                        row["scheduled_time"]
-                        if row["scheduled_time"] is not None
-                        and str(row["scheduled_time"]).strip() != "None"
-                        else None
-                    ),
-                    total_amount=(
-                        row["total_amount"]
-                        if "total_amount" in row and row["total_amount"] is not None
-                        else None
-                    ),
-                    materials_cost=(
-                        row["materials_cost"]
-                        if "materials_cost" in row and row["materials_cost"] is not None
-                        else None
-                    ),
-                    master_profit=(
-                        row["master_profit"]
-                        if "master_profit" in row and row["master_profit"] is not None
-                        else None
-                    ),
-                    company_profit=(
-                        row["company_profit"]
-                        if "company_profit" in row and row["company_profit"] is not None
-                        else None
-                    ),
-                    has_review=(
-                        bool(row["has_review"])
-                        if "has_review" in row and row["has_review"] is not None
-                        else None
-                    ),
-                    created_at=(
-                        datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
-                        if row["created_at"]
-                        else None
-                    ),
-                    updated_at=(
-                        datetime.fromisoformat(row["updated_at"]).replace(tzinfo=MOSCOW_TZ)
-                        if row["updated_at"]
-                        else None
-                    ),
-                    dispatcher_name=row["dispatcher_name"],
-                    master_name=row["master_name"],
-                )
-            )
-        return orders
+    async def get_active_orders(self) -> list[Order]:
+        """
+        Незавершенные заявки (все статусы, кроме CLOSED и REFUSED)
 
-    async def update_order_status(
-        self,
-        order_id: int,
-        status: str,
-        changed_by: int | None = None,
-        notes: str | None = None,
-        user_roles: list[str] | None = None,
+        Отбор и сортировка выполняются в SQL (индекс idx_orders_status),
+        без загрузки закрытых заявок.
+
+        Returns:
+            Список заявок в порядке OrderStatus.active_statuses(), внутри
+            статуса - по дате создания
+        """
+        statuses = OrderStatus.active_statuses()
+        placeholders = ", ".join("?" * len(statuses))
+        priority = " ".join(f"WHEN ? THEN {index}" for index in range(len(statuses)))
+        query = f"""
+            SELECT o.*,
+                   u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+                   u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+            FROM orders o
+            LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+            LEFT JOIN masters m ON o.assigned_master_id = m.id
+            LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+            WHERE o.status IN ({placeholders})
+              AND o.deleted_at IS NULL
+            ORDER BY CASE o.status {priority} END, o.created_at
+        """  # nosec B608 - плейсхолдеры формируются по числу статусов
+        params = [*statuses, *statuses]
+
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
+
+        return self._order_mapper.map_rows(query, cursor.description, rows)
+
+    async def get_closed_orders_in_period(
+        self, start: datetime, end: datetime, master_ids: Iterable[int] | None = None
+    ) -> list[Order]:
+        """
+        Закрытые заявки, закрытые в периоде [start, end)
+
+        Диапазон отбирается по индексу idx_orders_closed_at.
+
+        Args:
+            start: Начало периода (наивное время - московское)
+            end: Конец периода (не включительно)
+            master_ids: Только заявки этих мастеров (по умолчанию - все)
+
+        Returns:
+            Список заявок (новые первыми, как get_all_orders)
+        """
+        master_filter = ""
+        params: list[Any] = [to_db_timestamp(start), to_db_timestamp(end), OrderStatus.CLOSED]
+        if master_ids is not None:
+            ids = sorted(set(master_ids))
+            if not ids:
+                return []
+            master_filter = f"AND o.assigned_master_id IN ({', '.join('?' * len(ids))})"
+            params.extend(ids)
+
+        query = f"""
+            SELECT o.*,
+                   u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+                   u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+            FROM orders o
+            LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+            LEFT JOIN masters m ON o.assigned_master_id = m.id
+            LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+            WHERE o.closed_at >= ? AND o.closed_at < ?
+              AND o.status = ?
+              AND o.deleted_at IS NULL
+              {master_filter}
+            ORDER BY o.created_at DESC
+        """  # nosec B608 - плейсхолдеры формируются по числу ID, значения передаются параметрами
+
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
+
+        return self._order_mapper.map_rows(query, cursor.description, rows)
+
+    async def get_orders_scheduled_between(
+        self, start: datetime, end: datetime, statuses: Iterable[str] | None = None
+    ) -> list[Order]:
+        """
+        Заявки с временем визита (scheduled_at) в периоде [start, end)
+
+        Диапазон отбирается по индексу idx_orders_scheduled_at.
+
+        Args:
+            start: Начало периода
+            end: Конец периода (не включительно)
+            statuses: Фильтр по статусам (None - любые)
+
+        Returns:
+            Список заявок (ближайшие визиты первыми)
+        """
+        query = """
+            SELECT o.*,
+                   u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+                   u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+            FROM orders o
+            LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+            LEFT JOIN masters m ON o.assigned_master_id = m.id
+            LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+            WHERE o.scheduled_at >= ? AND o.scheduled_at < ?
+              AND o.deleted_at IS NULL
+        """
+        params: list[Any] = [to_db_timestamp(start), to_db_timestamp(end)]
+
+        if statuses is not None:
+            statuses = list(statuses)
+            if not statuses:
+                return []
+            placeholders = ", ".join("?" * len(statuses))
+            query += f" AND o.status IN ({placeholders})"  # nosec B608
+            params.extend(statuses)
+
+        query += " ORDER BY o.scheduled_at"
+
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
+
+        return self._order_mapper.map_rows(query, cursor.description, rows)
+
+    async def update_order_status(
+        self,
+        order_id: int,
+        status: str,
+        changed_by: int | None = None,
+        notes: str | None = None,
+        user_roles: list[str] | None = None,
         skip_validation: bool = False,
     ) -> bool:
         """
@@ -1212,10 +1502,8 @@ class Database:
         Raises:
             InvalidStateTransitionError: Если переход недопустим
         """
-        async with self.transaction():
+        async with self.transaction() as connection:
             # Получаем текущий статус перед изменением с блокировкой
-            connection = self._get_connection()
-
             cursor = await connection.execute("SELECT status FROM orders WHERE id = ?", (order_id,))
             row = await cursor.fetchone()
             if not row:
@@ -1238,11 +1526,22 @@ class Database:
                     logger.error(f"❌ Недопустимый переход статуса для заявки #{order_id}: {e}")
                     raise  # Пробрасываем исключение выше
 
-            # Обновляем статус заявки
-            await connection.execute(
-                "UPDATE orders SET status = ?, updated_at = ? WHERE id = ?",
-                (status, get_now().isoformat(), order_id),
+            # Обновляем статус заявки (и время входа в новый статус)
+            now = get_now()
+            timestamp_field = (
+                OrderStatus.get_timestamp_field(status) if status != old_status else None
             )
+            if timestamp_field:
+                await connection.execute(
+                    f"UPDATE orders SET status = ?, updated_at = ?, {timestamp_field} = ? "
+                    "WHERE id = ?",  # nosec B608 - имя колонки из OrderStatus.get_timestamp_field
+                    (status, now.isoformat(), to_db_timestamp(now), order_id),
+                )
+            else:
+                await connection.execute(
+                    "UPDATE orders SET status = ?, updated_at = ? WHERE id = ?",
+                    (status, now.isoformat(), order_id),
+                )
 
             # Логируем изменение статуса в историю
             transition_description = OrderStateMachine.get_transition_description(
@@ -1259,6 +1558,8 @@ class Database:
             )
             # commit() выполнится автоматически при выходе из context manager
 
+        sla_index.track(order_id, status, now)
+
         logger.info(
             f"Статус заявки #{order_id} изменен с {old_status} на {status}"
             f"{f' пользователем {changed_by}' if changed_by else ''}"
@@ -1276,27 +1577,26 @@ class Database:
         Returns:
             Список изменений статусов
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            SELECT
-                h.id,
-                h.order_id,
-                h.old_status,
-                h.new_status,
-                h.changed_by,
-                u.first_name || ' ' || COALESCE(u.last_name, '') as changed_by_name,
-                h.changed_at,
-                h.notes
-            FROM order_status_history h
-            LEFT JOIN users u ON h.changed_by = u.telegram_id
-            WHERE h.order_id = ?
-            ORDER BY h.changed_at ASC
-            """,
-            (order_id,),
-        )
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT
+                    h.id,
+                    h.order_id,
+                    h.old_status,
+                    h.new_status,
+                    h.changed_by,
+                    u.first_name || ' ' || COALESCE(u.last_name, '') as changed_by_name,
+                    h.changed_at,
+                    h.notes
+                FROM order_status_history h
+                LEFT JOIN users u ON h.changed_by = u.telegram_id
+                WHERE h.order_id = ?
+                ORDER BY h.changed_at ASC
+                """,
+                (order_id,),
+            )
+            rows = await cursor.fetchall()
 
         history = []
         for row in rows:
@@ -1348,13 +1648,29 @@ class Database:
         if field not in allowed_fields:
             raise ValueError(f"Поле {field} не может быть обновлено через этот метод")
 
-        connection = self._get_connection()
-
-        await connection.execute(
-            f"UPDATE orders SET {field} = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",  # nosec B608 - field из контролируемого enum, не из пользовательского ввода
-            (value, order_id),
-        )
-        await connection.commit()
+        if field == "client_phone":
+            await self._execute_write(
+                "UPDATE orders SET client_phone = ?, client_phone_normalized = ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (value, normalize_phone(value), order_id),
+            )
+        elif field == "scheduled_time":
+            scheduled_at, scheduled_until = parse_scheduled_window(value)
+            await self._execute_write(
+                "UPDATE orders SET scheduled_time = ?, scheduled_at = ?, scheduled_until = ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (
+                    value,
+                    to_db_timestamp(scheduled_at) if scheduled_at else None,
+                    to_db_timestamp(scheduled_until) if scheduled_until else None,
+                    order_id,
+                ),
+            )
+        else:
+            await self._execute_write(
+                f"UPDATE orders SET {field} = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",  # nosec B608 - field из контролируемого enum, не из пользовательского ввода
+                (value, order_id),
+            )
 
         logger.info("Order #%d: field '%s' updated", order_id, field)
         return True
@@ -1397,19 +1713,60 @@ class Database:
             )
 
             # Обновляем заявку
+            now = get_now()
             await connection.execute(
                 """
                 UPDATE orders
-                SET assigned_master_id = ?, status = ?, updated_at = ?
+                SET assigned_master_id = ?, status = ?, updated_at = ?, assigned_at = ?
                 WHERE id = ?
                 """,
-                (master_id, OrderStatus.ASSIGNED, get_now().isoformat(), order_id),
+                (
+                    master_id,
+                    OrderStatus.ASSIGNED,
+                    now.isoformat(),
+                    to_db_timestamp(now),
+                    order_id,
+                ),
             )
             # commit() выполнится автоматически при выходе из context manager
 
+        sla_index.track(order_id, OrderStatus.ASSIGNED, now)
+
         logger.info(f"Мастер {master_id} назначен на заявку #{order_id}")
         return True
 
+    async def unassign_master_from_order(
+        self, order_id: int, refuse_reason: str | None = None
+    ) -> bool:
+        """
+        Снятие мастера с заявки (заявка возвращается в NEW)
+
+        Args:
+            order_id: ID заявки
+            refuse_reason: Причина отказа/отмены (опционально)
+
+        Returns:
+            True если заявка найдена
+        """
+        now = get_now()
+        query = "UPDATE orders SET status = ?, assigned_master_id = NULL, updated_at = ?"
+        params: list[Any] = [OrderStatus.NEW, now.isoformat()]
+        if refuse_reason:
+            query += ", refuse_reason = ?"
+            params.append(refuse_reason)
+        result = await self._execute_write(
+            f"{query} WHERE id = ?",  # nosec B608 - набор полей фиксирован, значения - параметры
+            (*params, order_id),
+        )
+        if not result.rowcount:
+            logger.error(f"Заявка #{order_id} не найдена")
+            return False
+
+        sla_index.track(order_id, OrderStatus.NEW, now)
+
+        logger.info(f"Мастер снят с заявки #{order_id}, причина: {refuse_reason}")
+        return True
+
     async def update_order(
         self,
         order_id: int,
@@ -1453,6 +1810,8 @@ class Database:
         if client_phone:
             updates.append("client_phone = ?")
             params.append(client_phone)
+            updates.append("client_phone_normalized = ?")
+            params.append(normalize_phone(client_phone))
         if notes is not None:
             updates.append("notes = ?")
             params.append(notes)
@@ -1465,9 +1824,7 @@ class Database:
         params.append(order_id)
 
         query = f"UPDATE orders SET {', '.join(updates)} WHERE id = ?"  # nosec B608 - updates формируется из контролируемых полей, не из пользовательского ввода
-        connection = self._get_connection()
-        await connection.execute(query, params)
-        await connection.commit()
+        await self._execute_write(query, params)
 
         logger.info(f"Заявка #{order_id} обновлена")
         return True
@@ -1503,70 +1860,11 @@ class Database:
 
         query += " ORDER BY o.created_at DESC"
 
-        connection = self._get_connection()
-        cursor = await connection.execute(query, params)
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
 
-        orders = []
-        for row in rows:
-            orders.append(
-                Order(
-                    id=row["id"],
-                    equipment_type=row["equipment_type"],
-                    description=row["description"],
-                    client_name=row["client_name"],
-                    client_address=row["client_address"],
-                    client_phone=row["client_phone"],
-                    status=row["status"],
-                    assigned_master_id=row["assigned_master_id"],
-                    dispatcher_id=row["dispatcher_id"],
-                    notes=row["notes"],
-                    scheduled_time=(
-                        row["scheduled_time"]
-                        if row["scheduled_time"] is not None
-                        and str(row["scheduled_time"]).strip() != "None"
-                        else None
-                    ),
-                    total_amount=(
-                        row["total_amount"]
-                        if "total_amount" in row and row["total_amount"] is not None
-                        else None
-                    ),
-                    materials_cost=(
-                        row["materials_cost"]
-                        if "materials_cost" in row and row["materials_cost"] is not None
-                        else None
-                    ),
-                    master_profit=(
-                        row["master_profit"]
-                        if "master_profit" in row and row["master_profit"] is not None
-                        else None
-                    ),
-                    company_profit=(
-                        row["company_profit"]
-                        if "company_profit" in row and row["company_profit"] is not None
-                        else None
-                    ),
-                    has_review=(
-                        bool(row["has_review"])
-                        if "has_review" in row and row["has_review"] is not None
-                        else None
-                    ),
-                    created_at=(
-                        datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
-                        if row["created_at"]
-                        else None
-                    ),
-                    updated_at=(
-                        datetime.fromisoformat(row["updated_at"]).replace(tzinfo=MOSCOW_TZ)
-                        if row["updated_at"]
-                        else None
-                    ),
-                    dispatcher_name=row["dispatcher_name"],
-                    master_name=row["master_name"],
-                )
-            )
-        return orders
+        return self._order_mapper.map_rows(query, cursor.description, rows)
 
     async def update_order_amounts(
         self,
@@ -1628,9 +1926,7 @@ class Database:
         params.append(order_id)
 
         query = f"UPDATE orders SET {', '.join(updates)} WHERE id = ?"  # nosec B608 - updates формируется из контролируемых полей, не из пользовательского ввода
-        connection = self._get_connection()
-        await connection.execute(query, params)
-        await connection.commit()
+        await self._execute_write(query, params)
 
         logger.info(f"Суммы заявки #{order_id} обновлены")
         return True
@@ -1646,13 +1942,10 @@ class Database:
             action: Действие
             details: Детали
         """
-        connection = self._get_connection()
-
-        await connection.execute(
+        await self._execute_write(
             "INSERT INTO audit_log (user_id, action, details) VALUES (?, ?, ?)",
             (user_id, action, details),
         )
-        await connection.commit()
 
     async def get_audit_logs(self, limit: int = 100) -> list[AuditLog]:
         """
@@ -1664,12 +1957,11 @@ class Database:
         Returns:
             Список логов
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            "SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT ?", (limit,)
-        )
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT ?", (limit,)
+            )
+            rows = await cursor.fetchall()
 
         logs = []
         for row in rows:
@@ -1696,33 +1988,34 @@ class Database:
             Словарь со статистикой
         """
         stats: dict[str, Any] = {}
-        connection = self._get_connection()
-
-        # Количество пользователей по ролям
-        cursor = await connection.execute("SELECT role, COUNT(*) as count FROM users GROUP BY role")
-        roles_stats = await cursor.fetchall()
-        stats["users_by_role"] = {row["role"]: row["count"] for row in roles_stats}
+        async with self._reader() as connection:
+            # Количество пользователей по ролям
+            cursor = await connection.execute(
+                "SELECT role, COUNT(*) as count FROM users GROUP BY role"
+            )
+            roles_stats = await cursor.fetchall()
+            stats["users_by_role"] = {row["role"]: row["count"] for row in roles_stats}
 
-        # Количество заявок по статусам
-        cursor = await connection.execute(
-            "SELECT status, COUNT(*) as count FROM orders GROUP BY status"
-        )
-        orders_stats = await cursor.fetchall()
-        stats["orders_by_status"] = {row["status"]: row["count"] for row in orders_stats}
+            # Количество заявок по статусам
+            cursor = await connection.execute(
+                "SELECT status, COUNT(*) as count FROM orders GROUP BY status"
+            )
+            orders_stats = await cursor.fetchall()
+            stats["orders_by_status"] = {row["status"]: row["count"] for row in orders_stats}
 
-        # Количество активных мастеров
-        cursor = await connection.execute(
-            "SELECT COUNT(*) as count FROM masters WHERE is_active = 1 AND is_approved = 1"
-        )
-        row = await cursor.fetchone()
-        if row is not None:
-            stats["active_masters"] = cast(int, row["count"])
-        else:
-            stats["active_masters"] = 0
+            # Количество активных мастеров
+            cursor = await connection.execute(
+                "SELECT COUNT(*) as count FROM masters WHERE is_active = 1 AND is_approved = 1"
+            )
+            row = await cursor.fetchone()
+            if row is not None:
+                stats["active_masters"] = cast(int, row["count"])
+            else:
+                stats["active_masters"] = 0
 
-        # Общее количество заявок
-        cursor = await connection.execute("SELECT COUNT(*) as count FROM orders")
-        row = await cursor.fetchone()
+            # Общее количество заявок
+            cursor = await connection.execute("SELECT COUNT(*) as count FROM orders")
+            row = await cursor.fetchone()
         if row is not None:
             stats["total_orders"] = cast(int, row["count"])
         else:
@@ -1730,6 +2023,75 @@ class Database:
 
         return stats
 
+    async def get_order_counts_by_master_status(self) -> dict[int, dict[str, int]]:
+        """
+        Количество заявок каждого мастера по статусам (один GROUP BY запрос)
+
+        Returns:
+            Словарь {master_id: {status: count}} (удаленные заявки не учитываются)
+        """
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT assigned_master_id, status, COUNT(*) as count
+                FROM orders
+                WHERE assigned_master_id IS NOT NULL AND deleted_at IS NULL
+                GROUP BY assigned_master_id, status
+                """
+            )
+            counts: dict[int, dict[str, int]] = {}
+            for row in await cursor.fetchall():
+                counts.setdefault(row["assigned_master_id"], {})[row["status"]] = row["count"]
+        return counts
+
+    async def get_order_counts_by_equipment(self) -> dict[str, int]:
+        """
+        Количество заявок по типам техники (один GROUP BY запрос)
+
+        Returns:
+            Словарь {equipment_type: count} по убыванию количества
+            (удаленные заявки не учитываются)
+        """
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT equipment_type, COUNT(*) as count
+                FROM orders
+                WHERE deleted_at IS NULL
+                GROUP BY equipment_type
+                ORDER BY count DESC
+                """
+            )
+            return {row["equipment_type"]: row["count"] for row in await cursor.fetchall()}
+
+    async def count_orders_by_status(self, statuses: Iterable[str] | None = None) -> dict[str, int]:
+        """
+        Количество заявок по статусам (один GROUP BY запрос по idx_orders_status)
+
+        Args:
+            statuses: Статусы для подсчета (по умолчанию - все)
+
+        Returns:
+            Словарь {status: count}; для запрошенных статусов без заявок - 0
+            (удаленные заявки не учитываются)
+        """
+        query = "SELECT status, COUNT(*) as count FROM orders WHERE deleted_at IS NULL"
+        params: list[str] = []
+        if statuses is not None:
+            params = list(dict.fromkeys(statuses))
+            if not params:
+                return {}
+            query += f" AND status IN ({', '.join('?' * len(params))})"  # nosec B608
+        query += " GROUP BY status"
+
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
+
+        counts = dict.fromkeys(params, 0)
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
     # ==================== FINANCIAL REPORTS ====================
 
     async def get_orders_by_period(
@@ -1758,113 +2120,148 @@ class Database:
             LEFT JOIN masters m ON o.assigned_master_id = m.id
             LEFT JOIN users mu ON m.telegram_id = mu.telegram_id
             LEFT JOIN users d ON o.dispatcher_id = d.telegram_id
-            WHERE o.updated_at >= ? AND o.updated_at < ?
+            WHERE o.closed_at >= ? AND o.closed_at < ?
                   AND o.status = 'CLOSED'
                   AND o.total_amount IS NOT NULL
         """
-        params = [start_date.isoformat(), end_date.isoformat()]
+        params = [to_db_timestamp(start_date), to_db_timestamp(end_date)]
 
         if status:
             query += " AND o.status = ?"
             params.append(status)
 
-        query += " ORDER BY o.updated_at DESC"
+        query += " ORDER BY o.closed_at DESC"
 
-        connection = self._get_connection()
-        cursor = await connection.execute(query, params)
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            rows = await cursor.fetchall()
 
-        orders = []
-        for row in rows:
-            order = Order(
-                id=row["id"],
-                equipment_type=row["equipment_type"],
-                description=row["description"],
-                client_name=row["client_name"],
-                client_address=row["client_address"],
-                client_phone=row["client_phone"],
-                status=row["status"],
-                assigned_master_id=row["assigned_master_id"],
-                dispatcher_id=row["dispatcher_id"],
-                notes=row["notes"],
-                scheduled_time=row["scheduled_time"],
-                total_amount=row["total_amount"],
-                materials_cost=row["materials_cost"],
-                master_profit=row["master_profit"],
-                company_profit=row["company_profit"],
-                has_review=bool(row["has_review"]) if row["has_review"] is not None else None,
-                out_of_city=bool(row["out_of_city"]) if row["out_of_city"] is not None else None,
-                created_at=(
-                    datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
-                    if row["created_at"]
-                    else None
-                ),
-                updated_at=(
-                    datetime.fromisoformat(row["updated_at"]).replace(tzinfo=MOSCOW_TZ)
-                    if row["updated_at"]
-                    else None
-                ),
-            )
+        return self._order_mapper.map_rows(query, cursor.description, rows)
 
-            # Добавляем имена мастеров и диспетчеров
-            if row["master_first_name"]:
-                master_name = row["master_first_name"]
-                if row["master_last_name"]:
-                    master_name += f" {row['master_last_name']}"
-                order.master_name = master_name
-            elif row["master_username"]:
-                order.master_name = f"@{row['master_username']}"
+    async def get_financial_totals_by_master(
+        self, start_date: datetime, end_date: datetime
+    ) -> list[MasterFinancialReport]:
+        """
+        Финансовые итоги закрытых заказов периода по мастерам (один GROUP BY запрос)
 
-            if row["dispatcher_first_name"]:
-                dispatcher_name = row["dispatcher_first_name"]
-                if row["dispatcher_last_name"]:
-                    dispatcher_name += f" {row['dispatcher_last_name']}"
-                order.dispatcher_name = dispatcher_name
-            elif row["dispatcher_username"]:
-                order.dispatcher_name = f"@{row['dispatcher_username']}"
+        Заказы отбираются так же, как в get_orders_by_period(status="CLOSED"):
+        закрытые в [start_date, end_date) по closed_at, с указанной суммой.
 
-            orders.append(order)
+        Args:
+            start_date: Начало периода
+            end_date: Конец периода (не включительно)
+
+        Returns:
+            Итоги по мастерам без report_id. Заказы без мастера (или с удаленным
+            мастером) собраны в строку с master_id=None - она нужна для общих итогов
+        """
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT m.id as master_id,
+                       m.telegram_id as master_telegram_id,
+                       u.first_name, u.last_name, u.username,
+                       COUNT(*) as orders_count,
+                       COALESCE(SUM(o.total_amount), 0) as total_amount,
+                       COALESCE(SUM(o.materials_cost), 0) as total_materials_cost,
+                       COALESCE(SUM(o.master_profit), 0) as total_master_profit,
+                       COALESCE(SUM(o.company_profit), 0) as total_company_profit,
+                       SUM(CASE WHEN o.has_review THEN 1 ELSE 0 END) as reviews_count,
+                       SUM(CASE WHEN o.out_of_city THEN 1 ELSE 0 END) as out_of_city_count
+                FROM orders o
+                LEFT JOIN masters m ON o.assigned_master_id = m.id
+                LEFT JOIN users u ON m.telegram_id = u.telegram_id
+                WHERE o.closed_at >= ? AND o.closed_at < ?
+                      AND o.status = 'CLOSED'
+                      AND o.total_amount IS NOT NULL
+                GROUP BY m.id
+                """,
+                (to_db_timestamp(start_date), to_db_timestamp(end_date)),
+            )
+            rows = await cursor.fetchall()
 
-        return orders
+        totals = []
+        for row in rows:
+            master_name = ""
+            if row["master_id"] is not None:
+                master_name = Master(
+                    telegram_id=row["master_telegram_id"],
+                    first_name=row["first_name"],
+                    last_name=row["last_name"],
+                    username=row["username"],
+                ).get_display_name()
+
+            # total_amount уже включает расходный материал (как хранится в БД)
+            totals.append(
+                MasterFinancialReport(
+                    master_id=row["master_id"],
+                    master_name=master_name,
+                    orders_count=row["orders_count"],
+                    total_amount=row["total_amount"],
+                    total_materials_cost=row["total_materials_cost"],
+                    total_net_profit=row["total_amount"] - row["total_materials_cost"],
+                    total_master_profit=row["total_master_profit"],
+                    total_company_profit=row["total_company_profit"],
+                    average_check=row["total_amount"] / row["orders_count"],
+                    reviews_count=row["reviews_count"],
+                    out_of_city_count=row["out_of_city_count"],
+                )
+            )
+        return totals
 
-    async def create_financial_report(self, report: FinancialReport) -> int:
+    async def create_financial_report(
+        self,
+        report: FinancialReport,
+        master_reports: Iterable[MasterFinancialReport] = (),
+    ) -> int:
         """
         Создание финансового отчета
 
+        Отчет и отчеты по мастерам записываются одной транзакцией
+        (отчеты по мастерам - одним executemany).
+
         Args:
             report: Объект отчета
+            master_reports: Отчеты по мастерам (report_id подставляется автоматически)
 
         Returns:
             ID созданного отчета
         """
-        connection = self._get_connection()
+        async with self.transaction() as connection:
+            cursor = await connection.execute(
+                """
+                INSERT INTO financial_reports (
+                    report_type, period_start, period_end, total_orders,
+                    total_amount, total_materials_cost, total_net_profit,
+                    total_company_profit, total_master_profit, average_check, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    report.report_type,
+                    report.period_start.isoformat() if report.period_start else None,
+                    report.period_end.isoformat() if report.period_end else None,
+                    report.total_orders,
+                    report.total_amount,
+                    report.total_materials_cost,
+                    report.total_net_profit,
+                    report.total_company_profit,
+                    report.total_master_profit,
+                    report.average_check,
+                    report.created_at.isoformat() if report.created_at else None,
+                ),
+            )
+            if cursor.lastrowid is None:
+                raise ValueError("Failed to insert financial report: lastrowid is None")
+            report_id = int(cursor.lastrowid)
 
-        cursor = await connection.execute(
-            """
-            INSERT INTO financial_reports (
-                report_type, period_start, period_end, total_orders,
-                total_amount, total_materials_cost, total_net_profit,
-                total_company_profit, total_master_profit, average_check, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                report.report_type,
-                report.period_start.isoformat() if report.period_start else None,
-                report.period_end.isoformat() if report.period_end else None,
-                report.total_orders,
-                report.total_amount,
-                report.total_materials_cost,
-                report.total_net_profit,
-                report.total_company_profit,
-                report.total_master_profit,
-                report.average_check,
-                report.created_at.isoformat() if report.created_at else None,
-            ),
-        )
-        await connection.commit()
-        if cursor.lastrowid is None:
-            raise ValueError("Failed to insert financial report: lastrowid is None")
-        return int(cursor.lastrowid)
+            rows = []
+            for master_report in master_reports:
+                master_report.report_id = report_id
+                rows.append(self._master_financial_report_params(master_report))
+            if rows:
+                await connection.executemany(MASTER_FINANCIAL_REPORT_INSERT_SQL, rows)
+
+        return report_id
 
     async def get_financial_report_by_id(self, report_id: int) -> FinancialReport | None:
         """
@@ -1876,12 +2273,11 @@ class Database:
         Returns:
             Объект отчета или None
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            "SELECT * FROM financial_reports WHERE id = ?", (report_id,)
-        )
-        row = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT * FROM financial_reports WHERE id = ?", (report_id,)
+            )
+            row = await cursor.fetchone()
 
         if not row:
             return None
@@ -1913,36 +2309,31 @@ class Database:
         Returns:
             ID созданного отчета
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            INSERT INTO master_financial_reports (
-                report_id, master_id, master_name, orders_count,
-                total_amount, total_materials_cost, total_net_profit,
-                total_master_profit, total_company_profit, average_check,
-                reviews_count, out_of_city_count
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                master_report.report_id,
-                master_report.master_id,
-                master_report.master_name,
-                master_report.orders_count,
-                master_report.total_amount,
-                master_report.total_materials_cost,
-                master_report.total_net_profit,
-                master_report.total_master_profit,
-                master_report.total_company_profit,
-                master_report.average_check,
-                master_report.reviews_count,
-                master_report.out_of_city_count,
-            ),
+        result = await self._execute_write(
+            MASTER_FINANCIAL_REPORT_INSERT_SQL,
+            self._master_financial_report_params(master_report),
         )
-        await connection.commit()
-        if cursor.lastrowid is None:
+        if result.lastrowid is None:
             raise ValueError("Failed to insert financial report: lastrowid is None")
-        return int(cursor.lastrowid)
+        return int(result.lastrowid)
+
+    @staticmethod
+    def _master_financial_report_params(master_report: MasterFinancialReport) -> tuple:
+        """Параметры MASTER_FINANCIAL_REPORT_INSERT_SQL"""
+        return (
+            master_report.report_id,
+            master_report.master_id,
+            master_report.master_name,
+            master_report.orders_count,
+            master_report.total_amount,
+            master_report.total_materials_cost,
+            master_report.total_net_profit,
+            master_report.total_master_profit,
+            master_report.total_company_profit,
+            master_report.average_check,
+            master_report.reviews_count,
+            master_report.out_of_city_count,
+        )
 
     async def get_master_reports_by_report_id(self, report_id: int) -> list[MasterFinancialReport]:
         """
@@ -1954,13 +2345,12 @@ class Database:
         Returns:
             Список отчетов по мастерам
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            "SELECT * FROM master_financial_reports WHERE report_id = ? ORDER BY total_master_profit DESC",
-            (report_id,),
-        )
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT * FROM master_financial_reports WHERE report_id = ? ORDER BY total_master_profit DESC",
+                (report_id,),
+            )
+            rows = await cursor.fetchall()
 
         master_reports = []
         for row in rows:
@@ -1993,12 +2383,11 @@ class Database:
         Returns:
             Список отчетов
         """
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            "SELECT * FROM financial_reports ORDER BY created_at DESC LIMIT ?", (limit,)
-        )
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT * FROM financial_reports ORDER BY created_at DESC LIMIT ?", (limit,)
+            )
+            rows = await cursor.fetchall()
 
         reports = []
         for row in rows:
@@ -2035,9 +2424,7 @@ class Database:
             ID созданной записи
         """
 
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
+        result = await self._execute_write(
             """
             INSERT INTO master_reports_archive (
                 master_id, period_start, period_end, file_path, file_name,
@@ -2059,10 +2446,9 @@ class Database:
                 report.notes,
             ),
         )
-        await connection.commit()
-        if cursor.lastrowid is None:
+        if result.lastrowid is None:
             raise ValueError("Failed to insert financial report: lastrowid is None")
-        return int(cursor.lastrowid)
+        return int(result.lastrowid)
 
     async def get_master_archived_reports(
         self, master_id: int, limit: int = 10
@@ -2079,18 +2465,17 @@ class Database:
         """
         from app.database.models import MasterReportArchive
 
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            SELECT * FROM master_reports_archive
-            WHERE master_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-            """,
-            (master_id, limit),
-        )
-        rows = await cursor.fetchall()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT * FROM master_reports_archive
+                WHERE master_id = ?
+                ORDER BY created_at DESC
+                LIMIT ?
+                """,
+                (master_id, limit),
+            )
+            rows = await cursor.fetchall()
 
         reports = []
         for row in rows:
@@ -2127,13 +2512,12 @@ class Database:
         """
         from app.database.models import MasterReportArchive
 
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            "SELECT * FROM master_reports_archive WHERE id = ?",
-            (report_id,),
-        )
-        row = await cursor.fetchone()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT * FROM master_reports_archive WHERE id = ?",
+                (report_id,),
+            )
+            row = await cursor.fetchone()
 
         if not row:
             return None
@@ -2166,37 +2550,40 @@ class Database:
         Returns:
             True если успешно
         """
-        connection = self._get_connection()
-
         try:
-            # Сначала получаем ID мастера
-            cursor = await connection.execute(
-                "SELECT id FROM masters WHERE telegram_id = ?", (telegram_id,)
-            )
-            row = await cursor.fetchone()
+            async with self.transaction() as connection:
+                # Сначала получаем ID мастера
+                cursor = await connection.execute(
+                    "SELECT id FROM masters WHERE telegram_id = ?", (telegram_id,)
+                )
+                row = await cursor.fetchone()
 
-            if not row:
-                logger.warning(f"Master with telegram_id {telegram_id} not found")
-                return False
+                if not row:
+                    logger.warning(f"Master with telegram_id {telegram_id} not found")
+                    return False
 
-            master_id = row["id"]
+                master_id = row["id"]
 
-            # Удаляем мастера (каскадное удаление удалит связанные записи)
-            await connection.execute("DELETE FROM masters WHERE telegram_id = ?", (telegram_id,))
-            await connection.commit()
+                # Удаляем мастера (каскадное удаление удалит связанные записи)
+                await connection.execute(
+                    "DELETE FROM masters WHERE telegram_id = ?", (telegram_id,)
+                )
 
             logger.info(f"Master {telegram_id} (ID: {master_id}) deleted from system")
             return True
 
         except Exception as e:
+            # transaction() уже выполнил rollback
             logger.error(f"Error deleting master {telegram_id}: {e}")
-            await connection.rollback()
             return False
 
     async def get_orders_by_client_phone(self, phone: str) -> list[Order]:
         """
         Поиск заявок по номеру телефона клиента
 
+        Поиск идет по индексированной колонке client_phone_normalized, поэтому
+        номер можно передавать в любом формате.
+
         Args:
             phone: Номер телефона клиента
 
@@ -2206,72 +2593,30 @@ class Database:
         if not self.connection:
             await self.connect()
 
-        connection = self._get_connection()
-
-        cursor = await connection.execute(
-            """
-            SELECT o.*,
-                   m.first_name as master_first_name, m.last_name as master_last_name, m.username as master_username,
-                   u.first_name as dispatcher_first_name, u.last_name as dispatcher_last_name, u.username as dispatcher_username
-            FROM orders o
-            LEFT JOIN masters m ON o.assigned_master_id = m.id
-            LEFT JOIN users u ON o.dispatcher_id = u.telegram_id
-            WHERE o.client_phone = ? AND o.deleted_at IS NULL
-            ORDER BY o.created_at DESC
-            """,
-            (phone,),
-        )
-        rows = await cursor.fetchall()
-
-        orders = []
-        for row in rows:
-            order = Order(
-                id=row["id"],
-                equipment_type=row["equipment_type"],
-                description=row["description"],
-                client_name=row["client_name"],
-                client_address=row["client_address"],
-                client_phone=row["client_phone"],
-                status=row["status"],
-                assigned_master_id=row["assigned_master_id"],
-                dispatcher_id=row["dispatcher_id"],
-                notes=row["notes"],
-                scheduled_time=row["scheduled_time"],
-                total_amount=row["total_amount"],
-                materials_cost=row["materials_cost"],
-                master_profit=row["master_profit"],
-                company_profit=row["company_profit"],
-                has_review=bool(row["has_review"]) if row["has_review"] is not None else None,
-                out_of_city=bool(row["out_of_city"]) if row["out_of_city"] is not None else None,
-                created_at=(
-                    datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
-                    if row["created_at"]
-                    else None
-                ),
-                updated_at=(
-                    datetime.fromisoformat(row["updated_at"]).replace(tzinfo=MOSCOW_TZ)
-                    if row["updated_at"]
-                    else None
-                ),
-            )
-
-            # Добавляем имена мастеров и диспетчеров
-            if row["master_first_name"]:
-                master_name = row["master_first_name"]
-                if row["master_last_name"]:
-                    master_name += f" {row['master_last_name']}"
-                order.master_name = master_name
-            elif row["master_username"]:
-                order.master_name = f"@{row['master_username']}"
-
-            if row["dispatcher_first_name"]:
-                dispatcher_name = row["dispatcher_first_name"]
-                if row["dispatcher_last_name"]:
-                    dispatcher_name += f" {row['dispatcher_last_name']}"
-                order.dispatcher_name = dispatcher_name
-            elif row["dispatcher_username"]:
-                order.dispatcher_name = f"@{row['dispatcher_username']}"
-
-            orders.append(order)
-
-        return orders
+        async with self._reader() as connection:
+            normalized_phone = normalize_phone(phone)
+            if normalized_phone:
+                phone_filter, phone_value = "o.client_phone_normalized = ?", normalized_phone
+            else:
+                # В номере нет цифр ("Не указан") - сравниваем как есть
+                phone_filter, phone_value = "o.client_phone = ?", phone
+
+            query = f"""
+                SELECT o.*,
+                       mu.first_name as master_first_name,
+                       mu.last_name as master_last_name,
+                       mu.username as master_username,
+                       u.first_name as dispatcher_first_name,
+                       u.last_name as dispatcher_last_name,
+                       u.username as dispatcher_username
+                FROM orders o
+                LEFT JOIN masters m ON o.assigned_master_id = m.id
+                LEFT JOIN users mu ON m.telegram_id = mu.telegram_id
+                LEFT JOIN users u ON o.dispatcher_id = u.telegram_id
+                WHERE {phone_filter} AND o.deleted_at IS NULL
+                ORDER BY o.created_at DESC
+            """  # nosec B608 - phone_filter выбирается из двух констант
+            cursor = await connection.execute(query, (phone_value,))
+            rows = await cursor.fetchall()
+
+        return self._order_mapper.map_rows(query, cursor.description, rows)
@@ -162,6 +162,8 @@ class Order:
     scheduled_time: str | None = (
         None  # Время прибытия к клиенту (например: "14:00", "завтра 10:00")
     )
+    scheduled_at: datetime | None = None  # Время визита, разобранное из scheduled_time
+    scheduled_until: datetime | None = None  # Конец интервала визита ("с 10 до 12")
     total_amount: float | None = None  # Общая сумма заказа
     materials_cost: float | None = None  # Сумма расходного материала
     master_profit: float | None = None  # Прибыль мастера
@@ -174,6 +176,10 @@ class Order:
     last_rescheduled_at: datetime | None = None  # Дата последнего переноса
     reschedule_reason: str | None = None  # Причина последнего переноса
     refuse_reason: str | None = None  # Причина отказа от заявки
+    assigned_at: datetime | None = None  # Время входа в статус ASSIGNED
+    accepted_at: datetime | None = None  # Время входа в статус ACCEPTED
+    onsite_at: datetime | None = None  # Время входа в статус ONSITE
+    closed_at: datetime | None = None  # Время закрытия заявки
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
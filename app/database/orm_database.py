@@ -4,11 +4,12 @@ SQLAlchemy ORM Database класс
 
 import logging
 import os
+from collections.abc import Iterable
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import String, and_, case, func, or_, select, type_coerce
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -18,6 +19,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import joinedload, selectinload
 
 from app.config import Config, OrderStatus, UserRole
+from app.database.address_search import ADDRESS_FTS_DDL, ADDRESS_FTS_REBUILD
 from app.database.orm_models import (
     AuditLog,
     Base,
@@ -31,8 +33,11 @@ from app.database.orm_models import (
     SpecializationRate,
     User,
 )
+from app.database.registry import database_registry
+from app.database.user_cache import user_cache
 from app.domain.order_state_machine import InvalidStateTransitionError, OrderStateMachine
-from app.utils.helpers import get_now
+from app.domain.sla_index import sla_index
+from app.utils.helpers import get_now, normalize_phone, to_db_timestamp
 
 
 logger = logging.getLogger(__name__)
@@ -41,12 +46,14 @@ logger = logging.getLogger(__name__)
 class ORMDatabase:
     """Класс для работы с базой данных через SQLAlchemy ORM"""
 
-    def __init__(self, database_url: str | None = None):
+    def __init__(self, database_url: str | None = None, shared: bool | None = None):
         """
         Инициализация ORM Database
 
         Args:
             database_url: URL базы данных (SQLite или PostgreSQL)
+            shared: Использовать общий engine процесса (database_registry).
+                По умолчанию - только для БД из конфигурации (без явного URL)
         """
         raw_url = database_url or self._get_database_url()
         # Преобразуем простые SQLite пути в правильный async URL формат
@@ -54,6 +61,11 @@ class ORMDatabase:
         self.engine: AsyncEngine | None = None
         self.session_factory: async_sessionmaker[AsyncSession] | None = None
         self._is_sqlite = self.database_url.startswith("sqlite")
+        if shared is None:
+            shared = database_url is None and Config.DB_SHARED_CONNECTIONS
+        # In-memory БД у каждого engine своя - общей она быть не может
+        self.shared = shared and ":memory:" not in self.database_url
+        self._lease_id: int | None = None
 
     def _normalize_database_url(self, url: str) -> str:
         """
@@ -80,29 +92,54 @@ class ORMDatabase:
         # Fallback на SQLite
         return Config.DATABASE_PATH
 
+    def _create_engine(self) -> AsyncEngine:
+        """Создание async engine"""
+        logger.info("Инициализация подключения к БД...")
+        logger.info(f"   Database URL: {self.database_url}")
+        logger.info(f"   Is SQLite: {self._is_sqlite}")
+
+        return create_async_engine(
+            self.database_url,
+            echo=False,  # Устанавливаем True для отладки SQL
+            pool_pre_ping=True,  # Проверка соединения перед использованием
+            pool_recycle=3600,  # Переподключение каждый час
+            # Настройки для SQLite
+            connect_args={"check_same_thread": False} if self._is_sqlite else {},
+        )
+
+    def _create_session_factory(self, engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        """Создание session factory для engine"""
+        return async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,  # Важно для async работы
+        )
+
     async def connect(self):
-        """Подключение к базе данных"""
-        try:
-            logger.info("Инициализация подключения к БД...")
-            logger.info(f"   Database URL: {self.database_url}")
-            logger.info(f"   Is SQLite: {self._is_sqlite}")
+        """
+        Подключение к базе данных
 
-            # Создаем async engine
-            self.engine = create_async_engine(
-                self.database_url,
-                echo=False,  # Устанавливаем True для отладки SQL
-                pool_pre_ping=True,  # Проверка соединения перед использованием
-                pool_recycle=3600,  # Переподключение каждый час
-                # Настройки для SQLite
-                connect_args={"check_same_thread": False} if self._is_sqlite else {},
+        Общий экземпляр (shared) берет engine из database_registry: engine
+        и пул соединений создаются один раз на процесс. Повторный connect()
+        без disconnect() ничего не делает.
+        """
+        if self.shared:
+            if self._lease_id is not None:
+                return
+            self._lease_id, engine = database_registry.acquire_engine(
+                self, self.database_url, self._create_engine
             )
+            if engine is not self.engine:
+                self.engine = engine
+                self.session_factory = self._create_session_factory(engine)
+            return
+
+        try:
+            # Создаем async engine
+            self.engine = self._create_engine()
 
             # Создаем session factory
-            self.session_factory = async_sessionmaker(
-                self.engine,
-                class_=AsyncSession,
-                expire_on_commit=False,  # Важно для async работы
-            )
+            self.session_factory = self._create_session_factory(self.engine)
 
             logger.info(f"OK: Подключено к базе данных: {self.database_url}")
             logger.info("OK: Session factory создан")
@@ -130,10 +167,26 @@ class ORMDatabase:
         async with self.engine.begin() as conn:
             # Создаем все таблицы из метаданных
             await conn.run_sync(Base.metadata.create_all)
+            if self._is_sqlite:
+                # FTS5 индекс адресов (в production создается миграцией)
+                for ddl in ADDRESS_FTS_DDL:
+                    await conn.exec_driver_sql(ddl)
+                await conn.exec_driver_sql(ADDRESS_FTS_REBUILD)
         logger.info("OK: База данных инициализирована (таблицы созданы)")
 
     async def disconnect(self):
-        """Отключение от базы данных"""
+        """
+        Отключение от базы данных
+
+        Общий экземпляр только возвращает аренду: engine остается открытым
+        для следующих запросов и закрывается database_registry.close_all().
+        """
+        if self.shared:
+            if self._lease_id is not None:
+                lease_id, self._lease_id = self._lease_id, None
+                await database_registry.release(lease_id)
+            return
+
         if self.engine:
             await self.engine.dispose()
             logger.info("Отключено от базы данных")
@@ -324,6 +377,7 @@ class ORMDatabase:
             user.role = role
             user.version += 1
             await session.commit()
+            user_cache.invalidate(telegram_id)
 
             logger.info(f"Роль пользователя {telegram_id} изменена на {role}")
             return True
@@ -344,6 +398,7 @@ class ORMDatabase:
             new_roles = user.add_role(role)
             user.version += 1
             await session.commit()
+            user_cache.invalidate(telegram_id)
 
             logger.info(f"Роль {role} добавлена пользователю {telegram_id}. Роли: {new_roles}")
             return True
@@ -364,6 +419,7 @@ class ORMDatabase:
             new_roles = user.remove_role(role)
             user.version += 1
             await session.commit()
+            user_cache.invalidate(telegram_id)
 
             logger.info(f"Роль {role} удалена у пользователя {telegram_id}. Роли: {new_roles}")
             return True
@@ -388,6 +444,7 @@ class ORMDatabase:
                 user.role = ",".join(sorted(roles))
             user.version += 1
             await session.commit()
+            user_cache.invalidate(telegram_id)
 
             logger.info(f"Роли пользователя {telegram_id} установлены: {user.role}")
             return True
@@ -500,6 +557,16 @@ class ORMDatabase:
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
 
+    async def get_masters_by_ids(self, master_ids: Iterable[int]) -> dict[int, Master]:
+        """Пакетное получение мастеров по списку ID (один запрос вместо N)"""
+        ids = {master_id for master_id in master_ids if master_id is not None}
+        if not ids:
+            return {}
+        async with self.get_session() as session:
+            stmt = select(Master).options(joinedload(Master.user)).where(Master.id.in_(ids))
+            result = await session.execute(stmt)
+            return {master.id: master for master in result.scalars().all()}
+
     async def get_master_by_work_chat_id(self, work_chat_id: int) -> Master | None:
         """Получение мастера по ID рабочего чата"""
         async with self.get_session() as session:
@@ -731,6 +798,8 @@ class ORMDatabase:
             session.add(order)
             await session.flush()
 
+            sla_index.track(order.id, OrderStatus.NEW, now)
+
             logger.info(f"Создана заявка #{order.id}")
             return order
 
@@ -749,6 +818,34 @@ class ORMDatabase:
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
 
+    async def get_orders_by_ids(self, order_ids: Iterable[int]) -> list[Order]:
+        """
+        Пакетное получение заявок по списку ID (один запрос вместо N)
+
+        Args:
+            order_ids: ID заявок
+
+        Returns:
+            Найденные заявки в порядке переданных ID (отсутствующие и повторы пропускаются)
+        """
+        ids = list(dict.fromkeys(order_id for order_id in order_ids if order_id is not None))
+        if not ids:
+            return []
+
+        async with self.get_session() as session:
+            stmt = (
+                select(Order)
+                .options(
+                    joinedload(Order.assigned_master).joinedload(Master.user),
+                    joinedload(Order.dispatcher),
+                )
+                .where(Order.id.in_(ids))
+            )
+            result = await session.execute(stmt)
+            found = {order.id: order for order in result.scalars().all()}
+
+        return [found[order_id] for order_id in ids if order_id in found]
+
     async def get_all_orders(
         self, status: str | None = None, master_id: int | None = None, limit: int | None = None
     ) -> list[Order]:
@@ -775,6 +872,87 @@ class ORMDatabase:
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
+    async def get_active_orders(self) -> list[Order]:
+        """Незавершенные заявки в порядке OrderStatus.active_statuses(), затем по дате создания"""
+        statuses = OrderStatus.active_statuses()
+        priority = case(
+            {status: index for index, status in enumerate(statuses)}, value=Order.status
+        )
+
+        async with self.get_session() as session:
+            stmt = (
+                select(Order)
+                .options(
+                    joinedload(Order.assigned_master).joinedload(Master.user),
+                    joinedload(Order.dispatcher),
+                )
+                .where(Order.status.in_(statuses), Order.deleted_at.is_(None))
+                .order_by(priority, Order.created_at)
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def get_closed_orders_in_period(
+        self, start: datetime, end: datetime, master_ids: Iterable[int] | None = None
+    ) -> list[Order]:
+        """
+        Закрытые заявки, закрытые в периоде [start, end) (индекс idx_orders_closed_at)
+
+        master_ids ограничивает выборку заявками этих мастеров.
+        """
+        # Граница в формате колонки: наивное московское время
+        closed_at = type_coerce(Order.closed_at, String)
+        conditions = [
+            closed_at >= to_db_timestamp(start),
+            closed_at < to_db_timestamp(end),
+            Order.status == OrderStatus.CLOSED,
+            Order.deleted_at.is_(None),
+        ]
+        if master_ids is not None:
+            ids = set(master_ids)
+            if not ids:
+                return []
+            conditions.append(Order.assigned_master_id.in_(ids))
+
+        async with self.get_session() as session:
+            stmt = (
+                select(Order)
+                .options(
+                    joinedload(Order.assigned_master).joinedload(Master.user),
+                    joinedload(Order.dispatcher),
+                )
+                .where(*conditions)
+                .order_by(Order.created_at.desc())
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def get_orders_scheduled_between(
+        self, start: datetime, end: datetime, statuses: Iterable[str] | None = None
+    ) -> list[Order]:
+        """Заявки с временем визита в периоде [start, end) (индекс idx_orders_scheduled_at)"""
+        scheduled_at = type_coerce(Order.scheduled_at, String)
+        conditions = [
+            scheduled_at >= to_db_timestamp(start),
+            scheduled_at < to_db_timestamp(end),
+            Order.deleted_at.is_(None),
+        ]
+        if statuses is not None:
+            conditions.append(Order.status.in_(list(statuses)))
+
+        async with self.get_session() as session:
+            stmt = (
+                select(Order)
+                .options(
+                    joinedload(Order.assigned_master).joinedload(Master.user),
+                    joinedload(Order.dispatcher),
+                )
+                .where(*conditions)
+                .order_by(Order.scheduled_at)
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
     async def update_order_status(
         self,
         order_id: int,
@@ -811,10 +989,13 @@ class ORMDatabase:
                     logger.error(f"ERROR: Недопустимый переход статуса для заявки #{order_id}: {e}")
                     raise
 
-            # Обновляем статус заявки
+            # Обновляем статус заявки (и время входа в новый статус)
             order.status = status
             order.updated_at = get_now()
             order.version += 1
+            timestamp_field = OrderStatus.get_timestamp_field(status)
+            if timestamp_field and status != old_status:
+                setattr(order, timestamp_field, order.updated_at)
 
             # Логируем изменение статуса в историю
             transition_description = OrderStateMachine.get_transition_description(
@@ -834,6 +1015,8 @@ class ORMDatabase:
             session.add(status_history)
             await session.commit()
 
+            sla_index.track(order_id, status, order.updated_at)
+
             logger.info(
                 f"Статус заявки #{order_id} изменен с {old_status} на {status}"
                 f"{f' пользователем {changed_by}' if changed_by else ''}"
@@ -868,10 +1051,13 @@ class ORMDatabase:
             order.assigned_master_id = master_id
             order.status = OrderStatus.ASSIGNED
             order.updated_at = get_now()
+            order.assigned_at = order.updated_at
             order.version += 1
 
             await session.commit()
 
+            sla_index.track(order_id, OrderStatus.ASSIGNED, order.updated_at)
+
             logger.info(f"Мастер {master_id} назначен на заявку #{order_id}")
             return True
 
@@ -906,6 +1092,8 @@ class ORMDatabase:
 
             await session.commit()
 
+            sla_index.track(order_id, OrderStatus.NEW, order.updated_at)
+
             logger.info(f"Мастер снят с заявки #{order_id}, причина: {refuse_reason}")
             return True
 
@@ -1192,6 +1380,74 @@ class ORMDatabase:
 
             return stats
 
+    async def get_order_counts_by_master_status(self) -> dict[int, dict[str, int]]:
+        """
+        Количество заявок каждого мастера по статусам (один GROUP BY запрос)
+
+        Returns:
+            Словарь {master_id: {status: count}} (удаленные заявки не учитываются)
+        """
+        async with self.get_session() as session:
+            stmt = (
+                select(Order.assigned_master_id, Order.status, func.count(Order.id))
+                .where(Order.assigned_master_id.is_not(None), Order.deleted_at.is_(None))
+                .group_by(Order.assigned_master_id, Order.status)
+            )
+            result = await session.execute(stmt)
+
+            counts: dict[int, dict[str, int]] = {}
+            for master_id, status, count in result.tuples():
+                counts.setdefault(master_id, {})[status] = count
+            return counts
+
+    async def get_order_counts_by_equipment(self) -> dict[str, int]:
+        """
+        Количество заявок по типам техники (один GROUP BY запрос)
+
+        Returns:
+            Словарь {equipment_type: count} по убыванию количества
+            (удаленные заявки не учитываются)
+        """
+        async with self.get_session() as session:
+            count = func.count(Order.id)
+            stmt = (
+                select(Order.equipment_type, count)
+                .where(Order.deleted_at.is_(None))
+                .group_by(Order.equipment_type)
+                .order_by(count.desc())
+            )
+            result = await session.execute(stmt)
+            return dict(result.tuples().all())
+
+    async def count_orders_by_status(self, statuses: Iterable[str] | None = None) -> dict[str, int]:
+        """
+        Количество заявок по статусам (один GROUP BY запрос по idx_orders_status)
+
+        Args:
+            statuses: Статусы для подсчета (по умолчанию - все)
+
+        Returns:
+            Словарь {status: count}; для запрошенных статусов без заявок - 0
+            (удаленные заявки не учитываются)
+        """
+        stmt = (
+            select(Order.status, func.count(Order.id))
+            .where(Order.deleted_at.is_(None))
+            .group_by(Order.status)
+        )
+        requested: list[str] = []
+        if statuses is not None:
+            requested = list(dict.fromkeys(statuses))
+            if not requested:
+                return {}
+            stmt = stmt.where(Order.status.in_(requested))
+
+        async with self.get_session() as session:
+            result = await session.execute(stmt)
+            counts = dict.fromkeys(requested, 0)
+            counts.update(result.tuples().all())
+            return counts
+
     # ==================== FINANCIAL REPORTS ====================
 
     async def create_financial_report(self, report: FinancialReport) -> int:
@@ -1290,6 +1546,7 @@ class ORMDatabase:
             user.deleted_at = get_now()
             user.version += 1
             await session.commit()
+            user_cache.invalidate(telegram_id)
 
             logger.info(f"Пользователь {telegram_id} мягко удален")
             return True
@@ -1307,6 +1564,8 @@ class ORMDatabase:
             order.version += 1
             await session.commit()
 
+            sla_index.forget(order_id)
+
             logger.info(f"Заявка #{order_id} мягко удалена")
             return True
 
@@ -1422,16 +1681,25 @@ class ORMDatabase:
         """
         Поиск заявок по номеру телефона клиента
 
+        Поиск идет по индексированной колонке client_phone_normalized, поэтому
+        номер можно передавать в любом формате.
+
         Args:
             phone: Номер телефона клиента
 
         Returns:
             Список заявок клиента, отсортированный по дате создания (новые первые)
         """
+        normalized_phone = normalize_phone(phone)
+        phone_filter = (
+            Order.client_phone_normalized == normalized_phone
+            if normalized_phone
+            else Order.client_phone == phone
+        )
         async with self.get_session() as session:
             stmt = (
                 select(Order)
-                .where(Order.client_phone == phone)
+                .where(phone_filter)
                 .where(Order.deleted_at.is_(None))
                 .order_by(Order.created_at.desc())
             )
@@ -1692,6 +1960,8 @@ class ORMDatabase:
 
                 await session.commit()
 
+                sla_index.track(order_id, OrderStatus.NEW, order.updated_at)
+
                 logger.info(
                     f"Заявка #{order_id} восстановлена из REFUSED в NEW пользователем {restored_by_user_id}"
                 )
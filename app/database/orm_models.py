@@ -17,9 +17,11 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.sql import func
 
+from app.utils.helpers import normalize_phone
+
 
 # Базовый класс для всех моделей
 Base = declarative_base()
@@ -181,6 +183,8 @@ class Order(Base):
     client_name: Mapped[str] = mapped_column(String(255), nullable=False)
     client_address: Mapped[str] = mapped_column(Text, nullable=False)
     client_phone: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Телефон только из цифр (app.utils.helpers.normalize_phone) для поиска по индексу
+    client_phone_normalized: Mapped[str | None] = mapped_column(String(20), nullable=True)
     status: Mapped[str] = mapped_column(String(50), nullable=False, default="NEW")
 
     # Связи с пользователями
@@ -197,6 +201,9 @@ class Order(Base):
     )  # Имя мастера-источника лида
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     scheduled_time: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Время визита, разобранное из scheduled_time (начало и конец интервала)
+    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    scheduled_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # Финансовые поля
     total_amount: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -216,6 +223,12 @@ class Order(Base):
     # Поле для причины отказа
     refuse_reason: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
+    # Время входа в статусы (последний переход, пишет update_order_status)
+    assigned_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    accepted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    onsite_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
     # Системные поля
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -249,13 +262,31 @@ class Order(Base):
             return None
         return self.dispatcher.get_display_name()
 
+    @validates("client_phone")
+    def _sync_client_phone_normalized(self, _key: str, value: str) -> str:
+        """Поддержание client_phone_normalized при любой записи client_phone"""
+        self.client_phone_normalized = normalize_phone(value)
+        return value
+
+    @validates("scheduled_time")
+    def _sync_scheduled_at(self, _key: str, value: str | None) -> str | None:
+        """Поддержание scheduled_at/scheduled_until при любой записи scheduled_time"""
+        # Парсер дат нужен только при записи scheduled_time - не тянем его в слой моделей
+        from app.utils.date_parser import parse_scheduled_window
+
+        self.scheduled_at, self.scheduled_until = parse_scheduled_window(value)
+        return value
+
     # Индексы и ограничения
     __table_args__ = (
         Index("idx_orders_status", "status"),
+        Index("idx_orders_client_phone_normalized", "client_phone_normalized"),
         Index("idx_orders_assigned_master_id", "assigned_master_id"),
         Index("idx_orders_dispatcher_id", "dispatcher_id"),
         Index("idx_orders_deleted_at", "deleted_at"),
         Index("idx_orders_status_created", "status", "created_at"),
+        Index("idx_orders_closed_at", "closed_at"),
+        Index("idx_orders_scheduled_at", "scheduled_at"),
         Index("idx_orders_master_status", "assigned_master_id", "status"),
         Index("idx_orders_period", "updated_at", "status"),
         Index("idx_orders_financial", "status", "total_amount"),
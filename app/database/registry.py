@@ -0,0 +1,332 @@
+"""
+Реестр общих подключений к БД процесса
+
+Хэндлеры и сервисы создают экземпляр БД через get_database() и вызывают
+connect()/disconnect() на каждый запрос. Без реестра ORMDatabase.connect
+каждый раз строит новый AsyncEngine, а Database.connect открывает новый
+файл SQLite и выполняет PRAGMA journal_mode=WAL.
+
+Реестр хранит:
+- один AsyncEngine (со своим пулом соединений) на URL для ORMDatabase;
+- пул простаивающих aiosqlite-соединений на путь для legacy Database.
+  Соединения не разделяются между владельцами одновременно: legacy-код
+  открывает транзакции (BEGIN IMMEDIATE) на своем соединении;
+- один SQLitePool (читатели + очередь писателя) на путь для legacy Database.
+
+connect() берет аренду (lease), disconnect() возвращает ее. Если экземпляр БД
+удален сборщиком мусора с невозвращенной арендой (connect без disconnect),
+реестр пишет предупреждение с местом вызова connect() и освобождает ресурс.
+
+Engine и соединения привязаны к event loop, поэтому ресурсы другого
+(например, уже закрытого) цикла событий не переиспользуются.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import sys
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+import aiosqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.sqlite_pool import SQLitePool
+
+
+logger = logging.getLogger(__name__)
+
+# Кадры стека из пакета app/database пропускаются при определении места вызова
+_DATABASE_PACKAGE_DIR = str(Path(__file__).resolve().parent)
+
+ENGINE = "engine"
+CONNECTION = "connection"
+POOL = "pool"
+
+
+@dataclass(slots=True, eq=False)
+class _Lease:
+    """Аренда общего ресурса экземпляром БД"""
+
+    kind: str
+    key: str
+    resource: Any
+    loop: asyncio.AbstractEventLoop
+    acquired_at: float
+    site: str
+    finalizer: weakref.finalize | None = None
+
+
+def _caller_site() -> str:
+    """Место вызова connect() за пределами пакета app/database"""
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.startswith(_DATABASE_PACKAGE_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+class DatabaseRegistry:
+    """Общие engine и пулы соединений процесса с учетом аренд"""
+
+    def __init__(self, max_idle_connections: int = 8):
+        """
+        Инициализация
+
+        Args:
+            max_idle_connections: Сколько свободных legacy-соединений хранить на путь
+        """
+        self.max_idle_connections = max_idle_connections
+        self._engines: dict[str, tuple[asyncio.AbstractEventLoop, AsyncEngine]] = {}
+        self._idle: dict[str, tuple[asyncio.AbstractEventLoop, list[aiosqlite.Connection]]] = {}
+        self._pools: dict[str, tuple[asyncio.AbstractEventLoop, SQLitePool]] = {}
+        self._leases: dict[int, _Lease] = {}
+        self._lease_ids = itertools.count(1)
+        # Закрытие соединений из утекших аренд (дожидаемся в close_all)
+        self._closing: set[asyncio.Task] = set()
+        self.engines_created = 0
+        self.pools_created = 0
+        self.connections_opened = 0
+        self.reused = 0
+        self.leaked = 0
+
+    def acquire_engine(
+        self, owner: object, url: str, factory: Callable[[], AsyncEngine]
+    ) -> tuple[int, AsyncEngine]:
+        """
+        Аренда общего AsyncEngine
+
+        Args:
+            owner: Экземпляр БД, который берет аренду
+            url: URL базы данных
+            factory: Создание engine, если общего еще нет
+
+        Returns:
+            (ID аренды, engine)
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._engines.get(url)
+        if entry is not None and entry[0] is loop:
+            engine = entry[1]
+            self.reused += 1
+        else:
+            if entry is not None:
+                # Соединения пула принадлежат другому циклу событий
+                entry[1].sync_engine.dispose(close=False)
+            engine = factory()
+            self._engines[url] = (loop, engine)
+            self.engines_created += 1
+            logger.info("Создан общий engine БД: %s", url)
+
+        return self._lease(owner, ENGINE, url, engine, loop), engine
+
+    def acquire_pool(
+        self, owner: object, path: str, factory: Callable[[], SQLitePool]
+    ) -> tuple[int, SQLitePool]:
+        """
+        Аренда общего SQLitePool (открывает его владелец: SQLitePool.open)
+
+        Args:
+            owner: Экземпляр БД, который берет аренду
+            path: Путь к файлу базы данных
+            factory: Создание пула, если общего еще нет
+
+        Returns:
+            (ID аренды, пул)
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._pools.get(path)
+        if entry is not None and entry[0] is loop:
+            pool = entry[1]
+            self.reused += 1
+        else:
+            # Пул другого цикла событий закрыть отсюда нельзя - просто забываем его
+            pool = factory()
+            self._pools[path] = (loop, pool)
+            self.pools_created += 1
+            logger.info("Создан общий пул SQLite: %s", path)
+
+        return self._lease(owner, POOL, path, pool, loop), pool
+
+    async def acquire_connection(
+        self,
+        owner: object,
+        path: str,
+        factory: Callable[[], Awaitable[aiosqlite.Connection]],
+    ) -> tuple[int, aiosqlite.Connection]:
+        """
+        Аренда aiosqlite-соединения из пула
+
+        Args:
+            owner: Экземпляр БД, который берет аренду
+            path: Путь к файлу базы данных
+            factory: Открытие нового соединения, если свободных нет
+
+        Returns:
+            (ID аренды, соединение)
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._idle.get(path)
+        if entry is not None and entry[0] is not loop:
+            del self._idle[path]
+            entry = None
+
+        if entry is not None and entry[1]:
+            connection = entry[1].pop()
+            self.reused += 1
+        else:
+            connection = await factory()
+            self.connections_opened += 1
+
+        return self._lease(owner, CONNECTION, path, connection, loop), connection
+
+    def _lease(
+        self,
+        owner: object,
+        kind: str,
+        key: str,
+        resource: Any,
+        loop: asyncio.AbstractEventLoop,
+    ) -> int:
+        lease_id = next(self._lease_ids)
+        lease = _Lease(kind, key, resource, loop, time.monotonic(), _caller_site())
+        lease.finalizer = weakref.finalize(owner, self._on_owner_collected, lease_id)
+        self._leases[lease_id] = lease
+        return lease_id
+
+    async def release(self, lease_id: int) -> None:
+        """
+        Возврат аренды (повторный вызов ничего не делает)
+
+        Args:
+            lease_id: ID аренды из acquire_*
+        """
+        lease = self._leases.pop(lease_id, None)
+        if lease is None:
+            return
+        if lease.finalizer is not None:
+            lease.finalizer.detach()
+        if lease.kind == CONNECTION:
+            await self._return_connection(lease)
+
+    async def _return_connection(self, lease: _Lease) -> None:
+        """Возврат соединения в пул свободных (или закрытие при переполнении)"""
+        connection: aiosqlite.Connection = lease.resource
+        if connection.in_transaction:
+            # Незавершенная транзакция не должна достаться следующему владельцу
+            await connection.rollback()
+
+        entry = self._idle.get(lease.key)
+        if entry is None or entry[0] is not lease.loop:
+            entry = (lease.loop, [])
+            self._idle[lease.key] = entry
+
+        if len(entry[1]) < self.max_idle_connections:
+            entry[1].append(connection)
+        else:
+            await connection.close()
+
+    def _on_owner_collected(self, lease_id: int) -> None:
+        """Экземпляр БД удален с невозвращенной арендой - это утечка"""
+        lease = self._leases.pop(lease_id, None)
+        if lease is None:
+            return
+
+        self.leaked += 1
+        logger.warning(
+            "Утечка подключения к БД: connect() без disconnect() в %s (%s, удерживалось %.1f с)",
+            lease.site,
+            lease.key,
+            time.monotonic() - lease.acquired_at,
+        )
+        if lease.kind == CONNECTION and not lease.loop.is_closed():
+            # Соединение могло остаться в середине транзакции - не возвращаем в пул.
+            # Финализатор может сработать вне цикла событий, поэтому закрытие
+            # планируется через call_soon_threadsafe
+            with contextlib.suppress(RuntimeError):
+                lease.loop.call_soon_threadsafe(self._schedule_close, lease.resource)
+
+    def _schedule_close(self, connection: aiosqlite.Connection) -> None:
+        task = asyncio.get_running_loop().create_task(connection.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def active_leases(self) -> list[dict[str, Any]]:
+        """
+        Невозвращенные аренды
+
+        Returns:
+            Список словарей: ресурс, место вызова connect() и возраст в секундах
+        """
+        now = time.monotonic()
+        return [
+            {"key": lease.key, "site": lease.site, "age": now - lease.acquired_at}
+            for lease in self._leases.values()
+        ]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Счетчики реестра
+
+        Returns:
+            Словарь со счетчиками созданных/переиспользованных ресурсов и утечек
+        """
+        return {
+            "engines": len(self._engines),
+            "pools": len(self._pools),
+            "idle_connections": sum(len(idle) for _, idle in self._idle.values()),
+            "active_leases": len(self._leases),
+            "engines_created": self.engines_created,
+            "pools_created": self.pools_created,
+            "connections_opened": self.connections_opened,
+            "reused": self.reused,
+            "leaked": self.leaked,
+        }
+
+    async def close_all(self) -> None:
+        """Закрытие всех общих ресурсов (при остановке процесса)"""
+        for lease in self.active_leases():
+            logger.warning(
+                "Подключение к БД не возвращено к остановке: %s (%s, %.1f с)",
+                lease["site"],
+                lease["key"],
+                lease["age"],
+            )
+
+        loop = asyncio.get_running_loop()
+        closing = [task for task in self._closing if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
+
+        engines, self._engines = self._engines, {}
+        for engine_loop, engine in engines.values():
+            if engine_loop is loop:
+                await engine.dispose()
+            else:
+                engine.sync_engine.dispose(close=False)
+
+        pools, self._pools = self._pools, {}
+        for pool_loop, pool in pools.values():
+            if pool_loop is loop:
+                await pool.close()
+
+        idle, self._idle = self._idle, {}
+        for idle_loop, connections in idle.values():
+            if idle_loop is not loop:
+                continue
+            for connection in connections:
+                with contextlib.suppress(Exception):
+                    await connection.close()
+
+        logger.info("Общие подключения к БД закрыты")
+
+
+# Общий реестр процесса: get_database() создает экземпляры БД на каждый запрос
+database_registry = DatabaseRegistry()
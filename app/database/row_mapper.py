@@ -0,0 +1,225 @@
+"""
+Маппер строк SQLite -> Order для legacy Database с планом по колонкам
+
+Вместо того чтобы на каждой строке проверять наличие колонок (`"x" in row`)
+и разбирать даты, маппер один раз строит "план" по описанию курсора
+(cursor.description): для каждого поля Order заранее вычисляется индекс
+колонки и функция преобразования. План кешируется по тексту SQL-запроса,
+поэтому повторные вызовы одного и того же запроса только применяют план.
+"""
+
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, cast
+
+from app.database.models import Order
+from app.utils.helpers import MOSCOW_TZ
+
+
+logger = logging.getLogger(__name__)
+
+Converter = Callable[[Any], Any]
+
+
+def _to_moscow_datetime(value: Any) -> datetime | None:
+    """ISO-строка из SQLite -> datetime с московским timezone"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=MOSCOW_TZ)
+    return datetime.fromisoformat(value).replace(tzinfo=MOSCOW_TZ)
+
+
+def _to_optional_bool(value: Any) -> bool | None:
+    """INTEGER 0/1 -> bool, NULL остается None"""
+    return bool(value) if value is not None else None
+
+
+def _to_scheduled_time(value: Any) -> str | None:
+    """Строка "None", записанная старыми версиями бота, считается пустым значением"""
+    if value is None or str(value).strip() == "None":
+        return None
+    return cast(str, value)
+
+
+def _to_rescheduled_count(value: Any) -> int:
+    """NULL в rescheduled_count трактуется как 0 (значение по умолчанию модели)"""
+    return value or 0
+
+
+# Преобразования для колонок, которые нельзя передать в Order "как есть"
+_CONVERTERS: dict[str, Converter] = {
+    "has_review": _to_optional_bool,
+    "out_of_city": _to_optional_bool,
+    "scheduled_time": _to_scheduled_time,
+    "scheduled_at": _to_moscow_datetime,
+    "scheduled_until": _to_moscow_datetime,
+    "rescheduled_count": _to_rescheduled_count,
+    "last_rescheduled_at": _to_moscow_datetime,
+    "assigned_at": _to_moscow_datetime,
+    "accepted_at": _to_moscow_datetime,
+    "onsite_at": _to_moscow_datetime,
+    "closed_at": _to_moscow_datetime,
+    "created_at": _to_moscow_datetime,
+    "updated_at": _to_moscow_datetime,
+}
+
+# Поля Order, которые могут быть заполнены из колонок с тем же именем
+_ORDER_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(Order))
+
+# Составные имена (master_name/dispatcher_name) для запросов, которые выбирают
+# first_name/last_name/username отдельными колонками вместо конкатенации в SQL
+_NAME_PREFIXES: dict[str, str] = {
+    "master_name": "master",
+    "dispatcher_name": "dispatcher",
+}
+
+
+def _compose_name(
+    first_name: str | None, last_name: str | None, username: str | None
+) -> str | None:
+    """Имя в формате "Имя Фамилия" или "@username" (как в отчетах)"""
+    if first_name:
+        return f"{first_name} {last_name}" if last_name else first_name
+    if username:
+        return f"@{username}"
+    return None
+
+
+class OrderRowPlan:
+    """
+    План преобразования строк одного запроса в объекты Order
+
+    По набору колонок заранее вычисляются пары (поле, индекс колонки) и
+    тройки (поле, индекс, преобразование), так что на каждую строку
+    приходятся только обращения по индексу без проверок имен колонок.
+    """
+
+    __slots__ = ("_converted", "_names", "_plain", "column_names")
+
+    def __init__(self, column_names: Sequence[str]):
+        """
+        Построение плана по списку колонок курсора
+
+        Args:
+            column_names: Имена колонок в порядке cursor.description
+        """
+        self.column_names = tuple(column_names)
+        index = {name: i for i, name in enumerate(self.column_names)}
+
+        plain: list[tuple[str, int]] = []
+        converted: list[tuple[str, int, Converter]] = []
+        for name in _ORDER_FIELDS:
+            if name not in index:
+                continue
+            converter = _CONVERTERS.get(name)
+            if converter is None:
+                plain.append((name, index[name]))
+            else:
+                converted.append((name, index[name], converter))
+
+        names: list[tuple[str, tuple[int | None, ...]]] = []
+        for name, prefix in _NAME_PREFIXES.items():
+            if name in index or f"{prefix}_first_name" not in index:
+                continue
+            columns = (f"{prefix}_first_name", f"{prefix}_last_name", f"{prefix}_username")
+            names.append((name, tuple(index.get(column) for column in columns)))
+
+        self._plain = tuple(plain)
+        self._converted = tuple(converted)
+        self._names = tuple(names)
+
+    def map_row(self, row: Sequence[Any]) -> Order:
+        """
+        Преобразование одной строки по плану
+
+        Args:
+            row: Строка результата
+
+        Returns:
+            Объект Order
+        """
+        values = {name: row[i] for name, i in self._plain}
+        for name, i, convert in self._converted:
+            values[name] = convert(row[i])
+        for name, parts in self._names:
+            values[name] = _compose_name(*(row[i] if i is not None else None for i in parts))
+        return Order(**values)
+
+
+class OrderRowMapper:
+    """
+    Кеш планов маппинга Order, привязанный к тексту SQL-запроса
+
+    Usage:
+        cursor = await connection.execute(query, params)
+        rows = await cursor.fetchall()
+        orders = mapper.map_rows(query, cursor.description, rows)
+    """
+
+    def __init__(self) -> None:
+        self._plans: dict[str, OrderRowPlan] = {}
+
+    def get_plan(self, sql: str, description: Sequence[Sequence[Any]] | None) -> OrderRowPlan:
+        """
+        Получение (или построение) плана для запроса
+
+        План перестраивается, если набор колонок изменился
+        (например, после применения миграции без перезапуска бота).
+
+        Args:
+            sql: Текст SQL-запроса (ключ кеша)
+            description: cursor.description выполненного запроса
+
+        Returns:
+            План маппинга
+        """
+        column_names = tuple(col[0] for col in description or ())
+        plan = self._plans.get(sql)
+        if plan is None or plan.column_names != column_names:
+            plan = OrderRowPlan(column_names)
+            self._plans[sql] = plan
+            logger.debug("Построен план маппинга Order для %d колонок", len(column_names))
+        return plan
+
+    def map_rows(
+        self,
+        sql: str,
+        description: Sequence[Sequence[Any]] | None,
+        rows: Iterable[Sequence[Any]],
+    ) -> list[Order]:
+        """
+        Преобразование всех строк запроса в список Order
+
+        Args:
+            sql: Текст SQL-запроса
+            description: cursor.description выполненного запроса
+            rows: Строки результата
+
+        Returns:
+            Список заявок
+        """
+        map_row = self.get_plan(sql, description).map_row
+        return [map_row(row) for row in rows]
+
+    def map_row(
+        self, sql: str, description: Sequence[Sequence[Any]] | None, row: Sequence[Any]
+    ) -> Order:
+        """
+        Преобразование одной строки запроса в Order
+
+        Args:
+            sql: Текст SQL-запроса
+            description: cursor.description выполненного запроса
+            row: Строка результата
+
+        Returns:
+            Объект Order
+        """
+        return self.get_plan(sql, description).map_row(row)
+
+    def clear(self) -> None:
+        """Сброс всех планов (например, после изменения схемы)"""
+        self._plans.clear()
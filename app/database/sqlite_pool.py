@@ -0,0 +1,304 @@
+"""
+Пул соединений SQLite: читатели + один писатель с очередью
+
+Legacy Database раньше выполнял все запросы процесса и транзакции
+(BEGIN IMMEDIATE) на одном aiosqlite-соединении, поэтому параллельные
+хэндлеры мешали друг другу ("cannot start a transaction within a transaction").
+
+SQLitePool для одного файла БД держит:
+- N соединений только для чтения (PRAGMA query_only). В режиме WAL
+  читатели не блокируют писателя и друг друга;
+- одно соединение-писатель, которым владеет фоновая задача. Записи
+  попадают в очередь и выполняются строго по одной:
+    * execute() - одиночный оператор. Подряд стоящие в очереди операторы
+      выполняются в одной транзакции (group commit), каждый в своем
+      SAVEPOINT: ошибка одного оператора не отменяет остальные;
+    * transaction() - транзакция вызывающего кода. Когда подходит очередь,
+      писатель передает соединение вызывающему и ждет COMMIT/ROLLBACK.
+
+Внутри transaction() чтения и execute() той же задачи выполняются на
+соединении писателя (видят незакоммиченные изменения своей транзакции).
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+import aiosqlite
+
+
+logger = logging.getLogger(__name__)
+
+SQLParams = Sequence[Any] | Mapping[str, Any]
+
+
+class WriteResult(NamedTuple):
+    """Результат оператора записи"""
+
+    lastrowid: int | None
+    rowcount: int
+
+
+@dataclass(slots=True, eq=False)
+class _WriteJob:
+    """Задание писателя: оператор (sql) или транзакция вызывающего кода (sql=None)"""
+
+    sql: str | None
+    params: SQLParams
+    # WriteResult оператора или соединение писателя для транзакции
+    future: asyncio.Future[Any]
+    released: asyncio.Future[None] | None = None
+
+
+# Сигнал остановки задачи писателя
+_CLOSE: Any = object()
+
+
+class SQLitePool:
+    """Соединения для чтения и очередь записи одного файла SQLite"""
+
+    def __init__(self, path: str, readers: int = 4, max_batch: int = 64):
+        """
+        Инициализация (соединения открываются в open())
+
+        Args:
+            path: Путь к файлу базы данных
+            readers: Количество соединений для чтения
+            max_batch: Максимум операторов в одной групповой транзакции
+        """
+        self.path = path
+        self.readers = readers
+        self.max_batch = max_batch
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._reader_connections: list[aiosqlite.Connection] = []
+        self._queue: asyncio.Queue[_WriteJob] = asyncio.Queue()
+        self._writer_task: asyncio.Task | None = None
+        self._open_lock = asyncio.Lock()
+        # Соединение писателя, переданное текущей задаче внутри transaction()
+        self._current: ContextVar[aiosqlite.Connection | None] = ContextVar(
+            f"sqlite_pool_writer_{id(self)}", default=None
+        )
+        self.writes = 0
+        self.batches = 0
+        self.transactions = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Открыт ли пул"""
+        return self._writer_task is not None
+
+    async def open(self, connect: Callable[[], Awaitable[aiosqlite.Connection]]) -> None:
+        """
+        Открытие соединений и запуск писателя (повторный вызов ничего не делает)
+
+        Args:
+            connect: Открытие соединения (с row_factory и WAL)
+        """
+        async with self._open_lock:
+            if self.is_open:
+                return
+
+            self._writer = await connect()
+            for _ in range(self.readers):
+                connection = await connect()
+                cursor = await connection.execute("PRAGMA query_only=ON")
+                await cursor.close()
+                self._reader_connections.append(connection)
+                self._readers.put_nowait(connection)
+
+            self._writer_task = asyncio.create_task(self._run_writer())
+            logger.info(
+                "Пул SQLite открыт: %s (читателей: %s)", self.path, len(self._reader_connections)
+            )
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Соединение для чтения
+
+        Внутри transaction() возвращается соединение писателя текущей транзакции.
+        """
+        current = self._current.get()
+        if current is not None:
+            yield current
+            return
+
+        connection = await self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put_nowait(connection)
+
+    async def execute(self, sql: str, params: SQLParams = ()) -> WriteResult:
+        """
+        Выполнение оператора записи через очередь писателя
+
+        Args:
+            sql: SQL оператор (INSERT/UPDATE/DELETE)
+            params: Параметры
+
+        Returns:
+            WriteResult после COMMIT групповой транзакции
+        """
+        current = self._current.get()
+        if current is not None:
+            # Часть уже открытой транзакции этой задачи
+            cursor = await current.execute(sql, params)
+            return WriteResult(cursor.lastrowid, cursor.rowcount)
+
+        future: asyncio.Future[WriteResult] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_WriteJob(sql, params, future))
+        return await future
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Транзакция на соединении писателя (BEGIN IMMEDIATE ... COMMIT)
+
+        Ожидает своей очереди, затем выполняет блок. Исключение внутри блока
+        вызывает ROLLBACK. Вложенный вызов в той же задаче использует
+        внешнюю транзакцию.
+        """
+        current = self._current.get()
+        if current is not None:
+            yield current
+            return
+
+        loop = asyncio.get_running_loop()
+        released: asyncio.Future[None] = loop.create_future()
+        job = _WriteJob(None, (), loop.create_future(), released)
+        self._queue.put_nowait(job)
+        try:
+            connection: aiosqlite.Connection = await job.future
+        except BaseException:
+            if job.future.done() and not job.future.cancelled():
+                # Отмена пришла после передачи соединения: писатель ждет его возврата
+                released.set_result(None)
+            else:
+                # Отмена до получения соединения: писатель пропустит задание
+                job.future.cancel()
+            raise
+
+        token = self._current.set(connection)
+        try:
+            await connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                await connection.commit()
+            except BaseException:
+                await connection.rollback()
+                raise
+        finally:
+            self._current.reset(token)
+            released.set_result(None)
+
+    async def _run_writer(self) -> None:
+        """Задача писателя: выполнение очереди записи"""
+        pending: _WriteJob | None = None
+        while True:
+            job = pending if pending is not None else await self._queue.get()
+            pending = None
+            if job is _CLOSE:
+                return
+
+            if job.sql is None:
+                await self._hand_over(job)
+                continue
+
+            batch = [job]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                next_job = self._queue.get_nowait()
+                if next_job is _CLOSE or next_job.sql is None:
+                    pending = next_job
+                    break
+                batch.append(next_job)
+
+            await self._run_batch(batch)
+
+    async def _hand_over(self, job: _WriteJob) -> None:
+        """Передача соединения писателя транзакции вызывающего кода"""
+        if job.future.done():
+            return
+        job.future.set_result(self._writer)
+        self.transactions += 1
+        assert job.released is not None
+        await job.released
+
+    async def _run_batch(self, batch: list[_WriteJob]) -> None:
+        """Групповая транзакция из одиночных операторов"""
+        connection = self._writer
+        assert connection is not None
+        results: list[tuple[_WriteJob, WriteResult]] = []
+        grouped = len(batch) > 1
+
+        try:
+            await connection.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                if grouped:
+                    await connection.execute("SAVEPOINT group_write")
+                try:
+                    cursor = await connection.execute(job.sql, job.params)
+                except Exception as e:
+                    if grouped:
+                        await connection.execute("ROLLBACK TO group_write")
+                        await connection.execute("RELEASE group_write")
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                    continue
+                results.append((job, WriteResult(cursor.lastrowid, cursor.rowcount)))
+                if grouped:
+                    await connection.execute("RELEASE group_write")
+            await connection.commit()
+        except Exception as e:
+            logger.error("Ошибка групповой записи в %s: %s", self.path, e)
+            with contextlib.suppress(Exception):
+                await connection.rollback()
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(results)
+        for job, result in results:
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Счетчики пула
+
+        Returns:
+            Словарь: операторы записи, групповые транзакции, транзакции
+            вызывающего кода, размер очереди и свободные читатели
+        """
+        return {
+            "writes": self.writes,
+            "batches": self.batches,
+            "transactions": self.transactions,
+            "queued": self._queue.qsize(),
+            "idle_readers": self._readers.qsize(),
+        }
+
+    async def close(self) -> None:
+        """Остановка писателя после выполнения очереди и закрытие соединений"""
+        if self._writer_task is not None:
+            self._queue.put_nowait(_CLOSE)
+            await self._writer_task
+            self._writer_task = None
+
+        connections = self._reader_connections
+        if self._writer is not None:
+            connections = [self._writer, *connections]
+        self._writer = None
+        self._reader_connections = []
+        for connection in connections:
+            with contextlib.suppress(Exception):
+                await connection.close()
+        logger.info("Пул SQLite закрыт: %s", self.path)
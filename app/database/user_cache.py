@@ -0,0 +1,126 @@
+"""
+Кэш пользователей для RoleCheckMiddleware
+
+RoleCheckMiddleware вызывает get_or_create_user на каждый Message/CallbackQuery.
+Кэш хранит пользователя вместе с профилем Telegram (username, имя, фамилия),
+с которым он был получен: пока профиль не изменился и не истек TTL, middleware
+не обращается к БД. Записи вытесняются по LRU при превышении max_size.
+
+Методы изменения ролей и удаления пользователей (Database, ORMDatabase,
+UserRepository) сбрасывают запись через user_cache.invalidate().
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import Config
+
+
+# Профиль Telegram, с которым пользователь попал в кэш
+UserProfile = tuple[str | None, str | None, str | None]
+
+
+class UserCache:
+    """TTL + LRU кэш пользователей по telegram_id"""
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 5000):
+        """
+        Инициализация
+
+        Args:
+            ttl: Время жизни записи в секундах (0 - кэш выключен)
+            max_size: Максимальное количество записей
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[float, Any, UserProfile]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кэш"""
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, telegram_id: int, profile: UserProfile) -> Any | None:
+        """
+        Получение пользователя из кэша
+
+        Args:
+            telegram_id: Telegram ID
+            profile: Текущий профиль (username, first_name, last_name)
+
+        Returns:
+            Пользователь или None (нет записи, истек TTL или изменился профиль)
+        """
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user, cached_profile = entry
+        if expires_at <= time.monotonic() or cached_profile != profile:
+            # Профиль изменился - get_or_create_user должен обновить его в БД
+            del self._entries[telegram_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(telegram_id)
+        self.hits += 1
+        return user
+
+    def set(self, telegram_id: int, user: Any, profile: UserProfile) -> None:
+        """
+        Сохранение пользователя в кэш
+
+        Args:
+            telegram_id: Telegram ID
+            user: Пользователь (legacy или ORM модель)
+            profile: Профиль, с которым пользователь получен из БД
+        """
+        if not self.enabled:
+            return
+
+        self._entries[telegram_id] = (time.monotonic() + self.ttl, user, profile)
+        self._entries.move_to_end(telegram_id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, telegram_id: int) -> None:
+        """Сброс записи пользователя (изменились роли или пользователь удален)"""
+        if self._entries.pop(telegram_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Полная очистка кэша"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Статистика кэша
+
+        Returns:
+            Словарь со счетчиками и долей попаданий
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Общий кэш процесса: Database создается в хендлерах заново, поэтому инвалидация
+# должна попадать в один и тот же экземпляр
+user_cache = UserCache(ttl=Config.USER_CACHE_TTL, max_size=Config.USER_CACHE_MAX_SIZE)
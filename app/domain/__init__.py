@@ -7,10 +7,15 @@ from app.domain.order_state_machine import (
     OrderStateMachine,
     OrderStateTransitionResult,
 )
+from app.domain.sla_index import SLA_RULES, SLADeadlineIndex, SLAEntry, sla_index
 
 
 __all__ = [
+    "SLA_RULES",
     "InvalidStateTransitionError",
     "OrderStateMachine",
     "OrderStateTransitionResult",
+    "SLADeadlineIndex",
+    "SLAEntry",
+    "sla_index",
 ]
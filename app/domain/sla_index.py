@@ -0,0 +1,214 @@
+"""
+Индекс SLA-дедлайнов заявок
+
+Вместо полного сканирования всех заявок на каждом тике планировщика индекс
+хранит min-heap дедлайнов (время входа в статус + лимит SLA для статуса).
+Индекс пополняется при переходах статусов (Database/ORMDatabase), а
+TaskScheduler.check_order_sla на каждом тике забирает только заявки,
+дедлайн которых уже наступил.
+"""
+
+import heapq
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.core.constants import OrderStatus
+from app.utils.helpers import MOSCOW_TZ, get_now
+
+
+logger = logging.getLogger(__name__)
+
+# Допустимое время нахождения заявки в статусе
+SLA_RULES: dict[str, timedelta] = {
+    OrderStatus.NEW: timedelta(hours=2),  # Новая заявка > 2 часов
+    OrderStatus.ASSIGNED: timedelta(hours=4),  # Назначена > 4 часов
+    OrderStatus.ACCEPTED: timedelta(hours=8),  # Принята > 8 часов
+    OrderStatus.ONSITE: timedelta(hours=12),  # На объекте > 12 часов
+}
+
+# Нетерминальные статусы, которые отслеживает индекс
+SLA_TRACKED_STATUSES: tuple[str, ...] = (
+    OrderStatus.NEW,
+    OrderStatus.ASSIGNED,
+    OrderStatus.ACCEPTED,
+    OrderStatus.ONSITE,
+    OrderStatus.DR,
+)
+
+# Статусы, для которых работают "умные" напоминания по времени прибытия
+SCHEDULED_STATUSES: frozenset[str] = frozenset(
+    {OrderStatus.ASSIGNED, OrderStatus.ACCEPTED, OrderStatus.DR}
+)
+
+
+@dataclass(slots=True)
+class SLAEntry:
+    """Состояние заявки в индексе"""
+
+    order_id: int
+    status: str
+    entered_at: datetime
+    deadline: datetime | None = None
+
+
+class SLADeadlineIndex:
+    """
+    Min-heap дедлайнов SLA с ленивым удалением устаревших записей
+
+    В куче лежат пары (deadline, order_id). При смене статуса в кучу кладется
+    новая пара, а старая становится "мертвой" и отбрасывается при извлечении
+    (ее deadline не совпадает с актуальной записью в `_entries`).
+    """
+
+    def __init__(self, rules: dict[str, timedelta] | None = None):
+        """
+        Инициализация
+
+        Args:
+            rules: Лимиты SLA по статусам (по умолчанию SLA_RULES)
+        """
+        self.rules = dict(rules if rules is not None else SLA_RULES)
+        self._entries: dict[int, SLAEntry] = {}
+        self._heap: list[tuple[datetime, int]] = []
+        self._overdue: set[int] = set()
+        self.loaded_at: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._entries
+
+    @property
+    def is_loaded(self) -> bool:
+        """Был ли индекс заполнен из БД"""
+        return self.loaded_at is not None
+
+    def get(self, order_id: int) -> SLAEntry | None:
+        """Текущая запись индекса для заявки"""
+        return self._entries.get(order_id)
+
+    def track(
+        self,
+        order_id: int,
+        status: str,
+        entered_at: datetime | None = None,
+    ) -> None:
+        """
+        Регистрация (пере)входа заявки в статус
+
+        Повторный вызов с тем же статусом не сбрасывает время входа в статус.
+        Терминальные и неизвестные статусы удаляют заявку из индекса.
+
+        Args:
+            order_id: ID заявки
+            status: Новый статус
+            entered_at: Время входа в статус (по умолчанию - сейчас)
+        """
+        if status not in SLA_TRACKED_STATUSES:
+            self.forget(order_id)
+            return
+
+        previous = self._entries.get(order_id)
+        if previous is not None and previous.status == status:
+            return
+
+        if entered_at is None:
+            entered_at = get_now()
+        elif entered_at.tzinfo is None:
+            entered_at = entered_at.replace(tzinfo=MOSCOW_TZ)
+
+        limit = self.rules.get(status)
+        entry = SLAEntry(
+            order_id=order_id,
+            status=status,
+            entered_at=entered_at,
+            deadline=entered_at + limit if limit else None,
+        )
+        self._entries[order_id] = entry
+        self._overdue.discard(order_id)
+
+        if entry.deadline is not None:
+            heapq.heappush(self._heap, (entry.deadline, order_id))
+            self._maybe_compact()
+
+    def forget(self, order_id: int) -> None:
+        """Удаление заявки из индекса (закрыта, отклонена, удалена)"""
+        if self._entries.pop(order_id, None) is not None:
+            self._overdue.discard(order_id)
+
+    def collect_due(self, now: datetime) -> list[SLAEntry]:
+        """
+        Получение всех просроченных заявок
+
+        Из кучи извлекаются только записи с наступившим дедлайном, поэтому
+        стоимость вызова пропорциональна числу просроченных заявок.
+        Заявка остается просроченной до следующей смены статуса.
+
+        Args:
+            now: Текущее время
+
+        Returns:
+            Список просроченных записей
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, order_id = heapq.heappop(heap)
+            entry = self._entries.get(order_id)
+            if entry is not None and entry.deadline == deadline:
+                self._overdue.add(order_id)
+        return [self._entries[order_id] for order_id in self._overdue]
+
+    def load(self, orders: Iterable[Any], now: datetime | None = None) -> None:
+        """
+        Полное перестроение индекса по списку активных заявок
+
+        Время входа в статус берется из колонки статуса (assigned_at,
+        accepted_at, onsite_at), для NEW/DR и незаполненных колонок - из updated_at.
+
+        Args:
+            orders: Заявки (legacy или ORM модели)
+            now: Время загрузки
+        """
+        self._entries.clear()
+        self._heap.clear()
+        self._overdue.clear()
+
+        for order in orders:
+            if order.id is None:
+                continue
+            timestamp_field = OrderStatus.get_timestamp_field(order.status)
+            entered_at = getattr(order, timestamp_field, None) if timestamp_field else None
+            self.track(
+                order.id,
+                order.status,
+                entered_at=entered_at or order.updated_at or order.created_at,
+            )
+
+        self.loaded_at = now or get_now()
+        logger.info("SLA index loaded: %d active orders", len(self._entries))
+
+    def clear(self) -> None:
+        """Сброс индекса (следующий тик перезагрузит его из БД)"""
+        self._entries.clear()
+        self._heap.clear()
+        self._overdue.clear()
+        self.loaded_at = None
+
+    def _maybe_compact(self) -> None:
+        """Очистка кучи от устаревших записей, если их стало слишком много"""
+        if len(self._heap) <= 2 * len(self._entries) + 64:
+            return
+        self._heap = [
+            (entry.deadline, order_id)
+            for order_id, entry in self._entries.items()
+            if entry.deadline is not None and order_id not in self._overdue
+        ]
+        heapq.heapify(self._heap)
+
+
+# Общий индекс процесса: все экземпляры Database пишут в него переходы статусов
+sla_index = SLADeadlineIndex()
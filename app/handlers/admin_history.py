@@ -112,7 +112,7 @@ async def cmd_history(message: Message, db: Database):
         await message.answer("❌ Неверный номер заявки")
         return
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Проверяем существование заявки
     order = await order_repo.get_by_id(order_id, include_deleted=True)
@@ -137,7 +137,7 @@ async def cmd_history(message: Message, db: Database):
 @handle_errors
 async def cmd_deleted_orders(message: Message, db: Database):
     """Команда для просмотра удаленных заявок"""
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Получаем удаленные заявки
     deleted_orders = await order_repo.get_deleted_orders(limit=10, offset=0)
@@ -182,7 +182,7 @@ async def cmd_search(message: Message, db: Database):
 
     query = args[1]
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
     search_service = SearchService(order_repo)
 
     # Поиск
@@ -204,7 +204,7 @@ async def callback_history_status(callback: CallbackQuery, db: Database):
     data = callback.data or ""
     order_id = int(data.split(":")[1])
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Получаем историю статусов
     history = await order_repo.get_status_history(order_id)
@@ -242,7 +242,7 @@ async def callback_history_changes(callback: CallbackQuery, db: Database):
     data = callback.data or ""
     order_id = int(data.split(":")[1])
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Получаем полную историю
     full_history = await order_repo.get_full_history(order_id)
@@ -280,7 +280,7 @@ async def callback_history_audit(callback: CallbackQuery, db: Database):
     data = callback.data or ""
     order_id = int(data.split(":")[1])
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Получаем полную историю
     full_history = await order_repo.get_full_history(order_id)
@@ -317,7 +317,7 @@ async def callback_history_full(callback: CallbackQuery, db: Database):
     data = callback.data or ""
     order_id = int(data.split(":")[1])
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
     search_service = SearchService(order_repo)
 
     # Получаем полную историю
@@ -349,7 +349,7 @@ async def callback_deleted_orders(callback: CallbackQuery, db: Database):
     data = callback.data or ""
     page = int(data.split(":")[1])
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Получаем удаленные заявки
     page_size = 10
@@ -390,7 +390,7 @@ async def callback_restore_order(callback: CallbackQuery, db: Database):
         return
     user_id = user.id
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Проверяем, что заявка удалена
     order = await order_repo.get_by_id(order_id, include_deleted=True)
@@ -431,7 +431,7 @@ async def callback_view_deleted(callback: CallbackQuery, db: Database):
     data = callback.data or ""
     order_id = int(data.split(":")[1])
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Получаем заявку
     order = await order_repo.get_by_id(order_id, include_deleted=True)
@@ -479,7 +479,7 @@ async def cmd_restore_order(message: Message, db: Database):
         await message.answer("❌ Неверный номер заявки")
         return
 
-    order_repo = OrderRepositoryExtended(db.get_connection())
+    order_repo = db.repository(OrderRepositoryExtended)
 
     # Восстанавливаем
     user = message.from_user
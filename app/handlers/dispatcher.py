@@ -1933,17 +1933,16 @@ async def btn_all_orders(message: Message, state: FSMContext, user_role: str):
     db = get_database()
     await db.connect()
     try:
-        counts = {}
-        for status in [
-            OrderStatus.NEW,
-            OrderStatus.ASSIGNED,
-            OrderStatus.ACCEPTED,
-            OrderStatus.ONSITE,
-            OrderStatus.DR,
-            OrderStatus.CLOSED,
-        ]:
-            orders = await db.get_all_orders(status=status)
-            counts[status] = len(orders)
+        counts = await db.count_orders_by_status(
+            [
+                OrderStatus.NEW,
+                OrderStatus.ASSIGNED,
+                OrderStatus.ACCEPTED,
+                OrderStatus.ONSITE,
+                OrderStatus.DR,
+                OrderStatus.CLOSED,
+            ]
+        )
     finally:
         await db.disconnect()
 
@@ -2619,17 +2618,8 @@ async def callback_unassign_master(callback: CallbackQuery, user_role: str):
 
         master = await db.get_master_by_id(order.assigned_master_id)
 
-        # Снимаем мастера и возвращаем статус в NEW (ORM compatible)
-        if hasattr(db, "unassign_master_from_order"):
-            # ORM: используем специальный метод
-            await db.unassign_master_from_order(order_id)
-        elif db.connection:
-            # Legacy: прямой SQL
-            await db.connection.execute(
-                "UPDATE orders SET status = ?, assigned_master_id = NULL WHERE id = ?",
-                (OrderStatus.NEW, order_id),
-            )
-            await db.connection.commit()
+        # Снимаем мастера и возвращаем статус в NEW
+        await db.unassign_master_from_order(order_id)
 
         # Добавляем в лог
         await db.add_audit_log(
@@ -2935,16 +2925,15 @@ async def callback_back_to_orders(callback: CallbackQuery, user_role: str):
         db = get_database()
         await db.connect()
         try:
-            counts = {}
-            for status in [
-                OrderStatus.NEW,
-                OrderStatus.ASSIGNED,
-                OrderStatus.ACCEPTED,
-                OrderStatus.ONSITE,
-                OrderStatus.DR,
-            ]:
-                orders = await db.get_all_orders(status=status)
-                counts[status] = len(orders)
+            counts = await db.count_orders_by_status(
+                [
+                    OrderStatus.NEW,
+                    OrderStatus.ASSIGNED,
+                    OrderStatus.ACCEPTED,
+                    OrderStatus.ONSITE,
+                    OrderStatus.DR,
+                ]
+            )
         finally:
             await db.disconnect()
 
@@ -13,7 +13,6 @@ from app.config import UserRole
 from app.database.db import Database
 from app.decorators import handle_errors, require_role
 from app.services.financial_reports import FinancialReportsService
-from app.services.master_reports_detailed import MasterReportsService
 from app.utils.helpers import get_now
 
 
@@ -1128,6 +1127,7 @@ async def callback_select_monthly_master_date(callback: CallbackQuery, user_role
 @handle_errors
 async def callback_generate_daily_master_report(callback: CallbackQuery, user_role: str):
     """Генерация ежедневной сводки по мастерам"""
+    from app.services.master_reports_detailed import MasterReportsService
     from app.utils.helpers import MOSCOW_TZ
 
     data = callback.data or ""
@@ -1233,6 +1233,7 @@ async def callback_generate_daily_master_report(callback: CallbackQuery, user_ro
 @handle_errors
 async def callback_generate_weekly_master_report(callback: CallbackQuery, user_role: str):
     """Генерация еженедельной сводки по мастерам"""
+    from app.services.master_reports_detailed import MasterReportsService
     from app.utils.helpers import MOSCOW_TZ
 
     data = callback.data or ""
@@ -1299,6 +1300,7 @@ async def callback_generate_weekly_master_report(callback: CallbackQuery, user_r
 @handle_errors
 async def callback_generate_monthly_master_report(callback: CallbackQuery, user_role: str):
     """Генерация ежемесячной сводки по мастерам"""
+    from app.services.master_reports_detailed import MasterReportsService
     from app.utils.helpers import MOSCOW_TZ
 
     data = callback.data or ""
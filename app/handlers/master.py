@@ -2849,6 +2849,10 @@ async def confirm_reschedule_order(message: Message, state: FSMContext):
         from app.database.orm_database import ORMDatabase
 
         if isinstance(db, ORMDatabase):
+            from app.utils.date_parser import parse_scheduled_window
+            from app.utils.helpers import to_db_timestamp
+
+            scheduled_at, scheduled_until = parse_scheduled_window(new_time)
             async with db.get_session() as session:
                 from sqlalchemy import text
 
@@ -2857,6 +2861,8 @@ async def confirm_reschedule_order(message: Message, state: FSMContext):
                         """
                 UPDATE orders
                 SET scheduled_time = :new_time,
+                    scheduled_at = :scheduled_at,
+                    scheduled_until = :scheduled_until,
                     rescheduled_count = rescheduled_count + 1,
                     last_rescheduled_at = :last_rescheduled_at,
                     reschedule_reason = :reason,
@@ -2866,6 +2872,10 @@ async def confirm_reschedule_order(message: Message, state: FSMContext):
                     ),
                     {
                         "new_time": new_time,
+                        "scheduled_at": to_db_timestamp(scheduled_at) if scheduled_at else None,
+                        "scheduled_until": (
+                            to_db_timestamp(scheduled_until) if scheduled_until else None
+                        ),
                         "last_rescheduled_at": get_now(),
                         "reason": reason,
                         "updated_at": get_now(),
@@ -203,8 +203,7 @@ async def process_search_query(message: Message, state: FSMContext, user_role: s
         )
 
     finally:
-        if hasattr(db, "engine") and db.engine:
-            await db.engine.dispose()
+        await db.disconnect()
 
 
 @router.callback_query(F.data.startswith("search_page_"))
@@ -236,11 +235,7 @@ async def callback_search_pagination(callback: CallbackQuery, state: FSMContext)
         end_idx = start_idx + ORDERS_PER_PAGE
         page_ids = found_orders_ids[start_idx:end_idx]
 
-        page_orders = []
-        for order_id in page_ids:
-            order = await db.get_order_by_id(order_id)
-            if order:
-                page_orders.append(order)
+        page_orders = await db.get_orders_by_ids(page_ids)
 
         total_pages = math.ceil(len(found_orders_ids) / ORDERS_PER_PAGE)
 
@@ -261,8 +256,7 @@ async def callback_search_pagination(callback: CallbackQuery, state: FSMContext)
             )
 
     finally:
-        if hasattr(db, "engine") and db.engine:
-            await db.engine.dispose()
+        await db.disconnect()
 
     await callback.answer()
 
@@ -347,8 +341,7 @@ async def callback_search_view_order(callback: CallbackQuery, state: FSMContext,
             )
 
     finally:
-        if hasattr(db, "engine") and db.engine:
-            await db.engine.dispose()
+        await db.disconnect()
 
     await callback.answer()
 
@@ -383,11 +376,7 @@ async def callback_search_back_to_list(callback: CallbackQuery, state: FSMContex
         end_idx = start_idx + ORDERS_PER_PAGE
         page_ids = found_orders_ids[start_idx:end_idx]
 
-        page_orders = []
-        for order_id in page_ids:
-            order = await db.get_order_by_id(order_id)
-            if order:
-                page_orders.append(order)
+        page_orders = await db.get_orders_by_ids(page_ids)
 
         total_pages = math.ceil(len(found_orders_ids) / ORDERS_PER_PAGE)
 
@@ -414,7 +403,6 @@ async def callback_search_back_to_list(callback: CallbackQuery, state: FSMContex
             )
 
     finally:
-        if hasattr(db, "engine") and db.engine:
-            await db.engine.dispose()
+        await db.disconnect()
 
     await callback.answer()
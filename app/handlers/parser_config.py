@@ -191,11 +191,24 @@ async def cmd_parser_status(
     else:
         runtime_status = "⚠️ Ошибка: Сервис не доступен"
 
+    queue_text = ""
+    if parser_integration:
+        queue = parser_integration.ingestion.stats()
+        queue_text = (
+            f"<b>Очередь сообщений:</b>\n"
+            f"• В очереди: {queue['depth']} (максимум {queue['max_depth']})\n"
+            f"• Обработано: {queue['processed']}, ошибок: {queue['failed']}\n"
+            f"• Отброшено: {queue['dropped']}, ожиданий места: {queue['backpressure_waits']}\n"
+            f"• Среднее ожидание: {queue['avg_wait']:.2f} с, "
+            f"обработка: {queue['avg_handle']:.2f} с\n\n"
+        )
+
     await message.answer(
         f"📊 <b>Статус парсера</b>\n\n"
         f"{status_emoji} <b>Конфигурация БД:</b> {status_text}\n"
         f"⚙️ <b>Процесс:</b> {runtime_status}\n"
         f"📋 <b>Group ID:</b> {group_text}\n\n"
+        f"{queue_text}"
         f"<b>Параметры (.env):</b>\n"
         f"• PARSER_ENABLED: {Config.PARSER_ENABLED}\n"
         f"• TELETHON_SESSION: {Config.TELETHON_SESSION_NAME}\n",
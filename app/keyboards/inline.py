@@ -82,6 +82,12 @@ class MasterLike(Protocol):
     def get_display_name(self) -> str: ...
 
 
+class OrderLike(Protocol):
+    id: int | None
+    equipment_type: str
+    status: str
+
+
 def get_equipment_types_keyboard() -> InlineKeyboardMarkup:
     """
     Клавиатура выбора типа техники
@@ -721,7 +727,7 @@ def get_search_cancel_keyboard() -> InlineKeyboardMarkup:
 
 
 def get_order_search_results_list_keyboard(
-    orders: list[Order], current_page: int, total_pages: int
+    orders: Sequence[OrderLike], current_page: int, total_pages: int
 ) -> InlineKeyboardMarkup:
     """
     Клавиатура со списком найденных заказов и пагинацией
@@ -1,179 +1,537 @@
 """
 Middleware для ограничения частоты запросов (Rate Limiting)
+
+Состояние лимитера хранится в бэкенде:
+- MemoryRateLimitBackend - в памяти процесса. Корзины компактные (__slots__),
+  нарушения считаются скользящим окном из двух счетчиков за O(1),
+  простаивающие корзины вытесняются по idle TTL, общее число корзин
+  ограничено (LRU);
+- RedisRateLimitBackend - общий Redis для всех контейнеров городов: та же
+  логика выполняется Lua-скриптом атомарно, ключи истекают сами (PEXPIRE).
+  При недоступности Redis используется локальный бэкенд.
 """
 
 import logging
 import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
-from typing import Any, TypedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
 
 
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
 logger = logging.getLogger(__name__)
 
+# Длительность бана за max_violations нарушений (секунды)
+BAN_DURATION = 3600
+
+# Минимальный интервал между предупреждениями (секунды)
+WARNING_COOLDOWN = 5
+BANNED_WARNING_COOLDOWN = 10
+
+
+class RateLimitBucket:
+    """
+    Состояние rate limiting одного пользователя
+
+    Нарушения считаются скользящим окном по двум фиксированным окнам:
+    число нарушений предыдущего окна взвешивается долей, которая еще
+    попадает в скользящее окно, и складывается с текущим.
+    """
+
+    __slots__ = (
+        "banned_until",
+        "last_update",
+        "last_warning_sent",
+        "prev_violations",
+        "tokens",
+        "violations_in_window",
+        "window_start",
+    )
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.last_update = now
+        self.window_start = now
+        self.violations_in_window = 0
+        self.prev_violations = 0
+        self.banned_until: float | None = None
+        self.last_warning_sent = 0.0
+
+    def _roll_window(self, now: float, window: float) -> None:
+        elapsed = now - self.window_start
+        if elapsed < window:
+            return
+        # Предыдущим окном становится текущее, только если оно непосредственно предшествует
+        self.prev_violations = self.violations_in_window if elapsed < 2 * window else 0
+        self.violations_in_window = 0
+        self.window_start = now - elapsed % window
+
+    def violations(self, now: float, window: float) -> int:
+        """
+        Количество нарушений за последние window секунд
+
+        Args:
+            now: Текущее время
+            window: Длина окна в секундах
+
+        Returns:
+            Оценка числа нарушений в скользящем окне
+        """
+        self._roll_window(now, window)
+        weight = 1.0 - (now - self.window_start) / window
+        return self.violations_in_window + int(self.prev_violations * weight)
+
+    def add_violation(self, now: float, window: float) -> int:
+        """
+        Регистрация нарушения
+
+        Returns:
+            Количество нарушений в скользящем окне с учетом нового
+        """
+        self._roll_window(now, window)
+        self.violations_in_window += 1
+        return self.violations(now, window)
+
+    def reset_violations(self) -> None:
+        """Сброс нарушений и бана"""
+        self.banned_until = None
+        self.violations_in_window = 0
+        self.prev_violations = 0
 
-class RateLimitBucket(TypedDict):
-    """Структура данных для хранения информации о rate limiting для пользователя"""
 
+class RateLimitResult(NamedTuple):
+    """Решение лимитера по одному событию"""
+
+    allowed: bool
     tokens: float
-    last_update: float
     violations: int
-    violation_timestamps: list[float]
     banned_until: float | None
-    last_warning_sent: float
+    # Нужно ли отправить пользователю предупреждение (с учетом cooldown)
+    warn: bool
 
 
-class RateLimitMiddleware(BaseMiddleware):
-    """
-    Middleware для защиты от spam и DoS атак
-
-    Использует алгоритм Token Bucket для ограничения частоты запросов
-    """
+class MemoryRateLimitBackend:
+    """Token Bucket в памяти процесса с вытеснением простаивающих корзин"""
 
     def __init__(
         self,
-        rate: int = 3,  # Запросов в период
-        period: int = 1,  # Период в секундах
-        burst: int = 5,  # Максимальный burst (всплеск)
-        max_violations: int = 30,  # Максимум нарушений перед баном
-        violation_window: int = 60,  # Окно для подсчёта нарушений (секунды)
+        rate: int,
+        period: int,
+        burst: int,
+        max_violations: int,
+        violation_window: int,
+        max_users: int = 100_000,
+        idle_ttl: float | None = None,
+        sweep_interval: float = 60.0,
     ):
         """
-        Инициализация Rate Limiter
+        Инициализация
 
         Args:
             rate: Количество разрешённых запросов в период
             period: Период в секундах
-            burst: Максимальный burst (сколько запросов можно сделать сразу)
-            max_violations: Максимум нарушений перед постоянной блокировкой
-            violation_window: Окно времени для подсчёта нарушений (секунды)
-
-        Пример:
-            rate=3, period=1, burst=5
-            → 3 запроса в секунду, но можно сделать до 5 подряд
+            burst: Максимальный burst
+            max_violations: Нарушений до бана
+            violation_window: Окно подсчета нарушений (секунды)
+            max_users: Максимум отслеживаемых пользователей (LRU)
+            idle_ttl: Через сколько секунд простоя корзина удаляется
+                (по умолчанию - когда она уже неотличима от новой)
+            sweep_interval: Как часто искать простаивающие корзины (секунды)
         """
-        super().__init__()
-        self.rate = rate
-        self.period = period
+        self.rate_per_second = rate / period
         self.burst = burst
         self.max_violations = max_violations
         self.violation_window = violation_window
+        self.max_users = max_users
+        if idle_ttl is None:
+            # За это время восстанавливается весь burst и истекают все нарушения
+            idle_ttl = max(burst / self.rate_per_second, 2 * violation_window)
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+
+        # Порядок записей - от давно неактивных к недавним
+        self.buckets: OrderedDict[int, RateLimitBucket] = OrderedDict()
+        self._next_sweep = 0.0
+        self.evicted = 0
+
+    def _new_bucket(self, user_id: int, now: float) -> RateLimitBucket:
+        # Новый пользователь - даём полный burst
+        bucket = RateLimitBucket(float(self.burst), now)
+        self.buckets[user_id] = bucket
+        if len(self.buckets) > self.max_users:
+            self.buckets.popitem(last=False)
+            self.evicted += 1
+        return bucket
+
+    def sweep(self, now: float) -> int:
+        """
+        Удаление простаивающих корзин (с начала LRU-порядка)
+
+        Забаненные пользователи не удаляются до окончания бана.
 
-        # Хранилище для каждого пользователя
-        self.buckets: dict[int, RateLimitBucket] = {}
+        Args:
+            now: Текущее время
 
-    def _get_tokens(self, user_id: int) -> float:
+        Returns:
+            Количество удаленных корзин
         """
-        Получить текущее количество доступных токенов для пользователя
+        cutoff = now - self.idle_ttl
+        removed = 0
+        for _ in range(len(self.buckets)):
+            user_id, bucket = next(iter(self.buckets.items()))
+            if bucket.last_update > cutoff:
+                break
+            if bucket.banned_until is not None and bucket.banned_until > now:
+                self.buckets.move_to_end(user_id)
+                continue
+            del self.buckets[user_id]
+            removed += 1
+
+        self.evicted += removed
+        return removed
+
+    async def hit(self, user_id: int, now: float) -> RateLimitResult:
+        """
+        Учет события пользователя
 
         Args:
             user_id: Telegram ID пользователя
+            now: Текущее время (time.time())
 
         Returns:
-            Количество доступных токенов
+            RateLimitResult
         """
-        now = time.time()
+        if now >= self._next_sweep:
+            self.sweep(now)
+            self._next_sweep = now + self.sweep_interval
+
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            bucket = self._new_bucket(user_id, now)
+        else:
+            self.buckets.move_to_end(user_id)
+            # Восстанавливаем токены за прошедшее время (не больше burst)
+            bucket.tokens = min(
+                self.burst, bucket.tokens + (now - bucket.last_update) * self.rate_per_second
+            )
+            bucket.last_update = now
+        window = self.violation_window
 
-        if user_id not in self.buckets:
-            # Новый пользователь - даём полный burst
-            self.buckets[user_id] = {
-                "tokens": float(self.burst),
-                "last_update": now,
-                "violations": 0,
-                "violation_timestamps": [],
-                "banned_until": None,
-                "last_warning_sent": 0,  # Timestamp последнего предупреждения
-            }
-            return float(self.burst)
+        # Проверяем, не забанен ли пользователь
+        if bucket.banned_until is not None:
+            if bucket.banned_until > now:
+                warn = now - bucket.last_warning_sent >= BANNED_WARNING_COOLDOWN
+                if warn:
+                    bucket.last_warning_sent = now
+                return RateLimitResult._make(
+                    (
+                        False,
+                        bucket.tokens,
+                        bucket.violations(now, window),
+                        bucket.banned_until,
+                        warn,
+                    )
+                )
 
-        bucket = self.buckets[user_id]
+            # Бан истёк - сбрасываем
+            bucket.reset_violations()
+            logger.info("✅ Ban expired for user %s. Reset violations.", user_id)
 
-        # Вычисляем сколько токенов восстановилось
-        time_passed = now - bucket["last_update"]
-        tokens_to_add = time_passed * (self.rate / self.period)
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            # Без нарушений окно не пересчитывается
+            violations = (
+                bucket.violations(now, window)
+                if bucket.violations_in_window or bucket.prev_violations
+                else 0
+            )
+            # _make быстрее конструктора NamedTuple - это самый частый путь
+            return RateLimitResult._make((True, bucket.tokens, violations, None, False))
 
-        # Обновляем количество токенов (не больше burst)
-        new_tokens = min(self.burst, bucket["tokens"] + tokens_to_add)
-        bucket["tokens"] = new_tokens
-        bucket["last_update"] = now
+        # Лимит превышен - регистрируем нарушение
+        violations = bucket.add_violation(now, window)
+        if violations >= self.max_violations:
+            # Постоянный бан на 1 час
+            bucket.banned_until = now + BAN_DURATION
+            logger.critical(
+                f"🚫 User {user_id} PERMANENTLY BANNED for {self.max_violations}+ violations"
+            )
 
-        return float(new_tokens)
+        warn = now - bucket.last_warning_sent >= WARNING_COOLDOWN
+        if warn:
+            bucket.last_warning_sent = now
+        # Текущее событие отклоняется по лимиту, бан применяется со следующего
+        return RateLimitResult._make((False, bucket.tokens, violations, None, warn))
 
-    def _clean_old_violations(self, user_id: int) -> int:
-        """
-        Очистить старые нарушения вне временного окна
+    def stats(self, now: float) -> dict[str, Any]:
+        """Статистика по отслеживаемым пользователям"""
+        window = self.violation_window
+        return {
+            "backend": "memory",
+            "total_users": len(self.buckets),
+            "banned_users": sum(
+                1
+                for bucket in self.buckets.values()
+                if bucket.banned_until is not None and bucket.banned_until > now
+            ),
+            "users_with_violations": sum(
+                1 for bucket in self.buckets.values() if bucket.violations(now, window) > 0
+            ),
+            "evicted_users": self.evicted,
+            "max_users": self.max_users,
+        }
 
-        Args:
-            user_id: Telegram ID пользователя
 
-        Returns:
-            Количество актуальных нарушений
-        """
-        if user_id not in self.buckets:
-            return 0
-
-        now = time.time()
-        bucket = self.buckets[user_id]
+# Та же логика, что в MemoryRateLimitBackend.hit, атомарно на стороне Redis.
+# KEYS[1] - ключ пользователя; ARGV: now, rate_per_second, burst, max_violations,
+# violation_window, ban_duration, warning_cooldown, banned_warning_cooldown, idle_ttl.
+# Возвращает {allowed, tokens, violations, banned_until, warn} (дробные - строками;
+# banned_until - "0", если пользователь не был забанен до этого события)
+_REDIS_HIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local max_violations = tonumber(ARGV[4])
+local window = tonumber(ARGV[5])
+local ban_duration = tonumber(ARGV[6])
+local cooldown = tonumber(ARGV[7])
+local banned_cooldown = tonumber(ARGV[8])
+local idle_ttl = tonumber(ARGV[9])
+
+local state = redis.call('HMGET', KEYS[1], 't', 'u', 'ws', 'wc', 'pc', 'b', 'w')
+local tokens = tonumber(state[1]) or burst
+local last_update = tonumber(state[2]) or now
+local window_start = tonumber(state[3]) or now
+local window_count = tonumber(state[4]) or 0
+local prev_count = tonumber(state[5]) or 0
+local banned_until = tonumber(state[6]) or 0
+local last_warning = tonumber(state[7]) or 0
+
+tokens = math.min(burst, tokens + math.max(0, now - last_update) * rate)
+
+local function roll()
+    local elapsed = now - window_start
+    if elapsed >= window then
+        if elapsed < 2 * window then prev_count = window_count else prev_count = 0 end
+        window_count = 0
+        window_start = now - math.fmod(elapsed, window)
+    end
+end
+
+local function violations()
+    roll()
+    local weight = 1 - (now - window_start) / window
+    return window_count + math.floor(prev_count * weight)
+end
+
+local allowed = 0
+local warn = 0
+local reported_ban = '0'
+local count
+
+if banned_until > now then
+    count = violations()
+    reported_ban = tostring(banned_until)
+    if now - last_warning >= banned_cooldown then
+        warn = 1
+        last_warning = now
+    end
+else
+    if banned_until > 0 then
+        banned_until = 0
+        window_count = 0
+        prev_count = 0
+    end
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+        count = violations()
+    else
+        roll()
+        window_count = window_count + 1
+        count = violations()
+        if count >= max_violations then
+            banned_until = now + ban_duration
+        end
+        if now - last_warning >= cooldown then
+            warn = 1
+            last_warning = now
+        end
+    end
+end
+
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'u', tostring(now),
+    'ws', tostring(window_start), 'wc', window_count, 'pc', prev_count,
+    'b', tostring(banned_until), 'w', tostring(last_warning))
+local ttl = idle_ttl
+if banned_until > now then ttl = math.max(ttl, banned_until - now) end
+redis.call('PEXPIRE', KEYS[1], math.ceil(ttl * 1000))
+
+return {allowed, tostring(tokens), count, reported_ban, warn}
+"""
 
-        # Фильтруем нарушения - оставляем только те, что в пределах окна
-        cutoff_time = now - self.violation_window
-        bucket["violation_timestamps"] = [
-            ts for ts in bucket["violation_timestamps"] if ts > cutoff_time
-        ]
 
-        # Обновляем счетчик
-        violations_count = len(bucket["violation_timestamps"])
-        bucket["violations"] = violations_count
+class RedisRateLimitBackend:
+    """Token Bucket в общем Redis (согласованные лимиты для всех контейнеров)"""
 
-        return violations_count
+    def __init__(
+        self,
+        redis: "Redis",
+        fallback: MemoryRateLimitBackend,
+        key_prefix: str = "rate_limit",
+    ):
+        """
+        Инициализация
 
-    def _add_violation(self, user_id: int) -> int:
+        Args:
+            redis: Клиент redis.asyncio
+            fallback: Локальный бэкенд на время недоступности Redis
+                (его настройки используются и для Redis)
+            key_prefix: Префикс ключей
         """
-        Зарегистрировать нарушение
+        self.redis = redis
+        self.fallback = fallback
+        self.key_prefix = key_prefix
+        self._script = redis.register_script(_REDIS_HIT_SCRIPT)
+        self.redis_errors = 0
+
+    @classmethod
+    def from_url(
+        cls, url: str, fallback: MemoryRateLimitBackend, key_prefix: str = "rate_limit"
+    ) -> "RedisRateLimitBackend":
+        """
+        Создание бэкенда по URL Redis
 
         Args:
-            user_id: Telegram ID пользователя
+            url: URL Redis (REDIS_URL)
+            fallback: Локальный бэкенд
+            key_prefix: Префикс ключей
 
         Returns:
-            Текущее количество нарушений
+            RedisRateLimitBackend
         """
-        now = time.time()
-        bucket = self.buckets[user_id]
+        # redis импортируется только когда он действительно используется
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url), fallback, key_prefix)
+
+    async def hit(self, user_id: int, now: float) -> RateLimitResult:
+        """Учет события пользователя (см. MemoryRateLimitBackend.hit)"""
+        fallback = self.fallback
+        try:
+            allowed, tokens, violations, banned_until, warn = await self._script(
+                keys=[f"{self.key_prefix}:{user_id}"],
+                args=[
+                    now,
+                    fallback.rate_per_second,
+                    fallback.burst,
+                    fallback.max_violations,
+                    fallback.violation_window,
+                    BAN_DURATION,
+                    WARNING_COOLDOWN,
+                    BANNED_WARNING_COOLDOWN,
+                    fallback.idle_ttl,
+                ],
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Rate limit: Redis недоступен, используется локальный лимит: %s", e)
+            return await fallback.hit(user_id, now)
+
+        return RateLimitResult(
+            allowed=bool(allowed),
+            tokens=float(tokens),
+            violations=int(violations),
+            banned_until=float(banned_until) or None,
+            warn=bool(warn),
+        )
 
-        # Добавляем timestamp нарушения
-        bucket["violation_timestamps"].append(now)
-        violations_count = len(bucket["violation_timestamps"])
-        bucket["violations"] = violations_count
+    def stats(self, now: float) -> dict[str, Any]:
+        """Статистика (по Redis счетчики не собираются - только локальный резерв)"""
+        stats = self.fallback.stats(now)
+        stats["backend"] = "redis"
+        stats["redis_errors"] = self.redis_errors
+        return stats
 
-        # Проверяем, не превысили ли лимит
-        if violations_count >= self.max_violations:
-            # Постоянный бан на 1 час
-            bucket["banned_until"] = now + 3600
-            logger.critical(
-                f"🚫 User {user_id} PERMANENTLY BANNED for {self.max_violations}+ violations"
-            )
 
-        return violations_count
+class RateLimitMiddleware(BaseMiddleware):
+    """
+    Middleware для защиты от spam и DoS атак
 
-    def _consume_token(self, user_id: int) -> bool:
+    Использует алгоритм Token Bucket для ограничения частоты запросов
+    """
+
+    def __init__(
+        self,
+        rate: int = 3,  # Запросов в период
+        period: int = 1,  # Период в секундах
+        burst: int = 5,  # Максимальный burst (всплеск)
+        max_violations: int = 30,  # Максимум нарушений перед баном
+        violation_window: int = 60,  # Окно для подсчёта нарушений (секунды)
+        max_users: int = 100_000,  # Максимум отслеживаемых пользователей в памяти
+        redis_url: str | None = None,  # Общий Redis для лимитов (None - только память)
+    ):
         """
-        Попытка использовать токен
+        Инициализация Rate Limiter
 
         Args:
-            user_id: Telegram ID пользователя
+            rate: Количество разрешённых запросов в период
+            period: Период в секундах
+            burst: Максимальный burst (сколько запросов можно сделать сразу)
+            max_violations: Максимум нарушений перед постоянной блокировкой
+            violation_window: Окно времени для подсчёта нарушений (секунды)
+            max_users: Максимум пользователей в памяти (давно неактивные вытесняются)
+            redis_url: URL Redis для общих лимитов всех контейнеров
 
-        Returns:
-            True если токен доступен и использован
+        Пример:
+            rate=3, period=1, burst=5
+            → 3 запроса в секунду, но можно сделать до 5 подряд
         """
-        tokens = self._get_tokens(user_id)
-
-        if tokens >= 1:
-            self.buckets[user_id]["tokens"] -= 1
-            return True
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self.burst = burst
+        self.max_violations = max_violations
+        self.violation_window = violation_window
 
-        return False
+        # Локальное хранилище (при Redis - резерв на время его недоступности)
+        self.memory = MemoryRateLimitBackend(
+            rate, period, burst, max_violations, violation_window, max_users=max_users
+        )
+        self.backend: MemoryRateLimitBackend | RedisRateLimitBackend = self.memory
+        if redis_url:
+            self.backend = RedisRateLimitBackend.from_url(redis_url, self.memory)
+
+    @property
+    def buckets(self) -> OrderedDict[int, RateLimitBucket]:
+        """Корзины пользователей в памяти процесса"""
+        return self.memory.buckets
+
+    @staticmethod
+    def _wait_time(result: RateLimitResult, rate: int, period: int) -> int:
+        """Время ожидания с прогрессивным наказанием за нарушения"""
+        violations = result.violations
+
+        # Рассчитываем базовое время ожидания
+        tokens_needed = 1.0 - result.tokens
+        base_wait_time = max(10, int((tokens_needed / rate) * period))
+
+        if violations <= 3:
+            return base_wait_time
+        if violations <= 10:
+            # 4-10 нарушений: × 2-5
+            return base_wait_time * min(violations - 1, 5)
+        if violations <= 20:
+            # 11-20 нарушений: × 6-15
+            return base_wait_time * (violations - 5)
+        # 21-29 нарушений: × 20-30
+        return base_wait_time * violations
 
     async def __call__(
         self,
@@ -203,28 +561,14 @@ class RateLimitMiddleware(BaseMiddleware):
 
         user_id = user.id
         now = time.time()
-
-        # Получаем или создаём bucket
-        if user_id not in self.buckets:
-            self._get_tokens(user_id)
-
-        bucket = self.buckets[user_id]
-
-        # Убеждаемся, что у bucket есть поле last_warning_sent (для обратной совместимости)
-        if "last_warning_sent" not in bucket:
-            bucket["last_warning_sent"] = 0
+        result = await self.backend.hit(user_id, now)
 
         # Проверяем, не забанен ли пользователь
-        banned_until = bucket.get("banned_until")
-        if banned_until is not None and banned_until > now:
-            remaining_ban = int(banned_until - now)
-
-            # Проверяем, нужно ли отправлять предупреждение
-            # Отправляем максимум раз в 10 секунд для забаненных
-            last_warning = bucket.get("last_warning_sent", 0)
-            should_send_warning = (now - last_warning) >= 10
+        if result.banned_until is not None:
+            remaining_ban = int(result.banned_until - now)
 
-            if should_send_warning:
+            # Отправляем предупреждение максимум раз в 10 секунд для забаненных
+            if result.warn:
                 logger.error(
                     f"🚫 BANNED user {user_id} (@{user.username}) tried to access. "
                     f"Ban remaining: {remaining_ban}s"
@@ -242,57 +586,22 @@ class RateLimitMiddleware(BaseMiddleware):
                     await event.answer(
                         f"🚫 Вы заблокированы за спам на {remaining_ban // 60} мин", show_alert=True
                     )
-
-                bucket["last_warning_sent"] = now
             else:
                 # Молча блокируем без ответа
                 logger.debug(f"🚫 BANNED user {user_id} blocked silently (warning cooldown)")
 
             return None
 
-        # Если бан истёк - сбрасываем
-        banned_until = bucket.get("banned_until")
-        if banned_until is not None and banned_until <= now:
-            bucket["banned_until"] = None
-            bucket["violations"] = 0
-            bucket["violation_timestamps"] = []
-            logger.info("✅ Ban expired for user %s. Reset violations.", user_id)
-
-        # Очищаем старые нарушения
-        self._clean_old_violations(user_id)
-
-        # Проверяем лимит токенов
-        if not self._consume_token(user_id):
-            # Лимит превышен - регистрируем нарушение
-            violations = self._add_violation(user_id)
-            current_tokens = bucket["tokens"]
-
-            # Рассчитываем базовое время ожидания
-            tokens_needed = 1.0 - current_tokens
-            base_wait_time = max(10, int((tokens_needed / self.rate) * self.period))
-
-            # Прогрессивное наказание за нарушения
-            if violations <= 3:
-                wait_time = base_wait_time
-            elif violations <= 10:
-                # 4-10 нарушений: × 2-5
-                wait_time = base_wait_time * min(violations - 1, 5)
-            elif violations <= 20:
-                # 11-20 нарушений: × 6-15
-                wait_time = base_wait_time * (violations - 5)
-            else:
-                # 21-29 нарушений: × 20-30
-                wait_time = base_wait_time * (violations)
-
-            # Проверяем, нужно ли отправлять предупреждение
-            # Отправляем максимум раз в 5 секунд
-            last_warning = bucket.get("last_warning_sent", 0)
-            should_send_warning = (now - last_warning) >= 5
+        if not result.allowed:
+            # Лимит превышен - нарушение уже зарегистрировано бэкендом
+            violations = result.violations
+            wait_time = self._wait_time(result, self.rate, self.period)
 
-            if should_send_warning:
+            # Отправляем предупреждение максимум раз в 5 секунд
+            if result.warn:
                 logger.warning(
                     f"⚠️ Rate limit exceeded for user {user_id} (@{user.username}). "
-                    f"Wait time: {wait_time}s, violations: {violations}/{self.max_violations}, tokens: {current_tokens:.2f}"
+                    f"Wait time: {wait_time}s, violations: {violations}/{self.max_violations}, tokens: {result.tokens:.2f}"
                 )
 
                 # Отправляем сообщение пользователю
@@ -323,8 +632,6 @@ class RateLimitMiddleware(BaseMiddleware):
                         f"⚠️ Слишком много запросов. Подождите {wait_time} сек.\nНарушений: {violations}/{self.max_violations}",
                         show_alert=True,
                     )
-
-                bucket["last_warning_sent"] = now
             else:
                 # Молча блокируем без ответа
                 logger.debug(
@@ -338,7 +645,7 @@ class RateLimitMiddleware(BaseMiddleware):
         # Лимит не превышен - пропускаем запрос
         logger.debug(
             f"Rate limit OK for user {user_id}. "
-            f"Remaining tokens: {bucket['tokens']:.2f}, violations: {bucket['violations']}"
+            f"Remaining tokens: {result.tokens:.2f}, violations: {result.violations}"
         )
 
         return await handler(event, data)
@@ -350,22 +657,8 @@ class RateLimitMiddleware(BaseMiddleware):
         Returns:
             Словарь со статистикой
         """
-        now = time.time()
-        banned_users = sum(
-            1
-            for bucket in self.buckets.values()
-            if (bucket_banned_until := bucket.get("banned_until")) is not None
-            and bucket_banned_until > now
-        )
-
-        users_with_violations = sum(
-            1 for bucket in self.buckets.values() if bucket.get("violations", 0) > 0
-        )
-
         return {
-            "total_users": len(self.buckets),
-            "banned_users": banned_users,
-            "users_with_violations": users_with_violations,
+            **self.backend.stats(time.time()),
             "rate": self.rate,
             "period": self.period,
             "burst": self.burst,
@@ -10,6 +10,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
 
 from app.database import Database
+from app.database.user_cache import user_cache
 
 
 logger = logging.getLogger(__name__)
@@ -52,13 +53,20 @@ class RoleCheckMiddleware(BaseMiddleware):
         user = event.from_user
 
         if user:
-            # Получаем или создаем пользователя в БД
-            db_user = await self.db.get_or_create_user(
-                telegram_id=user.id,
-                username=user.username,
-                first_name=user.first_name,
-                last_name=user.last_name,
-            )
+            # Сначала смотрим в кэш: пока профиль Telegram не изменился и роли
+            # не менялись (см. user_cache.invalidate), в БД не ходим
+            profile = (user.username, user.first_name, user.last_name)
+            db_user = user_cache.get(user.id, profile)
+
+            if db_user is None:
+                # Получаем или создаем пользователя в БД
+                db_user = await self.db.get_or_create_user(
+                    telegram_id=user.id,
+                    username=user.username,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                )
+                user_cache.set(user.id, db_user, profile)
 
             # Добавляем пользователя и его роли в данные
             data["user"] = db_user
@@ -3,7 +3,9 @@
 """
 
 import logging
-from contextlib import asynccontextmanager
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from contextvars import ContextVar
 from typing import Generic, TypeVar
 
 import aiosqlite
@@ -13,6 +15,8 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+TransactionFactory = Callable[[], AbstractAsyncContextManager[aiosqlite.Connection]]
+
 
 class BaseRepository(Generic[T]):
     """
@@ -20,35 +24,72 @@ class BaseRepository(Generic[T]):
     Предоставляет общую функциональность для работы с БД
     """
 
-    def __init__(self, db_connection: aiosqlite.Connection):
+    def __init__(
+        self,
+        db_connection: aiosqlite.Connection,
+        transaction_factory: TransactionFactory | None = None,
+    ):
         """
         Инициализация репозитория
 
         Args:
             db_connection: Подключение к базе данных
+            transaction_factory: Источник транзакций (Database.transaction). С пулом
+                SQLite соединение db_connection только для чтения, а записи идут
+                через соединение писателя, которое выдает transaction_factory
         """
-        self.db = db_connection
+        self._connection = db_connection
+        self._transaction_factory = transaction_factory
+        # Соединение транзакции, открытой текущей задачей
+        self._current: ContextVar[aiosqlite.Connection | None] = ContextVar(
+            f"repository_transaction_{id(self)}", default=None
+        )
+
+    @property
+    def db(self) -> aiosqlite.Connection:
+        """Соединение для запросов: внутри transaction() - соединение транзакции"""
+        return self._current.get() or self._connection
 
     @asynccontextmanager
     async def transaction(self):
         """
         Контекстный менеджер для транзакций
 
+        Вложенный вызов в той же задаче использует внешнюю транзакцию.
+
         Yields:
             aiosqlite.Connection: Подключение к БД
         """
-        if not self.db:
+        current = self._current.get()
+        if current is not None:
+            yield current
+            return
+
+        if self._transaction_factory is not None:
+            async with self._transaction_factory() as connection:
+                token = self._current.set(connection)
+                try:
+                    yield connection
+                finally:
+                    self._current.reset(token)
+            return
+
+        if not self._connection:
             raise RuntimeError("База данных не подключена")
 
-        await self.db.execute("BEGIN IMMEDIATE")
+        connection = self._connection
+        await connection.execute("BEGIN IMMEDIATE")
+        token = self._current.set(connection)
         try:
-            yield self.db
-            await self.db.commit()
+            yield connection
+            await connection.commit()
             logger.debug("✅ Транзакция успешно завершена (commit)")
         except Exception as e:
-            await self.db.rollback()
+            await connection.rollback()
             logger.error(f"❌ Транзакция отменена (rollback): {e}")
             raise
+        finally:
+            self._current.reset(token)
 
     async def _execute(self, query: str, params: tuple | dict | None = None) -> aiosqlite.Cursor:
         """
@@ -109,6 +150,6 @@ class BaseRepository(Generic[T]):
         Returns:
             ID последней вставленной записи или количество измененных строк
         """
-        cursor = await self._execute(query, params)
-        await self.db.commit()
+        async with self.transaction():
+            cursor = await self._execute(query, params)
         return cursor.lastrowid if cursor.lastrowid else cursor.rowcount
@@ -41,14 +41,14 @@ class MasterRepository(BaseRepository[Master]):
             Объект Master
         """
         now = get_now()
-        cursor = await self._execute(
-            """
-            INSERT INTO masters (telegram_id, phone, specialization, is_active, is_approved, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (telegram_id, phone, specialization, is_active, is_approved, now.isoformat()),
-        )
-        await self.db.commit()
+        async with self.transaction():
+            cursor = await self._execute(
+                """
+                INSERT INTO masters (telegram_id, phone, specialization, is_active, is_approved, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (telegram_id, phone, specialization, is_active, is_approved, now.isoformat()),
+            )
 
         master = Master(
             id=cursor.lastrowid,
@@ -3,6 +3,7 @@
 """
 
 import logging
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
 
@@ -11,7 +12,8 @@ import aiosqlite
 from app.config import OrderStatus
 from app.database.models import Order
 from app.repositories.base import BaseRepository
-from app.utils.helpers import MOSCOW_TZ, get_now
+from app.utils.date_parser import parse_scheduled_window
+from app.utils.helpers import MOSCOW_TZ, get_now, normalize_phone, to_db_timestamp
 
 
 logger = logging.getLogger(__name__)
@@ -48,26 +50,31 @@ class OrderRepository(BaseRepository[Order]):
             Объект Order
         """
         now = get_now()
-        cursor = await self._execute(
-            """
-            INSERT INTO orders (equipment_type, description, client_name, client_address,
-                              client_phone, dispatcher_id, notes, scheduled_time, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                equipment_type,
-                description,
-                client_name,
-                client_address,
-                client_phone,
-                dispatcher_id,
-                notes,
-                scheduled_time,
-                now.isoformat(),
-                now.isoformat(),
-            ),
-        )
-        await self.db.commit()
+        scheduled_at, scheduled_until = parse_scheduled_window(scheduled_time)
+        async with self.transaction():
+            cursor = await self._execute(
+                """
+                INSERT INTO orders (equipment_type, description, client_name, client_address,
+                                  client_phone, client_phone_normalized, dispatcher_id, notes,
+                                  scheduled_time, scheduled_at, scheduled_until, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    equipment_type,
+                    description,
+                    client_name,
+                    client_address,
+                    client_phone,
+                    normalize_phone(client_phone),
+                    dispatcher_id,
+                    notes,
+                    scheduled_time,
+                    to_db_timestamp(scheduled_at) if scheduled_at else None,
+                    to_db_timestamp(scheduled_until) if scheduled_until else None,
+                    now.isoformat(),
+                    now.isoformat(),
+                ),
+            )
 
         order = Order(
             id=cursor.lastrowid,
@@ -79,6 +86,8 @@ class OrderRepository(BaseRepository[Order]):
             dispatcher_id=dispatcher_id,
             notes=notes,
             scheduled_time=scheduled_time,
+            scheduled_at=scheduled_at,
+            scheduled_until=scheduled_until,
             status=OrderStatus.NEW,
             created_at=now,
             updated_at=now,
@@ -115,6 +124,44 @@ class OrderRepository(BaseRepository[Order]):
             return self._row_to_order(row)
         return None
 
+    async def get_by_ids(self, order_ids: Iterable[int]) -> list[Order]:
+        """
+        Пакетное получение заявок по списку ID (один запрос вместо N)
+
+        Args:
+            order_ids: ID заявок
+
+        Returns:
+            Найденные заявки в порядке переданных ID (отсутствующие и повторы пропускаются)
+        """
+        ids = list(dict.fromkeys(order_id for order_id in order_ids if order_id is not None))
+        if not ids:
+            return []
+
+        found: dict[int, Order] = {}
+        # SQLite ограничивает число параметров в запросе, поэтому бьем на пачки
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            rows = await self._fetch_all(
+                f"""
+                SELECT o.*,
+                       u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+                       u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+                FROM orders o
+                LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+                LEFT JOIN masters m ON o.assigned_master_id = m.id
+                LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+                WHERE o.id IN ({", ".join("?" * len(chunk))})
+                """,  # nosec B608 - плейсхолдеры формируются по числу ID, значения передаются параметрами
+                tuple(chunk),
+            )
+            for row in rows:
+                order = self._row_to_order(row)
+                if order.id is not None:
+                    found[order.id] = order
+
+        return [found[order_id] for order_id in ids if order_id in found]
+
     async def get_all(
         self, status: str | None = None, master_id: int | None = None, limit: int | None = None
     ) -> list[Order]:
@@ -183,15 +230,28 @@ class OrderRepository(BaseRepository[Order]):
         now = get_now()
 
         async with self.transaction():
-            # Обновляем статус
-            await self._execute(
-                """
-                UPDATE orders
-                SET status = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (new_status, now.isoformat(), order_id),
+            # Обновляем статус (и время входа в новый статус)
+            timestamp_field = (
+                OrderStatus.get_timestamp_field(new_status) if new_status != old_status else None
             )
+            if timestamp_field:
+                await self._execute(
+                    f"""
+                    UPDATE orders
+                    SET status = ?, updated_at = ?, {timestamp_field} = ?
+                    WHERE id = ?
+                    """,  # nosec B608 - имя колонки из OrderStatus.get_timestamp_field
+                    (new_status, now.isoformat(), to_db_timestamp(now), order_id),
+                )
+            else:
+                await self._execute(
+                    """
+                    UPDATE orders
+                    SET status = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (new_status, now.isoformat(), order_id),
+                )
 
             # Добавляем запись в историю
             await self._execute(
@@ -228,10 +288,16 @@ class OrderRepository(BaseRepository[Order]):
             await self._execute(
                 """
                 UPDATE orders
-                SET assigned_master_id = ?, status = ?, updated_at = ?
+                SET assigned_master_id = ?, status = ?, updated_at = ?, assigned_at = ?
                 WHERE id = ?
                 """,
-                (master_id, OrderStatus.ASSIGNED, now.isoformat(), order_id),
+                (
+                    master_id,
+                    OrderStatus.ASSIGNED,
+                    now.isoformat(),
+                    to_db_timestamp(now),
+                    order_id,
+                ),
             )
 
             # Добавляем запись в историю статусов
@@ -403,6 +469,16 @@ class OrderRepository(BaseRepository[Order]):
             dispatcher_id=row["dispatcher_id"],
             notes=row["notes"],
             scheduled_time=row["scheduled_time"],
+            scheduled_at=(
+                datetime.fromisoformat(row_dict["scheduled_at"]).replace(tzinfo=MOSCOW_TZ)
+                if row_dict.get("scheduled_at")
+                else None
+            ),
+            scheduled_until=(
+                datetime.fromisoformat(row_dict["scheduled_until"]).replace(tzinfo=MOSCOW_TZ)
+                if row_dict.get("scheduled_until")
+                else None
+            ),
             total_amount=(
                 row["total_amount"]
                 if "total_amount" in row and row["total_amount"] is not None
@@ -451,6 +527,26 @@ class OrderRepository(BaseRepository[Order]):
                 else None
             ),
             reschedule_reason=row_dict.get("reschedule_reason"),
+            assigned_at=(
+                datetime.fromisoformat(row_dict["assigned_at"]).replace(tzinfo=MOSCOW_TZ)
+                if row_dict.get("assigned_at")
+                else None
+            ),
+            accepted_at=(
+                datetime.fromisoformat(row_dict["accepted_at"]).replace(tzinfo=MOSCOW_TZ)
+                if row_dict.get("accepted_at")
+                else None
+            ),
+            onsite_at=(
+                datetime.fromisoformat(row_dict["onsite_at"]).replace(tzinfo=MOSCOW_TZ)
+                if row_dict.get("onsite_at")
+                else None
+            ),
+            closed_at=(
+                datetime.fromisoformat(row_dict["closed_at"]).replace(tzinfo=MOSCOW_TZ)
+                if row_dict.get("closed_at")
+                else None
+            ),
             created_at=(
                 datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
                 if row["created_at"]
@@ -7,10 +7,11 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from app.config import OrderStatus
 from app.database.models import Order
 from app.repositories.exceptions import ConcurrentModificationError, EntityNotFoundError
 from app.repositories.order_repository import OrderRepository
-from app.utils.helpers import get_now
+from app.utils.helpers import get_now, to_db_timestamp
 
 
 logger = logging.getLogger(__name__)
@@ -446,15 +447,34 @@ class OrderRepositoryExtended(OrderRepository):
 
             old_status = row["status"]
 
-            # Обновляем с инкрементом версии
-            cursor = await self._execute(
-                """
-                UPDATE orders
-                SET status = ?, version = version + 1, updated_at = ?
-                WHERE id = ? AND version = ?
-                """,
-                (new_status, now.isoformat(), order_id, expected_version),
+            # Обновляем с инкрементом версии (и временем входа в новый статус)
+            timestamp_field = (
+                OrderStatus.get_timestamp_field(new_status) if new_status != old_status else None
             )
+            if timestamp_field:
+                cursor = await self._execute(
+                    f"""
+                    UPDATE orders
+                    SET status = ?, version = version + 1, updated_at = ?, {timestamp_field} = ?
+                    WHERE id = ? AND version = ?
+                    """,  # nosec B608 - имя колонки из OrderStatus.get_timestamp_field
+                    (
+                        new_status,
+                        now.isoformat(),
+                        to_db_timestamp(now),
+                        order_id,
+                        expected_version,
+                    ),
+                )
+            else:
+                cursor = await self._execute(
+                    """
+                    UPDATE orders
+                    SET status = ?, version = version + 1, updated_at = ?
+                    WHERE id = ? AND version = ?
+                    """,
+                    (new_status, now.isoformat(), order_id, expected_version),
+                )
 
             if cursor.rowcount == 0:
                 # Версия изменилась между SELECT и UPDATE (маловероятно, но возможно)
@@ -8,6 +8,7 @@ from datetime import datetime
 import aiosqlite
 
 from app.database.models import User
+from app.database.user_cache import user_cache
 from app.repositories.base import BaseRepository
 from app.utils.helpers import MOSCOW_TZ, get_now
 
@@ -66,14 +67,14 @@ class UserRepository(BaseRepository[User]):
 
         # Создаем нового пользователя
         now = get_now()
-        cursor = await self._execute(
-            """
-            INSERT INTO users (telegram_id, username, first_name, last_name, role, created_at)
-            VALUES (?, ?, ?, ?, 'UNKNOWN', ?)
-            """,
-            (telegram_id, username, first_name, last_name, now.isoformat()),
-        )
-        await self.db.commit()
+        async with self.transaction():
+            cursor = await self._execute(
+                """
+                INSERT INTO users (telegram_id, username, first_name, last_name, role, created_at)
+                VALUES (?, ?, ?, ?, 'UNKNOWN', ?)
+                """,
+                (telegram_id, username, first_name, last_name, now.isoformat()),
+            )
 
         user = User(
             id=cursor.lastrowid,
@@ -178,6 +179,7 @@ class UserRepository(BaseRepository[User]):
                 (new_roles, telegram_id),
             )
 
+        user_cache.invalidate(telegram_id)
         logger.info(f"Роль {role} добавлена пользователю {telegram_id}")
         return True
 
@@ -210,6 +212,7 @@ class UserRepository(BaseRepository[User]):
                 (new_roles, telegram_id),
             )
 
+        user_cache.invalidate(telegram_id)
         logger.info(f"Роль {role} удалена у пользователя {telegram_id}")
         return True
 
@@ -235,6 +238,7 @@ class UserRepository(BaseRepository[User]):
         params = [*list(updates.values()), telegram_id]
 
         await self._execute_commit(query, tuple(params))
+        user_cache.invalidate(telegram_id)
         logger.info(f"Пользователь {telegram_id} обновлен: {', '.join(updates.keys())}")
         return True
 
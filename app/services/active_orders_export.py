@@ -6,16 +6,29 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles import Font
 
 from app.config import OrderStatus
 from app.database import DatabaseType, get_database
+from app.services.excel.streaming import SUBTITLE_STYLE, StreamingSheet, StreamingWorkbook
+from app.services.excel.styles import ExcelStyles
 from app.utils.helpers import get_now
 
 
 logger = logging.getLogger(__name__)
 
+# Именованные стили отчета (регистрируются в _register_styles)
+SUMMARY_TITLE_STYLE = "active_summary_title"
+SUMMARY_HEADER_STYLE = "active_summary_header"
+MASTER_HEADER_STYLE = "active_master_header"
+MASTER_TABLE_HEADER_STYLE = "active_master_table_header"
+MASTER_FILL_STYLE = "active_master_fill"
+DATA_CENTER_STYLE = "active_data_center"
+DATA_LEFT_STYLE = "active_data_left"
+
+# Белый жирный шрифт заголовков таблиц
+HEADER_FONT = Font(bold=True, size=12, color="FFFFFF")
+
 
 def sanitize_sheet_name(name: str, max_length: int = 31) -> str:
     """
@@ -54,6 +67,10 @@ class ActiveOrdersExportService:
         """
         Экспорт всех активных (незакрытых) заявок в Excel
 
+        Активные заявки отбираются запросом get_active_orders (уже
+        отсортированными) и за один проход раскладываются по мастерам.
+        Книга пишется потоково (StreamingWorkbook).
+
         Returns:
             Путь к созданному файлу или None
         """
@@ -61,37 +78,36 @@ class ActiveOrdersExportService:
 
         try:
             # Получаем все активные заявки (не CLOSED и не REFUSED)
-            all_orders = await self.db.get_all_orders()
-            active_orders = [
-                order
-                for order in all_orders
-                if order.status not in [OrderStatus.CLOSED, OrderStatus.REFUSED]
-            ]
+            active_orders = await self.db.get_active_orders()
 
             if not active_orders:
                 logger.info("No active orders found")
                 return None
 
-            # Создаем Excel файл
-            wb = Workbook()
+            # Группируем заявки по мастерам за один проход
+            orders_by_master: dict[int, list] = {}
+            for order in active_orders:
+                if order.assigned_master_id is not None:
+                    orders_by_master.setdefault(order.assigned_master_id, []).append(order)
 
-            # Удаляем стандартный лист
-            wb.remove(wb.active)
+            # Создаем Excel файл
+            wb = StreamingWorkbook()
+            self._register_styles(wb)
 
             # Создаем сводный лист
-            summary_sheet = wb.create_sheet("Сводка")
-            await self._create_summary_sheet(summary_sheet, active_orders)
+            self._create_summary_sheet(wb.create_sheet("Сводка"), active_orders)
 
             # Получаем всех активных и одобренных мастеров
             masters = await self.db.get_all_masters(only_approved=True, only_active=True)
 
             # Создаем листы для каждого мастера (только если есть активные заказы)
             for master in masters:
-                master_orders = [o for o in active_orders if o.assigned_master_id == master.id]
-                if master_orders:  # Создаем лист только если есть активные заказы
+                if master.id is None:
+                    continue
+                master_orders = orders_by_master.get(master.id)
+                if master_orders:
                     sheet_name = sanitize_sheet_name(master.get_display_name())
-                    master_sheet = wb.create_sheet(sheet_name)
-                    await self._create_master_sheet(master_sheet, master, master_orders)
+                    self._create_master_sheet(wb.create_sheet(sheet_name), master, master_orders)
 
             # Создаем директорию для отчетов
             reports_dir = Path("reports")
@@ -115,39 +131,94 @@ class ActiveOrdersExportService:
         finally:
             await self.db.disconnect()
 
-    async def _create_summary_sheet(self, ws, active_orders: list):
+    @staticmethod
+    def _register_styles(wb: StreamingWorkbook) -> None:
+        """Регистрация стилей отчета в книге"""
+        wb.add_style(
+            SUMMARY_TITLE_STYLE,
+            font=Font(bold=True, size=14),
+            fill=ExcelStyles.HEADER_FILL,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+        )
+        wb.add_style(
+            SUMMARY_HEADER_STYLE,
+            font=HEADER_FONT,
+            fill=ExcelStyles.HEADER_FILL,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        )
+        wb.add_style(
+            MASTER_HEADER_STYLE,
+            font=HEADER_FONT,
+            fill=ExcelStyles.MASTER_HEADER_FILL,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+        )
+        wb.add_style(
+            MASTER_TABLE_HEADER_STYLE,
+            font=HEADER_FONT,
+            fill=ExcelStyles.MASTER_HEADER_FILL,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        )
+        wb.add_style(MASTER_FILL_STYLE, fill=ExcelStyles.MASTER_HEADER_FILL)
+        wb.add_style(
+            DATA_CENTER_STYLE,
+            font=ExcelStyles.DATA_FONT,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        )
+        wb.add_style(
+            DATA_LEFT_STYLE,
+            font=ExcelStyles.DATA_FONT,
+            alignment=ExcelStyles.LEFT_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        )
+
+    @staticmethod
+    def _format_created(order) -> str:
+        """Дата создания заявки для отчета"""
+        created_at: datetime | str | None = order.created_at
+        if not created_at:
+            return ""
+        if isinstance(created_at, str):
+            try:
+                created_dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+                return created_dt.strftime("%d.%m.%Y %H:%M")
+            except Exception:
+                return created_at
+        return created_at.strftime("%d.%m.%Y %H:%M")
+
+    def _create_summary_sheet(self, ws: StreamingSheet, active_orders: list) -> None:
         """Создание сводного листа с общей информацией"""
-        # Стили
-        header_font = Font(bold=True, size=12, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        data_font = Font(size=10)
-
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        left_alignment = Alignment(horizontal="left", vertical="center")
-
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+        # Устанавливаем ширину столбцов (до записи строк)
+        ws.set_widths(
+            {
+                "A": 10,  # № Заявки
+                "B": 18,  # Статус
+                "C": 20,  # Оборудование
+                "D": 30,  # Описание
+                "E": 20,  # Клиент
+                "F": 30,  # Адрес
+                "G": 15,  # Телефон
+                "H": 20,  # Мастер
+                "I": 20,  # Диспетчер
+                "J": 20,  # Время прибытия
+                "K": 18,  # Создана
+            }
         )
 
         # Заголовок
-        ws.merge_cells("A1:K1")
-        cell = ws["A1"]
-        cell.value = f"АКТИВНЫЕ ЗАЯВКИ - {get_now().strftime('%d.%m.%Y %H:%M')}"
-        cell.font = Font(bold=True, size=14)
-        cell.fill = header_fill
-        cell.alignment = center_alignment
-        ws.row_dimensions[1].height = 25
+        ws.append(
+            [f"АКТИВНЫЕ ЗАЯВКИ - {get_now().strftime('%d.%m.%Y %H:%M')}"],
+            SUMMARY_TITLE_STYLE,
+            height=25,
+        )
+        ws.merge("A", "K")
 
         # Общая информация
-        ws.merge_cells("A2:K2")
-        cell = ws["A2"]
-        cell.value = f"Всего активных заявок: {len(active_orders)}"
-        cell.font = Font(bold=True, size=11)
-        cell.alignment = center_alignment
-        ws.row_dimensions[2].height = 20
+        ws.append([f"Всего активных заявок: {len(active_orders)}"], SUBTITLE_STYLE, height=20)
+        ws.merge("A", "K")
+        ws.skip()
 
         # Заголовки столбцов
         headers = [
@@ -163,121 +234,54 @@ class ActiveOrdersExportService:
             "Время прибытия",
             "Создана",
         ]
+        ws.append(headers, SUMMARY_HEADER_STYLE)
 
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=4, column=col_idx, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_alignment
-            cell.border = thin_border
-
-        # Сортируем заявки по статусу и дате создания
-        status_priority = {
-            OrderStatus.NEW: 1,
-            OrderStatus.ASSIGNED: 2,
-            OrderStatus.ACCEPTED: 3,
-            OrderStatus.ONSITE: 4,
-            OrderStatus.DR: 5,
-        }
-
-        sorted_orders = sorted(
-            active_orders,
-            key=lambda x: (status_priority.get(x.status, 99), x.created_at or datetime.min),
-        )
-
-        # Данные по заявкам
-        row = 5
-        for order in sorted_orders:
+        # Данные по заявкам (уже отсортированы по статусу и дате создания)
+        row_styles = [DATA_CENTER_STYLE] * 2 + [DATA_LEFT_STYLE] * 9
+        for order in active_orders:
             status_name = OrderStatus.get_status_name(order.status)
             status_emoji = OrderStatus.get_status_emoji(order.status)
 
-            # Форматируем дату создания
-            created_str = ""
-            if order.created_at:
-                if isinstance(order.created_at, str):
-                    try:
-                        created_dt = datetime.fromisoformat(order.created_at.replace("Z", "+00:00"))
-                        created_str = created_dt.strftime("%d.%m.%Y %H:%M")
-                    except Exception:
-                        created_str = order.created_at
-                else:
-                    created_str = order.created_at.strftime("%d.%m.%Y %H:%M")
-
-            data = [
-                order.id,
-                f"{status_emoji} {status_name}",
-                order.equipment_type or "",
-                order.description or "",
-                order.client_name or "",
-                order.client_address or "",
-                order.client_phone or "",
-                order.master_name or "Не назначен",
-                order.dispatcher_name or "",
-                order.scheduled_time if order.scheduled_time else "",
-                created_str,
-            ]
-
-            for col_idx, value in enumerate(data, start=1):
-                cell = ws.cell(row=row, column=col_idx, value=value)
-                cell.font = data_font
-                cell.border = thin_border
-                cell.alignment = left_alignment if col_idx not in [1, 2] else center_alignment
-
-            row += 1
-
-        # Устанавливаем ширину столбцов
-        column_widths = {
-            "A": 10,  # № Заявки
-            "B": 18,  # Статус
-            "C": 20,  # Оборудование
-            "D": 30,  # Описание
-            "E": 20,  # Клиент
-            "F": 30,  # Адрес
-            "G": 15,  # Телефон
-            "H": 20,  # Мастер
-            "I": 20,  # Диспетчер
-            "J": 20,  # Время прибытия
-            "K": 18,  # Создана
-        }
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
-
-    async def _create_master_sheet(self, ws, master, orders: list):
+            ws.append(
+                [
+                    order.id,
+                    f"{status_emoji} {status_name}",
+                    order.equipment_type or "",
+                    order.description or "",
+                    order.client_name or "",
+                    order.client_address or "",
+                    order.client_phone or "",
+                    order.master_name or "Не назначен",
+                    order.dispatcher_name or "",
+                    order.scheduled_time if order.scheduled_time else "",
+                    self._format_created(order),
+                ],
+                row_styles,
+            )
+
+    def _create_master_sheet(self, ws: StreamingSheet, master, orders: list) -> None:
         """Создание листа для конкретного мастера"""
-        # Стили
-        header_font = Font(bold=True, size=12, color="FFFFFF")
-        header_fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-        data_font = Font(size=10)
-
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        left_alignment = Alignment(horizontal="left", vertical="center")
-
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+        # Устанавливаем ширину столбцов (до записи строк)
+        ws.set_widths(
+            {
+                "A": 12,
+                "B": 18,
+                "C": 20,
+                "D": 20,
+                "E": 30,
+                "F": 20,
+                "G": 18,
+            }
         )
 
-        # Заголовок
-        # A1: "Активные заказы мастера:"
-        cell_a1 = ws.cell(row=1, column=1)
-        cell_a1.value = "Активные заказы мастера:"
-        cell_a1.font = header_font
-        cell_a1.fill = header_fill
-        cell_a1.alignment = center_alignment
-
-        # B1: имя мастера
-        cell_b1 = ws.cell(row=1, column=2)
-        cell_b1.value = master.get_display_name()
-        cell_b1.font = header_font
-        cell_b1.fill = header_fill
-        cell_b1.alignment = center_alignment
-
-        ws.row_dimensions[1].height = 25
-        # Растягиваем заголовок на остальные столбцы
-        for col in range(3, 8):  # C1:G1
-            ws.cell(row=1, column=col).fill = header_fill
+        # Заголовок: "Активные заказы мастера:" и имя мастера,
+        # заливка растянута на остальные столбцы (C1:G1)
+        ws.append(
+            ["Активные заказы мастера:", master.get_display_name()] + [None] * 5,
+            [MASTER_HEADER_STYLE] * 2 + [MASTER_FILL_STYLE] * 5,
+            height=25,
+        )
+        ws.skip()
 
         # Заголовки столбцов (упрощенная структура для мастера)
         headers = [
@@ -289,58 +293,23 @@ class ActiveOrdersExportService:
             "Время прибытия",
             "Создана",
         ]
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=3, column=col_idx, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_alignment
-            cell.border = thin_border
+        ws.append(headers, MASTER_TABLE_HEADER_STYLE)
 
         # Данные по заказам
-        row = 4
+        row_styles = [DATA_CENTER_STYLE] * 2 + [DATA_LEFT_STYLE] * 5
         for order in orders:
             status_name = OrderStatus.get_status_name(order.status)
             status_emoji = OrderStatus.get_status_emoji(order.status)
 
-            # Форматируем дату создания
-            created_str = ""
-            if order.created_at:
-                if isinstance(order.created_at, str):
-                    try:
-                        created_dt = datetime.fromisoformat(order.created_at.replace("Z", "+00:00"))
-                        created_str = created_dt.strftime("%d.%m.%Y %H:%M")
-                    except Exception:
-                        created_str = order.created_at
-                else:
-                    created_str = order.created_at.strftime("%d.%m.%Y %H:%M")
-
-            data = [
-                order.id,
-                f"{status_emoji} {status_name}",
-                order.equipment_type or "",
-                order.client_name or "",
-                order.client_address or "",
-                order.scheduled_time if order.scheduled_time else "",
-                created_str,
-            ]
-
-            for col_idx, value in enumerate(data, start=1):
-                cell = ws.cell(row=row, column=col_idx, value=value)
-                cell.font = data_font
-                cell.border = thin_border
-                cell.alignment = left_alignment if col_idx not in [1, 2] else center_alignment
-
-            row += 1
-
-        # Устанавливаем ширину столбцов
-        column_widths: dict[str, int] = {
-            "A": 12,
-            "B": 18,
-            "C": 20,
-            "D": 20,
-            "E": 30,
-            "F": 20,
-            "G": 18,
-        }
-        for col_letter, width in column_widths.items():
-            ws.column_dimensions[col_letter].width = width
+            ws.append(
+                [
+                    order.id,
+                    f"{status_emoji} {status_name}",
+                    order.equipment_type or "",
+                    order.client_name or "",
+                    order.client_address or "",
+                    order.scheduled_time if order.scheduled_time else "",
+                    self._format_created(order),
+                ],
+                row_styles,
+            )
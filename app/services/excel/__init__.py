@@ -1,10 +1,13 @@
 """Excel utilities package"""
 
 from app.services.excel.formatter import ExcelFormatter
+from app.services.excel.streaming import StreamingSheet, StreamingWorkbook
 from app.services.excel.styles import ExcelStyles
 
 
 __all__ = [
     "ExcelFormatter",
     "ExcelStyles",
+    "StreamingSheet",
+    "StreamingWorkbook",
 ]
@@ -0,0 +1,226 @@
+"""
+Потоковая запись Excel-отчетов (write-only режим openpyxl)
+
+Обычный Workbook держит в памяти объект каждой ячейки вместе с ее стилями,
+поэтому большой отчет (закрытые заявки за год) занимает сотни мегабайт.
+В write-only режиме строка сериализуется во временный файл сразу при append,
+а стили регистрируются один раз как именованные (NamedStyle) и назначаются
+ячейкам по имени.
+
+Ограничения write-only листа: ячейки пишутся строго сверху вниз, ширины
+столбцов и высоты строк задаются до записи соответствующих строк,
+объединения ячеек - в любой момент до сохранения.
+"""
+
+from collections.abc import Mapping, Sequence
+from copy import copy
+from pathlib import Path
+from typing import Any
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+from app.services.excel.styles import ExcelStyles
+
+
+# Денежный формат отчетов
+MONEY_FORMAT = "#,##0.00 ₽"
+
+# Имена стилей для StreamingSheet.append
+TITLE_STYLE = "stream_title"
+SUBTITLE_STYLE = "stream_subtitle"
+TABLE_HEADER_STYLE = "stream_table_header"
+ID_STYLE = "stream_id"
+TEXT_STYLE = "stream_text"
+MONEY_STYLE = "stream_money"
+NOTE_STYLE = "stream_note"
+TOTAL_LABEL_STYLE = "stream_total_label"
+TOTAL_MONEY_STYLE = "stream_total_money"
+
+
+def _named_style(name: str, number_format: str | None = None, **attrs: Any) -> NamedStyle:
+    """
+    Создание именованного стиля из стилей ExcelStyles
+
+    Args:
+        name: Имя стиля
+        number_format: Формат чисел
+        **attrs: font, fill, alignment, border
+
+    Returns:
+        NamedStyle
+    """
+    style = NamedStyle(name=name)
+    for attr, value in attrs.items():
+        # Копия: NamedStyle привязывается к книге
+        setattr(style, attr, copy(value))
+    if number_format:
+        style.number_format = number_format
+    return style
+
+
+def build_named_styles() -> list[NamedStyle]:
+    """
+    Набор именованных стилей потоковых отчетов
+
+    Returns:
+        Новые экземпляры NamedStyle (по одному набору на книгу)
+    """
+    return [
+        _named_style(
+            TITLE_STYLE,
+            font=ExcelStyles.HEADER_FONT,
+            fill=ExcelStyles.HEADER_FILL,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+        ),
+        _named_style(
+            SUBTITLE_STYLE,
+            font=ExcelStyles.BOLD_FONT,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+        ),
+        _named_style(
+            TABLE_HEADER_STYLE,
+            font=ExcelStyles.TABLE_HEADER_FONT,
+            fill=ExcelStyles.TABLE_HEADER_FILL,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        ),
+        _named_style(
+            ID_STYLE,
+            font=ExcelStyles.SIMPLE_BOLD_FONT,
+            alignment=ExcelStyles.CENTER_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        ),
+        _named_style(
+            TEXT_STYLE,
+            alignment=ExcelStyles.LEFT_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        ),
+        _named_style(
+            MONEY_STYLE,
+            number_format=MONEY_FORMAT,
+            alignment=ExcelStyles.RIGHT_ALIGNMENT,
+            border=ExcelStyles.THIN_BORDER,
+        ),
+        _named_style(NOTE_STYLE, font=ExcelStyles.SIMPLE_ITALIC_FONT),
+        _named_style(TOTAL_LABEL_STYLE, font=ExcelStyles.BOLD_FONT),
+        _named_style(
+            TOTAL_MONEY_STYLE,
+            number_format=MONEY_FORMAT,
+            font=ExcelStyles.BOLD_FONT,
+            fill=ExcelStyles.HIGHLIGHT_FILL,
+        ),
+    ]
+
+
+class StreamingSheet:
+    """Лист, который заполняется построчно сверху вниз"""
+
+    def __init__(self, ws: WriteOnlyWorksheet):
+        self.ws = ws
+        self.row = 0
+
+    def set_widths(self, widths: Mapping[str, float]) -> None:
+        """
+        Ширина столбцов (до записи первой строки)
+
+        Args:
+            widths: {буква столбца: ширина}
+        """
+        for col_letter, width in widths.items():
+            self.ws.column_dimensions[col_letter].width = width
+
+    def append(
+        self,
+        values: Sequence[Any],
+        styles: str | Sequence[str | None] | None = None,
+        height: float | None = None,
+    ) -> int:
+        """
+        Запись строки
+
+        Args:
+            values: Значения ячеек начиная со столбца A
+            styles: Имя стиля для всех ячеек или список стилей по столбцам
+            height: Высота строки
+
+        Returns:
+            Номер записанной строки
+        """
+        row_number = self.row + 1
+        if height is not None:
+            self.ws.row_dimensions[row_number].height = height
+
+        cells: list[Any] = []
+        for col_idx, value in enumerate(values):
+            style = styles if styles is None or isinstance(styles, str) else styles[col_idx]
+            if style is None:
+                cells.append(value)
+                continue
+            cell = WriteOnlyCell(self.ws, value=value)
+            cell.style = style
+            cells.append(cell)
+
+        self.ws.append(cells)
+        self.row = row_number
+        return row_number
+
+    def skip(self, count: int = 1) -> None:
+        """Пустые строки"""
+        for _ in range(count):
+            self.ws.append([])
+        self.row += count
+
+    def merge(self, first_col: str, last_col: str, row: int | None = None) -> None:
+        """
+        Объединение ячеек в строке
+
+        Args:
+            first_col: Первый столбец
+            last_col: Последний столбец
+            row: Номер строки (по умолчанию последняя записанная)
+        """
+        row = row or self.row
+        self.ws.merged_cells.add(f"{first_col}{row}:{last_col}{row}")
+
+
+class StreamingWorkbook:
+    """Книга в write-only режиме с зарегистрированными стилями"""
+
+    def __init__(self) -> None:
+        self.wb = Workbook(write_only=True)
+        for style in build_named_styles():
+            self.wb.add_named_style(style)
+
+    def add_style(self, name: str, number_format: str | None = None, **attrs: Any) -> str:
+        """
+        Регистрация дополнительного именованного стиля отчета
+
+        Args:
+            name: Имя стиля
+            number_format: Формат чисел
+            **attrs: font, fill, alignment, border
+
+        Returns:
+            Имя стиля (для StreamingSheet.append)
+        """
+        self.wb.add_named_style(_named_style(name, number_format, **attrs))
+        return name
+
+    def create_sheet(self, title: str) -> StreamingSheet:
+        """
+        Создание листа
+
+        Args:
+            title: Название листа
+
+        Returns:
+            StreamingSheet
+        """
+        return StreamingSheet(self.wb.create_sheet(title))
+
+    def save(self, filepath: str | Path) -> None:
+        """Сохранение книги (книгу после сохранения использовать нельзя)"""
+        self.wb.save(filepath)
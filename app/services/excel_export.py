@@ -3,22 +3,34 @@
 """
 
 import logging
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import aiosqlite
 from openpyxl import Workbook
-from sqlalchemy import and_, case, func, select
+from sqlalchemy import DateTime, and_, bindparam, case, func, select, text
 from sqlalchemy.orm import joinedload
 
 from app.config import OrderStatus
 from app.database import DatabaseType, get_database
 from app.database.orm_models import Master, Order
 from app.repositories.order_repository_extended import OrderRepositoryExtended
+from app.services.excel.streaming import (
+    ID_STYLE,
+    MONEY_STYLE,
+    NOTE_STYLE,
+    SUBTITLE_STYLE,
+    TABLE_HEADER_STYLE,
+    TEXT_STYLE,
+    TITLE_STYLE,
+    TOTAL_LABEL_STYLE,
+    TOTAL_MONEY_STYLE,
+    StreamingWorkbook,
+)
 from app.services.excel.styles import ExcelStyles
-from app.utils.helpers import get_now
+from app.utils.helpers import get_now, to_db_timestamp
 
 
 if TYPE_CHECKING:
@@ -27,6 +39,22 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Закрытые заявки за период для export_closed_orders_to_excel
+CLOSED_ORDERS_EXPORT_SQL = """
+    SELECT
+        o.id, o.equipment_type, o.client_name, o.created_at, o.closed_at,
+        o.total_amount, o.master_profit, o.company_profit,
+        o.out_of_city, o.has_review,
+        u.first_name || ' ' || COALESCE(u.last_name, '') as master_name
+    FROM orders o
+    LEFT JOIN masters m ON o.assigned_master_id = m.id
+    LEFT JOIN users u ON m.telegram_id = u.telegram_id
+    WHERE o.status = 'CLOSED'
+        AND o.closed_at >= :start_date
+        AND o.deleted_at IS NULL
+    ORDER BY o.closed_at DESC
+"""
+
 
 def _get_status_display_text(status: str, assigned_master_id: int | None = None) -> str:
     """
@@ -59,6 +87,26 @@ def _get_status_display_text(status: str, assigned_master_id: int | None = None)
     return status_names.get(status, status)
 
 
+def _format_export_datetime(value: Any) -> str:
+    """
+    Форматирование даты из строки БД для отчета
+
+    Args:
+        value: Дата в ISO-формате (строка из SQLite) или datetime
+
+    Returns:
+        Дата в формате ДД.ММ.ГГГГ ЧЧ:ММ или пустая строка
+    """
+    if not value:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y %H:%M")
+    try:
+        return datetime.fromisoformat(value).strftime("%d.%m.%Y %H:%M")
+    except (TypeError, ValueError):
+        return str(value)[:16]
+
+
 class ExcelExportService:
     """Сервис для экспорта отчетов в Excel"""
 
@@ -95,8 +143,7 @@ class ExcelExportService:
     async def _get_extended_repo(self) -> OrderRepositoryExtended:
         """Получить расширенный репозиторий"""
         if self._order_repo_extended is None:
-            connection = self._get_connection()
-            self._order_repo_extended = OrderRepositoryExtended(connection)
+            self._order_repo_extended = self._get_legacy_db().repository(OrderRepositoryExtended)
         return self._order_repo_extended
 
     async def export_report_to_excel(self, report_id: int) -> str | None:
@@ -945,10 +992,47 @@ class ExcelExportService:
             for col_letter, width in widths.items():
                 ws.column_dimensions[col_letter].width = width
 
+    async def _iter_closed_orders(self, start_date: datetime) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Закрытые заявки за период по одной строке
+
+        Строки читаются курсором по мере записи в отчет, вся выборка
+        в память не загружается.
+
+        Args:
+            start_date: Начало периода (по closed_at)
+
+        Yields:
+            Строка заявки с именем мастера
+        """
+        if self._is_orm_database():
+            from app.database.orm_database import ORMDatabase
+
+            if not isinstance(self.db, ORMDatabase):
+                raise RuntimeError("Expected ORMDatabase but got different type")
+
+            query = text(CLOSED_ORDERS_EXPORT_SQL).bindparams(
+                bindparam("start_date", type_=DateTime)
+            )
+            async with self.db.get_session() as session:
+                result = await session.stream(query, {"start_date": start_date})
+                async for row in result.mappings():
+                    yield row
+        else:
+            connection = self._get_connection()
+            async with connection.execute(
+                CLOSED_ORDERS_EXPORT_SQL, {"start_date": to_db_timestamp(start_date)}
+            ) as cursor:
+                async for row in cursor:
+                    yield row
+
     async def export_closed_orders_to_excel(self, period_days: int = 30) -> str | None:
         """
         Экспорт закрытых заказов в Excel (обновляет существующий файл)
 
+        Отчет пишется потоково (StreamingWorkbook): строки заявок читаются
+        курсором и сразу сериализуются, итоги считаются по ходу записи.
+
         Args:
             period_days: За сколько дней показывать заказы
 
@@ -966,42 +1050,40 @@ class ExcelExportService:
                 logger.warning(f"Слишком большой период для закрытых заказов: {period_days} дней")
 
             # Имя файла
-            connection = self._get_connection()
             reports_dir = Path("reports")
             reports_dir.mkdir(exist_ok=True)
             filepath = reports_dir / "closed_orders.xlsx"
 
             # Создаем новый workbook (перезаписываем файл)
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Закрытые заказы"
-
-            # Стили из ExcelStyles
-            header_font = ExcelStyles.HEADER_FONT
-            header_fill = ExcelStyles.HEADER_FILL
-            center_alignment = ExcelStyles.CENTER_ALIGNMENT
-            left_alignment = ExcelStyles.LEFT_ALIGNMENT
-            right_alignment = ExcelStyles.RIGHT_ALIGNMENT
-            thin_border = ExcelStyles.THIN_BORDER
+            wb = StreamingWorkbook()
+            ws = wb.create_sheet("Закрытые заказы")
+
+            # Ширина столбцов (в write-only режиме задается до записи строк)
+            ws.set_widths(
+                {
+                    "A": 12,  # ID - соответствует документации (6-12)
+                    "B": 25,
+                    "C": 20,
+                    "D": 20,
+                    "E": 18,
+                    "F": 18,
+                    "G": 15,
+                    "H": 18,
+                    "I": 18,
+                    "J": 22,
+                }
+            )
 
             # Заголовок
-            row = 1
-            ws.merge_cells(f"A{row}:K{row}")
-            cell = ws[f"A{row}"]
-            cell.value = f"ЗАКРЫТЫЕ ЗАКАЗЫ (за {period_days} дней)"
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_alignment
-            ws.row_dimensions[row].height = ExcelStyles.HEADER_ROW_HEIGHT
-
-            row += 1
-            ws.merge_cells(f"A{row}:K{row}")
-            cell = ws[f"A{row}"]
-            cell.value = f"Обновлено: {get_now().strftime('%d.%m.%Y %H:%M')}"
-            cell.font = ExcelStyles.BOLD_FONT
-            cell.alignment = center_alignment
-
-            row += 2
+            ws.append(
+                [f"ЗАКРЫТЫЕ ЗАКАЗЫ (за {period_days} дней)"],
+                TITLE_STYLE,
+                height=ExcelStyles.HEADER_ROW_HEIGHT,
+            )
+            ws.merge("A", "K")
+            ws.append([f"Обновлено: {get_now().strftime('%d.%m.%Y %H:%M')}"], SUBTITLE_STYLE)
+            ws.merge("A", "K")
+            ws.skip()
 
             # Заголовки колонок
             headers = [
@@ -1016,144 +1098,72 @@ class ExcelExportService:
                 "Прибыль компании",
                 "Доп. инфо",
             ]
+            ws.append(headers, TABLE_HEADER_STYLE)
 
-            for col_idx, header in enumerate(headers, start=1):
-                cell = ws.cell(row=row, column=col_idx, value=header)
-                cell.font = ExcelStyles.TABLE_HEADER_FONT
-                cell.fill = ExcelStyles.TABLE_HEADER_FILL
-                cell.alignment = center_alignment
-                cell.border = thin_border
-
-            row += 1
+            row_styles = [ID_STYLE] + [TEXT_STYLE] * 5 + [MONEY_STYLE] * 3 + [TEXT_STYLE]
 
             # Получаем закрытые заказы
             from datetime import timedelta
 
             start_date = get_now() - timedelta(days=period_days)
 
-            cursor = await connection.execute(
-                """
-                SELECT
-                    o.id, o.equipment_type, o.client_name, o.created_at, o.updated_at,
-                    o.total_amount, o.materials_cost, o.master_profit, o.company_profit,
-                    o.out_of_city, o.has_review,
-                    u.first_name || ' ' || COALESCE(u.last_name, '') as master_name
-                FROM orders o
-                LEFT JOIN masters m ON o.assigned_master_id = m.id
-                LEFT JOIN users u ON m.telegram_id = u.telegram_id
-                WHERE o.status = 'CLOSED'
-                    AND o.updated_at >= ?
-                    AND o.deleted_at IS NULL
-                ORDER BY o.updated_at DESC
-                """,
-                (start_date.isoformat(),),
-            )
-
-            orders = await cursor.fetchall()
+            orders_count = 0
+            total_sum = 0.0
+            total_master_profit = 0.0
+            total_company_profit = 0.0
 
-            if not orders:
-                ws[f"A{row}"] = "Нет закрытых заказов за этот период"
-                ws[f"A{row}"].font = ExcelStyles.SIMPLE_ITALIC_FONT
-                ws.merge_cells(f"A{row}:J{row}")
-            else:
-                # Выводим заказы
-                for order in orders:
-                    additional_info = []
-                    if order["out_of_city"]:
-                        additional_info.append("Выезд")
-                    if order["has_review"]:
-                        additional_info.append("Отзыв")
+            async for order in self._iter_closed_orders(start_date):
+                additional_info = []
+                if order["out_of_city"]:
+                    additional_info.append("Выезд")
+                if order["has_review"]:
+                    additional_info.append("Отзыв")
 
-                    # Безопасное форматирование дат
-                    created_at = ""
-                    updated_at = ""
-                    if order["created_at"]:
-                        try:
-                            dt = datetime.fromisoformat(order["created_at"])
-                            if dt.tzinfo is not None:
-                                dt = dt.replace(tzinfo=None)
-                            created_at = dt.strftime("%d.%m.%Y %H:%M")
-                        except Exception:
-                            created_at = str(order["created_at"])[:16]
-                    if order["updated_at"]:
-                        try:
-                            dt = datetime.fromisoformat(order["updated_at"])
-                            if dt.tzinfo is not None:
-                                dt = dt.replace(tzinfo=None)
-                            updated_at = dt.strftime("%d.%m.%Y %H:%M")
-                        except Exception:
-                            updated_at = str(order["updated_at"])[:16]
+                amount = float(order["total_amount"] or 0)
+                master_profit = float(order["master_profit"] or 0)
+                company_profit = float(order["company_profit"] or 0)
 
-                    data = [
+                ws.append(
+                    [
                         order["id"],
                         order["equipment_type"],
                         order["client_name"],
                         order["master_name"] or "Не назначен",
-                        created_at,
-                        updated_at,
-                        float(order["total_amount"] or 0),
-                        float(order["master_profit"] or 0),
-                        float(order["company_profit"] or 0),
+                        _format_export_datetime(order["created_at"]),
+                        _format_export_datetime(order["closed_at"]),
+                        amount,
+                        master_profit,
+                        company_profit,
                         ", ".join(additional_info) if additional_info else "-",
-                    ]
-
-                    for col_idx, value in enumerate(data, start=1):
-                        cell = ws.cell(row=row, column=col_idx, value=value)
-                        cell.border = thin_border
-
-                        if col_idx == 1:
-                            cell.alignment = center_alignment
-                            cell.font = ExcelStyles.SIMPLE_BOLD_FONT
-                        elif col_idx in [2, 3, 4, 5, 6, 10]:
-                            cell.alignment = left_alignment
-                        else:
-                            cell.alignment = right_alignment
-                            if col_idx >= 7 and col_idx <= 9:
-                                cell.number_format = "#,##0.00 ₽"
-
-                    row += 1
-
-                # Итоги
-                row += 1
-                ws[f"A{row}"] = "ИТОГО:"
-                ws[f"A{row}"].font = ExcelStyles.BOLD_FONT
+                    ],
+                    row_styles,
+                )
 
-                total_sum = sum(float(o["total_amount"] or 0) for o in orders)
-                total_materials = sum(float(o["materials_cost"] or 0) for o in orders)
-                total_master_profit = sum(float(o["master_profit"] or 0) for o in orders)
-                total_company_profit = sum(float(o["company_profit"] or 0) for o in orders)
+                orders_count += 1
+                total_sum += amount
+                total_master_profit += master_profit
+                total_company_profit += company_profit
 
-                for col, val in [
-                    (f"G{row}", total_sum),
-                    (f"H{row}", total_materials),
-                    (f"I{row}", total_master_profit),
-                    (f"J{row}", total_company_profit),
-                ]:
-                    cell = ws[col]
-                    cell.value = val
-                    cell.font = ExcelStyles.BOLD_FONT
-                    cell.number_format = "#,##0.00 ₽"
-                    cell.fill = ExcelStyles.HIGHLIGHT_FILL
-
-            # Ширина столбцов
-            widths: dict[str, int] = {
-                "A": 12,  # ID - соответствует документации (6-12)
-                "B": 25,
-                "C": 20,
-                "D": 20,
-                "E": 18,
-                "F": 18,
-                "G": 15,
-                "H": 18,
-                "I": 18,
-                "J": 22,
-            }
-            for col_letter, width in widths.items():
-                ws.column_dimensions[col_letter].width = width
+            if not orders_count:
+                ws.append(["Нет закрытых заказов за этот период"], NOTE_STYLE)
+                ws.merge("A", "J")
+            else:
+                # Итоги (под соответствующими столбцами)
+                ws.skip()
+                ws.append(
+                    [
+                        "ИТОГО:",
+                        *([None] * 5),
+                        total_sum,
+                        total_master_profit,
+                        total_company_profit,
+                    ],
+                    [TOTAL_LABEL_STYLE, *([None] * 5), *([TOTAL_MONEY_STYLE] * 3)],
+                )
 
             # Сохраняем файл
             wb.save(filepath)
-            logger.info(f"Closed orders Excel saved: {filepath}")
+            logger.info(f"Closed orders Excel saved: {filepath} ({orders_count} orders)")
 
             return str(filepath)
 
@@ -2202,19 +2212,19 @@ class ExcelExportService:
         cursor = await connection.execute(
             """
             SELECT
-                o.id, o.equipment_type, o.client_name, o.created_at, o.updated_at,
+                o.id, o.equipment_type, o.client_name, o.created_at, o.closed_at,
                 o.total_amount, o.materials_cost, o.master_profit, o.company_profit,
                 o.out_of_city, o.has_review,
                 m.first_name || ' ' || m.last_name as master_name
             FROM orders o
             LEFT JOIN masters m ON o.assigned_master_id = m.id
             WHERE o.status = 'CLOSED'
-                AND o.updated_at >= ?
-                AND o.updated_at <= ?
+                AND o.closed_at >= ?
+                AND o.closed_at <= ?
                 AND o.deleted_at IS NULL
-            ORDER BY o.updated_at DESC
+            ORDER BY o.closed_at DESC
             """,
-            (report.period_start.isoformat(), report.period_end.isoformat()),
+            (to_db_timestamp(report.period_start), to_db_timestamp(report.period_end)),
         )
 
         orders = await cursor.fetchall()
@@ -2239,7 +2249,7 @@ class ExcelExportService:
                     order["client_name"],
                     order["master_name"] or "Не назначен",
                     order["created_at"][:16] if order["created_at"] else "",
-                    order["updated_at"][:16] if order["updated_at"] else "",
+                    order["closed_at"][:16] if order["closed_at"] else "",
                     float(order["total_amount"] or 0),
                     float(order["master_profit"] or 0),
                     float(order["company_profit"] or 0),
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from app.database import DatabaseType, get_database
-from app.database.models import FinancialReport, MasterFinancialReport, Order
+from app.database.models import FinancialReport
 from app.utils.helpers import get_now
 
 
@@ -118,29 +118,17 @@ class FinancialReportsService:
         try:
             legacy_db = self._get_legacy_db()
 
-            # Получаем все завершенные заказы за период
-            orders = await legacy_db.get_orders_by_period(period_start, period_end, status="CLOSED")
-
-            if not orders:
-                # Создаем пустой отчет
-                report = FinancialReport(
-                    report_type=report_type,
-                    period_start=period_start,
-                    period_end=period_end,
-                    created_at=get_now(),
-                )
-                legacy_db = self._get_legacy_db()
-                report.id = await legacy_db.create_financial_report(report)
-                return report
-
-            # Подсчитываем общие показатели
-            total_orders = len(orders)
+            # Итоги завершенных заказов за период по мастерам - один GROUP BY в БД
+            master_totals = await legacy_db.get_financial_totals_by_master(period_start, period_end)
+
+            # Общие показатели складываются из строк мастеров (включая заказы без мастера)
+            total_orders = sum(totals.orders_count for totals in master_totals)
             # total_amount уже включает расходный материал (как хранится в БД)
-            total_amount = sum(order.total_amount or 0 for order in orders)
-            total_materials_cost = sum(order.materials_cost or 0 for order in orders)
+            total_amount = sum(totals.total_amount for totals in master_totals)
+            total_materials_cost = sum(totals.total_materials_cost for totals in master_totals)
             total_net_profit = total_amount - total_materials_cost
-            total_company_profit = sum(order.company_profit or 0 for order in orders)
-            total_master_profit = sum(order.master_profit or 0 for order in orders)
+            total_company_profit = sum(totals.total_company_profit for totals in master_totals)
+            total_master_profit = sum(totals.total_master_profit for totals in master_totals)
             average_check = total_amount / total_orders if total_orders > 0 else 0
 
             # Создаем основной отчет
@@ -158,71 +146,15 @@ class FinancialReportsService:
                 created_at=get_now(),
             )
 
-            # Сохраняем отчет в базу (legacy)
-            report.id = await legacy_db.create_financial_report(report)
-
-            # Генерируем отчеты по мастерам
-            await self._generate_master_reports(report.id, orders)
+            # Отчет и отчеты по мастерам сохраняются одной транзакцией (legacy)
+            master_reports = [totals for totals in master_totals if totals.master_id is not None]
+            report.id = await legacy_db.create_financial_report(report, master_reports)
 
             return report
 
         finally:
             await self.db.disconnect()
 
-    async def _generate_master_reports(self, report_id: int, orders: list[Order]):
-        """
-        Генерация отчетов по мастерам
-
-        Args:
-            report_id: ID основного отчета
-            orders: Список заказов
-        """
-        # Группируем заказы по мастерам
-        masters_orders: dict[int, list[Order]] = {}
-        for order in orders:
-            if order.assigned_master_id:
-                if order.assigned_master_id not in masters_orders:
-                    masters_orders[order.assigned_master_id] = []
-                masters_orders[order.assigned_master_id].append(order)
-
-        # Создаем отчеты для каждого мастера
-        for master_id, master_orders in masters_orders.items():
-            # Получаем информацию о мастере
-            legacy_db = self._get_legacy_db()
-            master = await legacy_db.get_master_by_id(master_id)
-            if not master:
-                continue
-
-            # Подсчитываем показатели мастера
-            orders_count = len(master_orders)
-            # total_amount уже включает расходный материал (как хранится в БД)
-            total_amount = sum(order.total_amount or 0 for order in master_orders)
-            total_materials_cost = sum(order.materials_cost or 0 for order in master_orders)
-            total_net_profit = total_amount - total_materials_cost
-            total_company_profit = sum(order.company_profit or 0 for order in master_orders)
-            total_master_profit = sum(order.master_profit or 0 for order in master_orders)
-            average_check = total_amount / orders_count if orders_count > 0 else 0
-            reviews_count = sum(1 for order in master_orders if order.has_review is True)
-            out_of_city_count = sum(1 for order in master_orders if order.out_of_city is True)
-
-            # Создаем отчет по мастеру
-            master_report = MasterFinancialReport(
-                report_id=report_id,
-                master_id=master_id,
-                master_name=master.get_display_name(),
-                orders_count=orders_count,
-                total_amount=total_amount,
-                total_materials_cost=total_materials_cost,
-                total_net_profit=total_net_profit,
-                total_master_profit=total_master_profit,
-                total_company_profit=total_company_profit,
-                average_check=average_check,
-                reviews_count=reviews_count,
-                out_of_city_count=out_of_city_count,
-            )
-
-            await legacy_db.create_master_financial_report(master_report)
-
     async def get_report_summary(self, report_id: int) -> dict[str, Any]:
         """
         Получение сводки отчета
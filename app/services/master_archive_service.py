@@ -261,30 +261,29 @@ class MasterArchiveService:
                     await session.commit()
             else:
                 # Legacy база данных (SQLite)
-                connection = self._get_connection()
-                await connection.execute(
+                # Запись идет через очередь писателя общей БД (transaction)
+                async with self._get_legacy_db().transaction() as connection:
+                    await connection.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS master_archives (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            master_id INTEGER NOT NULL,
+                            file_path TEXT NOT NULL,
+                            reason TEXT NOT NULL,
+                            order_count INTEGER NOT NULL,
+                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            FOREIGN KEY (master_id) REFERENCES masters (id)
+                        )
                     """
-                    CREATE TABLE IF NOT EXISTS master_archives (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        master_id INTEGER NOT NULL,
-                        file_path TEXT NOT NULL,
-                        reason TEXT NOT NULL,
-                        order_count INTEGER NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (master_id) REFERENCES masters (id)
                     )
-                """
-                )
-
-                await connection.execute(
-                    """
-                    INSERT INTO master_archives (master_id, file_path, reason, order_count)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (master_id, filepath, reason, order_count),
-                )
 
-                await connection.commit()
+                    await connection.execute(
+                        """
+                        INSERT INTO master_archives (master_id, file_path, reason, order_count)
+                        VALUES (?, ?, ?, ?)
+                    """,
+                        (master_id, filepath, reason, order_count),
+                    )
 
             logger.info(f"Archive info saved for master {master_id}")
 
@@ -3,6 +3,9 @@
 """
 
 import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -10,13 +13,15 @@ from typing import Any
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 
-from app.config import OrderStatus
 from app.database import DatabaseType, get_database
 from app.utils.helpers import MOSCOW_TZ, get_now
 
 
 logger = logging.getLogger(__name__)
 
+# Название сводного листа отчета
+SUMMARY_SHEET_TITLE = "Сводка"
+
 
 def sanitize_sheet_name(name: str, max_length: int = 31) -> str:
     """
@@ -45,11 +50,26 @@ def sanitize_sheet_name(name: str, max_length: int = 31) -> str:
     return clean_name
 
 
+@dataclass(slots=True)
+class DailyReportState:
+    """Последний ежедневный отчет в памяти (для инкрементальных обновлений)"""
+
+    target_date: datetime
+    workbook: Workbook
+    # Закрытые заказы дня по ID
+    orders: dict[int, Any]
+    # Одобренные активные мастера в порядке листов полного отчета
+    masters: dict[int, Any]
+    # Название листа каждого мастера, у которого есть лист
+    sheets: dict[int, str]
+
+
 class MasterReportsService:
     """Сервис для генерации детализированных отчетов по мастерам"""
 
     def __init__(self) -> None:
         self.db: DatabaseType = get_database()
+        self._daily_state: DailyReportState | None = None
 
     async def generate_daily_master_report(self, target_date: datetime) -> str | None:
         """
@@ -129,7 +149,7 @@ class MasterReportsService:
             wb.remove(wb.active)
 
             # Создаем сводный лист
-            summary_sheet = wb.create_sheet("Сводка")
+            summary_sheet = wb.create_sheet(SUMMARY_SHEET_TITLE)
             await self._create_summary_sheet(
                 summary_sheet, orders, period_name, start_date, end_date, report_type
             )
@@ -138,11 +158,14 @@ class MasterReportsService:
             masters = await self.db.get_all_masters(only_approved=True, only_active=True)
 
             # Создаем листы для каждого мастера (только если есть заказы)
+            sheets: dict[int, str] = {}
             for master in masters:
+                if master.id is None:
+                    continue
                 master_orders = [o for o in orders if o.assigned_master_id == master.id]
                 if master_orders:  # Создаем лист только если есть заказы
-                    sheet_name = sanitize_sheet_name(master.get_display_name())
-                    master_sheet = wb.create_sheet(sheet_name)
+                    master_sheet = wb.create_sheet(sanitize_sheet_name(master.get_display_name()))
+                    sheets[master.id] = master_sheet.title
                     await self._create_master_sheet(
                         master_sheet, master, master_orders, report_type
                     )
@@ -160,6 +183,15 @@ class MasterReportsService:
             wb.save(filepath)
             logger.info(f"Master {report_type} report saved: {filepath}")
 
+            if report_type == "daily":
+                self._daily_state = DailyReportState(
+                    target_date=start_date,
+                    workbook=wb,
+                    orders={order.id: order for order in orders},
+                    masters={master.id: master for master in masters if master.id is not None},
+                    sheets=sheets,
+                )
+
             return str(filepath)
 
         except Exception as e:
@@ -169,28 +201,137 @@ class MasterReportsService:
         finally:
             await self.db.disconnect()
 
-    async def _get_closed_orders_in_period(self, start_date: datetime, end_date: datetime) -> list:
-        """Получение закрытых заказов за период"""
+    async def update_daily_master_report(
+        self, report_path: str, target_date: datetime, order_ids: Iterable[int]
+    ) -> bool:
+        """
+        Инкрементальное обновление готового ежедневного отчета
+
+        Отчет дня хранится в памяти после generate_daily_master_report.
+        Из БД читаются только заказы order_ids и закрытые за день заказы
+        затронутых мастеров: текущего и прежнего (если заказ переназначен).
+        Пересоздаются сводный лист и листы этих мастеров, остальные листы
+        не трогаются.
+
+        Args:
+            report_path: Путь к отчету, созданному generate_daily_master_report
+            target_date: Дата отчета (начало дня)
+            order_ids: ID заказов, закрытых с момента последнего обновления
+
+        Returns:
+            True, если отчет обновлен; False - нужна полная перегенерация
+        """
+        state = self._daily_state
+        if state is None or state.target_date != target_date or not os.path.exists(report_path):
+            return False
+
+        order_ids = set(order_ids)
+        end_date = target_date + timedelta(days=1)
+
+        # Прежние мастера заказов (из отчета) и текущие (из БД)
+        affected_master_ids = {
+            state.orders[order_id].assigned_master_id
+            for order_id in order_ids
+            if order_id in state.orders
+        }
+        await self.db.connect()
+        try:
+            changed_orders = await self.db.get_orders_by_ids(order_ids)
+            affected_master_ids.update(order.assigned_master_id for order in changed_orders)
+            if None in affected_master_ids:
+                # Заказы без мастера выбираются только полной перегенерацией
+                return False
+
+            fresh_orders = await self._get_closed_orders_in_period(
+                target_date, end_date, master_ids=affected_master_ids
+            )
+            masters = await self.db.get_masters_by_ids(affected_master_ids)
+        finally:
+            await self.db.disconnect()
+
+        for order_id, order in list(state.orders.items()):
+            if order_id in order_ids or order.assigned_master_id in affected_master_ids:
+                del state.orders[order_id]
+        state.orders.update((order.id, order) for order in fresh_orders)
+        orders = sorted(state.orders.values(), key=lambda o: (o.created_at, o.id), reverse=True)
+        if not orders:
+            return False
+
+        wb = state.workbook
+
+        # Сводный лист зависит от всех заказов дня - пересоздаем на том же месте
+        position = wb.sheetnames.index(SUMMARY_SHEET_TITLE)
+        wb.remove(wb[SUMMARY_SHEET_TITLE])
+        summary_sheet = wb.create_sheet(SUMMARY_SHEET_TITLE, position)
+        await self._create_summary_sheet(
+            summary_sheet, orders, "Ежедневный отчет", target_date, end_date, "daily"
+        )
+
+        for master_id in affected_master_ids:
+            master = masters.get(master_id)
+            # Тот же отбор, что у полного отчета (get_all_masters)
+            if master is not None and master.is_approved and master.is_active:
+                state.masters[master_id] = master
+            else:
+                state.masters.pop(master_id, None)
+
+            master_sheet = self._replace_master_sheet(state, master_id)
+            if master_sheet is not None:
+                master_orders = [o for o in orders if o.assigned_master_id == master_id]
+                await self._create_master_sheet(master_sheet, master, master_orders, "daily")
+
+        # Пишем во временный файл и подменяем: читатели не увидят недописанный отчет
+        tmp_path = f"{report_path}.tmp"
+        wb.save(tmp_path)
+        os.replace(tmp_path, report_path)
+        logger.info(
+            f"Daily master report updated incrementally: {report_path} "
+            f"({len(affected_master_ids)} master sheets)"
+        )
+        return True
+
+    def _replace_master_sheet(self, state: DailyReportState, master_id: int) -> Any | None:
+        """
+        Пустой лист мастера на месте прежнего (или удаление листа)
+
+        Лист остается, только если мастер проходит отбор отчета и у него есть
+        закрытые заказы дня. Новый лист встает после листов мастеров,
+        идущих раньше в порядке полного отчета.
+        """
+        wb = state.workbook
+        old_title = state.sheets.pop(master_id, None)
+        position = None
+        if old_title is not None:
+            position = wb.sheetnames.index(old_title)
+            wb.remove(wb[old_title])
+
+        master = state.masters.get(master_id)
+        has_orders = any(o.assigned_master_id == master_id for o in state.orders.values())
+        if master is None or not has_orders:
+            return None
+
+        if position is None:
+            position = 1
+            for other_id in state.masters:
+                if other_id == master_id:
+                    break
+                if other_id in state.sheets:
+                    position = wb.sheetnames.index(state.sheets[other_id]) + 1
+        sheet = wb.create_sheet(sanitize_sheet_name(master.get_display_name()), position)
+        state.sheets[master_id] = sheet.title
+        return sheet
+
+    async def _get_closed_orders_in_period(
+        self, start_date: datetime, end_date: datetime, master_ids: Iterable[int] | None = None
+    ) -> list:
+        """Получение закрытых заказов за период (master_ids - только этих мастеров)"""
         # Убеждаемся, что даты имеют часовой пояс
         if start_date.tzinfo is None:
             start_date = start_date.replace(tzinfo=MOSCOW_TZ)
         if end_date.tzinfo is None:
             end_date = end_date.replace(tzinfo=MOSCOW_TZ)
 
-        all_orders = await self.db.get_all_orders()
-
-        closed_orders = []
-        for order in all_orders:
-            if order.status == OrderStatus.CLOSED and order.updated_at:
-                # Убеждаемся, что order.updated_at имеет часовой пояс
-                order_updated_at = order.updated_at
-                if order_updated_at.tzinfo is None:
-                    order_updated_at = order_updated_at.replace(tzinfo=MOSCOW_TZ)
-
-                if start_date <= order_updated_at < end_date:
-                    closed_orders.append(order)
-
-        return closed_orders
+        return await self.db.get_closed_orders_in_period(start_date, end_date, master_ids)
 
     async def _create_summary_sheet(
         self,
@@ -4,9 +4,18 @@
 
 import logging
 import re
+import sqlite3
 from typing import TYPE_CHECKING
 
+from sqlalchemy.exc import OperationalError as SQLAlchemyOperationalError
+
 from app.database import Database
+from app.database.address_search import (
+    ADDRESS_FTS_CANDIDATES_SQL,
+    address_search_terms,
+    build_match_expression,
+    rank_by_terms,
+)
 from app.database.models import Order
 
 
@@ -73,9 +82,7 @@ class OrderSearchService:
         logger.info("Найдено заказов по телефону: %s", len(orders))
         return orders
 
-    async def unified_search(  # noqa: PLR0911
-        self, query: str
-    ) -> tuple[list[Order], str]:
+    async def unified_search(self, query: str) -> tuple[list[Order], str]:  # noqa: PLR0911
         """
         Умный поиск по строке запроса с улучшенной логикой определения:
 
@@ -184,7 +191,14 @@ class OrderSearchService:
 
         logger.info(f"Поиск заказов по адресу: {normalized_address}")
 
-        # Выполняем поиск в базе данных
+        # Основной путь: один запрос к FTS5-индексу по всем словам адреса
+        terms = address_search_terms(normalized_address)
+        indexed_orders = await self._search_orders_by_address_indexed(terms)
+        if indexed_orders is not None:
+            logger.info(f"Найдено заказов по адресу (индекс): {len(indexed_orders)}")
+            return indexed_orders
+
+        # Fallback: индекс недоступен или в запросе нет слов длиннее 2 символов
         orders = await self._search_orders_by_address_in_db(normalized_address)
 
         # Если не нашли по полному адресу, пробуем поиск по отдельным словам
@@ -345,6 +359,108 @@ class OrderSearchService:
 
         return normalized
 
+    async def _search_orders_by_address_indexed(self, terms: list[str]) -> list[Order] | None:
+        """
+        Поиск заказов по адресу через FTS5-индекс (app.database.address_search)
+
+        Все слова запроса ищутся одним запросом (OR), кандидаты ранжируются
+        по числу совпавших слов.
+
+        Args:
+            terms: Значимые слова адреса
+
+        Returns:
+            Список найденных заказов или None, если индексом воспользоваться нельзя
+        """
+        match = build_match_expression(terms)
+        if match is None:
+            return None
+
+        from app.database.orm_database import ORMDatabase as ORMDatabaseRuntime
+
+        try:
+            if isinstance(self.db, ORMDatabaseRuntime):
+                if not self.db._is_sqlite:
+                    return None
+                orders = await self._search_orders_by_address_indexed_orm(match)
+            else:
+                orders = await self._search_orders_by_address_indexed_legacy(match)
+        except (sqlite3.OperationalError, SQLAlchemyOperationalError) as e:
+            # Нет таблицы индекса (миграция не применена) или SQLite без FTS5
+            logger.warning(f"Индекс адресов недоступен, поиск через LIKE: {e}")
+            return None
+
+        return rank_by_terms(orders, terms)
+
+    async def _search_orders_by_address_indexed_orm(self, match: str) -> list[Order]:
+        """
+        Поиск кандидатов в FTS5-индексе и загрузка ORM-заказов одним запросом
+
+        Args:
+            match: FTS5 MATCH выражение
+
+        Returns:
+            Заказы в порядке релевантности индекса
+        """
+        from sqlalchemy import Float, Integer, column, select, text
+        from sqlalchemy.orm import joinedload
+
+        from app.database.orm_models import Master
+        from app.database.orm_models import Order as ORMOrder
+
+        session_factory = self.db.session_factory  # type: ignore[union-attr]
+        if session_factory is None:
+            raise RuntimeError("База данных не подключена")
+
+        candidates = (
+            text(ADDRESS_FTS_CANDIDATES_SQL)
+            .bindparams(match=match)
+            .columns(column("rowid", Integer), column("score", Float))
+            .subquery("f")
+        )
+        query = (
+            select(ORMOrder)
+            .join(candidates, candidates.c.rowid == ORMOrder.id)
+            .options(
+                joinedload(ORMOrder.assigned_master).joinedload(Master.user),
+                joinedload(ORMOrder.dispatcher),
+            )
+            .order_by(candidates.c.score, ORMOrder.created_at.desc())
+        )
+
+        async with session_factory() as session:
+            result = await session.execute(query)
+            return [self._from_orm_order(order) for order in result.unique().scalars().all()]
+
+    async def _search_orders_by_address_indexed_legacy(self, match: str) -> list[Order]:
+        """
+        Поиск заказов в FTS5-индексе через legacy Database
+
+        Args:
+            match: FTS5 MATCH выражение
+
+        Returns:
+            Заказы в порядке релевантности индекса
+        """
+        connection = self.db.get_connection()  # type: ignore[union-attr]
+        cursor = await connection.execute(
+            f"""
+            SELECT o.*,
+                   mu.first_name as master_first_name, mu.last_name as master_last_name,
+                   mu.username as master_username,
+                   u.first_name as dispatcher_first_name, u.last_name as dispatcher_last_name,
+                   u.username as dispatcher_username
+            FROM ({ADDRESS_FTS_CANDIDATES_SQL}) f
+            JOIN orders o ON o.id = f.rowid
+            LEFT JOIN masters m ON o.assigned_master_id = m.id
+            LEFT JOIN users mu ON m.telegram_id = mu.telegram_id
+            LEFT JOIN users u ON o.dispatcher_id = u.telegram_id
+            ORDER BY f.score, o.created_at DESC
+            """,  # nosec B608 - подзапрос - константа модуля, значения передаются параметрами
+            {"match": match},
+        )
+        return self._rows_to_orders(await cursor.fetchall())
+
     async def _search_orders_by_address_in_db(self, address: str) -> list[Order]:
         """
         Поиск заказов по адресу в базе данных
@@ -424,18 +540,31 @@ class OrderSearchService:
         cursor = await connection.execute(
             """
             SELECT o.*,
-                   m.first_name as master_first_name, m.last_name as master_last_name, m.username as master_username,
-                   u.first_name as dispatcher_first_name, u.last_name as dispatcher_last_name, u.username as dispatcher_username
+                   mu.first_name as master_first_name, mu.last_name as master_last_name,
+                   mu.username as master_username,
+                   u.first_name as dispatcher_first_name, u.last_name as dispatcher_last_name,
+                   u.username as dispatcher_username
             FROM orders o
             LEFT JOIN masters m ON o.assigned_master_id = m.id
+            LEFT JOIN users mu ON m.telegram_id = mu.telegram_id
             LEFT JOIN users u ON o.dispatcher_id = u.telegram_id
             WHERE LOWER(o.client_address) LIKE ? AND o.deleted_at IS NULL
             ORDER BY o.created_at DESC
             """,
             (f"%{address}%",),
         )
-        rows = await cursor.fetchall()
+        return self._rows_to_orders(await cursor.fetchall())
 
+    def _rows_to_orders(self, rows) -> list[Order]:
+        """
+        Конвертация строк legacy-запроса поиска в dataclass Order
+
+        Args:
+            rows: Строки с полями orders и именами мастера/диспетчера
+
+        Returns:
+            Список заказов
+        """
         orders: list[Order] = []
         for row in rows:
             # Формируем имя мастера
@@ -5,10 +5,10 @@ Parser Analytics Service
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from typing import Any
 
-from sqlalchemy import func, select, and_
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.orm_models import ParserAnalytics
@@ -93,110 +93,137 @@ class ParserAnalyticsService:
                 await session.commit()
                 logger.debug(f"Обновлено подтверждение: message_id={message_id}, confirmed={confirmed}")
 
+    @staticmethod
+    def _counters() -> tuple[Any, ...]:
+        """
+        Агрегатные выражения счетчиков для SELECT
+
+        Returns:
+            total, successful, confirmed, rejected, pending
+        """
+        pa = ParserAnalytics
+        return (
+            func.count(pa.id),
+            func.coalesce(func.sum(case((pa.success.is_(True), 1), else_=0)), 0),
+            func.coalesce(func.sum(case((pa.confirmed.is_(True), 1), else_=0)), 0),
+            func.coalesce(func.sum(case((pa.confirmed.is_(False), 1), else_=0)), 0),
+            func.coalesce(
+                func.sum(case((and_(pa.confirmed.is_(None), pa.success.is_(True)), 1), else_=0)),
+                0,
+            ),
+        )
+
+    @staticmethod
+    async def _breakdown(session: AsyncSession, column, period_filter: list) -> dict[str, int]:
+        """
+        Количество событий по значениям колонки (GROUP BY на стороне БД)
+
+        Args:
+            session: Сессия БД
+            column: Колонка ParserAnalytics для группировки
+            period_filter: Условия фильтра по периоду
+
+        Returns:
+            Словарь {значение: количество}, по убыванию количества
+        """
+        count = func.count(ParserAnalytics.id)
+        query = (
+            select(column, count)
+            .where(column.is_not(None), column != "", *period_filter)
+            .group_by(column)
+            .order_by(count.desc())
+        )
+        result = await session.execute(query)
+        return dict(result.tuples().all())
+
     async def get_stats(self, period_days: int | None = None) -> dict[str, Any]:
         """
         Получить агрегированную статистику парсера.
 
+        Счетчики считаются в БД (COUNT/SUM/AVG и GROUP BY), строки событий
+        в память не загружаются.
+
         Args:
             period_days: Период в днях (None = все время)
 
         Returns:
             Словарь со статистикой
         """
+        period_filter = []
+        if period_days:
+            cutoff_date = get_now() - timedelta(days=period_days)
+            period_filter.append(ParserAnalytics.created_at >= cutoff_date)
+
         async with self.session_factory() as session:
-            # Базовый запрос
-            query = select(ParserAnalytics)
+            query = select(*self._counters(), func.avg(ParserAnalytics.processing_time_ms)).where(
+                *period_filter
+            )
+            result = await session.execute(query)
+            total, successful, confirmed, rejected, pending, avg_processing_ms = result.one()
 
-            # Фильтр по периоду
-            if period_days:
-                cutoff_date = get_now() - timedelta(days=period_days)
-                query = query.where(ParserAnalytics.created_at >= cutoff_date)
+            # Типы ошибок и топ типов техники
+            error_breakdown = await self._breakdown(
+                session, ParserAnalytics.error_type, period_filter
+            )
+            equipment_breakdown = await self._breakdown(
+                session, ParserAnalytics.parsed_equipment_type, period_filter
+            )
 
-            result = await session.execute(query)
-            events = result.scalars().all()
-
-            # Агрегация
-            total = len(events)
-            successful = sum(1 for e in events if e.success)
-            failed = total - successful
-            confirmed = sum(1 for e in events if e.confirmed is True)
-            rejected = sum(1 for e in events if e.confirmed is False)
-            pending = sum(1 for e in events if e.confirmed is None and e.success)
-
-            # Средняя скорость
-            processing_times = [e.processing_time_ms for e in events if e.processing_time_ms is not None]
-            avg_processing_ms = sum(processing_times) / len(processing_times) if processing_times else 0
-
-            # Типы ошибок
-            error_breakdown = {}
-            for event in events:
-                if event.error_type:
-                    error_breakdown[event.error_type] = error_breakdown.get(event.error_type, 0) + 1
-
-            # Топ типов техники
-            equipment_breakdown = {}
-            for event in events:
-                if event.parsed_equipment_type:
-                    equip_type = event.parsed_equipment_type
-                    equipment_breakdown[equip_type] = equipment_breakdown.get(equip_type, 0) + 1
-
-            return {
-                "total_parses": total,
-                "successful_parses": successful,
-                "failed_parses": failed,
-                "success_rate": (successful / total * 100) if total > 0 else 0,
-                "confirmed": confirmed,
-                "rejected": rejected,
-                "pending_confirmation": pending,
-                "confirmation_rate": (confirmed / successful * 100) if successful > 0 else 0,
-                "avg_processing_ms": round(avg_processing_ms, 2),
-                "error_breakdown": error_breakdown,
-                "equipment_breakdown": equipment_breakdown,
-            }
+        failed = total - successful
+        avg_processing_ms = float(avg_processing_ms) if avg_processing_ms is not None else 0
+
+        return {
+            "total_parses": total,
+            "successful_parses": successful,
+            "failed_parses": failed,
+            "success_rate": (successful / total * 100) if total > 0 else 0,
+            "confirmed": confirmed,
+            "rejected": rejected,
+            "pending_confirmation": pending,
+            "confirmation_rate": (confirmed / successful * 100) if successful > 0 else 0,
+            "avg_processing_ms": round(avg_processing_ms, 2),
+            "error_breakdown": error_breakdown,
+            "equipment_breakdown": equipment_breakdown,
+        }
 
     async def get_timeline(self, days: int = 7) -> list[dict[str, Any]]:
         """
         Получить временную линию парсингов.
 
+        Группировка по дням выполняется в БД (GROUP BY date(created_at)).
+
         Args:
             days: Количество дней для анализа
 
         Returns:
             Список с данными по дням
         """
-        async with self.session_factory() as session:
-            cutoff_date = get_now() - timedelta(days=days)
+        cutoff_date = get_now() - timedelta(days=days)
+        day_column = func.date(ParserAnalytics.created_at)
+        total, successful, confirmed, _, _ = self._counters()
 
-            query = select(ParserAnalytics).where(ParserAnalytics.created_at >= cutoff_date)
+        async with self.session_factory() as session:
+            query = (
+                select(day_column, total, successful, confirmed)
+                .where(ParserAnalytics.created_at >= cutoff_date)
+                .group_by(day_column)
+                .order_by(day_column)
+            )
             result = await session.execute(query)
-            events = result.scalars().all()
-
-            # Группировка по дням
-            daily_stats = {}
-            for event in events:
-                day_key = event.created_at.date()
-                if day_key not in daily_stats:
-                    daily_stats[day_key] = {"total": 0, "successful": 0, "failed": 0, "confirmed": 0}
-
-                daily_stats[day_key]["total"] += 1
-                if event.success:
-                    daily_stats[day_key]["successful"] += 1
-                else:
-                    daily_stats[day_key]["failed"] += 1
-                if event.confirmed is True:
-                    daily_stats[day_key]["confirmed"] += 1
-
-            # Преобразование в список
-            timeline = []
-            for day in sorted(daily_stats.keys()):
-                stats = daily_stats[day]
-                timeline.append({
-                    "date": day.strftime("%d.%m.%Y"),
-                    "total": stats["total"],
-                    "successful": stats["successful"],
-                    "failed": stats["failed"],
-                    "confirmed": stats["confirmed"],
-                    "success_rate": (stats["successful"] / stats["total"] * 100) if stats["total"] > 0 else 0,
-                })
-
-            return timeline
+            rows = result.all()
+
+        timeline = []
+        for day, day_total, day_successful, day_confirmed in rows:
+            # SQLite возвращает date() строкой YYYY-MM-DD, PostgreSQL - объектом date
+            if isinstance(day, str):
+                day = date.fromisoformat(day)
+            timeline.append({
+                "date": day.strftime("%d.%m.%Y"),
+                "total": day_total,
+                "successful": day_successful,
+                "failed": day_total - day_successful,
+                "confirmed": day_confirmed,
+                "success_rate": (day_successful / day_total * 100) if day_total > 0 else 0,
+            })
+
+        return timeline
@@ -0,0 +1,274 @@
+"""
+Очередь входящих сообщений парсера заявок
+
+TelethonClient передает каждое сообщение группы в ParserIntegration и ждет,
+пока оно будет полностью обработано (парсинг, проверка дубликатов, аналитика,
+отправка подтверждения). Когда диспетчер вставляет пачку заявок, сообщения
+обрабатываются строго по одному.
+
+ParserIngestionQueue развязывает прием и обработку:
+- сообщения раскладываются по N воркерам по отправителю: сообщения одного
+  отправителя обрабатываются одним воркером в порядке поступления, разные
+  отправители - параллельно;
+- очередь ограничена: при заполнении прием ждет до put_timeout секунд
+  (Telethon не забирает новые обновления - backpressure), затем сообщение
+  отбрасывается и учитывается в метриках;
+- разбор текста (regex, dateparser) выполняется в пуле потоков или процессов
+  (parse_in_executor), event loop бота при этом не блокируется.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from app.services.telegram_parser import OrderParserService, ParseResult
+
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+# Парсер в процессе пула (создается один раз на процесс)
+_process_parser: OrderParserService | None = None
+
+
+def _parse_in_worker_process(text: str, message_id: int) -> ParseResult:
+    """Разбор сообщения в процессе пула"""
+    global _process_parser  # noqa: PLW0603 - кэш парсера на процесс пула
+    if _process_parser is None:
+        _process_parser = OrderParserService()
+    return _process_parser.parse_message(text, message_id)
+
+
+@dataclass(slots=True)
+class IncomingMessage:
+    """Сообщение группы в очереди на обработку"""
+
+    text: str
+    message_id: int
+    sender_id: int | None
+    received_at: float
+
+
+MessageHandler = Callable[[str, int, int | None], Awaitable[None]]
+
+
+class ParserIngestionQueue:
+    """Ограниченная очередь сообщений с пулом воркеров и порядком по отправителю"""
+
+    def __init__(
+        self,
+        handler: MessageHandler,
+        workers: int = 4,
+        maxsize: int = 200,
+        put_timeout: float = 10.0,
+    ):
+        """
+        Инициализация
+
+        Args:
+            handler: Обработчик сообщения (text, message_id, sender_id)
+            workers: Количество воркеров
+            maxsize: Максимум сообщений в очереди (делится между воркерами)
+            put_timeout: Сколько ждать места в очереди, прежде чем отбросить сообщение
+        """
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.maxsize = max(self.workers, maxsize)
+        self.put_timeout = put_timeout
+
+        self._queues: list[asyncio.Queue[IncomingMessage]] = []
+        self._tasks: list[asyncio.Task] = []
+
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.max_depth = 0
+        self._wait_time_total = 0.0
+        self._handle_time_total = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Запуск воркеров (повторный вызов ничего не делает)"""
+        if self._tasks:
+            return
+        shard_size = -(-self.maxsize // self.workers)
+        self._queues = [asyncio.Queue(maxsize=shard_size) for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"parser-ingestion-{index}")
+            for index, queue in enumerate(self._queues)
+        ]
+        logger.info(
+            "Очередь парсера запущена: %d воркеров, до %d сообщений", self.workers, self.maxsize
+        )
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """
+        Остановка воркеров
+
+        Args:
+            drain_timeout: Сколько ждать обработки уже принятых сообщений
+        """
+        if not self._tasks:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)), drain_timeout
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        lost = sum(queue.qsize() for queue in self._queues)
+        if lost:
+            self.dropped += lost
+            logger.warning("Очередь парсера остановлена, не обработано сообщений: %d", lost)
+        self._tasks = []
+        self._queues = []
+
+    def _queue_for(self, sender_id: int | None) -> asyncio.Queue[IncomingMessage]:
+        """Воркер отправителя: все его сообщения обрабатываются по порядку"""
+        return self._queues[(sender_id or 0) % self.workers]
+
+    async def submit(self, text: str, message_id: int, sender_id: int | None) -> bool:
+        """
+        Постановка сообщения в очередь
+
+        Сигнатура совпадает с on_message_callback TelethonClient.
+
+        Args:
+            text: Текст сообщения
+            message_id: ID сообщения в Telegram
+            sender_id: ID отправителя
+
+        Returns:
+            True, если сообщение принято; False, если отброшено
+        """
+        if not self._tasks:
+            self.start()
+
+        self.received += 1
+        queue = self._queue_for(sender_id)
+        item = IncomingMessage(text, message_id, sender_id, time.monotonic())
+
+        if queue.full():
+            self.backpressure_waits += 1
+            logger.warning(
+                "Очередь парсера заполнена (%d сообщений), ожидание места для сообщения %d",
+                self.depth,
+                message_id,
+            )
+            try:
+                await asyncio.wait_for(queue.put(item), self.put_timeout)
+            except TimeoutError:
+                self.dropped += 1
+                logger.error(
+                    "Сообщение %d отброшено: очередь парсера заполнена дольше %.0f с",
+                    message_id,
+                    self.put_timeout,
+                )
+                return False
+        else:
+            queue.put_nowait(item)
+
+        self.max_depth = max(self.max_depth, self.depth)
+        return True
+
+    async def _worker(self, queue: asyncio.Queue[IncomingMessage]) -> None:
+        """Последовательная обработка сообщений своей очереди"""
+        while True:
+            item = await queue.get()
+            started = time.monotonic()
+            self._wait_time_total += started - item.received_at
+            try:
+                await self.handler(item.text, item.message_id, item.sender_id)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.exception("Ошибка обработки сообщения %d: %s", item.message_id, e)
+            finally:
+                self._handle_time_total += time.monotonic() - started
+                queue.task_done()
+
+    @property
+    def depth(self) -> int:
+        """Сообщений в очереди сейчас"""
+        return sum(queue.qsize() for queue in self._queues)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Метрики очереди
+
+        Returns:
+            Глубина очереди, счетчики принятых/обработанных/отброшенных сообщений,
+            число ожиданий места в очереди и среднее время ожидания и обработки (секунды)
+        """
+        finished = self.processed + self.failed
+        return {
+            "running": self.is_running,
+            "workers": self.workers,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "backpressure_waits": self.backpressure_waits,
+            "avg_wait": self._wait_time_total / finished if finished else 0.0,
+            "avg_handle": self._handle_time_total / finished if finished else 0.0,
+        }
+
+
+class ParseExecutor:
+    """Разбор сообщений вне event loop (пул потоков или процессов)"""
+
+    def __init__(self, parser_service: OrderParserService, kind: str = EXECUTOR_THREAD):
+        """
+        Инициализация
+
+        Args:
+            parser_service: Парсер (используется в пуле потоков)
+            kind: thread - пул потоков по умолчанию, process - отдельный пул процессов
+        """
+        if kind not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Неизвестный тип пула парсера: {kind}")
+        self.parser_service = parser_service
+        self.kind = kind
+        self._executor: Executor | None = None
+
+    async def parse(self, text: str, message_id: int) -> ParseResult:
+        """
+        Разбор сообщения
+
+        Args:
+            text: Текст сообщения
+            message_id: ID сообщения в Telegram
+
+        Returns:
+            ParseResult
+        """
+        if self.kind == EXECUTOR_PROCESS:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=2)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, _parse_in_worker_process, text, message_id
+            )
+        return await asyncio.to_thread(self.parser_service.parse_message, text, message_id)
+
+    def shutdown(self) -> None:
+        """Остановка пула процессов"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
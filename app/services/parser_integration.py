@@ -9,6 +9,7 @@ import asyncio
 import contextlib
 import logging
 import time
+from typing import TYPE_CHECKING
 
 from aiogram import Bot
 
@@ -16,12 +17,17 @@ from app.core.config import Config
 from app.database.orm_database import ORMDatabase
 from app.database.parser_config_repository import ParserConfigRepository
 from app.services.parser_analytics import ParserAnalyticsService
+from app.services.parser_ingestion import ParseExecutor, ParserIngestionQueue
 from app.services.telegram_parser import (
     OrderConfirmationService,
     OrderParsed,
     OrderParserService,
-    TelethonClient,
 )
+from app.utils.helpers import normalize_phone
+
+
+if TYPE_CHECKING:
+    from app.services.telegram_parser.telethon_client import TelethonClient
 
 
 logger = logging.getLogger(__name__)
@@ -55,6 +61,18 @@ class ParserIntegration:
         self.analytics_service: ParserAnalyticsService = ParserAnalyticsService(db.session_factory)
         self.group_id: int | None = None  # ID группы для парсера
 
+        # Очередь между Telethon и обработкой: сообщения разных отправителей
+        # обрабатываются параллельно, разбор текста - вне event loop
+        self.ingestion = ParserIngestionQueue(
+            self._on_new_message,
+            workers=Config.PARSER_WORKERS,
+            maxsize=Config.PARSER_QUEUE_SIZE,
+            put_timeout=Config.PARSER_QUEUE_PUT_TIMEOUT,
+        )
+        # Создается вместе с очередью: сообщения могут прийти и от клиента,
+        # созданного в authenticate_user (до start())
+        self.parse_executor = ParseExecutor(OrderParserService(), Config.PARSER_PARSE_EXECUTOR)
+
         self.is_running = False
         self.waiting_for_auth = False  # Флаг ожидания аутентификации
         self.telethon_task: asyncio.Task | None = None
@@ -83,8 +101,11 @@ class ParserIntegration:
         
         # Инициализация клиента если нужно
         if not self.telethon_client:
+            # Telethon импортируется только при запуске парсера
+            from app.services.telegram_parser.telethon_client import TelethonClient
+
             self.telethon_client = TelethonClient.from_config(
-                on_message_callback=self._on_new_message,
+                on_message_callback=self.ingestion.submit,
             )
 
         # Получаем group_id
@@ -293,7 +314,7 @@ class ParserIntegration:
         # Инициализация компонентов
         try:
             # 1. OrderParserService
-            self.parser_service = OrderParserService()
+            self.parser_service = self.parse_executor.parser_service
             self.logger.info("✅ OrderParserService инициализирован")
 
             # 2. OrderConfirmationService
@@ -303,9 +324,11 @@ class ParserIntegration:
             )
             self.logger.info("✅ OrderConfirmationService инициализирован")
 
-            # 3. TelethonClient
+            # 3. TelethonClient (Telethon импортируется только при запуске парсера)
+            from app.services.telegram_parser.telethon_client import TelethonClient
+
             self.telethon_client = TelethonClient.from_config(
-                on_message_callback=self._on_new_message,
+                on_message_callback=self.ingestion.submit,
             )
             self.logger.info("✅ TelethonClient создан")
 
@@ -357,6 +380,10 @@ class ParserIntegration:
             with contextlib.suppress(asyncio.CancelledError):
                 await self.telethon_task
 
+        # Обработка уже принятых сообщений и остановка воркеров
+        await self.ingestion.stop()
+        self.parse_executor.shutdown()
+
         self.is_running = False
         self.is_running = False
         self.logger.info("🛑 Парсер заявок остановлен")
@@ -372,7 +399,7 @@ class ParserIntegration:
 
     async def _on_new_message(self, text: str, message_id: int, sender_id: int | None) -> None:
         """
-        Callback для обработки новых сообщений из Telegram-группы.
+        Обработка сообщения из Telegram-группы (вызывается воркером ParserIngestionQueue).
 
         Args:
             text: Текст сообщения
@@ -405,7 +432,7 @@ class ParserIntegration:
 
         # Парсинг сообщения (измеряем время)
         start_time = time.time()
-        parse_result = self.parser_service.parse_message(text, message_id)
+        parse_result = await self.parse_executor.parse(text, message_id)
         processing_time_ms = int((time.time() - start_time) * 1000)
 
         if not parse_result.success:
@@ -444,6 +471,7 @@ class ParserIntegration:
             return
 
         # Успешный парсинг — отправляем подтверждение
+        assert parse_result.data is not None  # при успешном разборе данные заполнены
         self.logger.info(
             f"✅ Сообщение {message_id} успешно распарсено: "
             f"{parse_result.data.equipment_type} - {parse_result.data.address}"
@@ -469,16 +497,25 @@ class ParserIntegration:
                 client_phone = parse_result.data.phone or "Не указан"
                 client_address = parse_result.data.address
 
+                # Сравниваем телефоны в канонической форме по индексу client_phone_normalized,
+                # чтобы "+7 900 ..." и "8900..." считались одним клиентом
+                normalized_phone = normalize_phone(parse_result.data.phone)
+                phone_condition = (
+                    Order.client_phone_normalized == normalized_phone
+                    if normalized_phone
+                    else Order.client_phone == client_phone
+                )
+
                 # 1. Проверяем на дубликаты (активные заявки с такими же данными)
                 active_statuses = ["NEW", "ASSIGNED", "ACCEPTED", "ONSITE"]
                 duplicate_query = select(Order).where(
                     and_(
+                        phone_condition,
                         Order.client_address == client_address,
-                        Order.client_phone == client_phone,
                         Order.equipment_type == parse_result.data.equipment_type,
                         Order.status.in_(active_statuses)
                     )
-                )
+                ).limit(1)
                 result = await session.execute(duplicate_query)
                 existing_order = result.scalar_one_or_none()
 
@@ -507,7 +544,7 @@ class ParserIntegration:
                 # 2. Проверяем историю клиента (по телефону или адресу)
                 history_query = select(Order).where(
                     or_(
-                        Order.client_phone == client_phone,
+                        phone_condition,
                         Order.client_address == client_address
                     )
                 ).order_by(Order.created_at.desc())
@@ -2,11 +2,14 @@
 Сервис для управления ежедневными таблицами в реальном времени
 """
 
+import asyncio
 import logging
 import os
+import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
+from app.config import OrderStatus
 from app.database import DatabaseType, get_database
 from app.services.master_reports_detailed import MasterReportsService
 from app.utils.helpers import MOSCOW_TZ, get_now
@@ -14,16 +17,45 @@ from app.utils.helpers import MOSCOW_TZ, get_now
 
 logger = logging.getLogger(__name__)
 
+# Пауза после последнего закрытия заказа перед обновлением таблицы (секунды)
+REFRESH_DEBOUNCE_SECONDS = 15.0
+
+# Максимальная задержка обновления при непрерывном потоке закрытий (секунды)
+REFRESH_MAX_DELAY_SECONDS = 60.0
+
 
 class RealtimeDailyTableService:
     """Сервис для управления ежедневными таблицами в реальном времени"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        debounce_seconds: float = REFRESH_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = REFRESH_MAX_DELAY_SECONDS,
+    ) -> None:
+        """
+        Инициализация
+
+        Args:
+            debounce_seconds: Пауза после последнего закрытия перед обновлением
+            max_delay_seconds: Через сколько секунд после первого закрытия из пачки
+                таблица обновляется, даже если закрытия продолжаются
+        """
         self.db: DatabaseType = get_database()
         self.reports_service = MasterReportsService()
         self.current_table_path: str | None = None
         self.current_date: date | None = None
 
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._pending_order_ids: set[int] = set()
+        self._first_pending_at: float | None = None
+        self._last_pending_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self._refresh_lock = asyncio.Lock()
+        # Текущий файл - не отчет generate_daily_master_report (заглушка или файл
+        # прошлого запуска), инкрементально его обновлять нельзя
+        self._full_rebuild_needed = True
+
     async def init(self):
         """Инициализация сервиса"""
         # ORM база данных не требует init_db
@@ -47,6 +79,9 @@ class RealtimeDailyTableService:
             logger.info(f"Создание новой ежедневной таблицы за {date.strftime('%d.%m.%Y')}")
             await self._create_daily_table(date)
 
+        if self.current_date != date:
+            self._full_rebuild_needed = True
+
         self.current_table_path = str(table_path)
         self.current_date = date
 
@@ -67,7 +102,7 @@ class RealtimeDailyTableService:
         new_path = reports_dir / new_filename
 
         if report_path and os.path.exists(report_path):
-            os.rename(report_path, new_path)
+            os.replace(report_path, new_path)
             logger.info(f"Ежедневная таблица создана: {new_path}")
         else:
             logger.info(f"Создание пустой ежедневной таблицы: {new_path}")
@@ -84,7 +119,12 @@ class RealtimeDailyTableService:
             logger.info(f"Пустая ежедневная таблица создана: {new_path}")
 
     async def update_table_on_order_completion(self, order_id: int):
-        """Обновляет таблицу при закрытии заказа"""
+        """
+        Обновляет таблицу при закрытии заказа
+
+        Таблица не перестраивается сразу: заказ ставится в очередь, и пачка
+        закрытий применяется одним обновлением (см. schedule_refresh).
+        """
         try:
             if not self.current_table_path or not self.current_date:
                 logger.warning("Текущая таблица не инициализирована")
@@ -92,7 +132,7 @@ class RealtimeDailyTableService:
 
             # Проверяем, что заказ был закрыт сегодня
             order = await self.db.get_order_by_id(order_id)
-            if not order or order.status != "completed":
+            if not order or order.status != OrderStatus.CLOSED:
                 return
 
             if order.updated_at:
@@ -104,15 +144,76 @@ class RealtimeDailyTableService:
                     logger.info(f"Заказ {order_id} закрыт не сегодня, пропускаем обновление")
                     return
 
-            # Обновляем таблицу
-            logger.info(f"Обновление ежедневной таблицы после закрытия заказа {order_id}")
-            await self._update_current_table()
+            self.schedule_refresh(order_id)
 
         except Exception as e:
             logger.error(f"Ошибка при обновлении таблицы после закрытия заказа {order_id}: {e}")
 
-    async def _update_current_table(self):
-        """Обновляет текущую таблицу"""
+    def schedule_refresh(self, order_id: int) -> None:
+        """
+        Отложенное обновление таблицы после закрытия заказа
+
+        Обновление выполняется через debounce_seconds после последнего
+        закрытия, но не позже max_delay_seconds после первого закрытия
+        из пачки. Все накопленные заказы применяются одним обновлением.
+
+        Args:
+            order_id: ID закрытого заказа
+        """
+        now = time.monotonic()
+        self._pending_order_ids.add(order_id)
+        self._last_pending_at = now
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._debounced_refresh())
+
+    def _refresh_delay(self) -> float:
+        """Сколько секунд осталось до обновления накопленных заказов"""
+        if self._first_pending_at is None:
+            return 0.0
+        deadline = min(
+            self._last_pending_at + self.debounce_seconds,
+            self._first_pending_at + self.max_delay_seconds,
+        )
+        return deadline - time.monotonic()
+
+    async def _debounced_refresh(self) -> None:
+        """Фоновая задача: ждет затишья и применяет накопленные заказы"""
+        # Заказы, закрытые во время обновления, попадают в следующую итерацию
+        while self._pending_order_ids:
+            delay = self._refresh_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Немедленно применяет накопленные закрытия заказов к таблице"""
+        async with self._refresh_lock:
+            order_ids = self._pending_order_ids
+            self._pending_order_ids = set()
+            self._first_pending_at = None
+            if not order_ids:
+                return
+
+            try:
+                logger.info(f"Обновление ежедневной таблицы: закрыто заказов {len(order_ids)}")
+                await self._update_current_table(order_ids)
+            except Exception as e:
+                logger.error(f"Ошибка при обновлении ежедневной таблицы: {e}")
+
+    async def _update_current_table(self, order_ids: set[int] | None = None):
+        """
+        Обновляет текущую таблицу
+
+        Если таблица уже построена отчетом, обновляются только сводка и листы
+        мастеров из order_ids; иначе отчет генерируется заново.
+
+        Args:
+            order_ids: ID закрытых заказов (None - полная перегенерация)
+        """
         if not self.current_date:
             return
 
@@ -120,20 +221,26 @@ class RealtimeDailyTableService:
         if not path:
             return
 
-        # Создаем новую версию таблицы
         start_datetime = datetime.combine(self.current_date, datetime.min.time()).replace(
             tzinfo=MOSCOW_TZ
         )
-        start_datetime + timedelta(days=1)
+
+        if order_ids and not self._full_rebuild_needed and os.path.exists(path):
+            try:
+                if await self.reports_service.update_daily_master_report(
+                    path, start_datetime, order_ids
+                ):
+                    return
+            except Exception as e:
+                logger.warning(f"Инкрементальное обновление таблицы не удалось: {e}")
 
         # Генерируем обновленный отчет
         report_path = await self.reports_service.generate_daily_master_report(start_datetime)
 
         if report_path and os.path.exists(report_path):
             # Заменяем текущую таблицу
-            if os.path.exists(path):
-                os.remove(path)
-            os.rename(report_path, path)
+            os.replace(report_path, path)
+            self._full_rebuild_needed = False
             logger.info(f"Ежедневная таблица обновлена: {path}")
         else:
             logger.error(f"Не удалось обновить таблицу: {report_path}")
@@ -141,6 +248,9 @@ class RealtimeDailyTableService:
     async def save_and_create_new_table(self):
         """Сохраняет текущую таблицу и создает новую пустую"""
         try:
+            # Применяем закрытия, накопленные до полуночи
+            await self.flush()
+
             if (
                 self.current_table_path
                 and self.current_date
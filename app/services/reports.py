@@ -30,6 +30,22 @@ class ReportsService:
         """
         self.db = db
 
+    @staticmethod
+    def _summarize_statuses(status_counts: dict[str, int]) -> tuple[int, int, int]:
+        """
+        Сводка по количеству заявок мастера в каждом статусе
+
+        Args:
+            status_counts: Словарь {status: count}
+
+        Returns:
+            (всего, завершено, активных)
+        """
+        total = sum(status_counts.values())
+        completed = status_counts.get(OrderStatus.CLOSED, 0)
+        active = total - completed - status_counts.get(OrderStatus.REFUSED, 0)
+        return total, completed, active
+
     async def generate_masters_report(self) -> str:
         """
         Генерация отчета по мастерам
@@ -46,16 +62,13 @@ class ReportsService:
 
         text += f"<b>Всего мастеров:</b> {len(masters)}\n\n"
 
+        counts = await self.db.get_order_counts_by_master_status()
+
         for master in masters:
             if master.id is None:
                 continue
 
-            orders = await self.db.get_orders_by_master(master.id, exclude_closed=False)
-            total = len(orders)
-            completed = len([o for o in orders if o.status == OrderStatus.CLOSED])
-            active = len(
-                [o for o in orders if o.status not in [OrderStatus.CLOSED, OrderStatus.REFUSED]]
-            )
+            total, completed, active = self._summarize_statuses(counts.get(master.id, {}))
 
             status = "🟢" if master.is_active else "🔴"
 
@@ -101,25 +114,18 @@ class ReportsService:
         Returns:
             Текст отчета
         """
-        # Получаем все заявки
-        orders = await self.db.get_all_orders()
-
-        # Подсчитываем по типам
-        by_equipment: dict[str, int] = {}
-        for order in orders:
-            by_equipment[order.equipment_type] = by_equipment.get(order.equipment_type, 0) + 1
+        # Количество заявок по типам (уже отсортировано по убыванию)
+        by_equipment = await self.db.get_order_counts_by_equipment()
+        total = sum(by_equipment.values())
 
         text = (
             "📊 <b>Отчет по типам техники</b>\n\n"
-            f"<b>Всего заявок:</b> {len(orders)}\n\n"
+            f"<b>Всего заявок:</b> {total}\n\n"
             "<b>По типам техники:</b>\n"
         )
 
-        # Сортируем по количеству
-        sorted_equipment = sorted(by_equipment.items(), key=lambda x: x[1], reverse=True)
-
-        for equipment, count in sorted_equipment:
-            percentage = (count / len(orders) * 100) if len(orders) > 0 else 0
+        for equipment, count in by_equipment.items():
+            percentage = (count / total * 100) if total > 0 else 0
             text += f"🔧 {equipment}: {count} ({percentage:.1f}%)\n"
 
         return text
@@ -257,17 +263,13 @@ class ReportsService:
 
         # Данные
         masters = await self.db.get_all_masters(only_approved=True)
+        counts = await self.db.get_order_counts_by_master_status()
 
         for master in masters:
             if master.id is None:
                 continue
 
-            orders = await self.db.get_orders_by_master(master.id, exclude_closed=False)
-            total = len(orders)
-            completed = len([o for o in orders if o.status == OrderStatus.CLOSED])
-            active = len(
-                [o for o in orders if o.status not in [OrderStatus.CLOSED, OrderStatus.REFUSED]]
-            )
+            total, completed, active = self._summarize_statuses(counts.get(master.id, {}))
 
             ws.append(
                 [
@@ -341,16 +343,10 @@ class ReportsService:
             cell.fill = header_fill
             cell.alignment = header_alignment
 
-        orders = await self.db.get_all_orders()
-
-        by_equipment: dict[str, int] = {}
-        for order in orders:
-            by_equipment[order.equipment_type] = by_equipment.get(order.equipment_type, 0) + 1
-
-        total = len(orders)
-        sorted_equipment = sorted(by_equipment.items(), key=lambda x: x[1], reverse=True)
+        by_equipment = await self.db.get_order_counts_by_equipment()
+        total = sum(by_equipment.values())
 
-        for equipment, count in sorted_equipment:
+        for equipment, count in by_equipment.items():
             percentage = (count / total * 100) if total > 0 else 0
             ws.append([equipment, count, f"{percentage:.1f}%"])
 
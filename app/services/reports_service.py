@@ -10,7 +10,7 @@ from typing import TYPE_CHECKING, Any
 
 from app.database import DatabaseType, get_database
 from app.repositories.order_repository_extended import OrderRepositoryExtended
-from app.utils.helpers import get_now
+from app.utils.helpers import get_now, to_db_timestamp
 
 
 if TYPE_CHECKING:
@@ -53,8 +53,7 @@ class ReportsService:
     async def _get_extended_repo(self) -> OrderRepositoryExtended:
         """Получить расширенный репозиторий"""
         if self._order_repo_extended is None:
-            connection = self._get_connection()
-            self._order_repo_extended = OrderRepositoryExtended(connection)
+            self._order_repo_extended = self._get_legacy_db().repository(OrderRepositoryExtended)
         return self._order_repo_extended
 
     async def generate_daily_report(self) -> dict[str, Any]:
@@ -345,17 +344,17 @@ class ReportsService:
                 o.out_of_city,
                 o.has_review,
                 o.created_at,
-                o.updated_at,
+                o.closed_at,
                 u.first_name || ' ' || COALESCE(u.last_name, '') as master_name
             FROM orders o
             LEFT JOIN masters m ON o.assigned_master_id = m.id
             LEFT JOIN users u ON m.telegram_id = u.telegram_id
             WHERE o.status = 'CLOSED'
-                AND DATE(o.updated_at) >= ?
-                AND DATE(o.updated_at) <= ?
-            ORDER BY o.updated_at DESC
+                AND o.closed_at >= ?
+                AND o.closed_at < ?
+            ORDER BY o.closed_at DESC
         """,
-            (start_date, end_date),
+            (to_db_timestamp(start_date), to_db_timestamp(end_date + timedelta(days=1))),
         )
 
         rows = await cursor.fetchall()
@@ -392,15 +391,15 @@ class ReportsService:
                 # Считаем дни от создания до закрытия
                 from datetime import datetime
 
-                if row["created_at"] and row["updated_at"]:
+                if row["created_at"] and row["closed_at"]:
                     created = datetime.fromisoformat(row["created_at"])
-                    updated = datetime.fromisoformat(row["updated_at"])
+                    closed = datetime.fromisoformat(row["closed_at"])
                     # Удаляем timezone информацию для корректного вычитания
                     if created.tzinfo is not None:
                         created = created.replace(tzinfo=None)
-                    if updated.tzinfo is not None:
-                        updated = updated.replace(tzinfo=None)
-                    history_stats["days_to_complete"] = (updated - created).days
+                    if closed.tzinfo is not None:
+                        closed = closed.replace(tzinfo=None)
+                    history_stats["days_to_complete"] = (closed - created).days
 
             orders_list.append(
                 {
@@ -416,7 +415,7 @@ class ReportsService:
                     "out_of_city": bool(row["out_of_city"]),
                     "has_review": bool(row["has_review"]),
                     "created_at": row["created_at"],
-                    "closed_at": row["updated_at"],
+                    "closed_at": row["closed_at"],
                     "history": history_stats,  # ✨ НОВОЕ: История изменений
                 }
             )
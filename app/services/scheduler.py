@@ -15,7 +15,9 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from app.config import Config, OrderStatus
 from app.database import Database
+from app.domain.sla_index import SCHEDULED_STATUSES, SLA_TRACKED_STATUSES, sla_index
 from app.utils import get_now, safe_send_message
+from app.utils.bulk_sender import BulkSender, OutgoingMessage
 from app.utils.helpers import MOSCOW_TZ
 
 
@@ -54,6 +56,8 @@ class TaskScheduler:
         self._background_tasks: set[asyncio.Task[None]] = set()
         # Ключ: (order_id, date) — напоминание за 2 часа уже поставлено/отправлено в этот день
         self._sent_scheduled_reminders: set[tuple[int, date]] = set()
+        # Защита от наложения запусков напоминаний, если отправка затянулась
+        self._remind_assigned_lock = asyncio.Lock()
 
     async def start(self):
         """Запуск планировщика"""
@@ -138,6 +142,8 @@ class TaskScheduler:
             id="remind_assigned_orders",
             name="Напоминание о непринятых заявках",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,
         )
 
         # Напоминание о неназначенных заявках
@@ -216,11 +222,14 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Failed to send scheduled time reminder for order #{order.id}: {e}")
 
-    def _check_scheduled_time_alert(self, order, now: datetime) -> bool:  # noqa: PLR0911
+    def _check_scheduled_time_alert(self, order, now: datetime) -> bool:
         """
         Проверка запланированного времени для перенесенных заявок.
         Отправляет напоминание за 2 часа до визита.
 
+        Время визита берется из scheduled_at - оно разбирается из scheduled_time
+        один раз при создании/переносе заявки, а не на каждом тике планировщика.
+
         Args:
             order: Заявка
             now: Текущее время
@@ -228,57 +237,13 @@ class TaskScheduler:
         Returns:
             True если напоминание было отправлено или время еще не подошло
         """
-        import re
-        from datetime import date, datetime, timedelta
-
-        scheduled_time = order.scheduled_time.lower().strip()
-
-        # Пытаемся найти время в формате HH:MM
-        time_pattern = r"(\d{1,2}):(\d{2})"
-        time_match = re.search(time_pattern, scheduled_time)
-
-        if not time_match:
-            return False  # Не удалось распарсить время
-
-        hour = int(time_match.group(1))
-        minute = int(time_match.group(2))
-
-        # Определяем дату
-        target_date = now.date()
-
-        # Ключевые слова для определения даты
-        if "завтра" in scheduled_time:
-            target_date = (now + timedelta(days=1)).date()
-        elif "послезавтра" in scheduled_time:
-            target_date = (now + timedelta(days=2)).date()
-        elif "через" in scheduled_time and "дн" in scheduled_time:
-            # Пытаемся найти количество дней
-            days_match = re.search(r"через\s+(\d+)\s+дн", scheduled_time)
-            if days_match:
-                days = int(days_match.group(1))
-                target_date = (now + timedelta(days=days)).date()
-
-        # Пытаемся найти дату в формате DD.MM.YYYY
-        date_pattern = r"(\d{1,2})\.(\d{1,2})\.(\d{4})"
-        date_match = re.search(date_pattern, scheduled_time)
-        if date_match:
-            day = int(date_match.group(1))
-            month = int(date_match.group(2))
-            year = int(date_match.group(3))
-            try:
-                target_date = date(year, month, day)
-            except ValueError:
-                return False  # Неверная дата
+        scheduled_datetime: datetime | None = getattr(order, "scheduled_at", None)
+        if scheduled_datetime is None:
+            return False  # Время визита не удалось разобрать
 
-        # Создаем целевое время визита
-        try:
-            scheduled_datetime = datetime.combine(
-                target_date, datetime.min.time().replace(hour=hour, minute=minute), tzinfo=MOSCOW_TZ
-            )
-            # Добавляем timezone как у now
-            scheduled_datetime = scheduled_datetime.replace(tzinfo=now.tzinfo)
-        except ValueError:
-            return False  # Неверное время
+        if scheduled_datetime.tzinfo is None:
+            # ORM возвращает naive datetime (московское время)
+            scheduled_datetime = scheduled_datetime.replace(tzinfo=MOSCOW_TZ)
 
         # Если время визита уже прошло, не отправляем напоминание
         if scheduled_datetime <= now:
@@ -293,8 +258,6 @@ class TaskScheduler:
                 f"Sending 2-hour reminder for rescheduled order #{order.id}, scheduled at {scheduled_datetime}"
             )
             # Отправляем напоминание асинхронно
-            import asyncio
-
             try:
                 # Дедупликация: не отправляем больше одного напоминания для одной заявки в одну дату
                 reminder_key = (order.id, scheduled_datetime.date())
@@ -329,120 +292,157 @@ class TaskScheduler:
         # Переход через полночь (например, 22:00 - 06:00)
         return hour >= start or hour < end
 
+    async def _refresh_sla_index(self, now: datetime) -> None:
+        """
+        Загрузка индекса SLA из БД при первом тике и периодическая пересинхронизация
+
+        Пересинхронизация подхватывает изменения статусов, сделанные в обход
+        Database.update_order_status (прямые SQL-запросы в хэндлерах).
+
+        Args:
+            now: Текущее время
+        """
+        resync_interval = timedelta(hours=Config.SLA_INDEX_RESYNC_HOURS)
+        if sla_index.loaded_at is not None and now - sla_index.loaded_at < resync_interval:
+            return
+
+        orders: list[Any] = []
+        for status in SLA_TRACKED_STATUSES:
+            orders.extend(await self.db.get_all_orders(status=status))
+        sla_index.load(orders, now)
+
+    async def _load_sla_orders(self, order_ids: set[int]) -> list[Any]:
+        """
+        Загрузка актуальных данных заявок из индекса SLA
+
+        Если статус в БД расходится с индексом (изменен в обход индекса),
+        запись индекса исправляется, а заявка пропускается до следующего тика.
+
+        Args:
+            order_ids: ID заявок
+
+        Returns:
+            Заявки, состояние которых совпадает с индексом (новые первыми)
+        """
+        # Просроченные заявки остаются в выборке до смены статуса, поэтому
+        # загружаются одним запросом, а не get_order_by_id на каждую
+        loaded = await self.db.get_orders_by_ids(sorted(order_ids, reverse=True))
+        found = {order.id: order for order in loaded}
+
+        orders = []
+        for order_id in sorted(order_ids, reverse=True):
+            order = found.get(order_id)
+            if order is None or getattr(order, "deleted_at", None) is not None:
+                sla_index.forget(order_id)
+                continue
+
+            entry = sla_index.get(order_id)
+            if entry is None or entry.status != order.status:
+                sla_index.track(order_id, order.status, entered_at=order.updated_at)
+                continue
+
+            orders.append(order)
+        return orders
+
     async def check_order_sla(self):
         """
         Проверка SLA заявок
         Уведомляет администраторов о заявках, которые находятся
         в одном статусе слишком долго
+
+        Вместо полного списка заявок используется индекс дедлайнов (sla_index):
+        из БД загружаются только просроченные заявки. Заявки с визитом в ближайшие
+        2,5 часа (для напоминаний за 2 часа) выбираются одним запросом по scheduled_at.
         """
         try:
-            # Получаем все активные заявки
-            orders = await self.db.get_all_orders()
-
             now = get_now()
 
             if self._is_night_mode(now):
                 logger.info("SLA check skipped due to night mode")
                 return
 
-            alerts: list[OrderAlert] = []
+            await self._refresh_sla_index(now)
 
-            for order in orders:
-                if order.status in [OrderStatus.CLOSED, OrderStatus.REFUSED]:
-                    continue
-
-                if not order.updated_at:
-                    continue
+            due_entries = {entry.order_id: entry for entry in sla_index.collect_due(now)}
+            orders = await self._load_sla_orders(set(due_entries))
 
-                # Убеждаемся что updated_at имеет timezone
-                updated_at = order.updated_at
-                if updated_at.tzinfo is None:
-                    updated_at = updated_at.replace(tzinfo=MOSCOW_TZ)
-
-                time_in_status = now - updated_at
-
-                # SLA правила
-                sla_rules = {
-                    OrderStatus.NEW: timedelta(hours=2),  # Новая заявка > 2 часов
-                    OrderStatus.ASSIGNED: timedelta(hours=4),  # Назначена > 4 часов
-                    OrderStatus.ACCEPTED: timedelta(hours=8),  # Принята > 8 часов
-                    OrderStatus.ONSITE: timedelta(hours=12),  # На объекте > 12 часов
-                }
+            # Напоминания за 2 часа до визита (просроченные заявки проверяются ниже)
+            upcoming = await self.db.get_orders_scheduled_between(
+                now, now + timedelta(hours=2, minutes=30), statuses=SCHEDULED_STATUSES
+            )
+            for order in upcoming:
+                if order.id not in due_entries:
+                    self._check_scheduled_time_alert(order, now)
 
-                sla_limit = sla_rules.get(order.status)
+            alerts: list[OrderAlert] = []
 
+            for order in orders:
                 # Для заявок с указанным временем прибытия - используем умные напоминания
                 # Работает для статусов ASSIGNED, ACCEPTED и DR
-                if order.scheduled_time and order.status in [
-                    OrderStatus.ASSIGNED,
-                    OrderStatus.ACCEPTED,
-                    OrderStatus.DR,
-                ]:
+                if order.scheduled_at and order.status in SCHEDULED_STATUSES:
                     scheduled_alert_sent = self._check_scheduled_time_alert(order, now)
                     if scheduled_alert_sent:
                         continue  # Пропускаем стандартную проверку SLA для этой заявки
 
-                if sla_limit and time_in_status > sla_limit:
-                    alert: OrderAlert = {"order": order, "time": time_in_status}
+                entry = due_entries.get(order.id) if order.id is not None else None
+                if entry is not None:
+                    alert: OrderAlert = {"order": order, "time": now - entry.entered_at}
                     alerts.append(alert)
 
             # Отправляем уведомления администраторам
             if alerts:
-                for admin_id in Config.ADMIN_IDS:
-                    # Группируем заявки по статусам для более точного заголовка
-                    accepted_orders = [
-                        a for a in alerts if a["order"].status == OrderStatus.ACCEPTED
-                    ]
-                    onsite_orders = [a for a in alerts if a["order"].status == OrderStatus.ONSITE]
-                    other_orders = [
-                        a
-                        for a in alerts
-                        if a["order"].status not in [OrderStatus.ACCEPTED, OrderStatus.ONSITE]
-                    ]
-
-                    # Определяем заголовок в зависимости от типов заявок
-                    if onsite_orders and not accepted_orders and not other_orders:
-                        text = (
-                            f"<b>⚠️ Мастер слишком долго на объекте</b> - {len(alerts)} заявок\n\n"
-                        )
-                    elif accepted_orders and not onsite_orders and not other_orders:
-                        text = f"<b>🚗 Мастер принял заявку, но не выехал к клиенту</b> - {len(alerts)} заявок\n\n"
-                    else:
-                        text = f"<b>⏰ Заявки требуют действий</b> - {len(alerts)} заявок\n\n"
-
-                    for alert in alerts[:5]:  # Показываем первые 5
-                        order = alert["order"]
-                        hours = int(alert["time"].total_seconds() / 3600)
-
-                        status_name = OrderStatus.get_status_name(order.status)
-                        master_info = f" - {order.master_name}" if order.master_name else ""
-
-                        # Добавляем подсказку в зависимости от статуса
-                        if order.status == OrderStatus.ASSIGNED:
-                            hint = " → Мастеру нужно принять заявку"
-                        elif order.status == OrderStatus.ACCEPTED:
-                            hint = " → Мастеру нужно выехать к клиенту"
-                        elif order.status == OrderStatus.ONSITE:
-                            hint = " → Мастеру нужно завершить работу"
-                        else:
-                            hint = ""
-
-                        text += f"📋 #{order.id} - {status_name} ({hours}ч){master_info}{hint}\n"
-
-                    if len(alerts) > 5:
-                        text += f"<i>И еще {len(alerts) - 5} заявок...</i>"
-
-                    # Добавляем общую подсказку в конце
-                    if onsite_orders and not accepted_orders and not other_orders:
-                        text += "\n<i>💡 Проверьте, не застрял ли мастер на объекте</i>"
-                    elif accepted_orders and not onsite_orders and not other_orders:
-                        text += "\n<i>💡 Свяжитесь с мастером - возможно, он забыл выехать</i>"
+                # Группируем заявки по статусам для более точного заголовка
+                accepted_orders = [a for a in alerts if a["order"].status == OrderStatus.ACCEPTED]
+                onsite_orders = [a for a in alerts if a["order"].status == OrderStatus.ONSITE]
+                other_orders = [
+                    a
+                    for a in alerts
+                    if a["order"].status not in [OrderStatus.ACCEPTED, OrderStatus.ONSITE]
+                ]
+
+                # Определяем заголовок в зависимости от типов заявок
+                if onsite_orders and not accepted_orders and not other_orders:
+                    text = f"<b>⚠️ Мастер слишком долго на объекте</b> - {len(alerts)} заявок\n\n"
+                elif accepted_orders and not onsite_orders and not other_orders:
+                    text = f"<b>🚗 Мастер принял заявку, но не выехал к клиенту</b> - {len(alerts)} заявок\n\n"
+                else:
+                    text = f"<b>⏰ Заявки требуют действий</b> - {len(alerts)} заявок\n\n"
+
+                for alert in alerts[:5]:  # Показываем первые 5
+                    order = alert["order"]
+                    hours = int(alert["time"].total_seconds() / 3600)
+
+                    status_name = OrderStatus.get_status_name(order.status)
+                    master_info = f" - {order.master_name}" if order.master_name else ""
+
+                    # Добавляем подсказку в зависимости от статуса
+                    if order.status == OrderStatus.ASSIGNED:
+                        hint = " → Мастеру нужно принять заявку"
+                    elif order.status == OrderStatus.ACCEPTED:
+                        hint = " → Мастеру нужно выехать к клиенту"
+                    elif order.status == OrderStatus.ONSITE:
+                        hint = " → Мастеру нужно завершить работу"
                     else:
-                        text += "\n<i>💡 Проверьте статус заявок и действия мастеров</i>"
+                        hint = ""
 
-                    await safe_send_message(
-                        self.bot, admin_id, text, parse_mode="HTML", max_attempts=5
-                    )
+                    text += f"📋 #{order.id} - {status_name} ({hours}ч){master_info}{hint}\n"
+
+                if len(alerts) > 5:
+                    text += f"<i>И еще {len(alerts) - 5} заявок...</i>"
+
+                # Добавляем общую подсказку в конце
+                if onsite_orders and not accepted_orders and not other_orders:
+                    text += "\n<i>💡 Проверьте, не застрял ли мастер на объекте</i>"
+                elif accepted_orders and not onsite_orders and not other_orders:
+                    text += "\n<i>💡 Свяжитесь с мастером - возможно, он забыл выехать</i>"
+                else:
+                    text += "\n<i>💡 Проверьте статус заявок и действия мастеров</i>"
+
+                # Текст одинаков для всех администраторов
+                await BulkSender(self.bot).send_all(
+                    OutgoingMessage(admin_id, text, {"parse_mode": "HTML"})
+                    for admin_id in Config.ADMIN_IDS
+                )
 
             logger.info(f"SLA check completed. Found {len(alerts)} alerts")
 
@@ -527,15 +527,11 @@ class TaskScheduler:
                         percentage = (count / len(new_orders) * 100) if len(new_orders) > 0 else 0
                         text += f"🔧 {equipment_type}: {count} ({percentage:.1f}%)\n"
 
-            # Отправляем администраторам
-            for admin_id in Config.ADMIN_IDS:
-                await safe_send_message(self.bot, admin_id, text, parse_mode="HTML", max_attempts=5)
-
-            # Отправляем диспетчерам
-            for dispatcher_id in Config.DISPATCHER_IDS:
-                await safe_send_message(
-                    self.bot, dispatcher_id, text, parse_mode="HTML", max_attempts=5
-                )
+            # Отправляем администраторам и диспетчерам (параллельно, с учетом лимитов)
+            await BulkSender(self.bot).send_all(
+                OutgoingMessage(chat_id, text, {"parse_mode": "HTML"})
+                for chat_id in dict.fromkeys([*Config.ADMIN_IDS, *Config.DISPATCHER_IDS])
+            )
 
             logger.info("Daily summary sent")
 
@@ -545,162 +541,174 @@ class TaskScheduler:
     async def remind_assigned_orders(self):
         """
         Напоминание мастерам о непринятых заявках
+
+        Мастера загружаются одним запросом, напоминания группируются по чатам
+        и отправляются через BulkSender с учетом лимитов Telegram.
         """
-        try:
-            # Получаем заявки со статусом ASSIGNED старше 15 минут
-            orders = await self.db.get_all_orders(status=OrderStatus.ASSIGNED)
+        if self._remind_assigned_lock.locked():
+            logger.warning("remind_assigned_orders is still running, skipping this tick")
+            return
 
-            now = get_now()
+        async with self._remind_assigned_lock:
+            try:
+                now = get_now()
 
-            if self._is_night_mode(now):
-                logger.info("Assigned orders reminder skipped due to night mode")
-                return
+                if self._is_night_mode(now):
+                    logger.info("Assigned orders reminder skipped due to night mode")
+                    return
 
-            # Для перенесенных заявок увеличиваем порог напоминания до 30 минут
-            base_remind_threshold = timedelta(minutes=15)
+                # Получаем заявки со статусом ASSIGNED старше 15 минут
+                orders = await self.db.get_all_orders(status=OrderStatus.ASSIGNED)
 
-            for order in orders:
-                if not order.updated_at:
-                    continue
+                # Для перенесенных заявок увеличиваем порог напоминания до 30 минут
+                remind_threshold = timedelta(minutes=15)
 
-                # Конвертируем naive datetime в aware для корректного сравнения
-                order_updated_at = order.updated_at
-                if order_updated_at.tzinfo is None:
-                    order_updated_at = order_updated_at.replace(tzinfo=MOSCOW_TZ)
+                due: list[tuple[Any, int, int]] = []
+                for order in orders:
+                    if not order.updated_at:
+                        continue
 
-                time_assigned = now - order_updated_at
+                    # Конвертируем naive datetime в aware для корректного сравнения
+                    order_updated_at = order.updated_at
+                    if order_updated_at.tzinfo is None:
+                        order_updated_at = order_updated_at.replace(tzinfo=MOSCOW_TZ)
 
-                # Для заявок с указанным временем прибытия - используем умные напоминания
-                if order.scheduled_time:
-                    scheduled_alert_sent = self._check_scheduled_time_alert(order, now)
-                    if scheduled_alert_sent:
-                        continue  # Пропускаем напоминание для этой заявки
+                    time_assigned = now - order_updated_at
 
-                # Используем стандартный порог напоминания
-                remind_threshold = base_remind_threshold
+                    # Для заявок с указанным временем прибытия - используем умные напоминания
+                    if order.scheduled_at:
+                        scheduled_alert_sent = self._check_scheduled_time_alert(order, now)
+                        if scheduled_alert_sent:
+                            continue  # Пропускаем напоминание для этой заявки
 
-                logger.debug(
-                    f"Order #{order.id}: updated_at={order.updated_at}, now={now}, time_assigned={time_assigned}, "
-                    f"rescheduled={order.rescheduled_count}, threshold={remind_threshold}"
-                )
+                    logger.debug(
+                        f"Order #{order.id}: updated_at={order.updated_at}, now={now}, time_assigned={time_assigned}, "
+                        f"rescheduled={order.rescheduled_count}, threshold={remind_threshold}"
+                    )
 
-                if time_assigned > remind_threshold and order.assigned_master_id:
-                    master = await self.db.get_master_by_id(order.assigned_master_id)
+                    master_id = order.assigned_master_id
+                    if time_assigned > remind_threshold and master_id:
+                        due.append((order, master_id, int(time_assigned.total_seconds() / 60)))
 
-                    if master:
-                        minutes = int(time_assigned.total_seconds() / 60)
+                # Один запрос за всеми нужными мастерами вместо get_master_by_id на каждую заявку
+                masters = await self.db.get_masters_by_ids(master_id for _, master_id, _ in due)
 
-                        logger.info(
-                            f"Sending reminder for order #{order.id}: assigned {minutes} minutes ago"
-                        )
+                messages: list[OutgoingMessage] = []
+                for order, master_id, minutes in due:
+                    master = masters.get(master_id)
+                    if not master:
+                        continue
 
-                        # Определяем, куда отправлять напоминание
-                        # Если есть work_chat_id - отправляем в рабочую группу
-                        # Иначе - в личные сообщения мастеру
-                        target_chat_id = (
-                            master.work_chat_id if master.work_chat_id else master.telegram_id
-                        )
+                    logger.info(
+                        f"Sending reminder for order #{order.id}: assigned {minutes} minutes ago"
+                    )
+                    messages.extend(self._build_assigned_reminders(order, master, minutes))
 
-                        if master.work_chat_id:
-                            # Отправляем в группу с упоминанием мастера и полной информацией о заявке
-                            from app.keyboards.inline import get_group_order_keyboard
-
-                            reminder_text = (
-                                f"🔔 <b>Напоминание о непринятой заявке</b>\n\n"
-                                f"📋 <b>Заявка #{order.id}</b>\n"
-                                f"📊 <b>Статус:</b> {OrderStatus.get_status_name(OrderStatus.ASSIGNED)}\n"
-                                f"⏰ <b>Назначена:</b> {minutes} минут назад\n\n"
-                                f"🔧 <b>Тип техники:</b> {order.equipment_type}\n"
-                                f"📝 <b>Описание:</b> {order.description}\n\n"
-                                f"👤 <b>Клиент:</b> {order.client_name}\n"
-                                f"📍 <b>Адрес:</b> {order.client_address}\n"
-                                f"📞 <b>Телефон:</b> <i>Будет доступен после прибытия на объект</i>\n\n"
-                            )
+                if messages:
+                    # Личные сообщения мастерам и диспетчерам склеиваются по чату,
+                    # сообщения в группы уходят по одному (у каждого своя клавиатура)
+                    result = await BulkSender(self.bot).send_all(messages, merge_plain_text=True)
+                    logger.info(
+                        f"Assigned reminders sent: {result.sent} delivered, "
+                        f"{result.failed} failed, {result.chats} chats"
+                    )
 
-                            if order.notes:
-                                reminder_text += f"📄 <b>Заметки:</b> {order.notes}\n\n"
+                logger.info(
+                    f"Reminders check completed. Found {len(orders)} assigned orders, "
+                    f"{len(due)} reminders due, threshold: 15 minutes"
+                )
 
-                            if order.scheduled_time:
-                                reminder_text += (
-                                    f"⏰ <b>Время прибытия:</b> {order.scheduled_time}\n\n"
-                                )
+            except Exception as e:
+                logger.error(f"Error in remind_assigned_orders: {e}")
 
-                            # Упоминаем мастера в группе (ORM: через master.user)
-                            master_username = (
-                                master.user.username
-                                if hasattr(master, "user") and master.user
-                                else None
-                            )
-                            if master_username:
-                                reminder_text += f"👨‍🔧 <b>Мастер:</b> @{master_username}\n\n"
-                            else:
-                                reminder_text += (
-                                    f"👨‍🔧 <b>Мастер:</b> {master.get_display_name()}\n\n"
-                                )
+    def _build_assigned_reminders(
+        self, order: Any, master: Any, minutes: int
+    ) -> list[OutgoingMessage]:
+        """
+        Формирование напоминаний о непринятой заявке
 
-                            reminder_text += "❗ <b>Пожалуйста, примите или отклоните заявку.</b>"
+        Args:
+            order: Заявка в статусе ASSIGNED
+            master: Назначенный мастер
+            minutes: Сколько минут назад заявка назначена
 
-                            # Создаем клавиатуру с кнопками для принятия/отклонения
-                            keyboard = get_group_order_keyboard(order, OrderStatus.ASSIGNED)
+        Returns:
+            Сообщения для мастера (группа или ЛС) и диспетчера
+        """
+        messages: list[OutgoingMessage] = []
 
-                            result = await safe_send_message(
-                                self.bot,
-                                target_chat_id,
-                                reminder_text,
-                                parse_mode="HTML",
-                                reply_markup=keyboard,
-                                max_attempts=5,
-                            )
+        # Определяем, куда отправлять напоминание
+        # Если есть work_chat_id - отправляем в рабочую группу
+        # Иначе - в личные сообщения мастеру
+        if master.work_chat_id:
+            # Отправляем в группу с упоминанием мастера и полной информацией о заявке
+            from app.keyboards.inline import get_group_order_keyboard
 
-                            if result:
-                                logger.info(
-                                    f"Reminder sent to group {target_chat_id} for master {master.telegram_id}"
-                                )
-                        else:
-                            # Отправляем в личные сообщения
-                            result = await safe_send_message(
-                                self.bot,
-                                target_chat_id,
-                                f"<b>Непринятая заявка</b> #{order.id}\n"
-                                f"{order.equipment_type} ({minutes}мин)\n"
-                                f"Примите или отклоните заявку.",
-                                parse_mode="HTML",
-                                max_attempts=5,
-                            )
+            reminder_text = (
+                f"🔔 <b>Напоминание о непринятой заявке</b>\n\n"
+                f"📋 <b>Заявка #{order.id}</b>\n"
+                f"📊 <b>Статус:</b> {OrderStatus.get_status_name(OrderStatus.ASSIGNED)}\n"
+                f"⏰ <b>Назначена:</b> {minutes} минут назад\n\n"
+                f"🔧 <b>Тип техники:</b> {order.equipment_type}\n"
+                f"📝 <b>Описание:</b> {order.description}\n\n"
+                f"👤 <b>Клиент:</b> {order.client_name}\n"
+                f"📍 <b>Адрес:</b> {order.client_address}\n"
+                f"📞 <b>Телефон:</b> <i>Будет доступен после прибытия на объект</i>\n\n"
+            )
 
-                            if result:
-                                logger.info(
-                                    f"Reminder sent to DM {target_chat_id} for master {master.telegram_id}"
-                                )
-
-                        # Отправляем уведомление диспетчеру
-                        if order.dispatcher_id:
-                            dispatcher_text = (
-                                f"<b>Непринятая заявка</b> #{order.id}\n"
-                                f"{order.equipment_type} ({minutes}мин)\n"
-                                f"Мастер: {master.get_display_name()}\n\n"
-                                f"Пожалуйста, примите или отклоните заявку."
-                            )
+            if order.notes:
+                reminder_text += f"📄 <b>Заметки:</b> {order.notes}\n\n"
 
-                            dispatcher_result = await safe_send_message(
-                                self.bot,
-                                order.dispatcher_id,
-                                dispatcher_text,
-                                parse_mode="HTML",
-                                max_attempts=5,
-                            )
+            if order.scheduled_time:
+                reminder_text += f"⏰ <b>Время прибытия:</b> {order.scheduled_time}\n\n"
 
-                            if dispatcher_result:
-                                logger.info(
-                                    f"Reminder sent to dispatcher {order.dispatcher_id} for order #{order.id}"
-                                )
+            # Упоминаем мастера в группе (ORM: через master.user)
+            master_username = (
+                master.user.username if hasattr(master, "user") and master.user else None
+            )
+            if master_username:
+                reminder_text += f"👨‍🔧 <b>Мастер:</b> @{master_username}\n\n"
+            else:
+                reminder_text += f"👨‍🔧 <b>Мастер:</b> {master.get_display_name()}\n\n"
 
-            logger.info(
-                f"Reminders check completed. Found {len(orders)} assigned orders, threshold: 15 minutes"
+            reminder_text += "❗ <b>Пожалуйста, примите или отклоните заявку.</b>"
+
+            # Создаем клавиатуру с кнопками для принятия/отклонения
+            keyboard = get_group_order_keyboard(order, OrderStatus.ASSIGNED)
+
+            messages.append(
+                OutgoingMessage(
+                    master.work_chat_id,
+                    reminder_text,
+                    {"parse_mode": "HTML", "reply_markup": keyboard},
+                )
+            )
+        else:
+            # Отправляем в личные сообщения
+            messages.append(
+                OutgoingMessage(
+                    master.telegram_id,
+                    f"<b>Непринятая заявка</b> #{order.id}\n"
+                    f"{order.equipment_type} ({minutes}мин)\n"
+                    f"Примите или отклоните заявку.",
+                    {"parse_mode": "HTML"},
+                )
             )
 
-        except Exception as e:
-            logger.error(f"Error in remind_assigned_orders: {e}")
+        # Отправляем уведомление диспетчеру
+        if order.dispatcher_id:
+            messages.append(
+                OutgoingMessage(
+                    order.dispatcher_id,
+                    f"<b>Непринятая заявка</b> #{order.id}\n"
+                    f"{order.equipment_type} ({minutes}мин)\n"
+                    f"Мастер: {master.get_display_name()}\n\n"
+                    f"Пожалуйста, примите или отклоните заявку.",
+                    {"parse_mode": "HTML"},
+                )
+            )
+
+        return messages
 
     async def remind_unassigned_orders(self):
         """
@@ -924,46 +932,38 @@ class TaskScheduler:
         """
         Автоматическое создание резервной копии базы данных
         Запускается по расписанию (ежедневно в 03:00 МСК)
+
+        Копия снимается онлайн-бэкапом SQLite в отдельном потоке
+        (app/database/backup.py), обработчики бота при этом не блокируются.
         """
-        import shutil
         from pathlib import Path
 
+        from app.database.backup import SQLiteBackup
+
         try:
             logger.info("Начало автоматического бэкапа БД...")
 
             # Пути
             db_path = Path(Config.DATABASE_PATH)
             backup_dir = Path("/app/backups" if os.path.exists("/app") else "backups")
-            backup_dir.mkdir(exist_ok=True, parents=True)
 
-            # Имя файла бэкапа
+            # Время бэкапа для уведомления
             timestamp = datetime.now(MOSCOW_TZ).strftime("%Y-%m-%d_%H-%M-%S")
-            backup_file = backup_dir / f"bot_database_{timestamp}.db"
 
-            # Создаём бэкап
             if db_path.exists():
-                shutil.copy2(db_path, backup_file)
-                file_size = backup_file.stat().st_size / 1024  # KB
+                backup = SQLiteBackup(
+                    db_path,
+                    backup_dir,
+                    compression=Config.BACKUP_COMPRESSION,
+                    keep_days=Config.BACKUP_KEEP_DAYS,
+                )
+                result = await backup.create()
+                backup_file = result.path
+                file_size = result.size / 1024  # KB
+                deleted_count = len(result.deleted)
 
                 logger.info(f"Бэкап создан: {backup_file.name} ({file_size:.2f} KB)")
 
-                # Удаление старых бэкапов (храним последние 30 дней)
-                cutoff_date = datetime.now(MOSCOW_TZ) - timedelta(days=30)
-                deleted_count = 0
-
-                for old_backup in backup_dir.glob("bot_database_*.db"):
-                    try:
-                        # Создаём timezone-aware datetime для корректного сравнения
-                        file_time = datetime.fromtimestamp(old_backup.stat().st_mtime, tz=MOSCOW_TZ)
-                        if file_time < cutoff_date:
-                            old_backup.unlink()
-                            deleted_count += 1
-                    except Exception as e:
-                        logger.warning(f"Не удалось удалить старый бэкап {old_backup.name}: {e}")
-
-                if deleted_count > 0:
-                    logger.info(f"Удалено старых бэкапов: {deleted_count}")
-
                 # Уведомляем админов об успешном бэкапе
                 try:
                     admins = await self.db.get_users_by_role("ADMIN")
@@ -976,15 +976,10 @@ class TaskScheduler:
                         f"🗑️ Удалено старых: {deleted_count}"
                     )
 
-                    for admin in admins:
-                        with contextlib.suppress(Exception):
-                            await safe_send_message(
-                                self.bot,
-                                admin.telegram_id,
-                                notification,
-                                parse_mode="HTML",
-                                max_attempts=1,
-                            )
+                    await BulkSender(self.bot, max_attempts=1).send_all(
+                        OutgoingMessage(admin.telegram_id, notification, {"parse_mode": "HTML"})
+                        for admin in admins
+                    )
 
                 except Exception as notify_error:
                     logger.warning(f"Не удалось отправить уведомление о бэкапе: {notify_error}")
@@ -1004,15 +999,10 @@ class TaskScheduler:
                     f"WARNING: Необходимо проверить систему!"
                 )
 
-                for admin in admins:
-                    with contextlib.suppress(Exception):
-                        await safe_send_message(
-                            self.bot,
-                            admin.telegram_id,
-                            error_notification,
-                            parse_mode="HTML",
-                            max_attempts=1,
-                        )
+                await BulkSender(self.bot, max_attempts=1).send_all(
+                    OutgoingMessage(admin.telegram_id, error_notification, {"parse_mode": "HTML"})
+                    for admin in admins
+                )
 
             except Exception as notify_exc:  # nosec B110 - сбой уведомления не критичен для бэкапа
                 logger.debug("Failed to notify admins about backup error: %s", notify_exc)
@@ -8,6 +8,7 @@ import aiosqlite
 
 from app.domain.order_state_machine import OrderStateMachine
 from app.repositories import MasterRepository, OrderRepository, UserRepository
+from app.repositories.base import TransactionFactory
 from app.services.master_service import MasterService
 from app.services.order_service import OrderService
 from app.services.user_service import UserService
@@ -21,14 +22,20 @@ class ServiceFactory:
     Factory для создания сервисов с инжекцией зависимостей
     """
 
-    def __init__(self, db_connection: aiosqlite.Connection):
+    def __init__(
+        self,
+        db_connection: aiosqlite.Connection,
+        transaction_factory: TransactionFactory | None = None,
+    ):
         """
         Инициализация фабрики
 
         Args:
             db_connection: Подключение к базе данных
+            transaction_factory: Источник транзакций для записи (Database.transaction)
         """
         self.db_connection = db_connection
+        self.transaction_factory = transaction_factory
         self._order_repo: OrderRepository | None = None
         self._user_repo: UserRepository | None = None
         self._master_repo: MasterRepository | None = None
@@ -41,21 +48,21 @@ class ServiceFactory:
     def order_repository(self) -> OrderRepository:
         """Ленивая инициализация OrderRepository"""
         if self._order_repo is None:
-            self._order_repo = OrderRepository(self.db_connection)
+            self._order_repo = OrderRepository(self.db_connection, self.transaction_factory)
         return self._order_repo
 
     @property
     def user_repository(self) -> UserRepository:
         """Ленивая инициализация UserRepository"""
         if self._user_repo is None:
-            self._user_repo = UserRepository(self.db_connection)
+            self._user_repo = UserRepository(self.db_connection, self.transaction_factory)
         return self._user_repo
 
     @property
     def master_repository(self) -> MasterRepository:
         """Ленивая инициализация MasterRepository"""
         if self._master_repo is None:
-            self._master_repo = MasterRepository(self.db_connection)
+            self._master_repo = MasterRepository(self.db_connection, self.transaction_factory)
         return self._master_repo
 
     @property
@@ -4,6 +4,8 @@ Telegram Parser Service
 Сервис для парсинга заявок из Telegram-группы через Telethon.
 """
 
+from typing import TYPE_CHECKING, Any
+
 from .confirmation_service import OrderConfirmationService
 from .equipment_dict import EQUIPMENT_ABBREVIATIONS, normalize_equipment_type
 from .parser_service import OrderParserService
@@ -17,7 +19,19 @@ from .patterns import (
     looks_like_address,
 )
 from .schemas import ConfirmationData, OrderParsed, ParseResult
-from .telethon_client import TelethonClient
+
+
+if TYPE_CHECKING:
+    from .telethon_client import TelethonClient
+
+
+def __getattr__(name: str) -> Any:
+    """TelethonClient загружается при первом обращении: импорт Telethon занимает ~0.2 с"""
+    if name == "TelethonClient":
+        from .telethon_client import TelethonClient
+
+        return TelethonClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
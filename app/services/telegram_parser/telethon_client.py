@@ -8,6 +8,7 @@ Telethon Client для мониторинга Telegram-группы
 import asyncio
 import logging
 from collections.abc import Awaitable, Callable
+from typing import Any
 
 from telethon import TelegramClient, events
 from telethon.tl.types import Message
@@ -32,7 +33,7 @@ class TelethonClient:
         api_hash: str,
         phone: str,
         session_name: str = "parser_session",
-        on_message_callback: Callable[[str, int, int | None], Awaitable[None]] | None = None,
+        on_message_callback: Callable[[str, int, int | None], Awaitable[Any]] | None = None,
     ) -> None:
         """
         Инициализация Telethon клиента.
@@ -44,6 +45,7 @@ class TelethonClient:
             session_name: Имя session файла (default: "parser_session")
             on_message_callback: Callback для обработки новых сообщений
                                 Сигнатура: async def callback(text: str, message_id: int, sender_id: int | None)
+                                (возвращаемое значение не используется)
         """
         self.api_id = api_id
         self.api_hash = api_hash
@@ -151,7 +153,9 @@ class TelethonClient:
         if old_group_id != group_id:
             self.logger.info(f"Группа для мониторинга изменена: {old_group_id} → {group_id}")
 
-    def set_message_callback(self, callback: Callable[[str, int, int | None], None]) -> None:
+    def set_message_callback(
+        self, callback: Callable[[str, int, int | None], Awaitable[Any]]
+    ) -> None:
         """
         Устанавливает callback для обработки новых сообщений.
 
@@ -207,7 +211,7 @@ class TelethonClient:
     @classmethod
     def from_config(
         cls,
-        on_message_callback: Callable[[str, int, int | None], Awaitable[None]] | None = None,
+        on_message_callback: Callable[[str, int, int | None], Awaitable[Any]] | None = None,
     ) -> "TelethonClient":
         """
         Создаёт TelethonClient из конфигурации приложения.
@@ -19,6 +19,7 @@ from app.utils.helpers import (
     get_now,
     get_user_display_name,
     log_action,
+    normalize_phone,
     parse_callback_data,
     truncate_text,
     validate_phone,
@@ -66,6 +67,7 @@ __all__ = [
     # PII Masking (GDPR compliance)
     "mask_phone",
     "mask_username",
+    "normalize_phone",
     # Callback utilities
     "parse_callback_data",
     "parse_natural_datetime",
@@ -0,0 +1,202 @@
+"""
+Пакетная отправка сообщений с ограничением параллелизма и частоты
+
+BulkSender группирует сообщения по чату: внутри одного чата они уходят
+последовательно, разные чаты обрабатываются параллельно (не более
+max_concurrency одновременно). Лимиты Telegram (на бота и на чат) соблюдает
+общий send_scheduler, через который идет safe_send_message; сообщения
+рассылки ставятся в него с приоритетом BULK и не задерживают ответы
+пользователям. Дополнительные паузы BulkSender по умолчанию выключены.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.utils.retry import safe_send_message
+from app.utils.send_scheduler import SendPriority, is_group_chat
+
+
+logger = logging.getLogger(__name__)
+
+# Максимальная длина текста сообщения в Telegram
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Разделитель при склейке нескольких сообщений в одно
+MERGE_SEPARATOR = "\n\n"
+
+
+@dataclass(slots=True)
+class OutgoingMessage:
+    """Сообщение в очереди на отправку"""
+
+    chat_id: int
+    text: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class BulkSendResult:
+    """Итог пакетной отправки"""
+
+    sent: int = 0
+    failed: int = 0
+    chats: int = 0
+
+
+class _Pacer:
+    """Выдает слоты отправки не чаще, чем раз в interval секунд"""
+
+    __slots__ = ("_next_slot", "interval")
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        # Между чтением и обновлением слота нет await, поэтому блокировка не нужна
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def merge_plain_messages(
+    messages: Iterable[OutgoingMessage], limit: int = TELEGRAM_MESSAGE_LIMIT
+) -> list[OutgoingMessage]:
+    """
+    Склейка подряд идущих сообщений в один чат без клавиатуры
+
+    Сообщения с reply_markup не склеиваются: у каждого своя клавиатура.
+    Текст после такого сообщения начинает новую склейку, чтобы порядок
+    сообщений внутри чата не менялся.
+
+    Args:
+        messages: Сообщения в порядке отправки
+        limit: Максимальная длина итогового текста
+
+    Returns:
+        Новый список сообщений
+    """
+    merged: list[OutgoingMessage] = []
+    last_by_chat: dict[int, OutgoingMessage] = {}
+
+    for message in messages:
+        if message.kwargs.get("reply_markup") is not None:
+            merged.append(message)
+            last_by_chat.pop(message.chat_id, None)
+            continue
+
+        previous = last_by_chat.get(message.chat_id)
+        if (
+            previous is not None
+            and previous.kwargs == message.kwargs
+            and len(previous.text) + len(MERGE_SEPARATOR) + len(message.text) <= limit
+        ):
+            previous.text = f"{previous.text}{MERGE_SEPARATOR}{message.text}"
+            continue
+
+        copy = OutgoingMessage(message.chat_id, message.text, dict(message.kwargs))
+        merged.append(copy)
+        last_by_chat[message.chat_id] = copy
+
+    return merged
+
+
+class BulkSender:
+    """Отправка пачки сообщений с учетом лимитов Telegram"""
+
+    def __init__(
+        self,
+        bot,
+        max_concurrency: int = 8,
+        global_rate: float = 0.0,
+        private_interval: float = 0.0,
+        group_interval: float = 0.0,
+        max_attempts: int = 5,
+        priority: int = SendPriority.BULK,
+    ):
+        """
+        Инициализация
+
+        Args:
+            bot: Экземпляр бота
+            max_concurrency: Сколько чатов обслуживается одновременно
+            global_rate: Максимум сообщений в секунду суммарно для этой рассылки
+                (0 - только общий лимит send_scheduler)
+            private_interval: Пауза между сообщениями в один личный чат (секунды)
+            group_interval: Пауза между сообщениями в одну группу (секунды)
+            max_attempts: Количество попыток отправки одного сообщения
+            priority: Приоритет в очереди send_scheduler
+        """
+        self.bot = bot
+        self.max_concurrency = max_concurrency
+        self.private_interval = private_interval
+        self.group_interval = group_interval
+        self.max_attempts = max_attempts
+        self.priority = priority
+        self._pacer = _Pacer(1.0 / global_rate if global_rate > 0 else 0.0)
+
+    async def send_all(
+        self, messages: Iterable[OutgoingMessage], merge_plain_text: bool = False
+    ) -> BulkSendResult:
+        """
+        Отправка сообщений
+
+        Порядок сообщений внутри одного чата сохраняется.
+
+        Args:
+            messages: Сообщения на отправку
+            merge_plain_text: Склеивать текстовые сообщения в один чат
+
+        Returns:
+            BulkSendResult со счетчиками отправленных/неотправленных
+        """
+        if merge_plain_text:
+            messages = merge_plain_messages(messages)
+
+        by_chat: dict[int, list[OutgoingMessage]] = {}
+        for message in messages:
+            by_chat.setdefault(message.chat_id, []).append(message)
+
+        result = BulkSendResult(chats=len(by_chat))
+        if not by_chat:
+            return result
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _send_chat(chat_id: int, chat_messages: list[OutgoingMessage]) -> None:
+            interval = self.group_interval if is_group_chat(chat_id) else self.private_interval
+            async with semaphore:
+                for position, message in enumerate(chat_messages):
+                    if position and interval:
+                        await asyncio.sleep(interval)
+                    await self._pacer.wait()
+                    sent = await safe_send_message(
+                        self.bot,
+                        chat_id,
+                        message.text,
+                        max_attempts=self.max_attempts,
+                        priority=self.priority,
+                        **message.kwargs,
+                    )
+                    if sent:
+                        result.sent += 1
+                    else:
+                        result.failed += 1
+
+        await asyncio.gather(
+            *(_send_chat(chat_id, chat_messages) for chat_id, chat_messages in by_chat.items())
+        )
+
+        logger.info(
+            "Bulk send completed: %d sent, %d failed, %d chats",
+            result.sent,
+            result.failed,
+            result.chats,
+        )
+        return result
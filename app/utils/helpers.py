@@ -4,7 +4,7 @@
 
 import logging
 import re
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from html import escape
 
 
@@ -28,6 +28,27 @@ def get_now() -> datetime:
     return datetime.now(MOSCOW_TZ)
 
 
+def to_db_timestamp(dt: date | datetime) -> str:
+    """
+    Момент в формате колонок времени статусов заявки (assigned_at ... closed_at)
+
+    Наивное московское время "YYYY-MM-DD HH:MM:SS.ffffff" - в таком виде
+    datetime сохраняет SQLAlchemy, поэтому значения, записанные legacy
+    Database и ORM, сравниваются в SQL как строки.
+
+    Args:
+        dt: Объект datetime (наивный считается московским) или date (полночь)
+
+    Returns:
+        Строка для записи в БД или сравнения в запросе
+    """
+    if not isinstance(dt, datetime):
+        dt = datetime.combine(dt, time.min)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(MOSCOW_TZ).replace(tzinfo=None)
+    return dt.isoformat(sep=" ", timespec="microseconds")
+
+
 def validate_phone(phone: str) -> bool:
     """
     Валидация номера телефона
@@ -73,6 +94,34 @@ def format_phone(phone: str) -> str:
     return cleaned
 
 
+def normalize_phone(phone: str | None) -> str | None:
+    """
+    Каноническая форма номера телефона: только цифры, российские номера с 7
+
+    Используется для колонки orders.client_phone_normalized и запросов к ней,
+    чтобы "+7 (900) 123-45-67", "89001234567" и "9001234567" совпадали.
+
+    Args:
+        phone: Номер телефона в произвольном формате
+
+    Returns:
+        Строка цифр или None, если цифр в номере нет
+    """
+    if not phone:
+        return None
+
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        return None
+
+    if len(digits) == 11 and digits.startswith("8"):
+        return "7" + digits[1:]
+    if len(digits) == 10:
+        return "7" + digits
+
+    return digits
+
+
 def format_datetime(dt: datetime) -> str:
     """
     Форматирование даты и времени
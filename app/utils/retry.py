@@ -21,6 +21,8 @@ from aiogram.exceptions import (
     TelegramUnauthorizedError,
 )
 
+from app.utils.send_scheduler import SendPriority, send_scheduler
+
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,9 @@ def retry_on_telegram_error(
                         max_attempts,
                     )
 
+                    # Остальные запросы тоже ждут: лимит общий для всего бота
+                    send_scheduler.throttle(wait_time)
+
                     if attempt < max_attempts:
                         logger.info("Waiting %s seconds before retry...", wait_time)
                         await asyncio.sleep(wait_time)
@@ -181,25 +186,34 @@ async def safe_send_message(
     chat_id: int,
     text: str,
     max_attempts: int = 3,
+    priority: int = SendPriority.INTERACTIVE,
     **kwargs: Any,
 ) -> Any | None:
     """
     Безопасная отправка сообщения с автоматическим retry
 
+    Отправка идет через send_scheduler (лимиты Bot API на бота и на чат).
+    Каждая повторная попытка заново встает в очередь планировщика, а пауза
+    между попытками не занимает его слот.
+
     Args:
         bot: Экземпляр бота
         chat_id: ID чата
         text: Текст сообщения
         max_attempts: Максимальное количество попыток
+        priority: Приоритет в очереди отправки (SendPriority)
         **kwargs: Дополнительные параметры для send_message
 
     Returns:
         Message объект или None при ошибке
     """
 
+    async def _request():
+        return await bot.send_message(chat_id, text, **kwargs)
+
     @retry_on_telegram_error(max_attempts=max_attempts)
     async def _send():
-        return await bot.send_message(chat_id, text, **kwargs)
+        return await send_scheduler.run(chat_id, _request, priority)
 
     return await _send()
 
@@ -249,24 +263,36 @@ async def safe_edit_message(
     message,
     text: str,
     max_attempts: int = 3,
+    priority: int = SendPriority.INTERACTIVE,
     **kwargs: Any,
 ) -> Any | None:
     """
     Безопасное редактирование сообщения с retry
 
+    Повторные правки того же сообщения, пока предыдущая ждет в очереди
+    send_scheduler, схлопываются: отправляется только последний текст.
+
     Args:
         message: Message объект
         text: Новый текст
         max_attempts: Максимальное количество попыток
+        priority: Приоритет в очереди отправки (SendPriority)
         **kwargs: Дополнительные параметры
 
     Returns:
         Message объект или None при ошибке
     """
 
+    chat_id = message.chat.id
+    message_id = getattr(message, "message_id", None)
+    coalesce_key = ("edit", chat_id, message_id) if message_id is not None else None
+
+    async def _request():
+        return await message.edit_text(text, **kwargs)
+
     @retry_on_telegram_error(max_attempts=max_attempts)
     async def _edit():
-        return await message.edit_text(text, **kwargs)
+        return await send_scheduler.run(chat_id, _request, priority, coalesce_key)
 
     return await _edit()
 
@@ -276,6 +302,7 @@ async def safe_delete_message(
     chat_id: int,
     message_id: int,
     max_attempts: int = 2,
+    priority: int = SendPriority.INTERACTIVE,
 ) -> bool:
     """
     Безопасное удаление сообщения с retry
@@ -285,14 +312,18 @@ async def safe_delete_message(
         chat_id: ID чата
         message_id: ID сообщения
         max_attempts: Максимальное количество попыток
+        priority: Приоритет в очереди отправки (SendPriority)
 
     Returns:
         True при успехе, False при ошибке
     """
 
+    async def _request():
+        return await bot.delete_message(chat_id, message_id)
+
     @retry_on_telegram_error(max_attempts=max_attempts, base_delay=0.5)
     async def _delete():
-        return await bot.delete_message(chat_id, message_id)
+        return await send_scheduler.run(chat_id, _request, priority)
 
     result = await _delete()
     return result is not None
@@ -0,0 +1,415 @@
+"""
+Общий планировщик исходящих запросов к Telegram Bot API
+
+Telegram ограничивает бота примерно 30 сообщениями в секунду суммарно,
+1 сообщением в секунду в личный чат и 20 сообщениями в минуту в группу.
+Без общего планировщика ограничения замечаются только по ответу 429
+(TelegramRetryAfter), когда рассылка уже упёрлась в лимит.
+
+SendScheduler пропускает запросы через token bucket-ы (глобальный и по
+чату) заранее:
+- очереди по приоритету: ответы пользователям (INTERACTIVE) уходят раньше
+  фоновых уведомлений (BULK);
+- внутри одного чата запросы выполняются строго по очереди (порядок
+  сообщений сохраняется);
+- повторное редактирование того же сообщения, пока предыдущее еще ждет
+  в очереди, схлопывается: уходит только последний текст;
+- после 429 отправка приостанавливается целиком на retry_after секунд.
+
+Очередь привязана к event loop и запускается при первом запросе.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Лимиты Bot API (сообщений в секунду) и допустимые всплески
+GLOBAL_RATE = 30.0
+GLOBAL_BURST = 30
+PRIVATE_CHAT_RATE = 1.0
+PRIVATE_CHAT_BURST = 3
+GROUP_CHAT_RATE = 20 / 60
+GROUP_CHAT_BURST = 5
+
+# Сколько последних задержек в очереди хранить для метрик
+LATENCY_SAMPLES = 1000
+
+# Как часто удалять состояние простаивающих чатов (секунды)
+IDLE_SWEEP_INTERVAL = 60.0
+
+
+class SendPriority(IntEnum):
+    """Приоритет исходящего запроса (меньше - раньше)"""
+
+    INTERACTIVE = 0  # Ответ на действие пользователя
+    NORMAL = 1
+    BULK = 2  # Рассылки и фоновые уведомления
+
+
+class _TokenBucket:
+    """Token bucket на монотонных часах"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Через сколько секунд будет доступен токен"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        """Использование токена"""
+        if self.rate <= 0:
+            return
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        """Восстановлен ли весь запас (состояние не отличается от нового)"""
+        return self.rate <= 0 or self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+@dataclass(slots=True, eq=False)
+class _Job:
+    """Запрос в очереди"""
+
+    priority: int
+    seq: int
+    chat_id: int
+    factory: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued_at: float
+    coalesce_key: Hashable | None = None
+
+
+@dataclass(slots=True, eq=False)
+class _ChatQueue:
+    """Очередь и лимит одного чата"""
+
+    bucket: _TokenBucket
+    jobs: deque[_Job] = field(default_factory=deque)
+    # Выполняется запрос этого чата
+    busy: bool = False
+    # Чат стоит в очереди готовых или ожидающих
+    scheduled: bool = False
+
+
+def is_group_chat(chat_id: int) -> bool:
+    """Группы и супергруппы в Telegram имеют отрицательный chat_id"""
+    return chat_id < 0
+
+
+class SendScheduler:
+    """Приоритетная очередь запросов к Bot API с глобальным и початовым лимитом"""
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE,
+        global_burst: int = GLOBAL_BURST,
+        private_rate: float = PRIVATE_CHAT_RATE,
+        private_burst: int = PRIVATE_CHAT_BURST,
+        group_rate: float = GROUP_CHAT_RATE,
+        group_burst: int = GROUP_CHAT_BURST,
+        enabled: bool = True,
+    ):
+        """
+        Инициализация
+
+        Args:
+            global_rate: Запросов в секунду суммарно (0 - без ограничения)
+            global_burst: Допустимый всплеск суммарно
+            private_rate: Запросов в секунду в личный чат
+            private_burst: Допустимый всплеск в личный чат
+            group_rate: Запросов в секунду в группу
+            group_burst: Допустимый всплеск в группу
+            enabled: False - запросы выполняются сразу, без очереди
+        """
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.private_rate = private_rate
+        self.private_burst = private_burst
+        self.group_rate = group_rate
+        self.group_burst = group_burst
+        self.enabled = enabled
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        self._seq = itertools.count()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        now = time.monotonic()
+        self._global = _TokenBucket(self.global_rate, self.global_burst, now)
+        self._chats: dict[int, _ChatQueue] = {}
+        # (приоритет, порядковый номер головного запроса, chat_id)
+        self._ready: list[tuple[int, int, int]] = []
+        # (момент, когда у чата появится токен, chat_id)
+        self._delayed: list[tuple[float, int]] = []
+        self._pending_edits: dict[Hashable, _Job] = {}
+        self._paused_until = 0.0
+        self._next_sweep = now + IDLE_SWEEP_INTERVAL
+        self._wakeup = asyncio.Event()
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Очередь другого (например, уже закрытого) цикла событий не переиспользуется
+            self._loop = loop
+            self._task = None
+            self._running = set()
+            self._reset_state()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._dispatch(), name="telegram-send-scheduler")
+
+    def submit(
+        self,
+        chat_id: int,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = SendPriority.INTERACTIVE,
+        coalesce_key: Hashable | None = None,
+    ) -> asyncio.Future:
+        """
+        Постановка запроса в очередь
+
+        Args:
+            chat_id: ID чата, в который идет запрос
+            factory: Функция, выполняющая запрос (вызывается, когда подойдет очередь)
+            priority: SendPriority
+            coalesce_key: Ключ схлопывания: если запрос с тем же ключом еще ждет
+                в очереди, вместо него выполнится новый, а оба вызова получат
+                его результат
+
+        Returns:
+            Future с результатом factory()
+        """
+        self._ensure_started()
+
+        if coalesce_key is not None:
+            pending = self._pending_edits.get(coalesce_key)
+            if pending is not None and not pending.future.done():
+                pending.factory = factory
+                self.coalesced += 1
+                return pending.future
+
+        now = time.monotonic()
+        job = _Job(
+            priority=int(priority),
+            seq=next(self._seq),
+            chat_id=chat_id,
+            factory=factory,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=now,
+            coalesce_key=coalesce_key,
+        )
+        if coalesce_key is not None:
+            self._pending_edits[coalesce_key] = job
+
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            if is_group_chat(chat_id):
+                bucket = _TokenBucket(self.group_rate, self.group_burst, now)
+            else:
+                bucket = _TokenBucket(self.private_rate, self.private_burst, now)
+            chat = self._chats[chat_id] = _ChatQueue(bucket)
+        chat.jobs.append(job)
+
+        if not chat.busy and not chat.scheduled:
+            chat.scheduled = True
+            heapq.heappush(self._ready, (job.priority, job.seq, chat_id))
+        self._wakeup.set()
+        return job.future
+
+    async def run(
+        self,
+        chat_id: int,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = SendPriority.INTERACTIVE,
+        coalesce_key: Hashable | None = None,
+    ) -> Any:
+        """
+        Выполнение запроса через очередь (см. submit)
+
+        Returns:
+            Результат factory()
+        """
+        if not self.enabled:
+            return await factory()
+        # Схлопнутый запрос ждут несколько вызовов: отмена одного не отменяет запрос
+        return await asyncio.shield(self.submit(chat_id, factory, priority, coalesce_key))
+
+    def throttle(self, seconds: float) -> None:
+        """
+        Приостановка всех отправок (после 429 Too Many Requests)
+
+        Args:
+            seconds: retry_after из ответа Telegram
+        """
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def _wait(self, delay: float | None) -> None:
+        """Ожидание нового запроса или освобождения чата (не дольше delay секунд)"""
+        self._wakeup.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    async def _dispatch(self) -> None:
+        """Цикл выдачи запросов с учетом приоритета и лимитов"""
+        while True:
+            now = time.monotonic()
+            if now >= self._next_sweep:
+                self._sweep_idle(now)
+
+            # Чаты, у которых восстановился токен, возвращаются в очередь готовых
+            while self._delayed and self._delayed[0][0] <= now:
+                _, chat_id = heapq.heappop(self._delayed)
+                head = self._chats[chat_id].jobs[0]
+                heapq.heappush(self._ready, (head.priority, head.seq, chat_id))
+
+            if not self._ready:
+                await self._wait(self._delayed[0][0] - now if self._delayed else None)
+                continue
+
+            # Глобальный лимит и пауза после 429
+            wait = max(self._global.delay(now), self._paused_until - now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            _, _, chat_id = heapq.heappop(self._ready)
+            chat = self._chats[chat_id]
+
+            # Отмененные запросы (close) пропускаются
+            while chat.jobs and chat.jobs[0].future.done():
+                self._forget(chat.jobs.popleft())
+            if not chat.jobs:
+                chat.scheduled = False
+                continue
+
+            head = chat.jobs[0]
+            chat_wait = chat.bucket.delay(now)
+            if chat_wait > 0:
+                heapq.heappush(self._delayed, (now + chat_wait, chat_id))
+                continue
+
+            job = chat.jobs.popleft()
+            self._forget(job)
+            chat.scheduled = False
+            chat.busy = True
+            self._global.take(now)
+            chat.bucket.take(now)
+            self._latencies.append(now - head.enqueued_at)
+
+            task = asyncio.create_task(self._execute(chat_id, chat, job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def _forget(self, job: _Job) -> None:
+        if job.coalesce_key is not None and self._pending_edits.get(job.coalesce_key) is job:
+            del self._pending_edits[job.coalesce_key]
+
+    async def _execute(self, chat_id: int, chat: _ChatQueue, job: _Job) -> None:
+        """Выполнение запроса и возврат чата в очередь"""
+        try:
+            result = await job.factory()
+        except Exception as e:
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            chat.busy = False
+            if chat.jobs:
+                head = chat.jobs[0]
+                chat.scheduled = True
+                heapq.heappush(self._ready, (head.priority, head.seq, chat_id))
+                self._wakeup.set()
+
+    def _sweep_idle(self, now: float) -> None:
+        """Удаление чатов без запросов, у которых восстановился весь лимит"""
+        idle = [
+            chat_id
+            for chat_id, chat in self._chats.items()
+            if not chat.jobs and not chat.busy and chat.bucket.is_full(now)
+        ]
+        for chat_id in idle:
+            del self._chats[chat_id]
+        self._next_sweep = now + IDLE_SWEEP_INTERVAL
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Метрики очереди
+
+        Returns:
+            Глубина очереди по приоритетам, выполняющиеся запросы, счетчики и
+            задержка в очереди (среднее, p95, максимум по последним запросам, секунды)
+        """
+        depth = {priority.name.lower(): 0 for priority in SendPriority}
+        for chat in self._chats.values():
+            for job in chat.jobs:
+                depth[SendPriority(job.priority).name.lower()] += 1
+
+        latencies = sorted(self._latencies)
+        return {
+            "queued": sum(depth.values()),
+            "queued_by_priority": depth,
+            "in_flight": sum(1 for chat in self._chats.values() if chat.busy),
+            "chats": len(self._chats),
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "throttled": self.throttled,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Остановка цикла выдачи (при остановке бота); ожидающие запросы отменяются"""
+        if self._task is not None and self._loop is asyncio.get_running_loop():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            if self._running:
+                await asyncio.gather(*self._running, return_exceptions=True)
+        for chat in self._chats.values():
+            for job in chat.jobs:
+                job.future.cancel()
+        self._task = None
+        self._loop = None
+        self._reset_state()
+
+
+# Общий планировщик процесса: через него идут safe_send_message/edit/delete
+send_scheduler = SendScheduler()
@@ -14,10 +14,10 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode, UpdateType
 from aiogram.types import BotCommand
 from aiogram.fsm.storage.memory import MemoryStorage
-from aiogram.fsm.storage.redis import RedisStorage
 
 from app.config import Config
 from app.database import Database, get_database
+from app.database.registry import database_registry
 from app.handlers import routers
 from app.middlewares import (
     DependencyInjectionMiddleware,
@@ -28,6 +28,7 @@ from app.middlewares import (
     global_error_handler,
 )
 from app.services.scheduler import TaskScheduler
+from app.utils.send_scheduler import send_scheduler
 from app.utils.sentry import init_sentry
 
 
@@ -207,6 +208,9 @@ async def main():
         logger.info("=" * 60)
 
         if redis_url and not Config.DEV_MODE:
+            # redis импортируется только когда он действительно используется
+            from aiogram.fsm.storage.redis import RedisStorage
+
             logger.info("OK: Используется RedisStorage для FSM: %s", redis_url)
             storage = RedisStorage.from_url(redis_url)
         else:
@@ -254,6 +258,11 @@ async def main():
             burst=4,  # максимум 4 подряд
             max_violations=30,  # бан после 30 нарушений
             violation_window=60,  # в течении 60 секунд
+            max_users=Config.RATE_LIMIT_MAX_USERS,  # давно неактивные вытесняются из памяти
+            # Общие лимиты для всех контейнеров городов (только вместе с RedisStorage)
+            redis_url=redis_url
+            if Config.RATE_LIMIT_REDIS and redis_url and not Config.DEV_MODE
+            else None,
         )
         dp.message.middleware(rate_limit_middleware)
         dp.callback_query.middleware(rate_limit_middleware)
@@ -374,6 +383,12 @@ async def main():
             except Exception as e:
                 logger.error("Ошибка при остановке парсера: %s", e)
 
+        # Остановка очереди исходящих сообщений
+        try:
+            await send_scheduler.close()
+        except Exception as e:
+            logger.error("Ошибка при остановке очереди отправки: %s", e)
+
         # Закрытие соединения с БД
         if db:
             try:
@@ -381,6 +396,12 @@ async def main():
             except Exception as e:
                 logger.error("Ошибка при отключении БД: %s", e)
 
+        # Закрытие общих подключений процесса (engine и пул соединений)
+        try:
+            await database_registry.close_all()
+        except Exception as e:
+            logger.error("Ошибка при закрытии общих подключений БД: %s", e)
+
         # Закрытие storage (для Redis)
         if dp and hasattr(dp.storage, "close"):
             try:
@@ -50,6 +50,11 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:  # noqa: A002
+    """Исключаем из autogenerate служебные таблицы FTS5-индекса адресов"""
+    return not (type_ == "table" and name.startswith("orders_address_fts"))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -66,6 +71,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         # Настройки для SQLite
@@ -93,6 +99,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
             # Настройки для SQLite
             render_as_batch=True,  # Включаем batch mode для SQLite
         )
@@ -0,0 +1,88 @@
+"""Add FTS5 trigram index for order addresses
+
+Revision ID: add_address_search_index
+Revises: ensure_parser_config
+Create Date: 2025-02-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_address_search_index'
+down_revision: Union[str, None] = 'ensure_parser_config'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# DDL дублируется из app/database/address_search.py намеренно:
+# миграция не должна зависеть от изменений кода приложения
+FTS_TABLE = 'orders_address_fts'
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        print("Address FTS index is SQLite-only. Skipping.")
+        return
+
+    if not sa.inspect(bind).has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    op.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            client_address,
+            content='orders',
+            content_rowid='id',
+            tokenize='trigram'
+        )
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orders_address_fts_insert
+        AFTER INSERT ON orders BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, client_address)
+            VALUES (new.id, new.client_address);
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orders_address_fts_delete
+        AFTER DELETE ON orders BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, client_address)
+            VALUES ('delete', old.id, old.client_address);
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_orders_address_fts_update
+        AFTER UPDATE OF client_address ON orders BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, client_address)
+            VALUES ('delete', old.id, old.client_address);
+            INSERT INTO {FTS_TABLE}(rowid, client_address)
+            VALUES (new.id, new.client_address);
+        END
+        """
+    )
+
+    # Заполняем индекс существующими заявками
+    op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS trg_orders_address_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_orders_address_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS trg_orders_address_fts_insert")
+    op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
@@ -0,0 +1,102 @@
+"""Add normalized client phone column with index
+
+Revision ID: add_client_phone_normalized
+Revises: add_address_search_index
+Create Date: 2025-02-12 12:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_client_phone_normalized'
+down_revision: Union[str, None] = 'add_address_search_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+
+def _normalize_phone(phone):
+    """Копия app.utils.helpers.normalize_phone: миграция не зависит от кода приложения"""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        return None
+    if len(digits) == 11 and digits.startswith("8"):
+        return "7" + digits[1:]
+    if len(digits) == 10:
+        return "7" + digits
+    return digits
+
+
+def upgrade() -> None:
+    """Добавление client_phone_normalized в orders и заполнение для существующих заявок"""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    columns = [c['name'] for c in inspector.get_columns('orders')]
+    if 'client_phone_normalized' in columns:
+        print("[INFO] Колонка client_phone_normalized уже существует в orders")
+    else:
+        # Без batch_alter_table: пересоздание orders удалило бы триггеры FTS-индекса адресов
+        op.add_column('orders', sa.Column('client_phone_normalized', sa.String(20), nullable=True))
+        print("[OK] Добавлена колонка client_phone_normalized в orders")
+
+    # Backfill пачками
+    rows = bind.execute(
+        sa.text("SELECT id, client_phone FROM orders WHERE client_phone_normalized IS NULL")
+    ).fetchall()
+    updates = [
+        {"id": row[0], "phone": normalized}
+        for row in rows
+        if (normalized := _normalize_phone(row[1])) is not None
+    ]
+    for start in range(0, len(updates), BATCH_SIZE):
+        bind.execute(
+            sa.text("UPDATE orders SET client_phone_normalized = :phone WHERE id = :id"),
+            updates[start : start + BATCH_SIZE],
+        )
+    print(f"[OK] Заполнено client_phone_normalized: {len(updates)} заявок")
+
+    indexes = [i['name'] for i in inspector.get_indexes('orders')]
+    if 'idx_orders_client_phone_normalized' not in indexes:
+        op.create_index(
+            'idx_orders_client_phone_normalized',
+            'orders',
+            ['client_phone_normalized'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Удаление client_phone_normalized из orders"""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    indexes = [i['name'] for i in inspector.get_indexes('orders')]
+    if 'idx_orders_client_phone_normalized' in indexes:
+        op.drop_index('idx_orders_client_phone_normalized', table_name='orders')
+
+    columns = [c['name'] for c in inspector.get_columns('orders')]
+    if 'client_phone_normalized' in columns:
+        op.drop_column('orders', 'client_phone_normalized')
+        print("[OK] Удалена колонка client_phone_normalized из orders")
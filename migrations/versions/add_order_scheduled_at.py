@@ -0,0 +1,160 @@
+"""Add pre-parsed visit time (scheduled_at, scheduled_until) to orders
+
+Revision ID: add_order_scheduled_at
+Revises: add_order_status_timestamps
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_order_scheduled_at'
+down_revision: Union[str, None] = 'add_order_status_timestamps'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+MOSCOW_TZ = timezone(timedelta(hours=3))
+
+FINAL_STATUSES = ('CLOSED', 'REFUSED')
+
+COLUMNS = ('scheduled_at', 'scheduled_until')
+
+
+def _base_date(value) -> date | None:
+    """Дата, относительно которой вводилось время (updated_at заявки)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        text = str(value)
+        try:
+            moment = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if moment.tzinfo is None and len(text) == 19:
+            moment = moment.replace(tzinfo=timezone.utc)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(MOSCOW_TZ)
+    return moment.date()
+
+
+def _parse_scheduled_time(text: str, base: date) -> datetime | None:
+    """
+    Разбор времени визита так же, как это делал планировщик напоминаний
+
+    Копия логики намеренно: миграция не должна зависеть от кода приложения.
+    Относительные даты ("завтра", "через 2 дня") считаются от base.
+    """
+    text = text.lower().strip()
+
+    time_match = re.search(r"(\d{1,2}):(\d{2})", text)
+    if not time_match:
+        return None
+
+    target_date = base
+    if "послезавтра" in text:
+        target_date = base + timedelta(days=2)
+    elif "завтра" in text:
+        target_date = base + timedelta(days=1)
+    else:
+        days_match = re.search(r"через\s+(\d+)\s+дн", text)
+        if days_match:
+            target_date = base + timedelta(days=int(days_match.group(1)))
+
+    date_match = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", text)
+    try:
+        if date_match:
+            target_date = date(
+                int(date_match.group(3)), int(date_match.group(2)), int(date_match.group(1))
+            )
+        return datetime.combine(
+            target_date,
+            datetime.min.time().replace(
+                hour=int(time_match.group(1)), minute=int(time_match.group(2))
+            ),
+        )
+    except ValueError:
+        return None
+
+
+def upgrade() -> None:
+    """Добавление колонок времени визита и заполнение для активных заявок"""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    columns = [c['name'] for c in inspector.get_columns('orders')]
+    for column in COLUMNS:
+        if column in columns:
+            print(f"[INFO] Колонка {column} уже существует в orders")
+            continue
+        # Без batch_alter_table: пересоздание orders удалило бы триггеры FTS-индекса адресов
+        op.add_column('orders', sa.Column(column, sa.DateTime(), nullable=True))
+        print(f"[OK] Добавлена колонка {column} в orders")
+
+    # Закрытые и отказанные заявки напоминаний не получают - их не трогаем
+    orders = bind.execute(
+        sa.text(
+            "SELECT id, scheduled_time, updated_at, created_at FROM orders "
+            "WHERE scheduled_at IS NULL AND scheduled_time IS NOT NULL "
+            "AND scheduled_time != 'None' AND status NOT IN :final"
+        ).bindparams(sa.bindparam("final", expanding=True)),
+        {"final": list(FINAL_STATUSES)},
+    ).fetchall()
+
+    rows = []
+    for order_id, scheduled_time, updated_at, created_at in orders:
+        base = _base_date(updated_at) or _base_date(created_at)
+        if base is None:
+            continue
+        moment = _parse_scheduled_time(scheduled_time, base)
+        if moment is not None:
+            rows.append({"id": order_id, "moment": moment})
+
+    statement = sa.text(
+        "UPDATE orders SET scheduled_at = :moment WHERE id = :id"
+    ).bindparams(sa.bindparam("moment", type_=sa.DateTime()))
+    for start in range(0, len(rows), BATCH_SIZE):
+        bind.execute(statement, rows[start : start + BATCH_SIZE])
+    print(f"[OK] Заполнено scheduled_at: {len(rows)} из {len(orders)} заявок")
+
+    indexes = [i['name'] for i in inspector.get_indexes('orders')]
+    if 'idx_orders_scheduled_at' not in indexes:
+        op.create_index('idx_orders_scheduled_at', 'orders', ['scheduled_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Удаление колонок времени визита"""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    indexes = [i['name'] for i in inspector.get_indexes('orders')]
+    if 'idx_orders_scheduled_at' in indexes:
+        op.drop_index('idx_orders_scheduled_at', table_name='orders')
+
+    columns = [c['name'] for c in inspector.get_columns('orders')]
+    for column in COLUMNS:
+        if column in columns:
+            op.drop_column('orders', column)
+            print(f"[OK] Удалена колонка {column} из orders")
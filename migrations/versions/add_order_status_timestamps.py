@@ -0,0 +1,144 @@
+"""Add status entry timestamps (assigned_at, accepted_at, onsite_at, closed_at) to orders
+
+Revision ID: add_order_status_timestamps
+Revises: add_client_phone_normalized
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_order_status_timestamps'
+down_revision: Union[str, None] = 'add_client_phone_normalized'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+MOSCOW_TZ = timezone(timedelta(hours=3))
+
+STATUS_COLUMNS = {
+    'ASSIGNED': 'assigned_at',
+    'ACCEPTED': 'accepted_at',
+    'ONSITE': 'onsite_at',
+    'CLOSED': 'closed_at',
+}
+
+
+def _to_moscow(value):
+    """
+    Время из БД -> наивное московское
+
+    В updated_at и order_status_history.changed_at встречаются isoformat со
+    смещением (legacy), наивное московское время (ORM) и CURRENT_TIMESTAMP
+    в UTC ("YYYY-MM-DD HH:MM:SS" без долей секунды)
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        text = str(value)
+        try:
+            moment = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if moment.tzinfo is None and len(text) == 19:
+            moment = moment.replace(tzinfo=timezone.utc)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(MOSCOW_TZ).replace(tzinfo=None)
+    return moment
+
+
+def upgrade() -> None:
+    """Добавление колонок времени входа в статусы и заполнение по истории статусов"""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    columns = [c['name'] for c in inspector.get_columns('orders')]
+    for column in STATUS_COLUMNS.values():
+        if column in columns:
+            print(f"[INFO] Колонка {column} уже существует в orders")
+            continue
+        # Без batch_alter_table: пересоздание orders удалило бы триггеры FTS-индекса адресов
+        op.add_column('orders', sa.Column(column, sa.DateTime(), nullable=True))
+        print(f"[OK] Добавлена колонка {column} в orders")
+
+    # Последний вход в статус по истории; для текущего статуса без истории - updated_at
+    entered: dict[tuple[int, str], datetime] = {}
+    if inspector.has_table('order_status_history'):
+        history = bind.execute(
+            sa.text("SELECT order_id, new_status, changed_at FROM order_status_history")
+        ).fetchall()
+        for order_id, status, changed_at in history:
+            column = STATUS_COLUMNS.get(status)
+            moment = _to_moscow(changed_at)
+            if column is None or moment is None:
+                continue
+            key = (order_id, column)
+            if key not in entered or entered[key] < moment:
+                entered[key] = moment
+
+    select_columns = ", ".join(STATUS_COLUMNS.values())
+    orders = bind.execute(
+        sa.text(f"SELECT id, status, updated_at, {select_columns} FROM orders")  # nosec B608
+    ).fetchall()
+
+    updates: dict[str, list[dict]] = {column: [] for column in STATUS_COLUMNS.values()}
+    for row in orders:
+        order_id, status, updated_at = row[0], row[1], row[2]
+        current = dict(zip(STATUS_COLUMNS.values(), row[3:]))
+        for column in STATUS_COLUMNS.values():
+            if current[column] is not None:
+                continue
+            moment = entered.get((order_id, column))
+            if moment is None and STATUS_COLUMNS.get(status) == column:
+                moment = _to_moscow(updated_at)
+            if moment is not None:
+                updates[column].append({"id": order_id, "moment": moment})
+
+    for column, rows in updates.items():
+        statement = sa.text(
+            f"UPDATE orders SET {column} = :moment WHERE id = :id"  # nosec B608
+        ).bindparams(sa.bindparam("moment", type_=sa.DateTime()))
+        for start in range(0, len(rows), BATCH_SIZE):
+            bind.execute(statement, rows[start : start + BATCH_SIZE])
+        print(f"[OK] Заполнено {column}: {len(rows)} заявок")
+
+    indexes = [i['name'] for i in inspector.get_indexes('orders')]
+    if 'idx_orders_closed_at' not in indexes:
+        op.create_index('idx_orders_closed_at', 'orders', ['closed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Удаление колонок времени входа в статусы"""
+    from sqlalchemy import inspect
+
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table('orders'):
+        print("[SKIP] Таблица orders не существует")
+        return
+
+    indexes = [i['name'] for i in inspector.get_indexes('orders')]
+    if 'idx_orders_closed_at' in indexes:
+        op.drop_index('idx_orders_closed_at', table_name='orders')
+
+    columns = [c['name'] for c in inspector.get_columns('orders')]
+    for column in STATUS_COLUMNS.values():
+        if column in columns:
+            op.drop_column('orders', column)
+            print(f"[OK] Удалена колонка {column} из orders")
@@ -1,13 +1,28 @@
 """
 Скрипт для создания резервной копии базы данных
-Использование: python backup_db.py
+Использование: python backup_db.py [--keep-days 30] [--compression gzip]
+
+Копия снимается онлайн-бэкапом SQLite (app/database/backup.py), поэтому
+скрипт можно запускать при работающем боте.
 """
 
 import io
 import os
-import shutil
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
+from pathlib import Path
+
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.backup import (
+    COMPRESSION_GZIP,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    BackupError,
+    SQLiteBackup,
+)
 
 
 # Настройка кодировки для консоли Windows
@@ -19,12 +34,13 @@ def format_size(size_bytes):
     return f"{size_bytes / 1024:.2f} KB"
 
 
-def backup_database(keep_days=30):
+def backup_database(keep_days=30, compression=COMPRESSION_GZIP):
     """
     Создание резервной копии базы данных
 
     Args:
         keep_days: Количество дней для хранения копий (по умолчанию 30)
+        compression: Сжатие копии: none, gzip (по умолчанию, как у бота) или zstd
     """
 
     # Поддержка Docker: используем переменную окружения или относительный путь
@@ -42,65 +58,32 @@ def backup_database(keep_days=30):
 
     print(f"✅ База данных найдена: {db_file}")
 
-    # Создание директории для backup
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
-        print(f"✅ Создана директория: {backup_dir}")
-    else:
-        print(f"✅ Директория существует: {backup_dir}")
-
-    # Получение размера БД
-    os.path.getsize(db_file)
-
-    # Создание имени файла с датой и временем
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    backup_file = os.path.join(backup_dir, f"bot_database_{timestamp}.db")
+    backup = SQLiteBackup(db_file, backup_dir, compression=compression, keep_days=keep_days)
 
-    # Создание резервной копии
+    # Создание резервной копии (с проверкой и удалением старых копий)
     try:
-        shutil.copy2(db_file, backup_file)
-        db_size = os.path.getsize(backup_file)
-        print(f"✅ Backup создан: {backup_file}")
-        print(f"📊 Размер: {format_size(db_size)}")
-    except Exception as e:
+        result = backup.create_sync()
+        print(f"✅ Backup создан: {result.path}")
+        print(f"📊 Размер: {format_size(result.size)}")
+        print(f"🔐 SHA-256: {result.checksum}")
+    except (BackupError, OSError) as e:
         print(f"❌ ОШИБКА при создании backup: {e}")
         return False
 
-    # Подсчет всех резервных копий
-    backup_files = [
-        f for f in os.listdir(backup_dir) if f.startswith("bot_database_") and f.endswith(".db")
-    ]
-    backup_files.sort(reverse=True)
-
-    # Удаление старых копий
-    cutoff_date = datetime.now() - timedelta(days=keep_days)
-    deleted_count = 0
-
-    for backup_filename in backup_files:
-        backup_path = os.path.join(backup_dir, backup_filename)
-        file_time = datetime.fromtimestamp(os.path.getmtime(backup_path))
-
-        if file_time < cutoff_date:
-            try:
-                os.remove(backup_path)
-                deleted_count += 1
-            except Exception:
-                pass
-
-    if deleted_count > 0:
-        print(f"🗑️  Удалено старых backups: {deleted_count}")
+    if result.deleted:
+        print(f"🗑️  Удалено старых backups: {len(result.deleted)}")
 
     # Список последних резервных копий
+    backup_files = backup.list_backups()
     print(f"\n📦 Всего backups: {len(backup_files)}")
     recent_backups = backup_files[:5]
     if recent_backups:
         print("📋 Последние 5 backups:")
-        for backup_filename in recent_backups:
-            backup_path = os.path.join(backup_dir, backup_filename)
-            size = os.path.getsize(backup_path)
-            mtime = datetime.fromtimestamp(os.path.getmtime(backup_path))
+        for backup_path in recent_backups:
+            size = backup_path.stat().st_size
+            mtime = datetime.fromtimestamp(backup_path.stat().st_mtime)
             print(
-                f"  - {backup_filename} ({format_size(size)}) - {mtime.strftime('%Y-%m-%d %H:%M:%S')}"
+                f"  - {backup_path.name} ({format_size(size)}) - {mtime.strftime('%Y-%m-%d %H:%M:%S')}"
             )
 
     return True
@@ -116,10 +99,17 @@ if __name__ == "__main__":
         default=30,
         help="Количество дней для хранения копий (по умолчанию: 30)",
     )
+    parser.add_argument(
+        "--compression",
+        choices=[COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD],
+        # Тот же источник и значение по умолчанию, что у бэкапов планировщика
+        default=os.getenv("BACKUP_COMPRESSION", COMPRESSION_GZIP).lower(),
+        help="Сжатие копии (по умолчанию: BACKUP_COMPRESSION или gzip)",
+    )
 
     args = parser.parse_args()
 
-    success = backup_database(keep_days=args.keep_days)
+    success = backup_database(keep_days=args.keep_days, compression=args.compression)
 
     if not success:
         sys.exit(1)
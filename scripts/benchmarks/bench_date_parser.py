@@ -0,0 +1,84 @@
+"""
+Микро-бенчмарк: parse_natural_datetime с быстрым путем для частых форм vs dateparser
+
+Использование:
+    python scripts/benchmarks/bench_date_parser.py [--calls 2000]
+
+Корпус - типичные формулировки времени прибытия из заявок диспетчеров,
+переносов у мастеров и групповых сообщений. Для сравнения быстрый путь
+отключается, и строка, как раньше, уходит в dateparser после предобработки.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.utils import date_parser  # noqa: E402
+
+
+CORPUS: dict[str, list[str]] = {
+    "день + время": [
+        "завтра в 10:00",
+        "Завтра в 12",
+        "послезавтра в 14:30",
+        "сегодня в 18",
+        "завтра после 15",
+    ],
+    "через N": [
+        "через 2 часа",
+        "через час",
+        "через полчаса",
+        "через полтора часа",
+        "через 1-1.5 часа",
+        "через 3 дня",
+        "через неделю",
+    ],
+    "только время": ["16:00", "В 17", "после 12"],
+    "DD.MM": ["20.10", "25.12 15:00", "01.03 в 9:30"],
+    "интервалы": ["с 10 до 16", "10-16", "завтра с 14 до 18", "до 18"],
+    "DD.MM.YYYY": ["21.10.2026 10:00", "до 01.11.2026"],
+    "dateparser": ["в понедельник", "в пятницу в 10:00"],
+    "не дата": ["Набрать клиенту", "В течение дня"],
+}
+
+
+def time_calls(texts: list[str], calls: int) -> float:
+    """Среднее время одного вызова parse_natural_datetime, мкс"""
+    started = time.perf_counter()
+    for i in range(calls):
+        date_parser.parse_natural_datetime(texts[i % len(texts)], validate=False)
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    # Первый вызов dateparser загружает языковые данные - не учитываем его
+    started = time.perf_counter()
+    date_parser.parse_natural_datetime("в понедельник")
+    print(f"Первый вызов dateparser: {(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+    fast_path = date_parser._parse_common_form
+    print(f"{'Форма':<14} {'dateparser, мкс':>16} {'быстрый путь, мкс':>18} {'ускорение':>10}")
+    for form, texts in CORPUS.items():
+        date_parser._parse_common_form = lambda *_: None
+        try:
+            baseline = time_calls(texts, args.calls)
+        finally:
+            date_parser._parse_common_form = fast_path
+        optimized = time_calls(texts, args.calls)
+        print(f"{form:<14} {baseline:16.1f} {optimized:18.1f} {baseline / optimized:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
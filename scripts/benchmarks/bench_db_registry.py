@@ -0,0 +1,104 @@
+"""
+Бенчмарк: задержка "хэндлера" с собственным подключением к БД vs общий реестр
+
+Использование:
+    python scripts/benchmarks/bench_db_registry.py [--calls 500] [--orders 1000]
+
+Хэндлер моделируется как в app/handlers: новый экземпляр БД, connect(),
+get_order_by_id(), disconnect(). Для ORMDatabase и legacy Database
+сравниваются:
+    private - прежнее поведение (shared=False): engine / файл SQLite на каждый вызов
+    shared  - database_registry: общий engine / пул соединений процесса
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.database.db import Database  # noqa: E402
+from app.database.orm_database import ORMDatabase  # noqa: E402
+from app.database.registry import database_registry  # noqa: E402
+
+
+async def build_database(path: Path, orders: int) -> None:
+    """Создание схемы и синтетических заявок"""
+    db = ORMDatabase(str(path), shared=False)
+    await db.connect()
+    await db.init_db()
+    await db.get_or_create_user(telegram_id=1, username="dispatcher", first_name="Диспетчер")
+    for i in range(orders):
+        await db.create_order(
+            equipment_type="Стиральная машина",
+            description=f"Заявка {i}",
+            client_name=f"Клиент {i}",
+            client_address=f"ул. Ленина, {i}",
+            client_phone=f"+7900{i:07d}",
+            dispatcher_id=1,
+        )
+    await db.disconnect()
+
+
+async def handler(factory, order_id: int) -> None:
+    """Типичный хэндлер: get_database() + connect/запрос/disconnect"""
+    db = factory()
+    await db.connect()
+    try:
+        await db.get_order_by_id(order_id)
+    finally:
+        await db.disconnect()
+
+
+async def measure(factory, calls: int, orders: int) -> list[float]:
+    """Задержки последовательных вызовов хэндлера, мс"""
+    await handler(factory, 1)  # прогрев (первый engine / соединение)
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        await handler(factory, i % orders + 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run(calls: int, orders: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        await build_database(db_path, orders)
+
+        cases = [
+            ("ORMDatabase", "private", lambda: ORMDatabase(str(db_path), shared=False)),
+            ("ORMDatabase", "shared", lambda: ORMDatabase(str(db_path), shared=True)),
+            ("Database", "private", lambda: Database(str(db_path), shared=False)),
+            ("Database", "shared", lambda: Database(str(db_path), shared=True)),
+        ]
+
+        print(f"{'backend':>12} {'variant':>8} {'mean, ms':>9} {'p50, ms':>8} {'p95, ms':>8}")
+        for backend, variant, factory in cases:
+            latencies = sorted(await measure(factory, calls, orders))
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(
+                f"{backend:>12} {variant:>8} {statistics.mean(latencies):>9.2f} "
+                f"{statistics.median(latencies):>8.2f} {p95:>8.2f}"
+            )
+
+        print(f"registry: {database_registry.stats()}")
+        await database_registry.close_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.orders))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Бенчмарк: экспорт закрытых заявок в Excel, обычный Workbook vs StreamingWorkbook
+
+Использование:
+    python scripts/benchmarks/bench_excel_export.py [--orders 10000 100000]
+
+Для каждого размера создается SQLite-файл с синтетическими закрытыми
+заявками. Каждый вариант запускается в отдельном процессе, чтобы пиковый
+RSS (ru_maxrss) относился только к нему:
+    inmemory  - прежняя схема: fetchall + Workbook() + стили на каждую ячейку
+    streaming - ExcelExportService.export_closed_orders_to_excel
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.excel_export import CLOSED_ORDERS_EXPORT_SQL  # noqa: E402
+from app.utils.helpers import get_now  # noqa: E402
+
+
+def build_database(path: Path, orders: int) -> None:
+    """Создание БД с синтетическими закрытыми заявками"""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE users (telegram_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT);
+        CREATE TABLE masters (id INTEGER PRIMARY KEY, telegram_id INTEGER);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY, equipment_type TEXT, client_name TEXT, status TEXT,
+            assigned_master_id INTEGER, total_amount REAL, materials_cost REAL,
+            master_profit REAL, company_profit REAL, out_of_city INTEGER, has_review INTEGER,
+            created_at TEXT, updated_at TEXT, deleted_at TEXT
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?, ?)",
+        [(1000 + i, f"Мастер{i}", "Иванов") for i in range(50)],
+    )
+    conn.executemany("INSERT INTO masters VALUES (?, ?)", [(i, 1000 + i) for i in range(50)])
+
+    now = get_now()
+    conn.executemany(
+        "INSERT INTO orders VALUES (?, ?, ?, 'CLOSED', ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+        (
+            (
+                i,
+                "Стиральная машина",
+                f"Клиент {i}",
+                i % 50,
+                5000.0,
+                1000.0,
+                2000.0,
+                2000.0,
+                i % 3 == 0,
+                i % 5 == 0,
+                (now - timedelta(minutes=i)).isoformat(),
+                (now - timedelta(minutes=i // 2)).isoformat(),
+            )
+            for i in range(1, orders + 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def export_in_memory(db_path: Path, filepath: Path) -> None:
+    """Прежний способ: вся выборка и все ячейки в памяти"""
+    import aiosqlite
+    from openpyxl import Workbook
+
+    from app.services.excel.styles import ExcelStyles
+
+    async with aiosqlite.connect(db_path) as connection:
+        connection.row_factory = aiosqlite.Row
+        cursor = await connection.execute(
+            CLOSED_ORDERS_EXPORT_SQL,
+            {"start_date": (get_now() - timedelta(days=365)).isoformat()},
+        )
+        orders = await cursor.fetchall()
+
+    wb = Workbook()
+    ws = wb.active
+    for row, order in enumerate(orders, start=5):
+        data = [
+            order["id"],
+            order["equipment_type"],
+            order["client_name"],
+            order["master_name"],
+            order["created_at"][:16],
+            order["updated_at"][:16],
+            float(order["total_amount"] or 0),
+            float(order["master_profit"] or 0),
+            float(order["company_profit"] or 0),
+            "-",
+        ]
+        for col_idx, value in enumerate(data, start=1):
+            cell = ws.cell(row=row, column=col_idx, value=value)
+            cell.border = ExcelStyles.THIN_BORDER
+            if col_idx == 1:
+                cell.alignment = ExcelStyles.CENTER_ALIGNMENT
+                cell.font = ExcelStyles.SIMPLE_BOLD_FONT
+            elif col_idx in [2, 3, 4, 5, 6, 10]:
+                cell.alignment = ExcelStyles.LEFT_ALIGNMENT
+            else:
+                cell.alignment = ExcelStyles.RIGHT_ALIGNMENT
+                cell.number_format = "#,##0.00 ₽"
+    wb.save(filepath)
+
+
+async def export_streaming(db_path: Path) -> None:
+    """Новый способ: ExcelExportService поверх legacy Database"""
+    from app.database.db import Database
+    from app.services.excel_export import ExcelExportService
+
+    service = ExcelExportService()
+    service.db = Database(str(db_path))
+    if await service.export_closed_orders_to_excel(period_days=365) is None:
+        raise RuntimeError("Экспорт завершился с ошибкой")
+
+
+def run_case(case: str, db_path: Path) -> None:
+    """Запуск одного варианта (в дочернем процессе) и вывод метрик"""
+    os.chdir(db_path.parent)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if case == "inmemory":
+        asyncio.run(export_in_memory(db_path, db_path.parent / "inmemory.xlsx"))
+    else:
+        asyncio.run(export_streaming(db_path))
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed:.3f} {peak_kb} {peak_kb - baseline_kb}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--case", choices=["inmemory", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.db)
+        return
+
+    print(f"{'orders':>8} {'variant':>10} {'time, s':>9} {'peak RSS, MB':>13} {'delta, MB':>10}")
+    for orders in args.orders:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = Path(tmp_dir) / "bench.db"
+            build_database(db_path, orders)
+
+            for case in ("inmemory", "streaming"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--case", case, "--db", str(db_path)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.split()
+                elapsed, peak_kb, delta_kb = float(output[-3]), int(output[-2]), int(output[-1])
+                print(
+                    f"{orders:>8} {case:>10} {elapsed:>9.2f} "
+                    f"{peak_kb / 1024:>13.1f} {delta_kb / 1024:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
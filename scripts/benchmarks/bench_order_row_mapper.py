@@ -0,0 +1,198 @@
+"""
+Микро-бенчмарк: ручной маппинг строк -> Order vs OrderRowMapper
+
+Использование:
+    python scripts/benchmarks/bench_order_row_mapper.py [--rows 50000] [--repeat 3]
+
+Строки генерируются в in-memory SQLite с полной схемой orders и тем же
+SELECT с JOIN, что и в Database.get_all_orders.
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.database.models import Order  # noqa: E402
+from app.database.row_mapper import OrderRowMapper  # noqa: E402
+from app.utils.helpers import MOSCOW_TZ  # noqa: E402
+
+
+QUERY = """
+    SELECT o.*,
+           u1.first_name || ' ' || COALESCE(u1.last_name, '') as dispatcher_name,
+           u2.first_name || ' ' || COALESCE(u2.last_name, '') as master_name
+    FROM orders o
+    LEFT JOIN users u1 ON o.dispatcher_id = u1.telegram_id
+    LEFT JOIN masters m ON o.assigned_master_id = m.id
+    LEFT JOIN users u2 ON m.telegram_id = u2.telegram_id
+    WHERE o.deleted_at IS NULL
+    ORDER BY o.created_at DESC
+"""
+
+
+def build_database(rows: int) -> sqlite3.Connection:
+    """Создание БД с синтетическими заявками"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE users (telegram_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT);
+        CREATE TABLE masters (id INTEGER PRIMARY KEY, telegram_id INTEGER);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY, equipment_type TEXT, description TEXT, client_name TEXT,
+            client_address TEXT, client_phone TEXT, status TEXT, assigned_master_id INTEGER,
+            dispatcher_id INTEGER, master_lead_name TEXT, notes TEXT, scheduled_time TEXT,
+            total_amount REAL, materials_cost REAL, master_profit REAL, company_profit REAL,
+            has_review INTEGER, out_of_city INTEGER, estimated_completion_date TEXT,
+            prepayment_amount REAL, rescheduled_count INTEGER, last_rescheduled_at TEXT,
+            reschedule_reason TEXT, refuse_reason TEXT, created_at TEXT, updated_at TEXT,
+            deleted_at TEXT, version INTEGER
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?, ?)",
+        [(1000 + i, f"User{i}", f"Last{i}") for i in range(50)],
+    )
+    conn.executemany("INSERT INTO masters VALUES (?, ?)", [(i, 1010 + i) for i in range(40)])
+
+    base = datetime(2025, 1, 1, tzinfo=MOSCOW_TZ)
+    statuses = ["NEW", "ASSIGNED", "ACCEPTED", "ONSITE", "CLOSED", "REFUSED", "DR"]
+    data = []
+    for i in range(rows):
+        created = (base + timedelta(minutes=17 * i)).isoformat()
+        closed = statuses[i % len(statuses)] == "CLOSED"
+        data.append(
+            (
+                i + 1,
+                "Холодильник",
+                "Не морозит",
+                f"Клиент {i}",
+                f"ул. Ленина, д. {i % 300}",
+                f"+7999{i:07d}",
+                statuses[i % len(statuses)],
+                i % 40,
+                1000 + i % 10,
+                None,
+                "Позвонить заранее",
+                "завтра 14:00",
+                5000.0 if closed else None,
+                500.0 if closed else None,
+                2250.0 if closed else None,
+                2250.0 if closed else None,
+                i % 2,
+                0,
+                None,
+                None,
+                0,
+                None,
+                None,
+                None,
+                created,
+                created,
+                None,
+                1,
+            )
+        )
+    conn.executemany(f"INSERT INTO orders VALUES ({', '.join('?' * 28)})", data)
+    return conn
+
+
+def legacy_map(row: sqlite3.Row) -> Order:
+    """Маппинг строки в том виде, в котором он был в Database.get_all_orders"""
+    return Order(
+        id=row["id"],
+        equipment_type=row["equipment_type"],
+        description=row["description"],
+        client_name=row["client_name"],
+        client_address=row["client_address"],
+        client_phone=row["client_phone"],
+        status=row["status"],
+        assigned_master_id=row["assigned_master_id"],
+        dispatcher_id=row["dispatcher_id"],
+        notes=row["notes"],
+        scheduled_time=(
+            row["scheduled_time"]
+            if row["scheduled_time"] is not None and str(row["scheduled_time"]).strip() != "None"
+            else None
+        ),
+        total_amount=(
+            row["total_amount"]
+            if "total_amount" in row and row["total_amount"] is not None
+            else None
+        ),
+        materials_cost=(
+            row["materials_cost"]
+            if "materials_cost" in row and row["materials_cost"] is not None
+            else None
+        ),
+        master_profit=(
+            row["master_profit"]
+            if "master_profit" in row and row["master_profit"] is not None
+            else None
+        ),
+        company_profit=(
+            row["company_profit"]
+            if "company_profit" in row and row["company_profit"] is not None
+            else None
+        ),
+        has_review=(
+            bool(row["has_review"])
+            if "has_review" in row and row["has_review"] is not None
+            else None
+        ),
+        created_at=(
+            datetime.fromisoformat(row["created_at"]).replace(tzinfo=MOSCOW_TZ)
+            if row["created_at"]
+            else None
+        ),
+        updated_at=(
+            datetime.fromisoformat(row["updated_at"]).replace(tzinfo=MOSCOW_TZ)
+            if row["updated_at"]
+            else None
+        ),
+        dispatcher_name=row["dispatcher_name"],
+        master_name=row["master_name"],
+    )
+
+
+def best_of(repeat: int, func) -> float:
+    """Минимальное время из нескольких прогонов"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = build_database(args.rows)
+    cursor = conn.execute(QUERY)
+    rows = cursor.fetchall()
+    description = cursor.description
+    mapper = OrderRowMapper()
+
+    legacy = best_of(args.repeat, lambda: [legacy_map(row) for row in rows])
+    mapped = best_of(args.repeat, lambda: mapper.map_rows(QUERY, description, rows))
+
+    print(f"Строк: {len(rows)}")
+    print(f"  legacy (row['x'] + 'x' in row): {legacy * 1000:8.1f} ms")
+    print(f"  OrderRowMapper:                 {mapped * 1000:8.1f} ms")
+    print(f"  Ускорение:                      {legacy / mapped:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
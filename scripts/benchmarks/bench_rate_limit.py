@@ -0,0 +1,152 @@
+"""
+Бенчмарк: накладные расходы rate limiting на событие при 100k отслеживаемых пользователей
+
+Использование:
+    python scripts/benchmarks/bench_rate_limit.py [--users 100000] [--events 200000]
+
+Сравниваются:
+    legacy - прежнее хранилище: dict TypedDict-корзин, список меток нарушений
+             с фильтрацией на каждом событии, записи никогда не удаляются
+    memory - MemoryRateLimitBackend: корзины со __slots__, скользящее окно
+             нарушений за O(1), вытеснение по idle TTL и LRU
+
+Трафик: каждый пользователь пишет один раз, затем поток событий, в котором
+0.1% пользователей спамят (нарушения копятся до бана). Память корзин - tracemalloc.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.middlewares.rate_limit import MemoryRateLimitBackend  # noqa: E402
+
+
+RATE, PERIOD, BURST, MAX_VIOLATIONS, WINDOW = 2, 1, 4, 30, 60
+
+
+class LegacyLimiter:
+    """Прежняя логика RateLimitMiddleware (те же шаги, без отправки сообщений)"""
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, dict] = {}
+
+    def _get_tokens(self, user_id: int, now: float) -> float:
+        if user_id not in self.buckets:
+            self.buckets[user_id] = {
+                "tokens": float(BURST),
+                "last_update": now,
+                "violations": 0,
+                "violation_timestamps": [],
+                "banned_until": None,
+                "last_warning_sent": 0,
+            }
+            return float(BURST)
+        bucket = self.buckets[user_id]
+        tokens_to_add = (now - bucket["last_update"]) * (RATE / PERIOD)
+        bucket["tokens"] = min(BURST, bucket["tokens"] + tokens_to_add)
+        bucket["last_update"] = now
+        return float(bucket["tokens"])
+
+    def _clean_old_violations(self, user_id: int, now: float) -> int:
+        bucket = self.buckets[user_id]
+        cutoff_time = now - WINDOW
+        bucket["violation_timestamps"] = [
+            ts for ts in bucket["violation_timestamps"] if ts > cutoff_time
+        ]
+        bucket["violations"] = len(bucket["violation_timestamps"])
+        return bucket["violations"]
+
+    def _add_violation(self, user_id: int, now: float) -> int:
+        bucket = self.buckets[user_id]
+        bucket["violation_timestamps"].append(now)
+        bucket["violations"] = len(bucket["violation_timestamps"])
+        if bucket["violations"] >= MAX_VIOLATIONS:
+            bucket["banned_until"] = now + 3600
+        return bucket["violations"]
+
+    async def hit(self, user_id: int, now: float) -> bool:
+        if user_id not in self.buckets:
+            self._get_tokens(user_id, now)
+        bucket = self.buckets[user_id]
+        if "last_warning_sent" not in bucket:
+            bucket["last_warning_sent"] = 0
+
+        banned_until = bucket.get("banned_until")
+        if banned_until is not None and banned_until > now:
+            return False
+        if banned_until is not None and banned_until <= now:
+            bucket["banned_until"] = None
+            bucket["violations"] = 0
+            bucket["violation_timestamps"] = []
+
+        self._clean_old_violations(user_id, now)
+        if self._get_tokens(user_id, now) >= 1:
+            bucket["tokens"] -= 1
+            return True
+        self._add_violation(user_id, now)
+        return False
+
+
+def build_traffic(users: int, events: int, seed: int = 42) -> list[tuple[int, float]]:
+    """Поток событий: 70% - обычные пользователи, 30% - 0.1% спамеров"""
+    rng = random.Random(seed)  # noqa: S311 - синтетический трафик
+    spammers = max(1, users // 1000)
+    traffic = []
+    for i in range(events):
+        user_id = rng.randrange(spammers) if rng.random() < 0.3 else rng.randrange(users)
+        # ~2000 событий в секунду
+        traffic.append((user_id, 1000.0 + i / 2000))
+    return traffic
+
+
+async def run(name: str, limiter, users: int, traffic: list[tuple[int, float]]) -> None:
+    """Прогон одного лимитера"""
+    tracemalloc.start()
+    for user_id in range(users):
+        await limiter.hit(user_id, 0.0)
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for user_id, now in traffic:
+        await limiter.hit(user_id, now)
+    per_event_us = (time.perf_counter() - started) / len(traffic) * 1_000_000
+
+    # Час спустя (все, кроме забаненных, давно неактивны)
+    await limiter.hit(users + 1, traffic[-1][1] + 3600)
+    print(f"{name:<8} {per_event_us:>10.2f} {memory_mb:>14.1f} {len(limiter.buckets):>16}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000, help="Отслеживаемых пользователей")
+    parser.add_argument("--events", type=int, default=200_000, help="Событий в потоке")
+    args = parser.parse_args()
+
+    # Баны спамеров логируются на уровне CRITICAL
+    logging.disable(logging.CRITICAL)
+    traffic = build_traffic(args.users, args.events)
+    print(f"Пользователей: {args.users}, событий: {args.events}")
+    print(f"{'':<8} {'мкс/событие':>10} {'память, МБ':>14} {'корзин через 1ч':>16}")
+    await run("legacy", LegacyLimiter(), args.users, traffic)
+    await run(
+        "memory",
+        MemoryRateLimitBackend(
+            RATE, PERIOD, BURST, MAX_VIOLATIONS, WINDOW, max_users=max(args.users, 100_000)
+        ),
+        args.users,
+        traffic,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Бенчмарк: legacy Database под параллельной нагрузкой, одно соединение vs SQLitePool
+
+Использование:
+    python scripts/benchmarks/bench_sqlite_pool.py [--tasks 50] [--requests 40]
+
+Каждая задача имитирует хэндлер: get_order_by_id, get_all_orders(limit=20),
+add_audit_log и update_order_status в транзакции. Все задачи работают
+с одним экземпляром Database (как хэндлеры с внедренным db):
+    single - DB_READ_CONNECTIONS=0: все запросы на одном соединении
+    pool   - DB_READ_CONNECTIONS=4: читатели + очередь писателя с group commit
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.config import Config, OrderStatus  # noqa: E402
+from app.database.db import Database  # noqa: E402
+from app.database.orm_database import ORMDatabase  # noqa: E402
+from app.database.registry import database_registry  # noqa: E402
+
+
+ORDERS = 500
+STATUSES = [OrderStatus.ASSIGNED, OrderStatus.ACCEPTED, OrderStatus.ONSITE]
+
+
+async def build_database(path: Path) -> None:
+    """Создание схемы и синтетических заявок"""
+    db = ORMDatabase(str(path), shared=False)
+    await db.connect()
+    await db.init_db()
+    await db.get_or_create_user(telegram_id=1, username="dispatcher", first_name="Диспетчер")
+    for i in range(ORDERS):
+        await db.create_order(
+            equipment_type="Стиральная машина",
+            description=f"Заявка {i}",
+            client_name=f"Клиент {i}",
+            client_address=f"ул. Ленина, {i}",
+            client_phone=f"+7900{i:07d}",
+            dispatcher_id=1,
+        )
+    await db.disconnect()
+
+
+async def worker(db: Database, task_id: int, requests: int, errors: list[Exception]) -> None:
+    """Последовательность запросов одного хэндлера"""
+    for i in range(requests):
+        order_id = (task_id * requests + i) % ORDERS + 1
+        try:
+            await db.get_order_by_id(order_id)
+            await db.get_all_orders(limit=20)
+            await db.add_audit_log(1, "BENCH", f"task {task_id} request {i}")
+            await db.update_order_status(
+                order_id, STATUSES[i % len(STATUSES)], changed_by=1, skip_validation=True
+            )
+        except Exception as e:
+            errors.append(e)
+
+
+async def run_case(db_path: Path, readers: int, tasks: int, requests: int) -> None:
+    Config.DB_READ_CONNECTIONS = readers
+    db = Database(str(db_path), shared=True)
+    await db.connect()
+
+    errors: list[Exception] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(db, task_id, requests, errors) for task_id in range(tasks)))
+    elapsed = time.perf_counter() - start
+
+    await db.disconnect()
+    await database_registry.close_all()
+
+    succeeded = tasks * requests - len(errors)
+    name = "pool" if readers else "single"
+    first_error = f"{type(errors[0]).__name__}: {errors[0]}" if errors else ""
+    print(f"{name:>8} {elapsed:>8.2f} {succeeded / elapsed:>10.0f} {len(errors):>8}  {first_error}")
+
+
+async def main_async(tasks: int, requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "bench.db"
+        await build_database(db_path)
+
+        print(f"{'variant':>8} {'time, s':>8} {'ok req/s':>10} {'errors':>8}")
+        for readers in (0, 4):
+            await run_case(db_path, readers, tasks, requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.tasks, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Бенчмарк старта бота: время импорта bot.py и пиковый RSS процесса
+
+Использование:
+    python scripts/benchmarks/bench_startup.py [--runs 5] [--top 15]
+
+Каждый прогон - отдельный процесс `python -X importtime -c "import bot"`.
+Для сравнения тяжелые необязательные зависимости (dateparser, Telethon,
+openpyxl, redis) импортируются принудительно - так стартовал бот, пока они
+загружались вместе с роутерами. В конце печатается профиль импорта
+(как -X importtime) с самыми долгими модулями.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Модули, которые загружаются лениво - при первом использовании функции
+LAZY_MODULES = ["dateparser", "telethon", "openpyxl", "aiogram.fsm.storage.redis"]
+
+PROBE = """
+import resource, sys
+{imports}
+loaded = [name for name in {lazy!r} if name in sys.modules]
+print("RSS", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, ",".join(loaded))
+"""
+
+
+def run(imports: str) -> tuple[float, int, str, list[tuple[int, str]]]:
+    """
+    Один холодный старт в отдельном процессе
+
+    Returns:
+        (время импорта bot, мс; пиковый RSS, КБ; загруженные ленивые модули;
+         [(кумулятивное время, мкс; модуль)])
+    """
+    code = PROBE.format(imports=imports, lazy=LAZY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    profile: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile.append((int(cumulative), name.rstrip()))
+
+    bot_time = next(cumulative for cumulative, name in profile if name.strip() == "bot")
+    _, rss, *loaded = result.stdout.split()
+    return bot_time / 1000, int(rss), ",".join(loaded), profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    variants = {
+        "ленивые импорты": "import bot",
+        "все сразу": "import bot\n" + "\n".join(f"import {name}" for name in LAZY_MODULES),
+    }
+    profile: list[tuple[int, str]] = []
+    for title, imports in variants.items():
+        runs = [run(imports) for _ in range(args.runs)]
+        import_ms = statistics.median(r[0] for r in runs)
+        rss_mb = statistics.median(r[1] for r in runs) / 1024
+        # В "все сразу" тяжелые модули импортируются после bot - считаем их время тоже
+        extra_ms = statistics.median(
+            sum(c for c, name in r[3] if name.strip() in LAZY_MODULES) / 1000 for r in runs
+        )
+        print(
+            f"{title:<16} импорт: {import_ms + extra_ms:7.0f} ms   RSS: {rss_mb:6.1f} MB   "
+            f"загружены: {runs[0][2] or '-'}"
+        )
+        if not profile:
+            profile = runs[0][3]
+
+    print(f"\nПрофиль импорта bot (ленивые импорты), топ-{args.top} по кумулятивному времени:")
+    for cumulative, name in sorted(profile, reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,13 +47,16 @@ else
     fi
 fi
 
+# Файлы бэкапов: без сжатия (.db) и сжатые (.db.gz, .db.zst)
+BACKUP_FILES="backups/bot_database_*.db backups/bot_database_*.db.gz backups/bot_database_*.db.zst"
+
 # Подсчёт бэкапов
-BACKUP_COUNT=$(ls -1 backups/bot_database_*.db 2>/dev/null | wc -l)
+BACKUP_COUNT=$(ls -1 $BACKUP_FILES 2>/dev/null | wc -l)
 echo "INFO: Всего бэкапов: $BACKUP_COUNT"
 
 # Список последних 3 бэкапов
 echo "INFO: Последние 3 бэкапа:"
-ls -lht backups/bot_database_*.db 2>/dev/null | head -3 | awk '{print "  -", $9, "("$5")", $6, $7, $8}'
+ls -lht $BACKUP_FILES 2>/dev/null | head -3 | awk '{print "  -", $9, "("$5")", $6, $7, $8}'
 
 echo "================================================================================"
 echo "БЭКАП ЗАВЕРШЁН - $(date '+%Y-%m-%d %H:%M:%S')"
@@ -4,13 +4,15 @@ Pytest fixtures и конфигурация для тестов
 
 import asyncio
 import sys
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
 from pathlib import Path
+from typing import Any
 
 import pytest
 import pytest_asyncio
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import update
 
 
 # Добавляем корневую директорию в PYTHONPATH
@@ -19,6 +21,8 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from app.config import Config
 from app.database import Database
+from app.database.orm_database import ORMDatabase
+from app.database.orm_models import Order
 
 
 @pytest.fixture(scope="session")
@@ -43,6 +47,80 @@ async def db() -> AsyncGenerator[Database, None]:
     await database.disconnect()
 
 
+@pytest.fixture(params=[False, True], ids=["orm", "legacy"])
+def legacy(request) -> bool:
+    """
+    Фикстура реализации БД: тест выполняется для ORMDatabase и для legacy Database
+    """
+    return request.param
+
+
+@pytest_asyncio.fixture
+async def open_db(legacy: bool) -> AsyncGenerator[Callable[[str], Awaitable[Any]], None]:
+    """
+    Фикстура открытия файла БД реализацией из фикстуры legacy
+
+    Открытые базы закрываются после теста.
+    """
+    opened: list[Any] = []
+
+    async def _open(path: str) -> Any:
+        database = Database(path) if legacy else ORMDatabase(path)
+        await database.connect()
+        opened.append(database)
+        return database
+
+    yield _open
+    for database in opened:
+        await database.disconnect()
+
+
+@pytest.fixture
+def create_order() -> Callable[..., Awaitable[int]]:
+    """
+    Фикстура создания заявки в ORMDatabase
+
+    Переданные колонки (статус, мастер, deleted_at...) записываются сразу после создания.
+    """
+
+    async def _create(database: ORMDatabase, equipment_type: str, **values: Any) -> int:
+        order = await database.create_order(
+            equipment_type=equipment_type,
+            description="Не работает",
+            client_name="Иван",
+            client_address="ул. Ленина, д. 15",
+            client_phone="+79001234567",
+            dispatcher_id=1,
+        )
+        if values:
+            async with database.get_session() as session:
+                await session.execute(update(Order).where(Order.id == order.id).values(**values))
+                await session.commit()
+        return order.id
+
+    return _create
+
+
+@pytest_asyncio.fixture
+async def seed_db(tmp_path: Path) -> AsyncGenerator[tuple[str, ORMDatabase, int], None]:
+    """
+    Фикстура файла БД для заполнения заявками: диспетчер (1) и одобренный мастер (101)
+
+    Возвращает (путь к файлу, ORMDatabase, ID мастера).
+    """
+    path = str(tmp_path / "orders.db")
+    database = ORMDatabase(path)
+    await database.connect()
+    await database.init_db()
+
+    await database.get_or_create_user(1, first_name="Анна")
+    await database.get_or_create_user(101, first_name="Петр")
+    master = await database.create_master(101, "+79000000000", "Холодильники", is_approved=True)
+
+    yield path, database, master.id
+    await database.disconnect()
+
+
 @pytest.fixture
 def bot_token() -> str:
     """
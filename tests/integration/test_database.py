@@ -248,6 +248,27 @@ class TestDatabase:
         masters = await db.get_all_masters(only_approved=True)
         assert len(masters) >= 3
 
+    @pytest.mark.asyncio
+    async def test_get_masters_by_ids(self, db: Database):
+        """Тест пакетного получения мастеров по ID"""
+        ids = []
+        for i in range(3):
+            telegram_id = 2000 + i
+            await db.get_or_create_user(telegram_id=telegram_id, first_name=f"Master{i}")
+            master = await db.create_master(
+                telegram_id=telegram_id,
+                phone=f"+7999765432{i}",
+                specialization="Холодильники",
+                is_approved=True,
+            )
+            ids.append(master.id)
+
+        masters = await db.get_masters_by_ids([ids[0], ids[2], ids[2], None, 999999])
+
+        assert set(masters) == {ids[0], ids[2]}
+        assert masters[ids[0]].first_name == "Master0"
+        assert await db.get_masters_by_ids([]) == {}
+
     @pytest.mark.asyncio
     async def test_get_statistics(self, db: Database):
         """Тест получения статистики"""
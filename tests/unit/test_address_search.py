@@ -0,0 +1,96 @@
+"""
+Тесты для индексированного поиска заказов по адресу
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.database.address_search import (
+    address_search_terms,
+    build_match_expression,
+    rank_by_terms,
+)
+from app.database.models import Order
+from app.database.orm_database import ORMDatabase
+from app.services.order_search import OrderSearchService
+
+
+def test_address_search_terms_skip_stop_words():
+    """Тест: типы адресных объектов не участвуют в поиске"""
+    assert address_search_terms("улица ленина, дом 15 квартира 3") == ["ленина", "15", "3"]
+
+
+def test_build_match_expression():
+    """Тест: в MATCH попадают только слова от 3 символов"""
+    assert build_match_expression(["ленина", "15"]) == '"ленина"'
+    assert build_match_expression(["15", "а"]) is None
+
+
+def test_rank_by_terms_prefers_full_match():
+    """Тест: при наличии полных совпадений возвращаются только они"""
+    orders = [
+        Order(id=1, client_address="ул. Ленина, д. 3"),
+        Order(id=2, client_address="ул. Ленина, д. 15"),
+        Order(id=3, client_address="пр. Мира, д. 15"),
+    ]
+
+    assert [o.id for o in rank_by_terms(orders, ["ленина", "15"])] == [2]
+    assert [o.id for o in rank_by_terms(orders, ["ленина", "мира", "99"])] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_search_orders_by_address_uses_fts_index(tmp_path):
+    """Тест: поиск через FTS5-индекс, поддерживаемый триггерами"""
+    db = ORMDatabase(str(tmp_path / "search.db"))
+    await db.connect()
+    await db.init_db()
+    try:
+        first = await db.create_order(
+            equipment_type="Холодильник",
+            description="Не морозит",
+            client_name="Иван",
+            client_address="ул. Ленина, д. 15",
+            client_phone="+79991234567",
+            dispatcher_id=1,
+        )
+        await db.create_order(
+            equipment_type="Стиральная машина",
+            description="Течет",
+            client_name="Петр",
+            client_address="пр. Мира, д. 42",
+            client_phone="+79997654321",
+            dispatcher_id=1,
+        )
+        service = OrderSearchService(db)
+
+        orders = await service.search_orders_by_address("ЛЕНИНА 15")
+        assert [o.id for o in orders] == [first.id]
+
+        # Изменение адреса попадает в индекс через триггер
+        await db.update_order_field(first.id, "client_address", "ул. Садовая, д. 7")
+        assert await service.search_orders_by_address("Ленина") == []
+        assert [o.id for o in await service.search_orders_by_address("садовая")] == [first.id]
+    finally:
+        await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_search_by_house_number_on_busy_street(seed_db, open_db, create_order):
+    """Тест: точный адрес находится среди сотен заявок на той же улице, удаленные не учитываются"""
+    path, database, _ = seed_db
+    target = await create_order(
+        database,
+        "Холодильник",
+        client_address="Московская область, г. Москва, ул. Ленина, д. 15, подъезд 2, этаж 3",
+    )
+    for _ in range(210):
+        await create_order(database, "Плита", client_address="ул. Ленина, д. 3")
+    await create_order(
+        database, "Духовка", client_address="ул. Ленина, д. 15", deleted_at=datetime.now(UTC)
+    )
+
+    service = OrderSearchService(await open_db(path))
+
+    orders = await service.search_orders_by_address("Ленина 15")
+    assert [o.id for o in orders] == [target]
@@ -0,0 +1,92 @@
+"""
+Тесты онлайн-бэкапа SQLite
+"""
+
+import gzip
+import os
+import sqlite3
+import time
+
+import pytest
+
+from app.database.backup import (
+    CHECKSUM_SUFFIX,
+    COMPRESSION_GZIP,
+    COMPRESSION_NONE,
+    SQLiteBackup,
+    verify_backup,
+)
+
+
+@pytest.fixture
+def live_db(tmp_path):
+    """БД в режиме WAL с незафиксированными в основной файл страницами"""
+    path = tmp_path / "bot.db"
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA wal_autocheckpoint=0")
+    connection.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, note TEXT)")
+    connection.executemany(
+        "INSERT INTO orders (note) VALUES (?)", [(f"заявка {i}",) for i in range(2000)]
+    )
+    connection.commit()
+    yield path
+    connection.close()
+
+
+def _count_orders(path) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+
+@pytest.mark.asyncio
+async def test_backup_includes_wal_pages(live_db, tmp_path):
+    """Тест: копия содержит данные из -wal и проходит сверку контрольной суммы"""
+    backup = SQLiteBackup(live_db, tmp_path / "backups", pages_per_step=4)
+
+    result = await backup.create()
+
+    assert result.path.name.endswith(".db")
+    assert result.pages > 4
+    assert verify_backup(result.path)
+    assert _count_orders(result.path) == 2000
+
+
+def test_backup_gzip_and_checksum_mismatch(live_db, tmp_path):
+    """Тест: сжатая копия распаковывается, поврежденный файл не проходит сверку"""
+    backup = SQLiteBackup(live_db, tmp_path / "backups", compression=COMPRESSION_GZIP)
+
+    result = backup.create_sync()
+
+    assert result.path.name.endswith(".db.gz")
+    restored = tmp_path / "restored.db"
+    restored.write_bytes(gzip.decompress(result.path.read_bytes()))
+    assert _count_orders(restored) == 2000
+
+    with open(result.path, "ab") as file:
+        file.write(b"\0")
+    assert not verify_backup(result.path)
+
+
+def test_backup_retention(live_db, tmp_path):
+    """Тест: копии старше срока хранения удаляются вместе с .sha256"""
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    old = backup_dir / "bot_database_2020-01-01_03-00-00.db"
+    old.write_bytes(b"old")
+    old_checksum = old.with_name(old.name + CHECKSUM_SUFFIX)
+    old_checksum.write_text("0  old\n")
+    month_ago = time.time() - 40 * 86400
+    os.utime(old, (month_ago, month_ago))
+    unrelated = backup_dir / "notes.txt"
+    unrelated.write_text("не бэкап")
+
+    result = SQLiteBackup(
+        live_db, backup_dir, compression=COMPRESSION_NONE, keep_days=30
+    ).create_sync()
+
+    assert result.deleted == [old]
+    assert not old.exists()
+    assert not old_checksum.exists()
+    assert unrelated.exists()
+    assert result.path.exists()
@@ -0,0 +1,88 @@
+"""
+Тесты для пакетной отправки сообщений
+"""
+
+import pytest
+
+from app.utils.bulk_sender import BulkSender, OutgoingMessage, merge_plain_messages
+
+
+class FakeBot:
+    """Бот, который запоминает отправленные сообщения"""
+
+    def __init__(self, fail_chats: set[int] | None = None):
+        self.sent: list[tuple[int, str, dict]] = []
+        self.fail_chats = fail_chats or set()
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if chat_id in self.fail_chats:
+            raise RuntimeError("boom")
+        self.sent.append((chat_id, text, kwargs))
+        return object()
+
+
+def test_merge_plain_messages_per_chat():
+    """Тест: текстовые сообщения в один чат склеиваются, с клавиатурой - нет"""
+    keyboard = object()
+    messages = [
+        OutgoingMessage(1, "a", {"parse_mode": "HTML"}),
+        OutgoingMessage(2, "x", {"parse_mode": "HTML"}),
+        OutgoingMessage(1, "b", {"parse_mode": "HTML"}),
+        OutgoingMessage(-100, "g1", {"reply_markup": keyboard}),
+        OutgoingMessage(-100, "g2", {"reply_markup": keyboard}),
+    ]
+
+    merged = merge_plain_messages(messages)
+
+    assert [(m.chat_id, m.text) for m in merged] == [
+        (1, "a\n\nb"),
+        (2, "x"),
+        (-100, "g1"),
+        (-100, "g2"),
+    ]
+    # Исходные сообщения не изменяются
+    assert messages[0].text == "a"
+
+
+def test_merge_keeps_order_around_keyboard_message():
+    """Тест: текст после сообщения с клавиатурой не переносится перед ним"""
+    keyboard = object()
+    messages = [
+        OutgoingMessage(1, "a"),
+        OutgoingMessage(1, "menu", {"reply_markup": keyboard}),
+        OutgoingMessage(1, "b"),
+        OutgoingMessage(1, "c"),
+    ]
+
+    merged = merge_plain_messages(messages)
+
+    assert [m.text for m in merged] == ["a", "menu", "b\n\nc"]
+
+
+def test_merge_respects_length_limit():
+    """Тест: склейка не превышает лимит длины сообщения"""
+    messages = [OutgoingMessage(1, "a" * 6), OutgoingMessage(1, "b" * 6)]
+
+    merged = merge_plain_messages(messages, limit=10)
+
+    assert len(merged) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_all_keeps_order_and_counts():
+    """Тест: порядок внутри чата сохраняется, ошибки считаются"""
+    bot = FakeBot(fail_chats={3})
+    sender = BulkSender(bot, max_concurrency=2, global_rate=0, private_interval=0, group_interval=0)
+    messages = [
+        OutgoingMessage(1, "first"),
+        OutgoingMessage(2, "other"),
+        OutgoingMessage(1, "second"),
+        OutgoingMessage(3, "lost"),
+    ]
+
+    result = await sender.send_all(messages)
+
+    assert result.sent == 3
+    assert result.failed == 1
+    assert result.chats == 3
+    assert [text for chat_id, text, _ in bot.sent if chat_id == 1] == ["first", "second"]
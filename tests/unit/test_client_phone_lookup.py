@@ -0,0 +1,92 @@
+"""
+Тесты поиска заявок клиента по нормализованному телефону
+"""
+
+import pytest
+
+from app.database.db import Database
+from app.database.orm_database import ORMDatabase
+
+
+@pytest.mark.asyncio
+async def test_get_orders_by_client_phone_any_format(tmp_path):
+    """Тест: заявки находятся независимо от формата записи телефона"""
+    db = ORMDatabase(str(tmp_path / "phones.db"))
+    await db.connect()
+    await db.init_db()
+    try:
+        first = await db.create_order(
+            equipment_type="Холодильник",
+            description="Не морозит",
+            client_name="Иван",
+            client_address="ул. Ленина, д. 15",
+            client_phone="+7 (900) 123-45-67",
+            dispatcher_id=1,
+        )
+        second = await db.create_order(
+            equipment_type="Духовка",
+            description="Не греет",
+            client_name="Иван",
+            client_address="ул. Ленина, д. 15",
+            client_phone="89001234567",
+            dispatcher_id=1,
+        )
+        await db.create_order(
+            equipment_type="Плита",
+            description="Не включается",
+            client_name="Петр",
+            client_address="пр. Мира, д. 42",
+            client_phone="+79997654321",
+            dispatcher_id=1,
+        )
+
+        orders = await db.get_orders_by_client_phone("9001234567")
+        assert {o.id for o in orders} == {first.id, second.id}
+
+        # Смена телефона обновляет нормализованную колонку
+        await db.update_order_field(second.id, "client_phone", "+7 999 765 43 21")
+        orders = await db.get_orders_by_client_phone("79997654321")
+        assert second.id in {o.id for o in orders}
+        assert [o.id for o in await db.get_orders_by_client_phone("79001234567")] == [first.id]
+    finally:
+        await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_legacy_schema_indexes_normalized_phone(tmp_path):
+    """Тест: legacy-схема ищет по нормализованному телефону через индекс"""
+    db = Database(str(tmp_path / "legacy.db"))
+    await db.connect()
+    await db.init_db()
+    try:
+        cursor = await db.get_connection().execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM orders WHERE client_phone_normalized = ?",
+            ("79001234567",),
+        )
+        plan = " ".join(row["detail"] for row in await cursor.fetchall())
+        assert "idx_orders_client_phone_normalized" in plan
+    finally:
+        await db.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("column", ["client_phone_normalized", "closed_at", "scheduled_at"])
+async def test_legacy_init_before_migration(tmp_path, column):
+    """Тест: init_db не падает на базе, где колонку ещё не добавила миграция"""
+    db = Database(str(tmp_path / "old.db"))
+    await db.connect()
+    await db.init_db()
+    try:
+        connection = db.get_connection()
+        await connection.execute(f"DROP INDEX idx_orders_{column}")
+        await connection.execute(f"ALTER TABLE orders DROP COLUMN {column}")
+        await connection.commit()
+
+        await db.init_db()
+
+        cursor = await connection.execute(
+            "SELECT name FROM sqlite_master WHERE name = ?", (f"idx_orders_{column}",)
+        )
+        assert await cursor.fetchone() is None
+    finally:
+        await db.disconnect()
@@ -0,0 +1,126 @@
+"""
+Тесты реестра общих подключений к БД
+"""
+
+import asyncio
+import gc
+import logging
+
+import pytest
+
+import app.database.db as legacy_db_module
+import app.database.orm_database as orm_db_module
+from app.config import Config
+from app.database.db import Database
+from app.database.orm_database import ORMDatabase
+from app.database.registry import DatabaseRegistry
+
+
+@pytest.fixture
+async def registry(monkeypatch):
+    """Отдельный реестр на тест (пул читателей legacy Database выключен)"""
+    registry = DatabaseRegistry(max_idle_connections=2)
+    monkeypatch.setattr(legacy_db_module, "database_registry", registry)
+    monkeypatch.setattr(orm_db_module, "database_registry", registry)
+    monkeypatch.setattr(Config, "DB_READ_CONNECTIONS", 0)
+    yield registry
+    await registry.close_all()
+
+
+def test_shared_only_for_configured_database(tmp_path):
+    """Тест: общий пул по умолчанию только для БД без явного пути"""
+    assert Database().shared
+    assert ORMDatabase().shared
+    assert not Database(str(tmp_path / "x.db")).shared
+    assert not ORMDatabase(str(tmp_path / "x.db")).shared
+    assert not Database(":memory:", shared=True).shared
+
+
+@pytest.mark.asyncio
+async def test_orm_engine_is_shared(registry, tmp_path):
+    """Тест: экземпляры ORMDatabase используют один engine"""
+    path = str(tmp_path / "orm.db")
+    first = ORMDatabase(path, shared=True)
+    second = ORMDatabase(path, shared=True)
+
+    await first.connect()
+    await first.connect()  # повторный connect не берет вторую аренду
+    await second.connect()
+    assert first.engine is second.engine
+    assert registry.stats()["active_leases"] == 2
+
+    await first.init_db()
+    await first.disconnect()
+    await second.disconnect()
+    await second.disconnect()
+
+    stats = registry.stats()
+    assert stats["engines_created"] == 1
+    assert stats["reused"] == 1
+    assert stats["active_leases"] == 0
+
+    # Engine не закрывается при disconnect - следующий запрос его переиспользует
+    third = ORMDatabase(path, shared=True)
+    await third.connect()
+    assert await third.get_order_by_id(1) is None
+    await third.disconnect()
+
+    await registry.close_all()
+    assert registry.stats()["engines"] == 0
+
+
+@pytest.mark.asyncio
+async def test_legacy_connections_pooled(registry, tmp_path):
+    """Тест: legacy-соединения переиспользуются, но не делятся одновременно"""
+    path = str(tmp_path / "legacy.db")
+    first = Database(path, shared=True)
+    second = Database(path, shared=True)
+
+    await first.connect()
+    await second.connect()
+    assert first.connection is not second.connection
+    connection = first.connection
+    pooled = {connection, second.connection}
+
+    # Незавершенная транзакция откатывается при возврате в пул
+    await connection.execute("CREATE TABLE t (x INTEGER)")
+    await connection.commit()
+    await connection.execute("INSERT INTO t VALUES (1)")
+    assert connection.in_transaction
+
+    await first.disconnect()
+    assert first.connection is None
+    assert not connection.in_transaction
+    await second.disconnect()
+
+    third = Database(path, shared=True)
+    await third.connect()
+    assert third.connection in pooled
+    cursor = await third.connection.execute("SELECT COUNT(*) FROM t")
+    assert (await cursor.fetchone())[0] == 0
+    await third.disconnect()
+
+    stats = registry.stats()
+    assert stats["connections_opened"] == 2
+    assert stats["reused"] == 1
+    assert stats["idle_connections"] == 2
+
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_leaked_handle_reported(registry, tmp_path, caplog):
+    """Тест: экземпляр, удаленный без disconnect(), считается утечкой"""
+    db = Database(str(tmp_path / "leak.db"), shared=True)
+    await db.connect()
+    assert registry.active_leases()[0]["site"].startswith(__file__)
+
+    with caplog.at_level(logging.WARNING, logger="app.database.registry"):
+        del db
+        gc.collect()
+        await asyncio.sleep(0)
+
+    assert registry.stats()["leaked"] == 1
+    assert registry.stats()["active_leases"] == 0
+    assert "connect() без disconnect()" in caplog.text
+    await registry.close_all()
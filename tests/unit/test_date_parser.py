@@ -0,0 +1,79 @@
+"""
+Тесты быстрого пути parse_natural_datetime
+"""
+
+from datetime import datetime
+
+import dateparser
+import pytest
+
+from app.utils import date_parser
+from app.utils.helpers import MOSCOW_TZ
+
+
+NOW = datetime(2026, 10, 17, 14, 37, 12, 345678, tzinfo=MOSCOW_TZ)
+
+
+@pytest.fixture(autouse=True)
+def fixed_now(monkeypatch):
+    """Фиксированное текущее время для относительных дат"""
+    monkeypatch.setattr(date_parser, "get_now", lambda: NOW)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "завтра в 10:00",
+        "послезавтра в 14:30",
+        "сегодня 9:00",
+        "завтра",
+        "через 2 часа",
+        "через 1.25 часа",
+        "через 30 минут",
+        "через 3 дня",
+        "через неделю",
+    ],
+)
+def test_common_form_matches_dateparser(text):
+    """Тест: быстрый путь дает тот же результат, что и dateparser"""
+    settings = {
+        "TIMEZONE": "Europe/Moscow",
+        "RETURN_AS_TIMEZONE_AWARE": True,
+        "PREFER_DATES_FROM": "future",
+        "RELATIVE_BASE": NOW,
+    }
+    expected = dateparser.parse(text, languages=["ru", "en"], settings=settings)
+
+    assert date_parser._parse_common_form(text, NOW) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Завтра в 12", datetime(2026, 10, 18, 12, 0, tzinfo=MOSCOW_TZ)),
+        ("завтра в 9:05", datetime(2026, 10, 18, 9, 5, tzinfo=MOSCOW_TZ)),
+        ("20.10", datetime(2026, 10, 20, 0, 0, tzinfo=MOSCOW_TZ)),
+        ("5.1 15:00", datetime(2027, 1, 5, 15, 0, tzinfo=MOSCOW_TZ)),
+    ],
+)
+def test_parse_natural_datetime_fast_path(monkeypatch, text, expected):
+    """Тест: частые формы разбираются без обращения к dateparser"""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("dateparser не должен вызываться")
+
+    monkeypatch.setattr(dateparser, "parse", fail)
+
+    parsed, _ = date_parser.parse_natural_datetime(text)
+
+    assert parsed == expected
+
+
+def test_unknown_form_falls_back_to_dateparser():
+    """Тест: формы вне быстрого пути разбирает dateparser"""
+    assert date_parser._parse_common_form("в понедельник", NOW) is None
+    assert date_parser._parse_common_form("завтра в 25:00", NOW) is None
+
+    parsed, _ = date_parser.parse_natural_datetime("в понедельник")
+
+    assert parsed.date() == datetime(2026, 10, 19, tzinfo=MOSCOW_TZ).date()
@@ -0,0 +1,160 @@
+"""
+Тесты потокового экспорта Excel
+"""
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import update
+
+from app.database.db import Database
+from app.database.orm_database import ORMDatabase
+from app.database.orm_models import Order
+from app.services.active_orders_export import ActiveOrdersExportService
+from app.services.excel.streaming import MONEY_FORMAT, TEXT_STYLE, TITLE_STYLE, StreamingWorkbook
+from app.services.excel_export import ExcelExportService
+from app.utils.helpers import get_now
+
+
+def test_streaming_workbook_styles_and_merges(tmp_path):
+    """Тест: именованные стили, ширины, высоты и объединения сохраняются"""
+    wb = StreamingWorkbook()
+    ws = wb.create_sheet("Лист")
+    ws.set_widths({"A": 30})
+    ws.append(["Заголовок"], TITLE_STYLE, height=25)
+    ws.merge("A", "C")
+    ws.skip()
+    assert ws.append([1, "текст", None], [None, TEXT_STYLE, None]) == 3
+
+    path = tmp_path / "stream.xlsx"
+    wb.save(path)
+
+    sheet = load_workbook(path)["Лист"]
+    assert [str(r) for r in sheet.merged_cells.ranges] == ["A1:C1"]
+    assert sheet.column_dimensions["A"].width == 30
+    assert sheet.row_dimensions[1].height == 25
+    assert sheet["A1"].style == TITLE_STYLE
+    assert sheet["A1"].font.b
+    assert sheet["B3"].style == TEXT_STYLE
+    assert sheet["A3"].value == 1
+
+
+async def _create_closed_orders(db: ORMDatabase, amounts: list[float]) -> None:
+    for amount in amounts:
+        order = await db.create_order(
+            equipment_type="Холодильник",
+            description="Не морозит",
+            client_name="Иван",
+            client_address="ул. Ленина, д. 15",
+            client_phone="+79001234567",
+            dispatcher_id=1,
+        )
+        async with db.get_session() as session:
+            await session.execute(
+                update(Order)
+                .where(Order.id == order.id)
+                .values(
+                    status="CLOSED",
+                    total_amount=amount,
+                    master_profit=amount / 2,
+                    company_profit=amount / 2,
+                    out_of_city=True,
+                    closed_at=get_now(),
+                )
+            )
+            await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("legacy", [False, True])
+async def test_export_closed_orders_streaming(tmp_path, monkeypatch, legacy):
+    """Тест: закрытые заявки и итоги пишутся потоково (ORM и legacy курсор)"""
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / "orders.db")
+    orm_db = ORMDatabase(db_path)
+    await orm_db.connect()
+    await orm_db.init_db()
+    await _create_closed_orders(orm_db, [1000.0, 2500.0])
+    await orm_db.disconnect()
+
+    service = ExcelExportService()
+    service.db = Database(db_path) if legacy else ORMDatabase(db_path)
+
+    filepath = await service.export_closed_orders_to_excel(period_days=30)
+    assert filepath is not None
+
+    sheet = load_workbook(filepath)["Закрытые заказы"]
+    assert sheet["A1"].value == "ЗАКРЫТЫЕ ЗАКАЗЫ (за 30 дней)"
+    assert sheet["A4"].value == "ID"
+    assert {sheet["A5"].value, sheet["A6"].value} == {1, 2}
+    assert sheet["D5"].value == "Не назначен"
+    assert sheet["J5"].value == "Выезд"
+    assert sheet["G5"].number_format == MONEY_FORMAT
+
+    # Итоги под столбцами Сумма / Прибыль мастера / Прибыль компании
+    assert sheet["A8"].value == "ИТОГО:"
+    assert sheet["G8"].value == 3500.0
+    assert sheet["H8"].value == 1750.0
+    assert sheet["I8"].value == 1750.0
+
+
+@pytest.mark.asyncio
+async def test_export_closed_orders_empty(tmp_path, monkeypatch):
+    """Тест: без закрытых заявок пишется пояснение"""
+    monkeypatch.chdir(tmp_path)
+    db = ORMDatabase(str(tmp_path / "orders.db"))
+    await db.connect()
+    await db.init_db()
+    await db.disconnect()
+
+    service = ExcelExportService()
+    service.db = db
+
+    filepath = await service.export_closed_orders_to_excel(period_days=7)
+    sheet = load_workbook(filepath)["Закрытые заказы"]
+    assert sheet["A5"].value == "Нет закрытых заказов за этот период"
+    assert "A5:J5" in [str(r) for r in sheet.merged_cells.ranges]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("legacy", [False, True])
+async def test_export_active_orders_streaming(tmp_path, monkeypatch, legacy):
+    """Тест: сводка и листы мастеров активных заявок пишутся потоково"""
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / "orders.db")
+    orm_db = ORMDatabase(db_path)
+    await orm_db.connect()
+    await orm_db.init_db()
+    await orm_db.get_or_create_user(101, first_name="Петр")
+    master = await orm_db.create_master(101, "+79000000000", "Холодильники", is_approved=True)
+    await _create_closed_orders(orm_db, [1000.0])
+    for _ in range(2):
+        order = await orm_db.create_order(
+            equipment_type="Плита",
+            description="Не греет",
+            client_name="Мария",
+            client_address="ул. Мира, д. 3",
+            client_phone="+79001234567",
+            dispatcher_id=1,
+        )
+    await orm_db.assign_master_to_order(order.id, master.id)
+    await orm_db.disconnect()
+
+    service = ActiveOrdersExportService()
+    service.db = Database(db_path) if legacy else ORMDatabase(db_path)
+
+    filepath = await service.export_active_orders_to_excel()
+    assert filepath is not None
+
+    wb = load_workbook(filepath)
+    assert wb.sheetnames == ["Сводка", "Петр"]
+    summary = wb["Сводка"]
+    assert summary["A2"].value == "Всего активных заявок: 2"
+    assert [summary["A5"].value, summary["A6"].value] == [2, 3]
+    assert summary["H5"].value == "Не назначен"
+    assert {str(r) for r in summary.merged_cells.ranges} == {"A1:K1", "A2:K2"}
+
+    master_sheet = wb["Петр"]
+    assert master_sheet["B1"].value == "Петр"
+    assert master_sheet["A3"].value == "№ Заказа"
+    assert master_sheet["A4"].value == 3
+    assert master_sheet["A5"].value is None
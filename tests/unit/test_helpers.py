@@ -4,7 +4,7 @@
 
 import pytest
 
-from app.utils.helpers import calculate_profit_split
+from app.utils.helpers import calculate_profit_split, normalize_phone
 
 
 @pytest.mark.parametrize(
@@ -189,3 +189,20 @@ def test_calculate_profit_split_no_review_no_bonus(monkeypatch):
     assert master_profit == net_profit * 0.5  # 4000
     assert company_profit == net_profit * 0.5  # 4000
 
+
+@pytest.mark.parametrize(
+    ("phone", "expected"),
+    [
+        ("+7 (900) 123-45-67", "79001234567"),
+        ("89001234567", "79001234567"),
+        ("9001234567", "79001234567"),
+        ("79001234567", "79001234567"),
+        ("+375 29 123-45-67", "375291234567"),
+        ("Не указан", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    """Тест приведения телефона к канонической форме (только цифры)."""
+    assert normalize_phone(phone) == expected
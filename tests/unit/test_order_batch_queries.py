@@ -0,0 +1,131 @@
+"""
+Тесты пакетных запросов заявок Database / ORMDatabase
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import OrderStatus, UserRole
+from app.utils.helpers import MOSCOW_TZ, get_now
+
+
+@pytest.fixture
+async def orders_db(seed_db, create_order):
+    """Файл БД с тремя заявками, вторая назначена мастеру"""
+    path, db, master_id = seed_db
+    ids = [
+        await create_order(db, equipment_type)
+        for equipment_type in ["Холодильник", "Плита", "Стиральная машина"]
+    ]
+    await db.assign_master_to_order(ids[1], master_id)
+    return path, ids
+
+
+def _close_orders(path: str, closed: dict[int, str]) -> None:
+    """Закрытие заявок с заданным closed_at"""
+    with sqlite3.connect(path) as connection:
+        for order_id, closed_at in closed.items():
+            connection.execute(
+                "UPDATE orders SET status = 'CLOSED', closed_at = ? WHERE id = ?",
+                (closed_at, order_id),
+            )
+
+
+@pytest.mark.asyncio
+async def test_get_orders_by_ids(orders_db, open_db):
+    """Тест: одна выборка страницы поиска в порядке переданных ID"""
+    path, ids = orders_db
+    db = await open_db(path)
+    orders = await db.get_orders_by_ids([ids[2], 99999, ids[1], ids[2]])
+
+    assert [order.id for order in orders] == [ids[2], ids[1]]
+    assert orders[0].equipment_type == "Стиральная машина"
+    assert orders[1].master_name.strip() == "Петр"
+    assert orders[1].dispatcher_name.strip() == "Анна"
+    assert await db.get_orders_by_ids([]) == []
+
+
+@pytest.mark.asyncio
+async def test_get_closed_orders_in_period(orders_db, open_db):
+    """Тест: закрытые заявки за [start, end) по closed_at"""
+    path, ids = orders_db
+    _close_orders(
+        path,
+        {
+            ids[0]: "2026-10-16 00:00:00.000000",
+            ids[1]: "2026-10-16 23:59:00.000000",
+            ids[2]: "2026-10-17 00:00:00.000000",
+        },
+    )
+
+    db = await open_db(path)
+    start = datetime(2026, 10, 16, tzinfo=MOSCOW_TZ)
+    orders = await db.get_closed_orders_in_period(start, start + timedelta(days=1))
+    assert sorted(order.id for order in orders) == [ids[0], ids[1]]
+    assert {order.id: order for order in orders}[ids[1]].master_name.strip() == "Петр"
+
+    # Наивные границы считаются московским временем
+    naive_start = datetime(2026, 10, 17, tzinfo=MOSCOW_TZ).replace(tzinfo=None)
+    orders = await db.get_closed_orders_in_period(naive_start, naive_start + timedelta(days=1))
+    assert [order.id for order in orders] == [ids[2]]
+
+
+@pytest.mark.asyncio
+async def test_status_entry_timestamps(orders_db, open_db):
+    """Тест: update_order_status записывает время входа в статус"""
+    path, ids = orders_db
+    db = await open_db(path)
+    assigned = await db.get_order_by_id(ids[1])
+    assert assigned.assigned_at is not None
+    assert assigned.closed_at is None
+
+    for status in [OrderStatus.ACCEPTED, OrderStatus.ONSITE, OrderStatus.CLOSED]:
+        await db.update_order_status(ids[1], status, changed_by=1, user_roles=[UserRole.ADMIN])
+
+    order = await db.get_order_by_id(ids[1])
+    assert order.accepted_at <= order.onsite_at <= order.closed_at
+    assert order.assigned_at == assigned.assigned_at
+
+    now = get_now()
+    orders = await db.get_closed_orders_in_period(now - timedelta(hours=1), now)
+    assert [order.id for order in orders] == [ids[1]]
+
+
+@pytest.mark.asyncio
+async def test_scheduled_at_parsed_once(orders_db, open_db):
+    """Тест: scheduled_time разбирается в scheduled_at при записи и ищется по диапазону"""
+    path, ids = orders_db
+    db = await open_db(path)
+    await db.update_order_field(ids[1], "scheduled_time", "20.10.2026 11:30")
+    await db.update_order_field(ids[2], "scheduled_time", "позвонить перед выездом")
+
+    order = await db.get_order_by_id(ids[1])
+    visit = datetime(2026, 10, 20, 11, 30, tzinfo=MOSCOW_TZ)
+    assert order.scheduled_at.replace(tzinfo=MOSCOW_TZ) == visit
+    assert (await db.get_order_by_id(ids[2])).scheduled_at is None
+
+    start = visit - timedelta(hours=2)
+    orders = await db.get_orders_scheduled_between(
+        start, visit + timedelta(minutes=1), statuses=[OrderStatus.ASSIGNED]
+    )
+    assert [order.id for order in orders] == [ids[1]]
+    assert await db.get_orders_scheduled_between(start, visit) == []
+    assert (
+        await db.get_orders_scheduled_between(start, visit + timedelta(hours=1), statuses=[]) == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_active_orders(orders_db, open_db):
+    """Тест: незавершенные заявки отбираются и сортируются по статусу в запросе"""
+    path, ids = orders_db
+    _close_orders(path, {ids[0]: "2026-10-01 12:00:00.000000"})
+    db = await open_db(path)
+    orders = await db.get_active_orders()
+
+    # NEW раньше ASSIGNED, закрытая заявка не попадает
+    assert [order.id for order in orders] == [ids[2], ids[1]]
+    assert orders[1].assigned_master_id is not None
+    assert orders[1].master_name.strip() == "Петр"
@@ -56,11 +56,14 @@ async def db_connection():
             client_name TEXT NOT NULL,
             client_address TEXT NOT NULL,
             client_phone TEXT NOT NULL,
+            client_phone_normalized TEXT,
             status TEXT DEFAULT 'NEW',
             assigned_master_id INTEGER,
             dispatcher_id INTEGER,
             notes TEXT,
             scheduled_time TEXT,
+            scheduled_at TIMESTAMP,
+            scheduled_until TIMESTAMP,
             total_amount REAL,
             materials_cost REAL,
             master_profit REAL,
@@ -72,6 +75,10 @@ async def db_connection():
             rescheduled_count INTEGER DEFAULT 0,
             last_rescheduled_at TIMESTAMP,
             reschedule_reason TEXT,
+            assigned_at TIMESTAMP,
+            accepted_at TIMESTAMP,
+            onsite_at TIMESTAMP,
+            closed_at TIMESTAMP,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (assigned_master_id) REFERENCES masters(id),
@@ -171,6 +178,28 @@ async def test_get_order_by_id_not_found(order_repository):
     assert order is None
 
 
+@pytest.mark.asyncio
+async def test_get_orders_by_ids(order_repository, sample_dispatcher):
+    """Тест пакетного получения заявок с сохранением порядка ID"""
+    ids = []
+    for equipment_type in ["Холодильник", "Духовой шкаф", "Стиральная машина"]:
+        order = await order_repository.create(
+            equipment_type=equipment_type,
+            description="Не работает",
+            client_name="Иван Иванов",
+            client_address="ул. Ленина 1",
+            client_phone="79991234567",
+            dispatcher_id=sample_dispatcher,
+        )
+        ids.append(order.id)
+
+    orders = await order_repository.get_by_ids([ids[2], 99999, ids[0], ids[2]])
+
+    assert [order.id for order in orders] == [ids[2], ids[0]]
+    assert orders[0].equipment_type == "Стиральная машина"
+    assert await order_repository.get_by_ids([]) == []
+
+
 @pytest.mark.asyncio
 async def test_get_all_orders(order_repository, sample_dispatcher):
     """Тест получения всех заявок"""
@@ -0,0 +1,98 @@
+"""
+Тесты агрегированной статистики парсера (ParserAnalyticsService)
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.database.orm_database import ORMDatabase
+from app.database.orm_models import ParserAnalytics
+from app.services.parser_analytics import ParserAnalyticsService
+from app.utils.helpers import get_now
+
+
+@pytest.mark.asyncio
+async def test_get_stats_and_timeline(tmp_path):
+    """Тест: счетчики, разбивки и линия по дням считаются в БД"""
+    db = ORMDatabase(str(tmp_path / "analytics.db"))
+    await db.connect()
+    await db.init_db()
+    try:
+        service = ParserAnalyticsService(db.session_factory)
+
+        await service.track_parse_event(
+            1, -100, True, parsed_equipment_type="Холодильник", processing_time_ms=10
+        )
+        await service.track_parse_event(
+            2, -100, True, parsed_equipment_type="Холодильник", processing_time_ms=20
+        )
+        await service.track_parse_event(3, -100, True, parsed_equipment_type="Плита")
+        await service.track_parse_event(
+            4, -100, False, error_type="no_phone", processing_time_ms=30
+        )
+        await service.track_parse_event(5, -100, False, error_type="")
+        await service.mark_confirmed(1, True, created_order_id=1)
+        await service.mark_confirmed(2, False)
+
+        # Старое событие: попадает только в статистику за все время
+        await service.track_parse_event(6, -100, False, error_type="no_phone")
+        async with db.session_factory() as session:
+            await session.execute(
+                update(ParserAnalytics)
+                .where(ParserAnalytics.message_id == 6)
+                .values(created_at=get_now() - timedelta(days=10))
+            )
+            await session.commit()
+
+        stats = await service.get_stats(period_days=7)
+        assert stats["total_parses"] == 5
+        assert stats["successful_parses"] == 3
+        assert stats["failed_parses"] == 2
+        assert stats["success_rate"] == pytest.approx(60.0)
+        assert stats["confirmed"] == 1
+        assert stats["rejected"] == 1
+        assert stats["pending_confirmation"] == 1
+        assert stats["confirmation_rate"] == pytest.approx(100 / 3)
+        assert stats["avg_processing_ms"] == 20.0
+        assert stats["error_breakdown"] == {"no_phone": 1}
+        assert list(stats["equipment_breakdown"].items()) == [("Холодильник", 2), ("Плита", 1)]
+
+        stats_all = await service.get_stats()
+        assert stats_all["total_parses"] == 6
+        assert stats_all["error_breakdown"] == {"no_phone": 2}
+
+        timeline = await service.get_timeline(days=7)
+        assert timeline == [
+            {
+                "date": get_now().strftime("%d.%m.%Y"),
+                "total": 5,
+                "successful": 3,
+                "failed": 2,
+                "confirmed": 1,
+                "success_rate": pytest.approx(60.0),
+            }
+        ]
+    finally:
+        await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_stats_empty(tmp_path):
+    """Тест: пустая таблица дает нулевую статистику"""
+    db = ORMDatabase(str(tmp_path / "analytics.db"))
+    await db.connect()
+    await db.init_db()
+    try:
+        service = ParserAnalyticsService(db.session_factory)
+
+        stats = await service.get_stats()
+        assert stats["total_parses"] == 0
+        assert stats["successful_parses"] == 0
+        assert stats["success_rate"] == 0
+        assert stats["avg_processing_ms"] == 0
+        assert stats["error_breakdown"] == {}
+        assert await service.get_timeline() == []
+    finally:
+        await db.disconnect()
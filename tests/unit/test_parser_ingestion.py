@@ -0,0 +1,110 @@
+"""
+Тесты для очереди входящих сообщений парсера
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.parser_ingestion import ParseExecutor, ParserIngestionQueue
+from app.services.parser_integration import ParserIntegration
+from app.services.telegram_parser import OrderParserService
+
+
+@pytest.mark.asyncio
+async def test_senders_processed_in_parallel_with_order_per_sender():
+    """Тест: разные отправители обрабатываются параллельно, один - по порядку"""
+    log: list[tuple[int, str]] = []
+    active = 0
+    max_active = 0
+
+    async def handler(text: str, message_id: int, sender_id: int | None) -> None:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        # Первое сообщение отправителя обрабатывается дольше следующих
+        await asyncio.sleep(0.02 if text.endswith("1") else 0.001)
+        log.append((sender_id, text))
+        active -= 1
+
+    queue = ParserIngestionQueue(handler, workers=2, maxsize=10)
+    for index in range(1, 4):
+        assert await queue.submit(f"a{index}", index, sender_id=10)
+        assert await queue.submit(f"b{index}", 100 + index, sender_id=11)
+    await queue.stop()
+
+    assert [text for sender, text in log if sender == 10] == ["a1", "a2", "a3"]
+    assert [text for sender, text in log if sender == 11] == ["b1", "b2", "b3"]
+    assert max_active == 2
+    assert queue.stats()["processed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure_and_drops():
+    """Тест: при заполненной очереди прием ждет, затем сообщение отбрасывается"""
+    release = asyncio.Event()
+
+    async def handler(text: str, message_id: int, sender_id: int | None) -> None:
+        await release.wait()
+
+    queue = ParserIngestionQueue(handler, workers=1, maxsize=1, put_timeout=0.01)
+    assert await queue.submit("first", 1, 1)
+    await asyncio.sleep(0)  # воркер забирает первое сообщение
+    assert await queue.submit("second", 2, 1)
+    assert not await queue.submit("third", 3, 1)
+
+    release.set()
+    await queue.stop()
+    stats = queue.stats()
+
+    assert stats["dropped"] == 1
+    assert stats["backpressure_waits"] == 1
+    assert stats["processed"] == 2
+    assert stats["max_depth"] == 1
+
+
+@pytest.mark.asyncio
+async def test_handler_errors_do_not_stop_worker():
+    """Тест: ошибка обработки одного сообщения не останавливает воркер"""
+    handled: list[int] = []
+
+    async def handler(text: str, message_id: int, sender_id: int | None) -> None:
+        if message_id == 1:
+            raise RuntimeError("boom")
+        handled.append(message_id)
+
+    queue = ParserIngestionQueue(handler, workers=1)
+    await queue.submit("x", 1, None)
+    await queue.submit("y", 2, None)
+    await queue.stop()
+
+    assert handled == [2]
+    assert queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_executor_thread():
+    """Тест: разбор в пуле потоков дает тот же результат, что и напрямую"""
+    parser = OrderParserService()
+    text = "С/м не крутит барабан. ул. Ленина 5-10. +79001234567"
+
+    result = await ParseExecutor(parser).parse(text, 1)
+
+    expected = parser.parse_message(text, 1)
+    assert result.model_dump(exclude={"parsed_at"}) == expected.model_dump(exclude={"parsed_at"})
+
+
+@pytest.mark.asyncio
+async def test_integration_parses_before_start():
+    """Тест: сообщение от клиента из authenticate_user (до start()) разбирается"""
+    integration = ParserIntegration(bot=AsyncMock(), db=SimpleNamespace(session_factory=None))
+    integration.analytics_service = AsyncMock()
+
+    assert await integration.ingestion.submit("Просто обсуждение в группе, без заявки", 1, 5)
+    await integration.ingestion.stop()
+
+    assert integration.ingestion.stats()["failed"] == 0
+    integration.analytics_service.track_parse_event.assert_awaited_once()
+    assert integration.analytics_service.track_parse_event.await_args.kwargs["success"] is False
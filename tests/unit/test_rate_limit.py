@@ -0,0 +1,187 @@
+"""
+Тесты rate limiting: корзины, скользящее окно нарушений и вытеснение
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.middlewares.rate_limit import (
+    BAN_DURATION,
+    MemoryRateLimitBackend,
+    RateLimitBucket,
+    RateLimitMiddleware,
+    RedisRateLimitBackend,
+)
+
+
+def _backend(**kwargs) -> MemoryRateLimitBackend:
+    params = {"rate": 2, "period": 1, "burst": 4, "max_violations": 5, "violation_window": 60}
+    params.update(kwargs)
+    return MemoryRateLimitBackend(**params)
+
+
+def test_sliding_window_violations():
+    """Тест: нарушения предыдущего окна учитываются пропорционально и истекают"""
+    bucket = RateLimitBucket(4.0, now=0.0)
+    for second in range(10):
+        bucket.add_violation(float(second), 60)
+
+    assert bucket.violations(59.0, 60) == 10
+    # Прошла половина следующего окна - половина старых нарушений
+    assert bucket.violations(90.0, 60) == 5
+    assert bucket.add_violation(90.0, 60) == 6
+    # Два окна без нарушений - счетчик обнулился
+    assert bucket.violations(300.0, 60) == 0
+
+
+@pytest.mark.asyncio
+async def test_burst_then_ban_and_expiry():
+    """Тест: burst, нарушения, бан после max_violations и сброс после бана"""
+    backend = _backend()
+
+    results = [await backend.hit(1, 100.0) for _ in range(4)]
+    assert all(result.allowed for result in results)
+
+    limited = [await backend.hit(1, 100.0) for _ in range(5)]
+    assert [result.violations for result in limited] == [1, 2, 3, 4, 5]
+    assert limited[0].warn
+    assert not limited[1].warn
+    # Событие, на котором набран лимит, отклонено без бана
+    assert limited[-1].banned_until is None
+
+    banned = await backend.hit(1, 111.0)
+    assert not banned.allowed
+    assert banned.banned_until == 100.0 + BAN_DURATION
+    assert banned.warn
+
+    after_ban = await backend.hit(1, 100.0 + BAN_DURATION + 1)
+    assert after_ban.allowed
+    assert after_ban.violations == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_buckets_evicted():
+    """Тест: простаивающие корзины удаляются, забаненные остаются до конца бана"""
+    backend = _backend(max_violations=1, sweep_interval=0)
+    for user_id in range(100):
+        await backend.hit(user_id, 0.0)
+    for _ in range(6):
+        await backend.hit(999, 0.0)
+
+    await backend.hit(1000, backend.idle_ttl + 1)
+
+    assert list(backend.buckets) == [999, 1000]
+    assert backend.evicted == 100
+
+
+@pytest.mark.asyncio
+async def test_max_users_lru():
+    """Тест: при превышении max_users вытесняется давно неактивный пользователь"""
+    backend = _backend(max_users=3)
+    for user_id in (1, 2, 3):
+        await backend.hit(user_id, 0.0)
+    await backend.hit(1, 1.0)
+    await backend.hit(4, 2.0)
+
+    assert list(backend.buckets) == [3, 1, 4]
+    assert backend.stats(2.0)["evicted_users"] == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_blocks_over_limit(monkeypatch):
+    """Тест: middleware пропускает burst и отвечает предупреждением сверх лимита"""
+    from aiogram.types import CallbackQuery
+
+    answers = []
+
+    async def fake_answer(self, text=None, show_alert=None, **kwargs):
+        answers.append(text)
+
+    monkeypatch.setattr(CallbackQuery, "answer", fake_answer)
+    middleware = RateLimitMiddleware(rate=1, period=60, burst=2)
+    event = CallbackQuery.model_construct(from_user=SimpleNamespace(id=7, username="ivan"))
+
+    async def handler(event, data):
+        return "ok"
+
+    results = [await middleware(handler, event, {}) for _ in range(4)]
+
+    assert results == ["ok", "ok", None, None]
+    assert len(answers) == 1
+    assert answers[0].startswith("⚠️ Слишком много запросов")
+    stats = middleware.get_stats()
+    assert stats["total_users"] == 1
+    assert stats["users_with_violations"] == 1
+    assert stats["backend"] == "memory"
+
+
+def _redis_backend(**kwargs) -> RedisRateLimitBackend:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return RedisRateLimitBackend(fakeredis.FakeAsyncRedis(), _backend(**kwargs))
+
+
+@pytest.mark.asyncio
+async def test_redis_matches_memory_backend():
+    """Тест: Lua-скрипт принимает те же решения, что и бэкенд в памяти"""
+    redis_backend = _redis_backend()
+    memory = _backend()
+    # burst, нарушения, бан, события во время бана и после его окончания
+    times = [100.0] * 9 + [100.5, 111.0, 115.0, 100.0 + BAN_DURATION + 1]
+
+    for now in times:
+        expected = await memory.hit(1, now)
+        result = await redis_backend.hit(1, now)
+        assert result == pytest.approx(expected), now
+
+    assert result.allowed
+    assert redis_backend.redis_errors == 0
+    # Состояние хранится только в Redis, локальный резерв не используется
+    assert not redis_backend.fallback.buckets
+
+
+@pytest.mark.asyncio
+async def test_redis_keys_expire():
+    """Тест: ключ живет idle TTL, а у забаненного - до конца бана"""
+    backend = _redis_backend(burst=1, max_violations=1)
+
+    await backend.hit(1, 0.0)
+    ttl = await backend.redis.pttl("rate_limit:1")
+    assert 0 < ttl <= backend.fallback.idle_ttl * 1000
+
+    await backend.hit(2, 0.0)
+    await backend.hit(2, 0.0)
+    ttl = await backend.redis.pttl("rate_limit:2")
+    assert ttl > backend.fallback.idle_ttl * 1000
+    assert ttl <= BAN_DURATION * 1000
+
+    # Ключ истек - пользователь снова получает полный burst
+    await backend.redis.delete("rate_limit:2")
+    assert (await backend.hit(2, 1.0)).allowed
+
+
+@pytest.mark.asyncio
+async def test_redis_unavailable_falls_back_to_memory():
+    """Тест: при ошибке Redis решение принимает локальный бэкенд"""
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    class _Redis:
+        def register_script(self, script):
+            async def _script(keys, args):
+                raise RedisConnectionError("Connection refused")
+
+            return _script
+
+    backend = RedisRateLimitBackend(_Redis(), _backend(burst=1))
+
+    first = await backend.hit(1, 0.0)
+    second = await backend.hit(1, 0.0)
+
+    assert first.allowed
+    assert not second.allowed
+    assert second.violations == 1
+    assert list(backend.fallback.buckets) == [1]
+    stats = backend.stats(0.0)
+    assert stats["backend"] == "redis"
+    assert stats["redis_errors"] == 2
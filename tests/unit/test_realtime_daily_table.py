@@ -0,0 +1,194 @@
+"""
+Тесты отложенного и инкрементального обновления ежедневной таблицы
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import update
+
+from app.database.orm_database import ORMDatabase
+from app.database.orm_models import Order
+from app.services.master_reports_detailed import MasterReportsService
+from app.services.realtime_daily_table import RealtimeDailyTableService
+from app.utils.helpers import MOSCOW_TZ, get_now
+
+
+def _make_service(debounce: float, max_delay: float) -> tuple[RealtimeDailyTableService, list]:
+    service = RealtimeDailyTableService(debounce_seconds=debounce, max_delay_seconds=max_delay)
+    calls: list[set[int]] = []
+
+    async def fake_update(order_ids=None):
+        calls.append(set(order_ids))
+
+    service._update_current_table = fake_update  # type: ignore[method-assign]
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_burst_of_completions_coalesced_into_one_refresh():
+    """Тест: пачка закрытий применяется одним обновлением"""
+    service, calls = _make_service(debounce=0.05, max_delay=1.0)
+
+    for order_id in (1, 2, 3, 2):
+        service.schedule_refresh(order_id)
+        await asyncio.sleep(0.01)
+
+    await asyncio.sleep(0.15)
+    assert calls == [{1, 2, 3}]
+
+
+@pytest.mark.asyncio
+async def test_continuous_completions_refresh_after_max_delay():
+    """Тест: при непрерывном потоке закрытий таблица обновляется не реже max_delay"""
+    service, calls = _make_service(debounce=0.05, max_delay=0.1)
+
+    for order_id in range(12):
+        service.schedule_refresh(order_id)
+        await asyncio.sleep(0.03)
+
+    await asyncio.sleep(0.15)
+    assert 2 <= len(calls) < 12
+    assert set().union(*calls) == set(range(12))
+
+
+@pytest.mark.asyncio
+async def test_flush_applies_pending_immediately():
+    """Тест: flush применяет накопленные заказы без ожидания"""
+    service, calls = _make_service(debounce=10.0, max_delay=10.0)
+    service.schedule_refresh(7)
+
+    await service.flush()
+    assert calls == [{7}]
+
+    await service.flush()
+    assert calls == [{7}]
+
+
+async def _close_order(db: ORMDatabase, master_id: int, amount: float) -> int:
+    order = await db.create_order(
+        equipment_type="Стиральная машина",
+        description="Не сливает",
+        client_name="Иван",
+        client_address="ул. Ленина, д. 15",
+        client_phone="+79001234567",
+        dispatcher_id=1,
+    )
+    async with db.get_session() as session:
+        await session.execute(
+            update(Order)
+            .where(Order.id == order.id)
+            .values(
+                status="CLOSED",
+                assigned_master_id=master_id,
+                total_amount=amount,
+                company_profit=amount / 2,
+                updated_at=get_now(),
+                closed_at=get_now(),
+            )
+        )
+        await session.commit()
+    return order.id
+
+
+@pytest.mark.asyncio
+async def test_incremental_update_rebuilds_only_affected_sheets(tmp_path, monkeypatch):
+    """Тест: инкрементальное обновление пересоздает сводку и лист мастера"""
+    monkeypatch.chdir(tmp_path)
+    db = ORMDatabase(str(tmp_path / "orders.db"))
+    await db.connect()
+    await db.init_db()
+
+    masters = []
+    for telegram_id, name in ((101, "Петр"), (102, "Сергей")):
+        await db.get_or_create_user(telegram_id, first_name=name)
+        masters.append(await db.create_master(telegram_id, "+79000000000", "Бытовая техника", True))
+
+    await _close_order(db, masters[0].id, 1000.0)
+    await _close_order(db, masters[1].id, 3000.0)
+
+    reports = MasterReportsService()
+    reports.db = db
+    day_start = datetime.combine(get_now().date(), datetime.min.time()).replace(tzinfo=MOSCOW_TZ)
+
+    report_path = await reports.generate_daily_master_report(day_start)
+    assert report_path is not None
+    sheets_before = load_workbook(report_path).sheetnames
+
+    new_order_id = await _close_order(db, masters[0].id, 500.0)
+    await db.connect()
+    assert await reports.update_daily_master_report(report_path, day_start, [new_order_id])
+
+    wb = load_workbook(report_path)
+    assert wb.sheetnames == sheets_before
+    summary = wb["Сводка"]
+    assert [summary.cell(row=r, column=2).value for r in (4, 5)] == [1, 2]
+    assert {wb["Петр"].cell(row=r, column=1).value for r in (4, 5)} == {1, new_order_id}
+    await db.disconnect()
+
+
+def _sheet_values(path: str) -> dict[str, list[tuple]]:
+    wb = load_workbook(path)
+    return {ws.title: list(ws.iter_rows(values_only=True)) for ws in wb.worksheets}
+
+
+@pytest.mark.asyncio
+async def test_incremental_update_matches_full_report(tmp_path, monkeypatch):
+    """Тест: переназначение и неодобренный мастер дают тот же отчет, что полная генерация"""
+    monkeypatch.chdir(tmp_path)
+    db = ORMDatabase(str(tmp_path / "orders.db"))
+    await db.connect()
+    await db.init_db()
+
+    masters = []
+    for telegram_id, name, approved in (
+        (101, "Петр", True),
+        (102, "Сергей", True),
+        (103, "Олег", False),
+    ):
+        await db.get_or_create_user(telegram_id, first_name=name)
+        masters.append(
+            await db.create_master(telegram_id, "+79000000000", "Бытовая техника", approved)
+        )
+
+    moved_order_id = await _close_order(db, masters[0].id, 1000.0)
+    await _close_order(db, masters[1].id, 3000.0)
+
+    reports = MasterReportsService()
+    reports.db = db
+    day_start = datetime.combine(get_now().date(), datetime.min.time()).replace(tzinfo=MOSCOW_TZ)
+    report_path = await reports.generate_daily_master_report(day_start)
+    assert load_workbook(report_path).sheetnames == ["Сводка", "Сергей", "Петр"]
+
+    # Единственный заказ Петра переназначен Сергею, закрыт заказ неодобренного мастера
+    await db.connect()
+    async with db.get_session() as session:
+        await session.execute(
+            update(Order).where(Order.id == moved_order_id).values(assigned_master_id=masters[1].id)
+        )
+        await session.commit()
+    unapproved_order_id = await _close_order(db, masters[2].id, 700.0)
+
+    periods = []
+    get_closed = db.get_closed_orders_in_period
+
+    async def spy(start, end, master_ids=None):
+        periods.append(master_ids)
+        return await get_closed(start, end, master_ids)
+
+    monkeypatch.setattr(db, "get_closed_orders_in_period", spy)
+    assert await reports.update_daily_master_report(
+        report_path, day_start, [moved_order_id, unapproved_order_id]
+    )
+
+    # Запрошены только заказы затронутых мастеров
+    assert periods == [{masters[0].id, masters[1].id, masters[2].id}]
+    incremental = _sheet_values(report_path)
+    assert list(incremental) == ["Сводка", "Сергей"]
+
+    await db.connect()
+    full_path = await reports.generate_daily_master_report(day_start)
+    assert incremental == _sheet_values(full_path)
+    await db.disconnect()
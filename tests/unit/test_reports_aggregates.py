@@ -0,0 +1,127 @@
+"""
+Тесты агрегатов для отчетов по мастерам и типам техники
+"""
+
+import pytest
+
+from app.database.db import Database
+from app.database.orm_database import ORMDatabase
+from app.services.financial_reports import FinancialReportsService
+from app.services.reports import ReportsService
+from app.utils.helpers import get_now
+
+
+@pytest.fixture
+async def orders_db(seed_db, create_order):
+    """Файл БД: мастер с заявками в разных статусах и удаленная заявка"""
+    path, db, master_id = seed_db
+    await create_order(db, "Холодильник", assigned_master_id=master_id, status="CLOSED")
+    await create_order(db, "Холодильник", assigned_master_id=master_id, status="ACCEPTED")
+    await create_order(db, "Плита", assigned_master_id=master_id, status="REFUSED")
+    await create_order(db, "Плита", assigned_master_id=master_id, deleted_at=get_now())
+    await create_order(db, "Холодильник")
+    return path, master_id
+
+
+@pytest.mark.asyncio
+async def test_order_counts_aggregates(orders_db, open_db):
+    """Тест: группировка мастер x статус и по типам техники без удаленных заявок"""
+    path, master_id = orders_db
+    db = await open_db(path)
+    assert await db.get_order_counts_by_master_status() == {
+        master_id: {"CLOSED": 1, "ACCEPTED": 1, "REFUSED": 1}
+    }
+    counts = await db.get_order_counts_by_equipment()
+    assert counts == {"Холодильник": 3, "Плита": 1}
+    assert list(counts) == ["Холодильник", "Плита"]
+
+    reports = ReportsService(db)
+    assert "Заявок: 3 (завершено: 1, активных: 1)" in await reports.generate_masters_report()
+    equipment_report = await reports.generate_equipment_report()
+    assert "Всего заявок:</b> 4" in equipment_report
+    assert "Холодильник: 3 (75.0%)" in equipment_report
+
+
+@pytest.mark.asyncio
+async def test_count_orders_by_status(orders_db, open_db):
+    """Тест: счетчики меню "Все заявки" одним GROUP BY без удаленных заявок"""
+    path, _ = orders_db
+    db = await open_db(path)
+    assert await db.count_orders_by_status() == {
+        "NEW": 1,
+        "CLOSED": 1,
+        "ACCEPTED": 1,
+        "REFUSED": 1,
+    }
+    assert await db.count_orders_by_status(["NEW", "DR", "CLOSED"]) == {
+        "NEW": 1,
+        "DR": 0,
+        "CLOSED": 1,
+    }
+    assert await db.count_orders_by_status([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_financial_report_aggregated_in_sql(tmp_path, create_order):
+    """Тест: итоги финансового отчета одним GROUP BY и запись отчетов по мастерам"""
+    path = str(tmp_path / "financial.db")
+    db = ORMDatabase(path)
+    await db.connect()
+    await db.init_db()
+    await db.get_or_create_user(101, first_name="Петр", last_name="Иванов")
+    await db.get_or_create_user(102, first_name="Олег")
+    first = await db.create_master(101, "+79000000001", "Холодильники", is_approved=True)
+    second = await db.create_master(102, "+79000000002", "Плиты", is_approved=True)
+
+    closed_at = get_now()
+    closed = {"status": "CLOSED", "closed_at": closed_at}
+    money = {"materials_cost": 500, "master_profit": 2000, "company_profit": 2500}
+    await create_order(
+        db,
+        "Холодильник",
+        assigned_master_id=first.id,
+        total_amount=5000,
+        has_review=True,
+        **money,
+        **closed,
+    )
+    await create_order(
+        db,
+        "Холодильник",
+        assigned_master_id=first.id,
+        total_amount=3000,
+        out_of_city=True,
+        **closed,
+    )
+    await create_order(db, "Плита", assigned_master_id=second.id, total_amount=1000, **closed)
+    await create_order(db, "Плита", total_amount=2000, **closed)
+    await create_order(db, "Плита", assigned_master_id=second.id, total_amount=9000)
+    await db.disconnect()
+
+    legacy = Database(path)
+    service = FinancialReportsService()
+    service.db = legacy
+    report = await service.generate_daily_report(closed_at)
+
+    assert report.total_orders == 4
+    assert report.total_amount == 11000
+    assert report.total_materials_cost == 500
+    assert report.total_net_profit == 10500
+    assert report.average_check == 2750
+
+    await legacy.connect()
+    try:
+        master_reports = {
+            item.master_id: item for item in await legacy.get_master_reports_by_report_id(report.id)
+        }
+    finally:
+        await legacy.disconnect()
+
+    assert set(master_reports) == {first.id, second.id}
+    assert master_reports[first.id].master_name == "Петр Иванов"
+    assert master_reports[first.id].orders_count == 2
+    assert master_reports[first.id].total_amount == 8000
+    assert master_reports[first.id].average_check == 4000
+    assert master_reports[first.id].reviews_count == 1
+    assert master_reports[first.id].out_of_city_count == 1
+    assert master_reports[second.id].orders_count == 1
@@ -0,0 +1,95 @@
+"""
+Тесты для OrderRowMapper
+"""
+
+import sqlite3
+
+import pytest
+
+from app.database.models import Order
+from app.database.row_mapper import OrderRowMapper
+from app.utils.helpers import MOSCOW_TZ
+
+
+@pytest.fixture
+def connection():
+    """Фикстура для in-memory SQLite с минимальной таблицей orders"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        """
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY,
+            equipment_type TEXT,
+            client_name TEXT,
+            status TEXT,
+            scheduled_time TEXT,
+            total_amount REAL,
+            has_review INTEGER,
+            created_at TEXT,
+            updated_at TEXT,
+            deleted_at TEXT
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO orders VALUES (1, 'Холодильник', 'Иван', 'CLOSED', 'None', 5000.0, 1, "
+        "'2025-01-10T12:30:00', '2025-01-11 09:00:00', NULL)"
+    )
+    conn.execute(
+        "INSERT INTO orders VALUES (2, 'Стиральная машина', 'Петр', 'NEW', '14:00', NULL, NULL, "
+        "NULL, NULL, NULL)"
+    )
+    yield conn
+    conn.close()
+
+
+def test_map_rows_converts_values(connection):
+    """Тест преобразования типов и служебных значений"""
+    mapper = OrderRowMapper()
+    query = "SELECT * FROM orders ORDER BY id"
+    cursor = connection.execute(query)
+
+    first, second = mapper.map_rows(query, cursor.description, cursor.fetchall())
+
+    assert isinstance(first, Order)
+    assert first.total_amount == 5000.0
+    assert first.has_review is True
+    assert first.scheduled_time is None
+    assert first.created_at.tzinfo == MOSCOW_TZ
+    assert first.updated_at.hour == 9
+
+    assert second.scheduled_time == "14:00"
+    assert second.has_review is None
+    assert second.created_at is None
+
+
+def test_composed_names(connection):
+    """Тест сборки имени мастера из отдельных колонок"""
+    mapper = OrderRowMapper()
+    query = """
+        SELECT o.*, 'Иван' as master_first_name, NULL as master_last_name,
+               NULL as master_username, NULL as dispatcher_first_name,
+               NULL as dispatcher_last_name, 'disp' as dispatcher_username
+        FROM orders o WHERE o.id = 1
+    """
+    cursor = connection.execute(query)
+
+    order = mapper.map_row(query, cursor.description, cursor.fetchone())
+
+    assert order.master_name == "Иван"
+    assert order.dispatcher_name == "@disp"
+
+
+def test_plan_is_cached_per_query(connection):
+    """Тест кеширования плана и его перестройки при смене набора колонок"""
+    mapper = OrderRowMapper()
+    query = "SELECT * FROM orders"
+
+    cursor = connection.execute(query)
+    plan = mapper.get_plan(query, cursor.description)
+    assert mapper.get_plan(query, cursor.description) is plan
+
+    connection.execute("ALTER TABLE orders ADD COLUMN notes TEXT")
+    cursor = connection.execute(query)
+    assert mapper.get_plan(query, cursor.description) is not plan
@@ -0,0 +1,173 @@
+"""
+Тесты для общего планировщика исходящих запросов к Bot API
+"""
+
+import asyncio
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.utils import retry
+from app.utils.send_scheduler import SendPriority, SendScheduler
+
+
+def _recorder(log: list, value):
+    async def _call():
+        log.append(value)
+        return value
+
+    return _call
+
+
+@pytest.mark.asyncio
+async def test_interactive_jumps_ahead_of_bulk():
+    """Тест: при упоре в глобальный лимит ответ пользователю уходит раньше рассылки"""
+    scheduler = SendScheduler(global_rate=50, global_burst=1, private_rate=0)
+    log: list[str] = []
+    try:
+        bulk = [
+            scheduler.submit(chat_id, _recorder(log, f"bulk-{chat_id}"), SendPriority.BULK)
+            for chat_id in range(1, 5)
+        ]
+        reply = scheduler.submit(100, _recorder(log, "reply"), SendPriority.INTERACTIVE)
+
+        await asyncio.gather(*bulk, reply)
+    finally:
+        await scheduler.close()
+
+    # Первый токен уже выдан до появления ответа, следующий - ответу
+    assert log.index("reply") <= 1
+    assert len(log) == 5
+
+
+@pytest.mark.asyncio
+async def test_chat_order_preserved():
+    """Тест: запросы в один чат выполняются по очереди в порядке постановки"""
+    scheduler = SendScheduler(global_rate=0, private_rate=0)
+    log: list[int] = []
+
+    def _slow(value: int):
+        async def _call():
+            await asyncio.sleep(0.001 * (5 - value))
+            log.append(value)
+
+        return _call
+
+    try:
+        await asyncio.gather(*(scheduler.run(1, _slow(value)) for value in range(5)))
+    finally:
+        await scheduler.close()
+
+    assert log == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_private_chat_rate_limit():
+    """Тест: сверх всплеска сообщения в один чат ждут токен"""
+    scheduler = SendScheduler(global_rate=0, private_rate=20, private_burst=1)
+    loop = asyncio.get_running_loop()
+    times: list[float] = []
+
+    async def _call():
+        times.append(loop.time())
+
+    try:
+        await asyncio.gather(*(scheduler.run(1, _call) for _ in range(3)))
+    finally:
+        await scheduler.close()
+
+    assert times[2] - times[0] >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_edit_coalescing():
+    """Тест: правки одного сообщения в очереди схлопываются в последнюю"""
+    scheduler = SendScheduler(global_rate=0, private_rate=0)
+    log: list[str] = []
+    release = asyncio.Event()
+
+    async def _blocking():
+        await release.wait()
+
+    try:
+        # Чат занят - правки ждут в очереди
+        busy = scheduler.submit(1, _blocking)
+        first = scheduler.submit(1, _recorder(log, "v1"), coalesce_key=("edit", 1, 10))
+        second = scheduler.submit(1, _recorder(log, "v2"), coalesce_key=("edit", 1, 10))
+        release.set()
+
+        results = await asyncio.gather(busy, first, second)
+        stats = scheduler.stats()
+    finally:
+        await scheduler.close()
+
+    assert log == ["v2"]
+    assert results[1:] == ["v2", "v2"]
+    assert stats["coalesced"] == 1
+    assert stats["sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_throttle_and_stats():
+    """Тест: после 429 отправка приостанавливается, ошибки попадают в метрики"""
+    scheduler = SendScheduler(global_rate=0, private_rate=0)
+    loop = asyncio.get_running_loop()
+
+    async def _fail():
+        raise RuntimeError("boom")
+
+    try:
+        with pytest.raises(RuntimeError):
+            await scheduler.run(1, _fail)
+
+        scheduler.throttle(0.05)
+        started = loop.time()
+        await scheduler.run(2, _recorder([], "ok"), SendPriority.BULK)
+        elapsed = loop.time() - started
+        stats = scheduler.stats()
+    finally:
+        await scheduler.close()
+
+    assert elapsed >= 0.04
+    assert stats["failed"] == 1
+    assert stats["sent"] == 1
+    assert stats["throttled"] == 1
+    assert stats["queued"] == 0
+    assert stats["latency_max"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_disabled_runs_directly():
+    """Тест: выключенный планировщик выполняет запрос без очереди"""
+    scheduler = SendScheduler(enabled=False)
+
+    assert await scheduler.run(1, _recorder([], "ok")) == "ok"
+    assert scheduler.stats()["sent"] == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_goes_back_through_scheduler(monkeypatch):
+    """Тест: повтор после 429 заново проходит очередь и берет новый токен чата"""
+    scheduler = SendScheduler(global_rate=0, private_rate=20, private_burst=1)
+    monkeypatch.setattr(retry, "send_scheduler", scheduler)
+    loop = asyncio.get_running_loop()
+    times: list[float] = []
+
+    class _Bot:
+        async def send_message(self, chat_id, text, **kwargs):
+            times.append(loop.time())
+            if len(times) == 1:
+                raise TelegramRetryAfter(method=None, message="Flood", retry_after=0)
+            return text
+
+    try:
+        result = await retry.safe_send_message(_Bot(), 1, "ok")
+        stats = scheduler.stats()
+    finally:
+        await scheduler.close()
+
+    assert result == "ok"
+    assert times[1] - times[0] >= 0.04
+    assert stats["failed"] == 1
+    assert stats["sent"] == 1
+    assert stats["throttled"] == 1
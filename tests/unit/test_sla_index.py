@@ -0,0 +1,103 @@
+"""
+Тесты для индекса SLA-дедлайнов
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.config import OrderStatus
+from app.database.models import Order
+from app.domain.sla_index import SLADeadlineIndex
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import TaskScheduler
+from app.utils.helpers import MOSCOW_TZ
+
+
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=MOSCOW_TZ)
+
+
+def test_collect_due_returns_only_expired():
+    """Тест: в выборку попадают только заявки с наступившим дедлайном"""
+    index = SLADeadlineIndex()
+    index.track(1, OrderStatus.NEW, NOW - timedelta(hours=3))
+    index.track(2, OrderStatus.NEW, NOW - timedelta(minutes=30))
+    index.track(3, OrderStatus.ONSITE, NOW - timedelta(hours=13))
+
+    due = {entry.order_id for entry in index.collect_due(NOW)}
+
+    assert due == {1, 3}
+
+
+def test_overdue_order_stays_due_until_transition():
+    """Тест: просроченная заявка остается в выборке до смены статуса"""
+    index = SLADeadlineIndex()
+    index.track(1, OrderStatus.ASSIGNED, NOW - timedelta(hours=5))
+
+    assert [e.order_id for e in index.collect_due(NOW)] == [1]
+    assert [e.order_id for e in index.collect_due(NOW + timedelta(minutes=30))] == [1]
+
+    index.track(1, OrderStatus.ACCEPTED, NOW)
+    assert index.collect_due(NOW + timedelta(hours=1)) == []
+    assert [e.order_id for e in index.collect_due(NOW + timedelta(hours=9))] == [1]
+
+
+def test_terminal_status_removes_order():
+    """Тест: закрытые и отклоненные заявки удаляются из индекса"""
+    index = SLADeadlineIndex()
+    index.track(1, OrderStatus.ONSITE, NOW - timedelta(hours=20))
+    index.track(1, OrderStatus.CLOSED, NOW)
+
+    assert 1 not in index
+    assert index.collect_due(NOW) == []
+
+
+def test_same_status_keeps_entry_time():
+    """Тест: повторный переход в тот же статус не сбрасывает таймер"""
+    index = SLADeadlineIndex()
+    index.track(1, OrderStatus.NEW, NOW - timedelta(hours=3))
+    index.track(1, OrderStatus.NEW, NOW)
+
+    assert [e.order_id for e in index.collect_due(NOW)] == [1]
+
+
+def test_load_from_orders():
+    """Тест: загрузка индекса из списка заявок"""
+    index = SLADeadlineIndex()
+    orders = [
+        Order(id=1, status=OrderStatus.NEW, updated_at=NOW - timedelta(hours=3)),
+        Order(id=2, status=OrderStatus.ACCEPTED, updated_at=NOW, scheduled_time="завтра 10:00"),
+    ]
+
+    index.load(orders, NOW)
+
+    assert index.is_loaded
+    assert len(index) == 2
+    assert [e.order_id for e in index.collect_due(NOW)] == [1]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_loads_due_orders_in_one_query(monkeypatch):
+    """Тест: просроченные заявки загружаются одним пакетным запросом"""
+    index = SLADeadlineIndex()
+    index.track(1, OrderStatus.NEW, NOW - timedelta(hours=3))
+    index.track(2, OrderStatus.NEW, NOW - timedelta(hours=3))
+    index.track(3, OrderStatus.NEW, NOW - timedelta(hours=3))
+    monkeypatch.setattr(scheduler_module, "sla_index", index)
+
+    db = AsyncMock()
+    db.get_orders_by_ids.return_value = [
+        Order(id=2, status=OrderStatus.ACCEPTED, updated_at=NOW),
+        Order(id=1, status=OrderStatus.NEW, updated_at=NOW - timedelta(hours=3)),
+    ]
+    scheduler = TaskScheduler(bot=AsyncMock(), db=db)
+
+    orders = await scheduler._load_sla_orders({1, 2, 3})
+
+    db.get_orders_by_ids.assert_awaited_once_with([3, 2, 1])
+    db.get_order_by_id.assert_not_called()
+    assert [o.id for o in orders] == [1]
+    # Заявки нет в БД - забыта, статус разошелся - индекс исправлен
+    assert 3 not in index
+    assert index.get(2).status == OrderStatus.ACCEPTED
@@ -0,0 +1,226 @@
+"""
+Тесты пула SQLite: читатели, групповая запись и очередь транзакций
+"""
+
+import asyncio
+import sqlite3
+
+import aiosqlite
+import pytest
+
+import app.database.db as legacy_db_module
+from app.config import Config
+from app.database.db import Database
+from app.database.orm_database import ORMDatabase
+from app.database.registry import DatabaseRegistry
+from app.database.sqlite_pool import SQLitePool
+from app.repositories.order_repository_extended import OrderRepositoryExtended
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    """Открытый пул над таблицей counters"""
+    path = str(tmp_path / "pool.db")
+
+    async def connect() -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(path)
+        connection.row_factory = aiosqlite.Row
+        cursor = await connection.execute("PRAGMA journal_mode=WAL")
+        await cursor.close()
+        return connection
+
+    async with aiosqlite.connect(path) as connection:
+        await connection.execute(
+            "CREATE TABLE counters (id INTEGER PRIMARY KEY, name TEXT NOT NULL, value INTEGER)"
+        )
+        await connection.commit()
+
+    pool = SQLitePool(path, readers=2)
+    await pool.open(connect)
+    yield pool
+    await pool.close()
+
+
+async def test_small_writes_group_committed(pool):
+    """Тест: одновременные записи фиксируются общей транзакцией"""
+    results = await asyncio.gather(
+        *(pool.execute("INSERT INTO counters (name) VALUES (?)", (f"c{i}",)) for i in range(20))
+    )
+
+    assert sorted(result.lastrowid for result in results) == list(range(1, 21))
+    assert pool.stats()["writes"] == 20
+    assert pool.stats()["batches"] < 20
+
+    async with pool.reader() as connection:
+        cursor = await connection.execute("SELECT COUNT(*) FROM counters")
+        assert (await cursor.fetchone())[0] == 20
+
+
+async def test_failed_write_does_not_cancel_batch(pool):
+    """Тест: ошибка одного оператора не отменяет соседние в группе"""
+    results = await asyncio.gather(
+        pool.execute("INSERT INTO counters (name) VALUES ('a')"),
+        pool.execute("INSERT INTO counters (name) VALUES (NULL)"),
+        pool.execute("INSERT INTO counters (name) VALUES ('b')"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    async with pool.reader() as connection:
+        cursor = await connection.execute("SELECT name FROM counters ORDER BY id")
+        assert [row["name"] for row in await cursor.fetchall()] == ["a", "b"]
+
+
+async def test_transactions_are_serialized(pool):
+    """Тест: параллельные транзакции выполняются по очереди (без потерянных обновлений)"""
+    await pool.execute("INSERT INTO counters (id, name, value) VALUES (1, 'total', 0)")
+
+    async def increment() -> None:
+        async with pool.transaction() as connection:
+            # Чтение внутри транзакции идет через соединение писателя
+            async with pool.reader() as reader:
+                assert reader is connection
+                cursor = await reader.execute("SELECT value FROM counters WHERE id = 1")
+                value = (await cursor.fetchone())["value"]
+            await asyncio.sleep(0.01)
+            await pool.execute("UPDATE counters SET value = ? WHERE id = 1", (value + 1,))
+
+    await asyncio.gather(*(increment() for _ in range(5)))
+
+    async with pool.reader() as connection:
+        cursor = await connection.execute("SELECT value FROM counters WHERE id = 1")
+        assert (await cursor.fetchone())["value"] == 5
+    assert pool.stats()["transactions"] == 5
+
+
+async def test_transaction_rollback(pool):
+    """Тест: исключение внутри transaction() откатывает изменения"""
+
+    async def failing_transaction() -> None:
+        async with pool.transaction() as connection:
+            await connection.execute("INSERT INTO counters (name) VALUES ('x')")
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await failing_transaction()
+
+    async with pool.reader() as connection:
+        cursor = await connection.execute("SELECT COUNT(*) FROM counters")
+        assert (await cursor.fetchone())[0] == 0
+
+
+async def test_cancel_after_hand_over_releases_writer(pool, monkeypatch):
+    """Тест: отмена сразу после передачи соединения не блокирует очередь записи"""
+    put_nowait = pool._queue.put_nowait
+
+    def put_and_cancel_on_hand_over(job) -> None:
+        if getattr(job, "sql", "") is None:
+            waiter = asyncio.current_task()
+            # Колбэк срабатывает раньше, чем задача возобновится с соединением
+            job.future.add_done_callback(lambda _: waiter.cancel())
+        put_nowait(job)
+
+    monkeypatch.setattr(pool._queue, "put_nowait", put_and_cancel_on_hand_over)
+
+    async def write_in_transaction() -> None:
+        async with pool.transaction() as connection:
+            await connection.execute("INSERT INTO counters (name) VALUES ('lost')")
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.create_task(write_in_transaction())
+    monkeypatch.undo()
+
+    result = await asyncio.wait_for(
+        pool.execute("INSERT INTO counters (name) VALUES ('next')"), timeout=1
+    )
+    assert result.rowcount == 1
+    assert pool.stats()["transactions"] == 1
+
+
+async def test_database_uses_shared_pool(monkeypatch, tmp_path):
+    """Тест: общий legacy Database читает через пул и пишет через очередь"""
+    path = str(tmp_path / "bot.db")
+    orm_db = ORMDatabase(path)
+    await orm_db.connect()
+    await orm_db.init_db()
+    await orm_db.get_or_create_user(telegram_id=1, username="dispatcher")
+    order = await orm_db.create_order(
+        equipment_type="Стиральная машина",
+        description="Не сливает воду",
+        client_name="Клиент",
+        client_address="ул. Ленина, 1",
+        client_phone="+79001234567",
+        dispatcher_id=1,
+    )
+    await orm_db.disconnect()
+
+    registry = DatabaseRegistry()
+    monkeypatch.setattr(legacy_db_module, "database_registry", registry)
+    monkeypatch.setattr(Config, "DB_READ_CONNECTIONS", 2)
+
+    handles = [Database(path, shared=True) for _ in range(10)]
+    try:
+        for db in handles:
+            await db.connect()
+
+        await asyncio.gather(
+            *(db.add_audit_log(1, "TEST", f"details {i}") for i, db in enumerate(handles))
+        )
+        await asyncio.gather(
+            handles[1].update_order_status(order.id, "ASSIGNED", skip_validation=True),
+            handles[2].update_order_field(order.id, "notes", "позвонить заранее"),
+        )
+
+        assert len(await handles[3].get_audit_logs()) == 10
+        saved = await handles[4].get_order_by_id(order.id)
+        assert saved.status == "ASSIGNED"
+        assert saved.notes == "позвонить заранее"
+
+        pool = handles[0]._pool
+        assert pool is handles[9]._pool
+        assert registry.stats()["pools_created"] == 1
+        assert pool.stats()["batches"] < pool.stats()["writes"]
+    finally:
+        for db in handles:
+            await db.disconnect()
+        await registry.close_all()
+
+
+async def test_pooled_database_writes_only_through_writer(monkeypatch, tmp_path):
+    """Тест: с пулом выданное соединение только читает, репозитории пишут через очередь"""
+    path = str(tmp_path / "bot.db")
+    orm_db = ORMDatabase(path)
+    await orm_db.connect()
+    await orm_db.init_db()
+    await orm_db.get_or_create_user(telegram_id=1, username="dispatcher")
+    order = await orm_db.create_order(
+        equipment_type="Стиральная машина",
+        description="Не сливает воду",
+        client_name="Клиент",
+        client_address="ул. Ленина, 1",
+        client_phone="+79001234567",
+        dispatcher_id=1,
+    )
+    await orm_db.disconnect()
+
+    registry = DatabaseRegistry()
+    monkeypatch.setattr(legacy_db_module, "database_registry", registry)
+    monkeypatch.setattr(Config, "DB_READ_CONNECTIONS", 2)
+
+    db = Database(path, shared=True)
+    await db.connect()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            await db.get_connection().execute("DELETE FROM orders")
+
+        repo = db.repository(OrderRepositoryExtended)
+        await asyncio.gather(repo.soft_delete(order.id, 1, "тест"), repo.soft_delete(order.id, 1))
+        await db.services.user_service.get_or_create_user(2, username="master")
+
+        assert await repo.get_by_id(order.id) is None
+        assert await repo.get_by_id(order.id, include_deleted=True) is not None
+        assert await db.get_user_by_telegram_id(2) is not None
+        assert db._pool.stats()["transactions"] >= 3
+    finally:
+        await db.disconnect()
+        await registry.close_all()
@@ -0,0 +1,111 @@
+"""
+Тесты для кэша пользователей RoleCheckMiddleware
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import UserRole
+from app.database.user_cache import UserCache, user_cache
+from app.middlewares.role_check import RoleCheckMiddleware
+
+
+PROFILE = ("ivan", "Иван", None)
+
+
+def test_hit_and_miss_counters():
+    """Тест: попадания и промахи считаются"""
+    cache = UserCache(ttl=60, max_size=10)
+
+    assert cache.get(1, PROFILE) is None
+    cache.set(1, "user-1", PROFILE)
+    assert cache.get(1, PROFILE) == "user-1"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_ttl_expiry(monkeypatch):
+    """Тест: запись устаревает по TTL"""
+    now = [1000.0]
+    monkeypatch.setattr("app.database.user_cache.time.monotonic", lambda: now[0])
+    cache = UserCache(ttl=60, max_size=10)
+    cache.set(1, "user-1", PROFILE)
+
+    now[0] += 59
+    assert cache.get(1, PROFILE) == "user-1"
+    now[0] += 2
+    assert cache.get(1, PROFILE) is None
+
+
+def test_profile_change_is_miss():
+    """Тест: изменение профиля Telegram приводит к обращению в БД"""
+    cache = UserCache(ttl=60, max_size=10)
+    cache.set(1, "user-1", PROFILE)
+
+    assert cache.get(1, ("ivan_new", "Иван", None)) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    """Тест: при переполнении вытесняется давно не использованная запись"""
+    cache = UserCache(ttl=60, max_size=2)
+    cache.set(1, "user-1", PROFILE)
+    cache.set(2, "user-2", PROFILE)
+    cache.get(1, PROFILE)
+    cache.set(3, "user-3", PROFILE)
+
+    assert cache.get(2, PROFILE) is None
+    assert cache.get(1, PROFILE) == "user-1"
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_uses_cache():
+    """Тест: повторные события пользователя не обращаются к БД"""
+    user_cache.clear()
+
+    class FakeDB:
+        calls = 0
+
+        async def get_or_create_user(self, **kwargs):
+            FakeDB.calls += 1
+            return SimpleNamespace(
+                get_primary_role=lambda: UserRole.DISPATCHER,
+                get_roles=lambda: [UserRole.DISPATCHER],
+            )
+
+    from aiogram.types import Message
+
+    middleware = RoleCheckMiddleware(FakeDB())
+    event = Message.model_construct(
+        from_user=SimpleNamespace(id=555, username="ivan", first_name="Иван", last_name=None)
+    )
+
+    async def handler(event, data):
+        return data["user_role"]
+
+    try:
+        for _ in range(3):
+            assert await middleware(handler, event, {}) == UserRole.DISPATCHER
+        assert FakeDB.calls == 1
+
+        user_cache.invalidate(555)
+        await middleware(handler, event, {})
+        assert FakeDB.calls == 2
+    finally:
+        user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_cache(db):
+    """Тест: изменение ролей в БД сбрасывает запись кэша"""
+    user = await db.get_or_create_user(telegram_id=777, username="petr")
+    user_cache.set(777, user, ("petr", None, None))
+
+    await db.add_user_role(777, UserRole.MASTER)
+
+    assert user_cache.get(777, ("petr", None, None)) is None